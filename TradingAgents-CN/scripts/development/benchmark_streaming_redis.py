@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+流式管道Redis写入基准测试
+对比逐条await写入（原实现）与 RedisBatchWriter 微批次流水线写入的持续吞吐（消息/秒）
+
+默认使用 fakeredis，并为每次Redis往返注入模拟网络延迟（--rtt-ms），
+也可以通过 --redis-url 连接本地Redis实例。
+
+用法:
+    python scripts/development/benchmark_streaming_redis.py --messages 20000 --rtt-ms 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from tradingagents.dataflows.streaming_batch_writer import RedisBatchWriter, redis_op
+
+
+class LatencyRedis:
+    """为每次往返（单条命令或一次pipeline执行）增加固定延迟的Redis客户端代理"""
+
+    def __init__(self, client, rtt: float):
+        self._client = client
+        self._rtt = rtt
+
+    def __getattr__(self, name):
+        command = getattr(self._client, name)
+
+        async def call(*args, **kwargs):
+            await asyncio.sleep(self._rtt)
+            return await command(*args, **kwargs)
+        return call
+
+    def pipeline(self, transaction: bool = True):
+        return LatencyPipeline(self._client.pipeline(transaction=transaction), self._rtt)
+
+
+class LatencyPipeline:
+    def __init__(self, pipe, rtt: float):
+        self._pipe = pipe
+        self._rtt = rtt
+
+    def __getattr__(self, name):
+        return getattr(self._pipe, name)
+
+    async def execute(self, raise_on_error: bool = True):
+        await asyncio.sleep(self._rtt)
+        return await self._pipe.execute(raise_on_error=raise_on_error)
+
+
+def create_client(redis_url: str):
+    if redis_url:
+        import redis.asyncio as redis_asyncio
+        return redis_asyncio.from_url(redis_url)
+    try:
+        from fakeredis import FakeAsyncRedis
+    except ImportError:
+        print("❌ 需要安装 fakeredis（pip install fakeredis）或通过 --redis-url 指定Redis")
+        sys.exit(1)
+    return FakeAsyncRedis()
+
+
+def market_tick_operations(index: int, symbols: int):
+    """与 StreamingDataManager 处理一条行情tick时的Redis写入一致"""
+    symbol = f"SYM{index % symbols:04d}"
+    timestamp = datetime.now()
+    price = 100.0 + (index % 1000) * 0.01
+    price_point = {'timestamp': timestamp.isoformat(), 'price': price, 'volume': 100}
+    indicators = {'sma_5': price, 'sma_20': price, 'rsi': 50.0, 'change_pct': 0.0}
+    fields = {
+        'message_id': f"bench_{index}",
+        'timestamp': timestamp.isoformat(),
+        'data_type': 'market_tick',
+        'symbol': symbol,
+        'source': 'benchmark',
+        'data': json.dumps({'price': price, 'volume': 100}),
+        'metadata': 'null',
+    }
+    return [
+        redis_op('xadd', f"stream:market_tick:{symbol}", fields, maxlen=10000),
+        redis_op('hset', f"latest_price:{symbol}", mapping={
+            'price': price, 'volume': 100, 'timestamp': timestamp.isoformat(), 'source': 'benchmark'}),
+        redis_op('expire', f"latest_price:{symbol}", 300),
+        redis_op('zadd', f"price_series:{symbol}", {json.dumps(price_point): timestamp.timestamp()}),
+        redis_op('zremrangebyrank', f"price_series:{symbol}", 0, -1001),
+        redis_op('expire', f"price_series:{symbol}", 3600),
+        redis_op('hset', f"indicators:{symbol}", mapping=indicators),
+        redis_op('expire', f"indicators:{symbol}", 300),
+    ]
+
+
+async def run_benchmark(args, batched: bool) -> dict:
+    client = create_client(args.redis_url)
+    await client.flushdb()
+    latency_client = LatencyRedis(client, args.rtt_ms / 1000.0)
+    writer = RedisBatchWriter(
+        lambda: latency_client,
+        batch_size=args.batch_size,
+        flush_interval=args.flush_interval_ms / 1000.0,
+        max_pending=args.max_pending,
+        enabled=batched,
+    )
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for index in range(args.messages):
+        queue.put_nowait(index)
+
+    async def producer():
+        # 每个生产者模拟一路并发的消息处理任务
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await writer.submit(market_tick_operations(index, args.symbols))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(producer() for _ in range(args.concurrency)))
+    await writer.close()
+    elapsed = time.perf_counter() - start
+
+    stats = writer.get_stats()
+    await client.aclose()
+    return {
+        'mode': '批量流水线' if batched else '逐条写入',
+        'elapsed': elapsed,
+        'rate': args.messages / elapsed,
+        'stats': stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="流式管道Redis写入基准测试")
+    parser.add_argument('--messages', type=int, default=20000, help="消息数量")
+    parser.add_argument('--symbols', type=int, default=200, help="股票数量")
+    parser.add_argument('--concurrency', type=int, default=64, help="并发处理任务数")
+    parser.add_argument('--rtt-ms', type=float, default=0.2, help="模拟的Redis往返延迟（毫秒）")
+    parser.add_argument('--batch-size', type=int, default=256, help="每批最大消息数")
+    parser.add_argument('--flush-interval-ms', type=float, default=5.0, help="最长攒批时间（毫秒）")
+    parser.add_argument('--max-pending', type=int, default=10000, help="缓冲区上限（背压阈值）")
+    parser.add_argument('--redis-url', default='', help="使用真实Redis（例如 redis://localhost:6379/15）")
+    args = parser.parse_args()
+
+    print(f"🚀 Redis写入基准: {args.messages}条消息, {args.symbols}只股票, "
+          f"并发{args.concurrency}, 往返延迟{args.rtt_ms}ms")
+
+    results = [asyncio.run(run_benchmark(args, batched)) for batched in (False, True)]
+    for result in results:
+        stats = result['stats']
+        print(f"  {result['mode']}: {result['rate']:,.0f} 消息/秒 "
+              f"(耗时 {result['elapsed']:.2f}s, Redis命令 {stats['commands']}, "
+              f"批次 {stats['batches']}, 合并命令 {stats['commands_coalesced']}, 错误 {stats['errors']})")
+
+    speedup = results[1]['rate'] / results[0]['rate']
+    print(f"📊 吞吐提升: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+价格数据格式转换工具
+将离线price_data目录和股票数据缓存中的CSV文件转换为Parquet/Feather列式存储
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('scripts')
+
+
+def convert_offline_price_data(format_name: str, remove_csv: bool) -> int:
+    """转换离线YFin价格数据目录"""
+    from tradingagents.dataflows.config import get_config
+    from tradingagents.dataflows.frame_storage import convert_csv_directory
+
+    price_dir = Path(get_config()["data_dir"]) / "market_data" / "price_data"
+    if not price_dir.exists():
+        logger.info(f"ℹ️ 离线价格目录不存在，跳过: {price_dir}")
+        return 0
+
+    logger.info(f"📁 转换离线价格目录: {price_dir}")
+    return convert_csv_directory(price_dir, format_name, index=False, remove_csv=remove_csv)
+
+
+def convert_stock_cache(format_name: str, remove_csv: bool) -> int:
+    """转换股票数据缓存并更新缓存目录中的记录"""
+    from tradingagents.dataflows.cache_manager import get_cache
+
+    logger.info(f"🗄️ 转换股票数据缓存")
+    return get_cache().convert_cached_frames(format_name, remove_csv=remove_csv)
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="将CSV价格数据转换为列式存储格式")
+    parser.add_argument("--format", choices=["parquet", "feather"], default="parquet",
+                        help="目标格式 (默认: parquet)")
+    parser.add_argument("--type", choices=["all", "price_data", "cache"], default="all",
+                        help="转换范围 (默认: all)")
+    parser.add_argument("--keep-csv", action="store_true", help="保留原CSV文件")
+
+    args = parser.parse_args()
+
+    total = 0
+    if args.type in ["all", "price_data"]:
+        total += convert_offline_price_data(args.format, not args.keep_csv)
+    if args.type in ["all", "cache"]:
+        total += convert_stock_cache(args.format, not args.keep_csv)
+
+    logger.info(f"🎉 转换完成！共转换 {total} 个文件")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Vectorized backtest kernel against the original per-bar loop"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.ml.validation import BacktestingFramework, ValidationConfig
+
+
+def loop_backtest(framework, signals, prices, returns):
+    """The bar-by-bar simulation that ``_run_backtest`` used before vectorization"""
+    config = framework.config
+    cash, positions = config.initial_capital, 0
+    trades, values = [], []
+    aligned_signals, aligned_prices = signals.align(prices['Close'], join='inner')
+    for date, signal in aligned_signals.items():
+        price = aligned_prices[date]
+        value = cash + positions * price
+        if signal == 'BUY' and positions <= 0:
+            size = framework._calculate_position_size(value, price, signal, returns.get(date, 0))
+            if size > 0:
+                cost = size * price * (1 + config.transaction_cost)
+                if cost <= cash:
+                    cash -= cost
+                    positions += size
+                    trades.append(('BUY', date, size))
+        elif signal == 'SELL' and positions > 0:
+            cash += positions * price * (1 - config.transaction_cost)
+            trades.append(('SELL', date, positions))
+            positions = 0
+        values.append(cash + positions * price)
+    returns_out = [0.0] + [(b - a) / a for a, b in zip(values, values[1:])]
+    return {'daily_values': np.array(values), 'daily_returns': np.array(returns_out), 'trades': trades}
+
+
+def random_market(seed, days=300):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2022-01-03", periods=days)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    signals = pd.Series(rng.choice(['BUY', 'SELL', 'HOLD'], size=days, p=[0.2, 0.2, 0.6]), index=dates)
+    returns = pd.Series(rng.normal(0, 0.01, days), index=dates)
+    return signals, pd.DataFrame({'Close': close}, index=dates), returns
+
+
+@pytest.mark.parametrize("method", ["fixed", "kelly", "risk_parity"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_vectorized_backtest_matches_loop(method, seed):
+    framework = BacktestingFramework(ValidationConfig(position_size_method=method))
+    signals, prices, returns = random_market(seed)
+
+    expected = loop_backtest(framework, signals, prices, returns)
+    result = framework._run_backtest(signals, prices, returns)
+
+    np.testing.assert_allclose(result['daily_values'], expected['daily_values'], rtol=1e-10)
+    np.testing.assert_allclose(result['daily_returns'], expected['daily_returns'], rtol=1e-10, atol=1e-15)
+    trades = [(trade['action'], trade['date'], trade['quantity']) for trade in result['trades']]
+    assert [t[:2] for t in trades] == [t[:2] for t in expected['trades']]
+    np.testing.assert_allclose([t[2] for t in trades], [t[2] for t in expected['trades']], rtol=1e-10)
+
+    metrics = framework._calculate_performance_metrics(result)
+    expected_metrics = framework._calculate_performance_metrics(expected)
+    for name in ('total_return', 'sharpe_ratio', 'max_drawdown', 'win_rate'):
+        assert metrics[name] == pytest.approx(expected_metrics[name], rel=1e-9, abs=1e-12)
+
+
+def test_batch_backtest_matches_single_symbol_runs():
+    framework = BacktestingFramework(ValidationConfig())
+    markets = {symbol: random_market(seed) for seed, symbol in enumerate(["AAA", "BBB", "CCC"])}
+    signals = pd.DataFrame({symbol: market[0] for symbol, market in markets.items()})
+    prices = pd.DataFrame({symbol: market[1]['Close'] for symbol, market in markets.items()})
+
+    batch = framework.run_batch_backtest(signals, prices)
+
+    for symbol, (symbol_signals, symbol_prices, returns) in markets.items():
+        expected = loop_backtest(framework, symbol_signals, symbol_prices, returns)
+        np.testing.assert_allclose(batch['equity'][symbol].values, expected['daily_values'], rtol=1e-10)
+        assert batch['metrics'].loc[symbol, 'num_trades'] == len(expected['trades'])
@@ -0,0 +1,83 @@
+"""SQLite cache metadata catalog (CacheCatalog)"""
+
+import json
+
+import pytest
+
+from tradingagents.dataflows.cache_catalog import CacheCatalog
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = CacheCatalog(tmp_path / "catalog.db")
+    yield catalog
+    catalog.close()
+
+
+def entry(symbol, cached_at, start="2024-01-01", end="2024-06-30", source="tushare", **extra):
+    return dict(symbol=symbol, data_type="stock_data", market_type="china", data_source=source,
+                start_date=start, end_date=end, file_path=f"{symbol}.csv", file_format="csv",
+                cached_at=cached_at, **extra)
+
+
+def test_put_get_round_trip_keeps_extra_fields(catalog):
+    catalog.put("k1", entry("000001", "2024-07-01T10:00:00", rows=120))
+
+    metadata = catalog.get("k1")
+
+    assert metadata['symbol'] == "000001"
+    assert metadata['rows'] == 120
+    assert metadata['cache_key'] == "k1"
+    assert catalog.get("missing") is None
+
+
+def test_find_filters_and_orders_newest_first(catalog):
+    catalog.put("old", entry("000001", "2024-07-01T10:00:00"))
+    catalog.put("new", entry("000001", "2024-07-02T10:00:00"))
+    catalog.put("other_source", entry("000001", "2024-07-03T10:00:00", source="akshare"))
+    catalog.put("other_symbol", entry("600000", "2024-07-04T10:00:00"))
+
+    found = catalog.find(symbol="000001", data_source="tushare")
+    assert [m['cache_key'] for m in found] == ["new", "old"]
+
+    fresh = catalog.find(symbol="000001", newer_than="2024-07-02T00:00:00")
+    assert [m['cache_key'] for m in fresh] == ["other_source", "new"]
+
+    catalog.delete("new")
+    assert [m['cache_key'] for m in catalog.find(symbol="000001", limit=1)] == ["other_source"]
+
+
+def test_find_covering_needs_the_whole_range(catalog):
+    catalog.put("h1", entry("000001", "2024-07-01T10:00:00", start="2024-01-01", end="2024-03-31"))
+    catalog.put("year", entry("000001", "2024-07-01T09:00:00", start="2024-01-01", end="2024-12-31"))
+
+    assert catalog.find_covering("000001", "stock_data", "2024-02-01", "2024-03-01")['cache_key'] == "h1"
+    assert catalog.find_covering("000001", "stock_data", "2024-02-01", "2024-05-01")['cache_key'] == "year"
+    assert catalog.find_covering("000001", "stock_data", "2023-12-01", "2024-05-01") is None
+
+
+def test_json_metadata_is_migrated_once(tmp_path, catalog):
+    metadata_dir = tmp_path / "metadata"
+    metadata_dir.mkdir()
+    (metadata_dir / "k1_meta.json").write_text(
+        json.dumps(entry("000001", "2024-07-01T10:00:00")), encoding="utf-8")
+    (metadata_dir / "broken_meta.json").write_text("{", encoding="utf-8")
+
+    assert catalog.migrate_json_metadata(metadata_dir) == 1
+    assert catalog.get("k1")['file_path'] == "000001.csv"
+    assert catalog.migrate_json_metadata(metadata_dir) == 0
+
+
+def test_catalog_persists_across_connections(tmp_path):
+    first = CacheCatalog(tmp_path / "catalog.db")
+    first.put("k1", entry("000001", "2024-07-01T10:00:00"))
+    first.set_ranges("000001|tushare", [("2024-01-01", "2024-01-31"), ("2024-03-01", "2024-03-31")])
+    first.close()
+
+    reopened = CacheCatalog(tmp_path / "catalog.db")
+    try:
+        assert reopened.get("k1")['symbol'] == "000001"
+        assert reopened.get_ranges("000001|tushare") == [("2024-01-01", "2024-01-31"),
+                                                        ("2024-03-01", "2024-03-31")]
+    finally:
+        reopened.close()
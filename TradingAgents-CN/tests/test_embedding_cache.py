@@ -0,0 +1,107 @@
+"""Shared embedding cache and batched memory embeddings"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from tradingagents.agents.utils.embedding_cache import EmbeddingCache, embedding_cache_key
+
+
+def test_vectors_persist_across_instances(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.db"))
+    key = embedding_cache_key("openai", "text-embedding-3-small", "rates rise")
+    cache.put_many({key: [0.25, -1.5, 3.0]})
+    cache.close()
+
+    reopened = EmbeddingCache(str(tmp_path / "embeddings.db"))
+    try:
+        assert reopened.get_many([key, "missing"]) == {key: [0.25, -1.5, 3.0]}
+        assert reopened.get_stats()['hits'] == 1
+        assert reopened.get_stats()['misses'] == 1
+    finally:
+        reopened.close()
+
+
+def test_key_depends_on_provider_and_model():
+    keys = {embedding_cache_key(provider, model, "text")
+            for provider, model in [("openai", "a"), ("openai", "b"), ("dashscope", "a")]}
+    assert len(keys) == 3
+
+
+def test_memory_lru_is_bounded(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.db"), memory_size=2)
+    try:
+        cache.put_many({"a": [1.0], "b": [2.0], "c": [3.0]})
+        assert cache.get_stats()['memory_entries'] == 2
+        # Evicted entries are still served from SQLite
+        assert cache.get_many(["a"]) == {"a": [1.0]}
+    finally:
+        cache.close()
+
+
+class FakeEmbeddingsAPI:
+    """OpenAI-compatible embeddings endpoint that records each request"""
+
+    def __init__(self, fail_on=None):
+        self.requests = []
+        self.fail_on = fail_on
+
+    def create(self, model, input):
+        self.requests.append(list(input))
+        if self.fail_on in input:
+            raise RuntimeError("provider unavailable")
+        return SimpleNamespace(data=[SimpleNamespace(index=i, embedding=[float(len(text)), 1.0])
+                                     for i, text in enumerate(input)])
+
+
+@pytest.fixture
+def make_memory(tmp_path):
+    pytest.importorskip("chromadb")
+    from tradingagents.agents.utils.memory import FinancialSituationMemory
+
+    cache = EmbeddingCache(str(tmp_path / "embeddings.db"))
+
+    def factory(api, batch_size=2):
+        memory = FinancialSituationMemory.__new__(FinancialSituationMemory)
+        memory.client = SimpleNamespace(embeddings=api)
+        memory.embedding_provider = "openai"
+        memory.embedding = "text-embedding-3-small"
+        memory.embedding_cache = cache
+        memory.embedding_batch_size = batch_size
+        return memory
+
+    yield factory
+    cache.close()
+
+
+def test_misses_are_deduplicated_and_batched(make_memory):
+    api = FakeEmbeddingsAPI()
+    memory = make_memory(api)
+
+    vectors = memory.get_embeddings(["a", "bb", "a", "ccc", "dddd"])
+
+    assert api.requests == [["a", "bb"], ["ccc", "dddd"]]
+    assert [v[0] for v in vectors] == [1.0, 2.0, 1.0, 3.0, 4.0]
+
+
+def test_cache_is_shared_between_memory_instances(make_memory):
+    make_memory(FakeEmbeddingsAPI()).get_embeddings(["bull market", "bear market"])
+    api = FakeEmbeddingsAPI()
+
+    make_memory(api).get_embeddings(["bear market", "sideways"])
+
+    assert api.requests == [["sideways"]]
+
+
+def test_failed_batch_returns_zero_vectors_and_is_not_cached(make_memory):
+    from tradingagents.agents.utils.memory import EMPTY_EMBEDDING_DIM
+
+    memory = make_memory(FakeEmbeddingsAPI(fail_on="bad"), batch_size=1)
+    vectors = memory.get_embeddings(["good", "bad"])
+
+    assert vectors[0] == [4.0, 1.0]
+    assert vectors[1] == [0.0] * EMPTY_EMBEDDING_DIM
+
+    api = FakeEmbeddingsAPI()
+    make_memory(api).get_embeddings(["good", "bad"])
+    assert api.requests == [["bad"]]
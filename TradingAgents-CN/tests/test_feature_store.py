@@ -0,0 +1,97 @@
+"""Incremental feature store against a full feature rebuild"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.ml.feature_engineering import FeatureConfig, create_comprehensive_features
+from tradingagents.ml.feature_store import IncrementalFeatureStore
+
+
+def random_bars(days=320, seed=7):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2022-01-03", periods=days)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.015, days)))
+    spread = np.abs(rng.normal(0, 0.01, days)) * close
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.003, days)),
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(100_000, 1_000_000, days).astype(float),
+    }, index=dates)
+
+
+@pytest.fixture
+def config():
+    # Fundamental and sentiment features come from per-call inputs, not the store
+    return FeatureConfig(fundamental_features=False, sentiment_features=False)
+
+
+@pytest.fixture
+def store(tmp_path, config):
+    return IncrementalFeatureStore(str(tmp_path / "features"), config, storage_format="csv")
+
+
+def assert_same_features(actual, expected):
+    assert list(actual.columns) == list(expected.columns)
+    pd.testing.assert_index_equal(actual.index, expected.index)
+    np.testing.assert_allclose(actual.values, expected.values, rtol=1e-9, atol=1e-9)
+
+
+def test_appended_bars_match_full_rebuild(store, config):
+    bars = random_bars()
+    store.get_features("AAA", bars.iloc[:250])
+
+    for end in (260, 261, len(bars)):
+        features = store.get_features("AAA", bars.iloc[:end])
+        assert_same_features(features, create_comprehensive_features(bars.iloc[:end], config))
+
+    stats = store.get_stats()
+    assert stats['rows_reused'] > 0
+    assert stats['full_rebuilds'] == len(store._raw_engines)
+
+
+def test_revised_bar_recomputes_from_that_bar(store, config):
+    bars = random_bars()
+    store.get_features("AAA", bars)
+
+    revised = bars.copy()
+    revised.iloc[300, revised.columns.get_loc('Close')] *= 1.05
+    features = store.get_features("AAA", revised)
+
+    assert_same_features(features, create_comprehensive_features(revised, config))
+
+
+def test_shorter_history_is_served_from_store(store, config):
+    bars = random_bars()
+    store.get_features("AAA", bars)
+    computed = store.get_stats()['rows_computed']
+
+    features = store.get_features("AAA", bars.iloc[:280])
+
+    assert store.get_stats()['rows_computed'] == computed
+    assert_same_features(features, create_comprehensive_features(bars.iloc[:280], config))
+
+
+def test_new_store_instance_reuses_persisted_blocks(tmp_path, config):
+    bars = random_bars()
+    IncrementalFeatureStore(str(tmp_path / "features"), config, storage_format="csv").get_features("AAA", bars.iloc[:300])
+
+    reopened = IncrementalFeatureStore(str(tmp_path / "features"), config, storage_format="csv")
+    features = reopened.get_features("AAA", bars)
+
+    assert reopened.get_stats()['full_rebuilds'] == 0
+    assert_same_features(features, create_comprehensive_features(bars, config))
+
+
+def test_feature_dtype_gets_its_own_store(tmp_path, config):
+    bars = random_bars()
+    IncrementalFeatureStore(str(tmp_path / "features"), config, storage_format="csv").get_features("AAA", bars)
+
+    float32_config = FeatureConfig(fundamental_features=False, sentiment_features=False, feature_dtype="float32")
+    float32_store = IncrementalFeatureStore(str(tmp_path / "features"), float32_config, storage_format="csv")
+    float32_store.get_features("AAA", bars)
+
+    assert float32_store.get_stats()['rows_reused'] == 0
+    assert float32_store.get_stats()['full_rebuilds'] == len(float32_store._raw_engines)
@@ -0,0 +1,109 @@
+"""Bulk ingestion and embedding reuse (FinancialKnowledgeBase)"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from tradingagents.ai import financial_rag
+from tradingagents.ai.financial_rag import FinancialDocument, FinancialKnowledgeBase, RAGQuery
+
+
+@pytest.fixture
+def kb(tmp_path, monkeypatch):
+    # Deterministic fallback embeddings, local store only
+    monkeypatch.setattr(financial_rag, "SENTENCE_TRANSFORMERS_AVAILABLE", False)
+    monkeypatch.setattr(financial_rag, "CHROMADB_AVAILABLE", False)
+    knowledge_base = FinancialKnowledgeBase(str(tmp_path / "kb"))
+    yield knowledge_base
+    knowledge_base.store.close()
+
+
+def make_document(doc_id, content, doc_type="news"):
+    return FinancialDocument(doc_id=doc_id, title=doc_id, content=content, doc_type=doc_type)
+
+
+def test_embedding_not_reused_after_owner_content_changes(kb):
+    kb.add_documents([make_document("a", "central bank raises rates")])
+    kb.add_documents([make_document("a", "quarterly earnings beat estimates")])
+
+    report = kb.add_documents([make_document("b", "central bank raises rates")])
+
+    assert report.reused_embeddings == 0
+    assert report.embedded == 1
+    expected = kb.embedding_system.embed_text("central bank raises rates", "news")
+    assert np.allclose(kb.documents["b"].embedding, expected)
+
+
+def test_duplicate_content_is_embedded_once(kb):
+    report = kb.add_documents([
+        make_document("a", "same headline"),
+        make_document("b", "same headline"),
+        make_document("c", "other headline"),
+    ])
+
+    assert report.added == 3
+    assert report.embedded == 2
+    assert report.reused_embeddings == 1
+    assert np.array_equal(kb.documents["a"].embedding, kb.documents["b"].embedding)
+
+
+def test_unchanged_documents_are_skipped(kb):
+    kb.add_documents([make_document("a", "text")])
+
+    report = kb.add_documents([make_document("a", "text")])
+
+    assert report.unchanged == 1
+    assert report.added == 0
+
+
+class RejectingCollection:
+    """Vector database stub that rejects any batch containing a given id"""
+
+    def __init__(self, bad_id):
+        self.bad_id = bad_id
+        self.ids = []
+        self.contents = {}
+
+    def upsert(self, embeddings, documents, metadatas, ids):
+        if self.bad_id in ids:
+            raise ValueError(f"invalid document {self.bad_id}")
+        self.ids.extend(ids)
+        self.contents.update(zip(ids, documents))
+
+
+def test_one_rejected_document_does_not_fail_the_batch(kb):
+    kb.collection = RejectingCollection("bad")
+
+    report = kb.add_documents([
+        make_document("x", "one"),
+        make_document("bad", "two"),
+        make_document("y", "three"),
+    ])
+
+    assert report.added == 2
+    assert report.failed == 1
+    assert kb.collection.ids == ["x", "y"]
+    assert "bad" not in kb.documents
+
+
+def test_reingested_document_replaces_the_stored_version(kb):
+    kb.collection = RejectingCollection("bad")
+    kb.add_documents([make_document("x", "first draft")])
+
+    report = kb.add_documents([make_document("x", "final version")])
+
+    assert report.added == 1
+    assert kb.collection.contents == {"x": "final version"}
+
+
+def test_reingested_document_leaves_its_old_filter_entries(kb):
+    kb.add_documents([FinancialDocument(doc_id="a", title="a", content="guidance cut", doc_type="news",
+                                        symbol="AAPL", timestamp=datetime(2024, 1, 2))])
+    kb.add_documents([FinancialDocument(doc_id="a", title="a", content="guidance raised", doc_type="research",
+                                        symbol="MSFT", timestamp=datetime(2024, 3, 4))])
+
+    assert kb._candidate_doc_ids(RAGQuery("q", symbols=["AAPL"])) == set()
+    assert kb._candidate_doc_ids(RAGQuery("q", doc_types=["news"])) == set()
+    assert kb._candidate_doc_ids(RAGQuery("q", symbols=["MSFT"], doc_types=["research"])) == {"a"}
+    assert dict(kb.date_index) == {"2024-03-04": ["a"]}
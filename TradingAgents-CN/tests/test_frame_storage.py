@@ -0,0 +1,52 @@
+"""OHLCV frame storage backends and CSV conversion"""
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import frame_storage
+from tradingagents.dataflows.frame_storage import (
+    CsvFrameStorage, convert_csv_directory, get_frame_storage, get_storage_for_path
+)
+
+
+def test_with_extension_keeps_dotted_symbols():
+    storage = CsvFrameStorage()
+    assert storage.with_extension("cache/BRK.B").name == "BRK.B.csv"
+    assert storage.with_extension("cache/0700.HK.parquet").name == "0700.HK.csv"
+
+
+def test_csv_round_trip_with_column_projection(tmp_path):
+    data = pd.DataFrame({'Close': [1.0, 2.0], 'Volume': [10, 20]}, index=['2024-01-02', '2024-01-03'])
+    path = CsvFrameStorage().save(data, tmp_path / "AAPL", index=True)
+
+    loaded = get_storage_for_path(path).load(path, columns=['Close'])
+
+    assert list(loaded.columns) == ['Close']
+    assert loaded['Close'].tolist() == [1.0, 2.0]
+
+
+def test_unknown_format_falls_back_to_csv():
+    assert get_frame_storage("xlsx").format_name == "csv"
+
+
+@pytest.mark.skipif(not frame_storage.PYARROW_AVAILABLE, reason="pyarrow not installed")
+def test_converter_never_rewrites_unconvertible_csv(tmp_path, monkeypatch):
+    source = tmp_path / "000001.csv"
+    source.write_text("code,close\n000001,10.5\n000002,11.0\n", encoding="utf-8")
+    original = source.read_bytes()
+    monkeypatch.setattr(frame_storage.ParquetFrameStorage, "accepts", lambda self, data, index=True: False)
+
+    converted = convert_csv_directory(tmp_path, "parquet", index=False, remove_csv=True)
+
+    assert converted == 0
+    assert source.read_bytes() == original
+    assert not (tmp_path / "000001.parquet").exists()
+
+
+@pytest.mark.skipif(not frame_storage.PYARROW_AVAILABLE, reason="pyarrow not installed")
+def test_parquet_save_falls_back_to_csv_for_unconvertible_frames(tmp_path):
+    mixed = pd.DataFrame({'value': [1, 'x']})
+
+    path = get_frame_storage("parquet").save(mixed, tmp_path / "mixed", index=False)
+
+    assert path.suffix == ".csv"
@@ -0,0 +1,69 @@
+"""NumPy indicator kernels against their pandas equivalents"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.utils import indicator_kernels as kernels
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(11)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 3000)))
+    close[[5, 400, 401]] = np.nan
+    return close
+
+
+def assert_series_close(actual, expected):
+    np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-9, atol=1e-9)
+
+
+def test_rolling_statistics_match_pandas(prices):
+    series = pd.Series(prices)
+    assert_series_close(kernels.rolling_mean(prices, 20), series.rolling(20).mean())
+    assert_series_close(kernels.rolling_sum(prices, 5), series.rolling(5).sum())
+    assert_series_close(kernels.rolling_std(prices, 20), series.rolling(20).std())
+    assert_series_close(kernels.rolling_max(prices, 14), series.rolling(14).max())
+    assert_series_close(kernels.cumsum_skipna(prices), series.cumsum())
+    assert_series_close(kernels.pct_change(prices, 5), series / series.shift(5) - 1)
+
+
+@pytest.mark.parametrize("span", [2, 12, 26, 200])
+def test_ema_matches_pandas_across_recurrence_blocks(prices, span):
+    # 3000 bars spans several closed-form blocks for the short spans
+    assert_series_close(kernels.ema(prices, span), pd.Series(prices).ewm(span=span).mean())
+
+
+def test_macd_and_rsi_match_pandas(prices):
+    series = pd.Series(prices)
+    macd_line, signal_line, histogram = kernels.macd(prices)
+    expected_macd = series.ewm(span=12).mean() - series.ewm(span=26).mean()
+    assert_series_close(macd_line, expected_macd)
+    assert_series_close(signal_line, expected_macd.ewm(span=9).mean())
+    assert_series_close(histogram, expected_macd - expected_macd.ewm(span=9).mean())
+
+    delta = series.diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    assert_series_close(kernels.rsi(prices), 100 - 100 / (1 + gain / loss))
+
+
+def test_simplified_sar_matches_the_loop():
+    rng = np.random.default_rng(5)
+    high = 50 + np.cumsum(rng.normal(0, 1, 500))
+    low = high - 1
+
+    expected = np.empty(len(high))
+    expected[0], expected[1] = low[0], high[0]
+    for i in range(2, len(high)):
+        expected[i] = expected[i - 1] + 0.02 * (high[i - 1] - expected[i - 1])
+
+    np.testing.assert_allclose(kernels.parabolic_sar_simplified(high, low), expected, rtol=1e-10)
+
+
+def test_float32_output_keeps_float64_accumulation(prices):
+    result = kernels.rolling_mean(prices, 20, dtype=np.float32)
+
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, kernels.rolling_mean(prices, 20), rtol=1e-6, equal_nan=True)
@@ -0,0 +1,145 @@
+"""Append-only segment store behind the knowledge base (SegmentedKnowledgeStore)"""
+
+import pickle
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from tradingagents.ai import financial_rag
+from tradingagents.ai.financial_rag import FinancialDocument, FinancialKnowledgeBase
+from tradingagents.ai.kb_store import SegmentedKnowledgeStore
+
+
+def record(doc_id, content="text", symbol="AAPL", doc_type="news"):
+    return {'doc_id': doc_id, 'content': content, 'doc_type': doc_type, 'symbol': symbol,
+            'timestamp': "2024-03-01T09:30:00"}
+
+
+def vector(seed, dim=4):
+    return np.random.default_rng(seed).normal(size=dim).astype(np.float32)
+
+
+@pytest.fixture
+def store(tmp_path):
+    segment_store = SegmentedKnowledgeStore(tmp_path / "segments", background_compaction=False)
+    segment_store.open()
+    yield segment_store
+    segment_store.close()
+
+
+def test_reopened_store_reads_bodies_and_embeddings(store, tmp_path):
+    store.append([record("a", "first"), record("b", "second")], [vector(0), None])
+    store.close()
+
+    reopened = SegmentedKnowledgeStore(tmp_path / "segments")
+    reopened.open()
+
+    assert reopened.read_record("a")['content'] == "first"
+    assert np.allclose(reopened.read_record("a")['embedding'], vector(0))
+    assert 'embedding' not in reopened.read_record("b")
+    assert [ids for ids, _ in reopened.iter_embeddings()] == [["a"]]
+    reopened.close()
+
+
+def test_latest_segment_wins(store):
+    store.append([record("a", "old")], [vector(0)])
+    store.append([record("a", "new")], [vector(1)])
+
+    assert store.read_record("a")['content'] == "new"
+    ids, embeddings = zip(*store.iter_embeddings())
+    assert list(ids) == [["a"]]
+    assert np.allclose(embeddings[0][0], vector(1))
+
+
+def test_odd_dimension_embedding_is_stored_inline(store):
+    # The store dimension is the most common one in the first segment
+    store.append([record("a"), record("b"), record("c")], [vector(0), vector(1), vector(2, dim=3)])
+
+    assert store.locators["c"].row == -1
+    assert np.allclose(store.read_record("c")['embedding'], vector(2, dim=3))
+
+
+def test_compaction_drops_superseded_versions(store, tmp_path):
+    store.append([record("a", "old"), record("b")], [vector(0), vector(1)])
+    store.append([record("a", "new"), record("c")], [vector(2), None])
+
+    assert store.compact()
+
+    assert store.stats()['segments'] == 1
+    assert store.read_record("a")['content'] == "new"
+    assert store.read_record("c")['content'] == "text"
+    ids, embeddings = next(store.iter_embeddings())
+    assert sorted(ids) == ["a", "b"]
+    assert np.allclose(embeddings[ids.index("a")], vector(2))
+    segment_files = {path.name.split('.', 1)[0] for path in (tmp_path / "segments").glob("seg-*")}
+    assert segment_files == set(store.segments)
+
+
+def test_automatic_compaction_past_max_segments(tmp_path):
+    segment_store = SegmentedKnowledgeStore(tmp_path / "segments", max_segments=2)
+    segment_store.open()
+    for i in range(4):
+        segment_store.append([record(f"doc{i}")], [vector(i)])
+    segment_store.wait_for_compaction()
+
+    assert segment_store.stats()['segments'] <= 2
+    assert segment_store.stats()['documents'] == 4
+    segment_store.close()
+
+
+def test_uncommitted_segment_is_discarded_on_open(store, tmp_path):
+    store.append([record("a")], [vector(0)])
+    # Segment files written without the manifest commit, as after a crash mid-save
+    name = store._allocate_segment()
+    store._write_segment(name, b'{}\n', np.zeros((0, 4), dtype=np.float32), [])
+    store.close()
+
+    reopened = SegmentedKnowledgeStore(tmp_path / "segments")
+    reopened.open()
+
+    assert list(reopened.locators) == ["a"]
+    assert not list((tmp_path / "segments").glob(f"{name}.*"))
+    reopened.close()
+
+
+@pytest.fixture
+def local_only(monkeypatch):
+    monkeypatch.setattr(financial_rag, "SENTENCE_TRANSFORMERS_AVAILABLE", False)
+    monkeypatch.setattr(financial_rag, "CHROMADB_AVAILABLE", False)
+
+
+def make_document(doc_id, content, symbol="AAPL"):
+    return FinancialDocument(doc_id=doc_id, title=doc_id, content=content, doc_type="news",
+                             symbol=symbol, timestamp=datetime(2024, 3, 1, 9, 30))
+
+
+def test_saved_knowledge_base_reloads_lazily(tmp_path, local_only):
+    kb = FinancialKnowledgeBase(str(tmp_path / "kb"))
+    kb.add_documents([make_document("a", "apple earnings"), make_document("m", "msft cloud", "MSFT")])
+    kb.save_knowledge_base()
+    kb.store.close()
+
+    reloaded = FinancialKnowledgeBase(str(tmp_path / "kb"))
+
+    assert reloaded.documents.pending == {}
+    assert sorted(reloaded.symbol_index["AAPL"]) == ["a"]
+    assert reloaded.documents["m"].content == "msft cloud"
+    assert reloaded.vector_index.stats()['vectors'] == 2
+    reloaded.store.close()
+
+
+def test_legacy_pickle_is_migrated(tmp_path, local_only):
+    kb_dir = tmp_path / "kb"
+    kb_dir.mkdir()
+    document = make_document("a", "apple earnings")
+    document.embedding = np.ones(8)
+    with open(kb_dir / "knowledge_base.pkl", 'wb') as f:
+        pickle.dump({'documents': {"a": document}}, f)
+
+    migrated = FinancialKnowledgeBase(str(kb_dir))
+
+    assert migrated.store.exists()
+    assert migrated.documents.pending == {}
+    assert migrated.documents["a"].content == "apple earnings"
+    migrated.store.close()
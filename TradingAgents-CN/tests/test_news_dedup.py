@@ -0,0 +1,65 @@
+"""Near-duplicate news clustering (MinHash + LSH)"""
+
+import pandas as pd
+
+from tradingagents.utils.news_dedup import (
+    NearDuplicateDetector, dedup_markdown_news, dedup_news_dataframe
+)
+
+STORY = "Apple reports record quarterly revenue of 120 billion dollars driven by iPhone sales"
+REPRINT = "Apple reports record quarterly revenue of 120 billion dollars, driven by iPhone sales!"
+OTHER = "Federal Reserve leaves interest rates unchanged and signals two cuts later this year"
+CHINESE = "贵州茅台发布年度业绩预告，净利润同比增长百分之十九，超出市场预期"
+CHINESE_REPRINT = "贵州茅台发布年度业绩预告：净利润同比增长百分之十九，超出市场预期。"
+
+
+def test_reprints_cluster_and_distinct_stories_do_not():
+    clusters = NearDuplicateDetector().cluster([STORY, OTHER, REPRINT, CHINESE, CHINESE_REPRINT])
+
+    assert clusters == [[0, 2], [1], [3, 4]]
+
+
+def test_detector_matches_exact_jaccard_closely():
+    detector = NearDuplicateDetector(num_perm=256)
+    shingles = lambda text: set(detector._shingles(text).tolist())
+    a, b = shingles(STORY), shingles(OTHER)
+    exact = len(a & b) / len(a | b)
+
+    estimate = float((detector.signature(STORY) == detector.signature(OTHER)).mean())
+
+    assert abs(estimate - exact) < 0.1
+
+
+def test_also_reported_by_counts_other_sources():
+    items = [(STORY, "Reuters"), (REPRINT, "Bloomberg"), (REPRINT + " ", "Reuters"), (OTHER, "CNBC")]
+
+    clusters = NearDuplicateDetector().cluster_items(items, text_fn=lambda i: i[0], source_fn=lambda i: i[1])
+
+    assert [c.representative for c in clusters] == [0, 3]
+    assert [c.also_reported_by for c in clusters] == [1, 0]
+
+
+def test_dataframe_keeps_first_row_of_each_cluster():
+    news = pd.DataFrame({
+        '新闻标题': [CHINESE, OTHER, CHINESE_REPRINT],
+        '新闻内容': ["", "", ""],
+        '文章来源': ["新浪财经", "Reuters", "东方财富"],
+    })
+
+    result = dedup_news_dataframe(news)
+
+    assert result['文章来源'].tolist() == ["新浪财经", "Reuters"]
+    assert result['also_reported_by'].tolist() == [1, 0]
+
+
+def test_markdown_blocks_are_merged_and_annotated():
+    text = (f"# 新闻\n\n### {STORY}\n(source: Reuters)\n\n"
+            f"### {OTHER}\n(source: CNBC)\n\n"
+            f"### {REPRINT}\n(source: Bloomberg)\n")
+
+    result = dedup_markdown_news(text)
+
+    assert result.count("### ") == 2
+    assert "（另有1个来源报道相同内容）" in result
+    assert result.startswith("# 新闻")
+    assert dedup_markdown_news(f"### {STORY}\n") == f"### {STORY}\n"
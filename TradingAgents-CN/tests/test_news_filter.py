@@ -0,0 +1,57 @@
+"""Batch news relevance scoring (NewsRelevanceFilter)"""
+
+import random
+
+import pandas as pd
+import pytest
+
+from tradingagents.utils.news_filter import NewsRelevanceFilter
+
+
+@pytest.fixture
+def news_filter():
+    return NewsRelevanceFilter("600036", "招商银行")
+
+
+def random_text(rng, news_filter, words):
+    vocabulary = (news_filter.strong_keywords + news_filter.include_keywords + news_filter.exclude_keywords
+                  + ["招商银行", "600036", "市场", "银行股", "ETF", "今日", "预告"])
+    return "".join(rng.choice(vocabulary) for _ in range(rng.randint(0, words)))
+
+
+def test_batch_scores_match_per_item_scoring(news_filter):
+    rng = random.Random(3)
+    titles = [random_text(rng, news_filter, 4) for _ in range(500)]
+    contents = [random_text(rng, news_filter, 12) for _ in range(500)]
+
+    batch = news_filter.score_news_batch(titles, contents)
+
+    expected = [news_filter.calculate_relevance_score(t, c) for t, c in zip(titles, contents)]
+    assert batch.tolist() == expected
+
+
+def test_overlapping_keywords_all_count(news_filter):
+    # "业绩预告" also contains "业绩"; "资产重组" also contains "重组"
+    title = "招商银行业绩预告及资产重组"
+
+    assert news_filter.score_news_batch([title], [""])[0] == news_filter.calculate_relevance_score(title, "")
+
+
+def test_keyword_list_changes_recompile_the_matcher(news_filter):
+    news_filter.score_news_batch(["招商银行"], [""])
+    news_filter.include_keywords.append("数字化转型")
+
+    title = "招商银行推进数字化转型"
+    assert news_filter.score_news_batch([title], [""])[0] == 65
+
+
+def test_filter_news_keeps_relevant_rows_sorted(news_filter):
+    news = pd.DataFrame({
+        '新闻标题': ["银行ETF资金流入", "招商银行发布年报", "招商银行600036停牌公告"],
+        '新闻内容': ["指数基金", "", ""],
+    })
+
+    filtered = news_filter.filter_news(news, min_score=30, deduplicate=False)
+
+    assert filtered['新闻标题'].tolist() == ["招商银行600036停牌公告", "招商银行发布年报"]
+    assert filtered['relevance_score'].tolist() == [100, 65]
@@ -0,0 +1,122 @@
+"""Process-level cache of offline FinnHub/SimFin datasets (OfflineDatasetCache)"""
+
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.offline_data_cache import (
+    DateIndexedData, OfflineDatasetCache, load_date_indexed_json, load_simfin_statements
+)
+
+
+def write_json(path, data, mtime=None):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_date_range_matches_string_filter():
+    data = {"2024-01-03": [1], "2024-01-01": [2], "2024-01-02": [], "2024-01-05": [3], "2023-12-31": [4]}
+    indexed = DateIndexedData(data)
+
+    for start, end in [("2024-01-01", "2024-01-05"), ("2024-01-02", "2024-01-04"), ("2025-01-01", "2025-02-01")]:
+        expected = {k: v for k, v in data.items() if start <= k <= end and len(v) > 0}
+        assert indexed.range(start, end) == expected
+
+
+def test_file_is_parsed_once_until_it_changes(tmp_path):
+    cache = OfflineDatasetCache()
+    path = write_json(tmp_path / "AAPL_data_formatted.json", {"2024-01-02": ["a"]}, mtime=1_700_000_000)
+
+    first = cache.get(path, load_date_indexed_json)
+    assert cache.get(path, load_date_indexed_json) is first
+
+    write_json(tmp_path / "AAPL_data_formatted.json", {"2024-01-02": ["b"]}, mtime=1_700_000_100)
+    reloaded = cache.get(path, load_date_indexed_json)
+
+    assert reloaded.range("2024-01-01", "2024-12-31") == {"2024-01-02": ["b"]}
+    assert cache.get_stats()['hits'] == 1
+    assert cache.get_stats()['reloads'] == 1
+
+
+def test_least_recently_used_dataset_is_evicted(tmp_path):
+    paths = [write_json(tmp_path / f"{name}.json", {"2024-01-02": ["x" * 100]}) for name in "abc"]
+    cache = OfflineDatasetCache(max_bytes=2 * os.path.getsize(paths[0]))
+
+    cache.get(paths[0], load_date_indexed_json)
+    cache.get(paths[1], load_date_indexed_json)
+    cache.get(paths[0], load_date_indexed_json)
+    cache.get(paths[2], load_date_indexed_json)
+
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1
+    assert stats['entries'] == 2
+    cache.get(paths[0], load_date_indexed_json)
+    assert cache.get_stats()['loads'] == 3
+
+
+def test_concurrent_first_loads_parse_once(tmp_path):
+    cache = OfflineDatasetCache()
+    path = write_json(tmp_path / "data.json", {"2024-01-02": [1]})
+    calls = []
+
+    def slow_loader(p):
+        calls.append(p)
+        time.sleep(0.05)
+        return load_date_indexed_json(p)
+
+    threads = [threading.Thread(target=cache.get, args=(path, slow_loader)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+
+
+def test_failed_load_is_not_cached(tmp_path):
+    cache = OfflineDatasetCache()
+    path = tmp_path / "broken.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        cache.get(str(path), load_date_indexed_json)
+    assert cache.get_stats()['entries'] == 0
+
+
+def original_latest(df, ticker, curr_date):
+    """The per-call filter + idxmax selection the SimFin tools used before caching"""
+    df = df.copy()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    filtered = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    if filtered.empty:
+        return None
+    return filtered.loc[filtered["Publish Date"].idxmax()]
+
+
+def test_simfin_latest_matches_original_selection(tmp_path):
+    raw = pd.DataFrame({
+        "Ticker": ["AAPL", "MSFT", "AAPL", "AAPL", "MSFT", "AAPL"],
+        "SimFinId": [1, 2, 3, 4, 5, 6],
+        "Report Date": ["2023-03-31", "2023-03-31", "2023-06-30", "2023-06-30", "2023-06-30", "2023-09-30"],
+        "Publish Date": ["2023-05-01", "2023-04-20", "2023-08-01", "2023-08-01", "2023-07-25", "2023-11-02"],
+        "Revenue": [100, 200, 110, 111, 210, 120],
+    })
+    path = tmp_path / "us-balance-quarterly.csv"
+    raw.to_csv(path, sep=";", index=False)
+    statements = load_simfin_statements(str(path))
+
+    for ticker in ("AAPL", "MSFT", "TSLA"):
+        for curr_date in ("2023-01-01", "2023-05-01", "2023-08-01", "2023-10-15", "2024-01-01"):
+            expected = original_latest(raw, ticker, curr_date)
+            actual = statements.latest(ticker, curr_date)
+            if expected is None:
+                assert actual is None
+            else:
+                assert actual["SimFinId"] == expected["SimFinId"]
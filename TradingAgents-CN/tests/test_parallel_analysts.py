@@ -0,0 +1,95 @@
+"""Parallel analyst stage of the trading graph (GraphSetup)"""
+
+import threading
+
+import pytest
+
+pytest.importorskip("langgraph")
+pytest.importorskip("langchain_openai")
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from tradingagents.graph import setup as graph_setup
+from tradingagents.graph.setup import ANALYST_REPORT_KEYS, GraphSetup
+
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+
+
+class FakeLogic:
+    """Every analyst finishes without tool calls; one debate and one risk round"""
+
+    def __getattr__(self, name):
+        analyst_type = name[len("should_continue_"):]
+        return lambda state: f"Msg Clear {analyst_type.capitalize()}"
+
+    def should_continue_debate(self, state):
+        return "Research Manager"
+
+    def should_continue_risk_analysis(self, state):
+        return "Risk Judge"
+
+
+@pytest.fixture
+def build_graph(monkeypatch):
+    seen = {}
+    lock = threading.Lock()
+
+    def analyst_factory(analyst_type):
+        def create(llm, toolkit):
+            def analyst(state):
+                with lock:
+                    seen[analyst_type] = [message.content for message in state["messages"]]
+                return {"messages": [AIMessage(content=f"{analyst_type} done")],
+                        ANALYST_REPORT_KEYS[analyst_type]: f"{analyst_type} report"}
+            return analyst
+        return create
+
+    def passthrough(name):
+        def create(*args):
+            def node(state):
+                if name == "bull":
+                    seen["bull"] = {key: state.get(key) for key in ANALYST_REPORT_KEYS.values()}
+                return {}
+            return node
+        return create
+
+    for analyst_type in ANALYSTS:
+        factory_name = "create_social_media_analyst" if analyst_type == "social" else f"create_{analyst_type}_analyst"
+        monkeypatch.setattr(graph_setup, factory_name, analyst_factory(analyst_type))
+    for factory_name, name in [("create_bull_researcher", "bull"), ("create_bear_researcher", "bear"),
+                               ("create_research_manager", "manager"), ("create_trader", "trader"),
+                               ("create_risky_debator", "risky"), ("create_neutral_debator", "neutral"),
+                               ("create_safe_debator", "safe"), ("create_risk_manager", "judge")]:
+        monkeypatch.setattr(graph_setup, factory_name, passthrough(name))
+
+    def build(parallel):
+        setup = GraphSetup(None, None, None, {t: (lambda state: {}) for t in ANALYSTS},
+                           None, None, None, None, None, FakeLogic(),
+                           config={"parallel_analysts": parallel})
+        return setup.setup_graph(ANALYSTS), seen
+    return build
+
+
+def run(graph):
+    return graph.invoke({"messages": [HumanMessage(content="AAPL")],
+                         "company_of_interest": "AAPL", "trade_date": "2024-01-02"})
+
+
+def test_parallel_analysts_produce_the_sequential_reports(build_graph):
+    sequential_graph, _ = build_graph(parallel=False)
+    sequential = run(sequential_graph)
+    parallel_graph, seen = build_graph(parallel=True)
+    parallel = run(parallel_graph)
+
+    for report_key in ANALYST_REPORT_KEYS.values():
+        assert parallel[report_key] == sequential[report_key]
+    # The debate starts only after every branch has reported
+    assert all(seen["bull"].values())
+
+
+def test_parallel_branches_do_not_see_each_others_messages(build_graph):
+    graph, seen = build_graph(parallel=True)
+    run(graph)
+
+    for analyst_type in ANALYSTS:
+        assert seen[analyst_type] == ["AAPL"]
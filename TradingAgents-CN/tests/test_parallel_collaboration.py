@@ -0,0 +1,71 @@
+"""Per-agent deadlines in MultiModelManager parallel collaboration"""
+
+import threading
+import time
+
+import pytest
+
+from tradingagents.core.base_multi_model_adapter import TaskResult
+from tradingagents.core.multi_model_manager import MultiModelManager
+
+AGENT_TIMEOUT = 0.5
+
+
+class SleepingClient:
+    """Model client whose task duration is looked up by model name (= agent role here)"""
+
+    def __init__(self, durations):
+        self.durations = durations
+
+    def execute_task(self, model_name, prompt, task_spec, **kwargs):
+        time.sleep(self.durations[model_name])
+        return TaskResult(result=model_name, model_used=None, execution_time=0,
+                          actual_cost=0.0, token_usage={})
+
+
+@pytest.fixture
+def make_manager():
+    def factory(durations, provider_slots=1, max_concurrent=4):
+        # Only the pieces used by _execute_parallel_collaboration, no API clients
+        manager = MultiModelManager.__new__(MultiModelManager)
+        manager.max_concurrent_tasks = max_concurrent
+        manager.parallel_agent_timeout = AGENT_TIMEOUT
+        manager._agent_local = threading.local()
+        semaphore = threading.BoundedSemaphore(provider_slots)
+        client = SleepingClient(durations)
+        manager._get_provider_semaphore = lambda key: semaphore
+        manager._get_client_for_model = lambda name: client
+        manager._get_provider_key_for_model = lambda name: "provider"
+        manager._get_agent_task_type = lambda role: "general"
+        manager._synthesize_parallel_results = lambda results, task: f"{len(results)} results"
+        manager.execute_task = lambda agent_role, task_prompt, task_type, context: \
+            manager._try_execute_with_model(agent_role, task_prompt, None, context)
+        return manager, semaphore
+    return factory
+
+
+def test_hung_agent_is_cut_and_queued_agents_complete(make_manager):
+    manager, _ = make_manager({'hung': 10, 'a': 0.2, 'b': 0.2, 'c': 0.2})
+
+    started = time.monotonic()
+    result = manager._execute_parallel_collaboration("task", ['hung', 'a', 'b', 'c'], {})
+    elapsed = time.monotonic() - started
+
+    assert [r.success for r in result.individual_results] == [False, True, True, True]
+    assert result.collaboration_metadata['timed_out_agents'] == ['hung']
+    # Queueing behind the hung agent does not count against the others' budgets
+    assert elapsed < AGENT_TIMEOUT + 3 * 0.2 + 1.0
+
+
+def test_provider_slot_held_outside_the_run_does_not_block_forever(make_manager):
+    manager, semaphore = make_manager({'a': 0.1, 'b': 0.1})
+    semaphore.acquire()  # e.g. a plain `with semaphore:` call that never returns
+    try:
+        started = time.monotonic()
+        result = manager._execute_parallel_collaboration("task", ['a', 'b'], {'collaboration_timeout': 0.5})
+        elapsed = time.monotonic() - started
+    finally:
+        semaphore.release()
+
+    assert not any(r.success for r in result.individual_results)
+    assert elapsed < 1.5
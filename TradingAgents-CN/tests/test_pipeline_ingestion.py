@@ -0,0 +1,85 @@
+"""Concurrent symbol ingestion in MLPipeline"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.ml import pipeline as ml_pipeline
+from tradingagents.ml.pipeline import MLPipeline, PipelineConfig
+
+
+class NoRateLimit:
+    def acquire(self, api):
+        pass
+
+
+def bars(symbol, days=40):
+    dates = pd.bdate_range("2024-01-02", periods=days)
+    close = np.linspace(10, 12, days)
+    return pd.DataFrame({'Open': close, 'High': close + 0.1, 'Low': close - 0.1,
+                         'Close': close, 'Volume': np.full(days, 1000.0)}, index=dates)
+
+
+@pytest.fixture
+def make_pipeline(monkeypatch):
+    def factory(fetch_market, **config_overrides):
+        config = PipelineConfig(symbols=["AAA"], market_type="US", ingestion_backoff_seconds=0.01,
+                                **config_overrides)
+        # Only the ingestion pieces, no model registry or feature store
+        pipeline = MLPipeline.__new__(MLPipeline)
+        pipeline.config = config
+        pipeline.rate_limiter = NoRateLimit()
+        pipeline.feature_store = None
+        monkeypatch.setattr(ml_pipeline, "get_YFin_data_window", fetch_market)
+        monkeypatch.setattr(ml_pipeline, "get_finnhub_news", lambda symbol, days_back: [])
+        return pipeline
+    return factory
+
+
+def test_symbols_download_concurrently_and_keep_input_order(make_pipeline):
+    delays = {"SLOW": 0.3, "MID": 0.2, "FAST": 0.05}
+
+    def fetch(symbol, start, end):
+        time.sleep(delays[symbol])
+        return bars(symbol)
+
+    pipeline = make_pipeline(fetch, ingestion_workers=3)
+    started = time.monotonic()
+    data = pipeline._ingest_and_prepare_data(["SLOW", "MID", "FAST"])
+
+    assert time.monotonic() - started < 0.5
+    assert list(data['market_data']) == ["SLOW", "MID", "FAST"]
+    assert list(data['data_quality']) == ["SLOW", "MID", "FAST"]
+
+
+def test_transient_failures_are_retried(make_pipeline):
+    attempts = {}
+    lock = threading.Lock()
+
+    def flaky(symbol, start, end):
+        with lock:
+            attempts[symbol] = attempts.get(symbol, 0) + 1
+            if attempts[symbol] < 3:
+                raise ConnectionError("429 Too Many Requests")
+        return bars(symbol)
+
+    pipeline = make_pipeline(flaky, ingestion_max_retries=3)
+    data = pipeline._ingest_and_prepare_data(["AAA", "BBB"])
+
+    assert attempts == {"AAA": 3, "BBB": 3}
+    assert list(data['market_data']) == ["AAA", "BBB"]
+
+
+def test_failed_symbol_is_skipped(make_pipeline):
+    def fetch(symbol, start, end):
+        if symbol == "BAD":
+            raise ConnectionError("delisted")
+        return bars(symbol)
+
+    pipeline = make_pipeline(fetch, ingestion_max_retries=1)
+    data = pipeline._ingest_and_prepare_data(["AAA", "BAD", "CCC"])
+
+    assert list(data['market_data']) == ["AAA", "CCC"]
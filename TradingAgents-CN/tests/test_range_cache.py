@@ -0,0 +1,96 @@
+"""Range-cache coverage (OHLCVRangeCache)"""
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.cache_catalog import CacheCatalog
+from tradingagents.dataflows.range_cache import OHLCVRangeCache, covered_span
+
+# Spring festival: no bars between these dates
+HOLIDAY = (pd.Timestamp("2024-02-09"), pd.Timestamp("2024-02-17"))
+
+
+class FakeSource:
+    """Business-day bars with a holiday gap; records every requested range"""
+
+    def __init__(self, close: float = 10.0):
+        self.close = close
+        self.calls = []
+
+    def __call__(self, symbol, start, end):
+        self.calls.append((start, end))
+        days = [day for day in pd.bdate_range(start, end) if not HOLIDAY[0] <= day <= HOLIDAY[1]]
+        return pd.DataFrame({
+            'date': [day.strftime("%Y-%m-%d") for day in days],
+            'close': [self.close] * len(days),
+        })
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADINGAGENTS_CACHE_FORMAT", "csv")
+    return OHLCVRangeCache(cache_dir=str(tmp_path / "series"),
+                           catalog=CacheCatalog(tmp_path / "catalog.db"))
+
+
+def test_only_gaps_are_fetched(cache):
+    source = FakeSource()
+    cache.get("000001", "2024-01-02", "2024-01-31", source, source="tushare")
+    source.calls.clear()
+
+    data = cache.get("000001", "2024-01-15", "2024-03-08", source, source="tushare")
+
+    assert source.calls == [("2024-02-01", "2024-03-08")]
+    assert data['date'].iloc[0] == "2024-01-15"
+    assert data['date'].iloc[-1] == "2024-03-08"
+
+
+def test_holiday_gap_is_not_refetched(cache):
+    source = FakeSource()
+    cache.get("000001", "2024-02-01", "2024-02-29", source, source="tushare", adjustment="qfq")
+    assert cache.missing_ranges("000001", "2024-02-01", "2024-02-29",
+                                source="tushare", adjustment="qfq") == []
+
+    source.calls.clear()
+    data = cache.get("000001", "2024-02-05", "2024-02-20", source, source="tushare", adjustment="qfq")
+
+    assert source.calls == []
+    assert not data['date'].between("2024-02-09", "2024-02-17").any()
+
+
+def test_rows_outside_the_gap_do_not_mark_it_covered(cache):
+    def wrong_range(symbol, start, end):
+        return pd.DataFrame({'date': ["2023-01-03"], 'close': [1.0]})
+
+    assert cache.get("600000", "2024-01-01", "2024-01-31", wrong_range, source="akshare") is None
+    assert cache.missing_ranges("600000", "2024-01-01", "2024-01-31",
+                                source="akshare") == [("2024-01-01", "2024-01-31")]
+
+
+def test_partial_response_covers_only_returned_dates(cache):
+    def first_week(symbol, start, end):
+        days = pd.bdate_range("2024-03-04", "2024-03-08")
+        return pd.DataFrame({'date': [day.strftime("%Y-%m-%d") for day in days],
+                             'close': [1.0] * len(days)})
+
+    cache.get("600000", "2024-03-04", "2024-04-30", first_week, source="akshare")
+
+    assert cache.missing_ranges("600000", "2024-03-04", "2024-04-30",
+                                source="akshare") == [("2024-03-09", "2024-04-30")]
+
+
+def test_adjustment_basis_change_rebuilds_series(cache):
+    source = FakeSource(close=10.0)
+    cache.get("000001", "2024-01-02", "2024-01-31", source, source="tushare", adjustment="qfq")
+
+    # A dividend moves every forward-adjusted price
+    source.close = 9.0
+    data = cache.get("000001", "2024-01-02", "2024-02-29", source, source="tushare", adjustment="qfq")
+
+    assert set(data['close']) == {9.0}
+
+
+def test_covered_span_with_no_rows():
+    # A long weekday gap without data is not confirmed; a short one is a holiday
+    assert covered_span("2024-01-01", "2024-01-31", []) is None
+    assert covered_span("2024-02-09", "2024-02-17", []) == ("2024-02-09", "2024-02-17")
@@ -0,0 +1,108 @@
+"""Shared token-bucket rate limits for data providers"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tradingagents.dataflows import rate_limiter
+from tradingagents.dataflows.rate_limiter import (
+    FileLockBucketBackend, LocalBucketBackend, RateLimit, RateLimiterService
+)
+
+
+def test_burst_then_reserved_spacing():
+    limiter = RateLimiterService(limits={'api': RateLimit(rate=20.0, capacity=2)})
+
+    waits = [limiter.acquire('api') for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.05, abs=0.02)
+    assert waits[3] == pytest.approx(0.05, abs=0.02)
+    assert limiter.get_stats()['api']['throttled'] == 2
+
+
+def test_concurrent_callers_each_wait_for_their_own_slot():
+    limiter = RateLimiterService(limits={'api': RateLimit(rate=20.0, capacity=1)})
+    waits = []
+    lock = threading.Lock()
+
+    def call():
+        wait = limiter.acquire('api')
+        with lock:
+            waits.append(wait)
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Reservations are queued: 0, 0.05, 0.10, 0.15, 0.20 rather than everyone sleeping 0.05 repeatedly
+    assert sorted(waits) == pytest.approx([0.0, 0.05, 0.10, 0.15, 0.20], abs=0.03)
+    assert time.monotonic() - started < 0.4
+
+
+def test_unlimited_api_and_configure():
+    limiter = RateLimiterService()
+    assert limiter.acquire('unknown_api') == 0.0
+
+    limiter.configure('ml_market', 5.0, capacity=1.0)
+    assert limiter.limits['ml_market'] == RateLimit(rate=5.0, capacity=1.0)
+    limiter.configure('ml_news', 0.5)
+    assert limiter.limits['ml_news'].capacity == 1.0
+
+
+def test_async_acquire_does_not_block_the_loop():
+    limiter = RateLimiterService(limits={'api': RateLimit(rate=10.0, capacity=1)})
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await limiter.acquire_async('api')
+        await limiter.acquire_async('api')
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(scenario()) >= 5
+
+
+@pytest.mark.skipif(not rate_limiter.FCNTL_AVAILABLE, reason="fcntl not available")
+def test_file_backend_shares_the_bucket(tmp_path):
+    limit = RateLimit(rate=1.0, capacity=1)
+    first = FileLockBucketBackend(str(tmp_path))
+    second = FileLockBucketBackend(str(tmp_path))
+
+    assert first.reserve('tushare', limit, 1.0) == 0.0
+    assert second.reserve('tushare', limit, 1.0) == pytest.approx(1.0, abs=0.05)
+
+
+def test_failing_backend_falls_back_to_local():
+    class BrokenBackend:
+        name = 'redis'
+        blocking_io = True
+
+        def reserve(self, api, limit, amount):
+            raise ConnectionError("redis down")
+
+    limiter = RateLimiterService(BrokenBackend(), limits={'api': RateLimit(rate=1.0, capacity=1)})
+
+    assert limiter.acquire('api') == 0.0
+    assert isinstance(limiter.backend, LocalBucketBackend)
+
+
+def test_limits_from_env(monkeypatch):
+    monkeypatch.setenv('TRADINGAGENTS_RATE_LIMIT_TUSHARE', '3:6')
+    monkeypatch.setenv('TRADINGAGENTS_RATE_LIMIT_FINNHUB', 'fast')
+    monkeypatch.setenv('TRADINGAGENTS_RATE_LIMIT_BACKEND', 'local')
+
+    assert rate_limiter._limits_from_env() == {'tushare': RateLimit(rate=3.0, capacity=6.0)}
@@ -0,0 +1,73 @@
+"""Concurrent news source fetching with per-source deadlines (RealtimeNewsAggregator)"""
+
+import time
+from datetime import datetime, timedelta
+
+from tradingagents.dataflows.realtime_news_utils import NewsItem, RealtimeNewsAggregator
+
+
+def make_news(source, title, minutes_ago=0):
+    return NewsItem(title=title, content=title, source=source,
+                    publish_time=datetime.now() - timedelta(minutes=minutes_ago),
+                    url="", urgency="low", relevance_score=0.5)
+
+
+def sleeping_source(seconds, items):
+    def fetch(ticker, hours_back):
+        time.sleep(seconds)
+        return items
+    return fetch
+
+
+def failing_source(ticker, hours_back):
+    raise ConnectionError("connection reset")
+
+
+def aggregator_with(sources, **kwargs):
+    aggregator = RealtimeNewsAggregator(**kwargs)
+    aggregator._news_sources = lambda: sources
+    return aggregator
+
+
+def test_slow_source_is_abandoned_at_its_deadline():
+    aggregator = aggregator_with([
+        ('Fast', sleeping_source(0.05, [make_news('Fast', "Company beats quarterly revenue estimates")]), True),
+        ('Slow', sleeping_source(2.0, [make_news('Slow', "Regulator opens probe into accounting")]), True),
+        ('Broken', failing_source, True),
+        ('NoKey', failing_source, False),
+    ], source_timeout=0.3, total_budget=5)
+
+    started = time.monotonic()
+    result = aggregator.fetch_news("AAPL")
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0
+    statuses = {r.source: r.status for r in result.source_results}
+    assert statuses == {'Fast': 'ok', 'Slow': 'timeout', 'Broken': 'error', 'NoKey': 'skipped'}
+    assert [item.source for item in result.news] == ['Fast']
+
+
+def test_per_source_timeout_override_and_total_budget():
+    aggregator = aggregator_with([
+        ('Patient', sleeping_source(0.3, [make_news('Patient', "Chipmaker raises full year guidance")]), True),
+        ('Slow', sleeping_source(2.0, []), True),
+    ], source_timeout=0.1, total_budget=0.6, source_timeouts={'Patient': 1.0, 'Slow': 5.0})
+
+    started = time.monotonic()
+    result = aggregator.fetch_news("NVDA")
+
+    assert time.monotonic() - started < 1.2
+    assert {r.source: r.status for r in result.source_results} == {'Patient': 'ok', 'Slow': 'timeout'}
+
+
+def test_sequential_mode_merges_sources_in_priority_order():
+    aggregator = aggregator_with([
+        ('First', sleeping_source(0, [make_news('First', "Bank cuts dividend after stress test", 30)]), True),
+        ('Second', sleeping_source(0, [make_news('Second', "Automaker recalls two million vehicles", 5)]), True),
+    ], fetch_mode='sequential')
+
+    result = aggregator.fetch_news("TSLA")
+
+    assert result.fetch_mode == 'sequential'
+    # Newest first after the merge
+    assert [item.source for item in result.news] == ['Second', 'First']
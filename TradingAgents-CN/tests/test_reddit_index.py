@@ -0,0 +1,104 @@
+"""Date-partitioned Reddit index (RedditDateIndex) against the raw dump scan"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from tradingagents.dataflows import reddit_utils
+from tradingagents.dataflows.reddit_index import INDEX_DIR_NAME, RedditDateIndex
+
+TICKERS = {"AAPL": "Apple", "META": "Meta OR Facebook"}
+
+
+def created(day, hour=12):
+    return datetime.strptime(f"{day} {hour}", "%Y-%m-%d %H").replace(tzinfo=timezone.utc).timestamp()
+
+
+def post(day, title, ups, text=""):
+    return {"created_utc": created(day), "title": title, "selftext": text,
+            "url": f"https://reddit.com/{title.replace(' ', '_')}", "ups": ups}
+
+
+def write_dump(path, posts):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for item in posts:
+            f.write(json.dumps(item) + "\n")
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    write_dump(tmp_path / "company_news" / "stocks.jsonl", [
+        post("2024-03-01", "Apple beats estimates", 50),
+        post("2024-03-01", "Facebook ad revenue", 70),
+        post("2024-03-01", "Markets open flat", 90, text="apple and others"),
+        post("2024-03-02", "AAPL options flow", 20),
+        post("2024-03-04", "Meta layoffs", 40),
+    ])
+    write_dump(tmp_path / "company_news" / "investing.jsonl", [
+        post("2024-03-01", "Long term Apple thesis", 30),
+        post("2024-03-02", "Bond yields", 10),
+    ])
+    write_dump(tmp_path / "global_news" / "worldnews.jsonl", [
+        post("2024-03-01", "Rates unchanged", 5),
+        post("2024-03-01", "Oil spikes", 15),
+    ])
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize("category,query", [
+    ("company_news", "AAPL"),
+    ("company_news", "META"),
+    ("company_news", None),
+    ("global_news", None),
+])
+def test_index_matches_raw_scan(data_path, monkeypatch, category, query):
+    monkeypatch.setattr(reddit_utils, "ticker_to_company", TICKERS)
+    index = RedditDateIndex(data_path, TICKERS)
+
+    result = index.fetch_range(category, "2024-03-01", "2024-03-04", 4, query)
+
+    for date, posts in result.items():
+        assert posts == reddit_utils._scan_top_from_category(category, date, 4, query, data_path)
+
+
+def test_query_outside_ticker_map_is_matched_at_read_time(data_path):
+    index = RedditDateIndex(data_path, TICKERS)
+
+    posts = index.fetch_range("company_news", "2024-03-01", "2024-03-01", 4, "Bond|Markets")
+
+    assert [p["title"] for p in posts["2024-03-01"]] == ["Markets open flat"]
+
+
+def test_changed_dump_rebuilds_category(data_path):
+    index = RedditDateIndex(data_path, TICKERS)
+    index.fetch_range("global_news", "2024-03-01", "2024-03-01", 2)
+
+    write_dump(os.path.join(data_path, "global_news", "worldnews.jsonl"),
+               [post("2024-03-01", "Rates cut", 99, text="surprise move")])
+    result = index.fetch_range("global_news", "2024-03-01", "2024-03-01", 2)
+
+    assert [p["title"] for p in result["2024-03-01"]] == ["Rates cut"]
+    leftovers = [name for name in os.listdir(os.path.join(data_path, INDEX_DIR_NAME))
+                 if ".building." in name or ".retired." in name]
+    assert leftovers == []
+
+
+def test_max_limit_below_subreddit_count_still_raises(data_path):
+    with pytest.raises(ValueError, match="REDDIT FETCHING ERROR"):
+        RedditDateIndex(data_path, TICKERS).fetch_range("company_news", "2024-03-01", "2024-03-01", 1)
+
+
+def test_unwritable_index_falls_back_to_scan(data_path, monkeypatch):
+    def refuse(self, category):
+        raise PermissionError("read-only data path")
+
+    monkeypatch.setattr(RedditDateIndex, "ensure_index", refuse)
+    monkeypatch.setattr(reddit_utils, "ticker_to_company", TICKERS)
+
+    posts = reddit_utils.fetch_top_from_category("company_news", "2024-03-01", 4, "AAPL", data_path=data_path)
+
+    # Subreddit order follows os.listdir, so compare titles regardless of order
+    assert sorted(p["title"] for p in posts) == ["Apple beats estimates", "Long term Apple thesis", "Markets open flat"]
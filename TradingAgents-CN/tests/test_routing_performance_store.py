@@ -0,0 +1,90 @@
+"""In-memory routing performance and batched stats persistence"""
+
+import sqlite3
+
+import pytest
+
+from tradingagents.core.routing_performance_store import ModelPerformanceStore, RoutingStatsWriter
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "routing.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+            CREATE TABLE model_performance (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                model_name TEXT NOT NULL, provider TEXT NOT NULL, task_type TEXT NOT NULL,
+                avg_response_time REAL NOT NULL, success_rate REAL NOT NULL,
+                avg_cost REAL DEFAULT 0.0, last_updated TEXT NOT NULL,
+                UNIQUE(model_name, provider, task_type)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE routing_decisions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL, agent_role TEXT NOT NULL, task_type TEXT NOT NULL,
+                selected_model TEXT NOT NULL, selected_provider TEXT NOT NULL,
+                routing_reason TEXT, confidence_score REAL, execution_time INTEGER, cost_estimate REAL
+            )
+        """)
+    return path
+
+
+def test_ewma_updates():
+    store = ModelPerformanceStore(alpha=0.5)
+    store.record("deepseek-chat", "deepseek", "analysis", 2.0, True, cost=0.02)
+    store.record("deepseek-chat", "deepseek", "analysis", 4.0, False, cost=0.04)
+
+    stats = store.get("deepseek-chat", "analysis")
+
+    assert stats['avg_response_time'] == pytest.approx(3.0)
+    assert stats['success_rate'] == pytest.approx(0.5)
+    assert stats['avg_cost'] == pytest.approx(0.03)
+    assert stats['samples'] == 2
+    assert store.get("deepseek-chat", "coding") is None
+
+
+def test_latest_provider_wins_after_load():
+    store = ModelPerformanceStore()
+    store.load([
+        ("qwen-plus", "dashscope", "analysis", 1.0, 0.9, 0.01, "2024-01-01T00:00:00"),
+        ("qwen-plus", "siliconflow", "analysis", 3.0, 0.7, None, "2024-02-01T00:00:00"),
+    ])
+
+    assert store.get("qwen-plus", "analysis")['avg_response_time'] == 3.0
+    store.record("qwen-plus", "dashscope", "analysis", 1.0, True)
+    assert store.get("qwen-plus", "analysis")['success_rate'] == pytest.approx(0.93)
+
+
+def test_writer_batches_and_keeps_latest_snapshot(database):
+    store = ModelPerformanceStore()
+    writer = RoutingStatsWriter(database, flush_interval=60, batch_size=1000)
+    try:
+        for i in range(3):
+            writer.log_decision(("s1", "market_analyst", "analysis", "qwen-plus", "dashscope",
+                                 "fastest", 0.9, 100 + i, 0.01))
+            writer.log_performance(store.record("qwen-plus", "dashscope", "analysis", 1.0 + i, True))
+        assert writer.flush()
+    finally:
+        writer.close()
+
+    with sqlite3.connect(database) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM routing_decisions").fetchone()[0] == 3
+        rows = conn.execute("SELECT avg_response_time FROM model_performance").fetchall()
+    assert rows == [(pytest.approx(store.get("qwen-plus", "analysis")['avg_response_time']),)]
+    stats = writer.get_stats()
+    assert stats['batches'] == 1
+    assert stats['performance_written'] == 1
+
+
+def test_close_writes_pending_records(database):
+    writer = RoutingStatsWriter(database, flush_interval=60)
+    writer.log_decision(("s1", "trader", "decision", "gpt-4o", "openai", "quality", 0.8, 250, 0.05))
+    writer.close()
+
+    with sqlite3.connect(database) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM routing_decisions").fetchone()[0] == 1
+    # Records after close are dropped instead of queueing forever
+    writer.log_decision(("s2", "trader", "decision", "gpt-4o", "openai", "quality", 0.8, 250, 0.05))
+    assert writer.get_stats()['pending'] == 0
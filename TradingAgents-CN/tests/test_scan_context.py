@@ -0,0 +1,73 @@
+"""Scan-scoped shared tool results (ScanSharedContext)"""
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tradingagents.core.scan_context import (
+    ScanSharedContext, activate_scan_context, get_active_scan_context, shared_tool_call
+)
+
+
+def test_concurrent_callers_share_one_computation():
+    context = ScanSharedContext("scan-1")
+    calls = []
+    release = threading.Event()
+
+    def fetch_overview(market):
+        calls.append(market)
+        release.wait(2)
+        return f"{market} overview"
+
+    def worker():
+        return shared_tool_call("market_overview", fetch_overview, "A股")
+
+    with activate_scan_context(context):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            # Each worker runs in a copy of the activating context, as LangGraph tool threads do
+            futures = [pool.submit(contextvars.copy_context().run, worker) for _ in range(4)]
+            release.set()
+            results = [future.result() for future in futures]
+
+    assert calls == ["A股"]
+    assert results == ["A股 overview"] * 4
+    stats = context.get_stats()
+    assert stats['computed'] == 1
+    assert stats['hits'] + stats['coalesced'] == 3
+
+
+def test_failures_are_not_cached():
+    context = ScanSharedContext()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("timeout")
+        return "news"
+
+    with pytest.raises(ConnectionError):
+        context.get_or_compute("global_news", flaky)
+    assert context.peek("global_news") is None
+
+    assert context.get_or_compute("global_news", flaky) == "news"
+    assert context.get_stats()['failed'] == 1
+
+
+def test_arguments_are_part_of_the_key():
+    context = ScanSharedContext()
+    with activate_scan_context(context):
+        assert shared_tool_call("news", lambda day: day, "2024-01-02") == "2024-01-02"
+        assert shared_tool_call("news", lambda day: day, "2024-01-03") == "2024-01-03"
+    assert context.get_stats()['computed'] == 2
+
+
+def test_outside_a_scan_tools_are_called_directly():
+    calls = []
+    for _ in range(2):
+        shared_tool_call("news", lambda: calls.append(1))
+
+    assert calls == [1, 1]
+    assert get_active_scan_context() is None
@@ -0,0 +1,43 @@
+"""Source ranking under failures (SourceHealthTracker)"""
+
+from tradingagents.dataflows.source_health import SourceHealthTracker
+
+
+def test_fast_failing_source_ranks_below_healthy_sources():
+    tracker = SourceHealthTracker()
+    tracker.record('tushare', 1.5, True)
+    tracker.record('akshare', 1.2, True)
+
+    for _ in range(5):
+        # Failing in 10ms must not look "fast"
+        tracker.record('baostock', 0.01, False)
+        assert tracker.rank(['baostock', 'tushare', 'akshare'])[-1] == 'baostock'
+        assert tracker.rank(['tushare', 'akshare', 'baostock'])[-1] == 'baostock'
+
+
+def test_failure_latency_does_not_lower_success_latency():
+    tracker = SourceHealthTracker()
+    for _ in range(5):
+        tracker.record('a', 0.2, True)
+        tracker.record('b', 1.0, True)
+    tracker.record('a', 0.01, False)
+
+    # The last request of 'a' failed, so the source without a recent failure goes first
+    assert tracker.rank(['a', 'b']) == ['b', 'a']
+
+    # Back to tier 0 once it succeeds again
+    tracker.record('a', 0.2, True)
+    assert tracker.rank(['a', 'b']) == ['a', 'b']
+
+
+def test_source_that_never_succeeded_ranks_last():
+    tracker = SourceHealthTracker()
+    tracker.record('ok', 2.0, True)
+    tracker.record('broken', 0.05, False)
+
+    assert tracker.rank(['broken', 'ok']) == ['ok', 'broken']
+
+
+def test_unknown_sources_keep_priority_order():
+    tracker = SourceHealthTracker()
+    assert tracker.rank(['tushare', 'akshare', 'baostock']) == ['tushare', 'akshare', 'baostock']
@@ -0,0 +1,77 @@
+"""Whole-series indicator windows (StockstatsIndicatorEngine)"""
+
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("stockstats")
+pytest.importorskip("yfinance")
+
+from tradingagents.dataflows import stockstats_utils
+from tradingagents.dataflows.frame_storage import PRICE_DATA_STEM
+from tradingagents.dataflows.stockstats_utils import NOT_TRADING_DAY, StockstatsIndicatorEngine
+
+
+@pytest.fixture
+def price_dir(tmp_path):
+    days = pd.bdate_range("2024-01-02", periods=60)
+    pd.DataFrame({
+        'Date': [day.strftime("%Y-%m-%d") for day in days],
+        'Open': [10.0 + i for i in range(len(days))],
+        'High': [11.0 + i for i in range(len(days))],
+        'Low': [9.0 + i for i in range(len(days))],
+        'Close': [10.5 + i * (-1) ** i for i in range(len(days))],
+        'Volume': [1000 + i for i in range(len(days))],
+    }).to_csv(tmp_path / f"{PRICE_DATA_STEM.format(symbol='AAPL')}.csv", index=False)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+    load_frame = stockstats_utils.load_frame
+
+    def counting_load(path, *args, **kwargs):
+        calls.append(path)
+        return load_frame(path, *args, **kwargs)
+
+    monkeypatch.setattr(stockstats_utils, "load_frame", counting_load)
+    return calls
+
+
+def test_window_matches_per_day_lookup_and_reads_file_once(price_dir, loads):
+    engine = StockstatsIndicatorEngine()
+
+    window = engine.get_indicator_window("AAPL", ["close_10_sma", "rsi"], "2024-03-08", 14, price_dir)
+
+    assert len(loads) == 1
+    for indicator, rows in window.items():
+        # Trading days only, newest first
+        assert [day for day, _ in rows] == sorted((day for day, _ in rows), reverse=True)
+        assert "2024-03-03" not in dict(rows)
+        for day, value in rows:
+            assert value == str(engine.get_indicator_value("AAPL", indicator, day, price_dir))
+    assert len(loads) == 1
+
+
+def test_non_trading_days_are_marked(price_dir, loads):
+    engine = StockstatsIndicatorEngine()
+
+    window = engine.get_indicator_window("AAPL", ["close_10_sma"], "2024-03-04", 2, price_dir,
+                                         trading_days_only=False)
+
+    assert [value for _, value in window["close_10_sma"]][1:] == [NOT_TRADING_DAY, NOT_TRADING_DAY]
+    assert engine.get_indicator_value("AAPL", "close_10_sma", "2024-03-03", price_dir) == NOT_TRADING_DAY
+
+
+def test_rewritten_price_file_is_reloaded(price_dir, loads):
+    engine = StockstatsIndicatorEngine()
+    engine.get_indicator_value("AAPL", "close_10_sma", "2024-03-08", price_dir)
+    path = os.path.join(price_dir, f"{PRICE_DATA_STEM.format(symbol='AAPL')}.csv")
+    os.utime(path, (os.path.getatime(path), os.path.getmtime(path) + 10))
+
+    engine.get_indicator_value("AAPL", "close_10_sma", "2024-03-08", price_dir)
+
+    assert len(loads) == 2
+    assert len(engine._histories) == 1
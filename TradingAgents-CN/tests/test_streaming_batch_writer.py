@@ -0,0 +1,107 @@
+"""Micro-batched Redis writes for the streaming pipeline (RedisBatchWriter)"""
+
+import asyncio
+
+from tradingagents.dataflows.streaming_batch_writer import RedisBatchWriter, redis_op
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, command):
+        return lambda *args, **kwargs: self.commands.append((command, args, kwargs))
+
+    async def execute(self, raise_on_error=True):
+        self.client.pipelines.append(self.commands)
+        return [ValueError("WRONGTYPE") if command == 'lpush' and args[0] == "bad" else True
+                for command, args, _ in self.commands]
+
+
+class FakeRedis:
+    """Async Redis client that records pipelines and direct commands"""
+
+    def __init__(self):
+        self.pipelines = []
+        self.direct = []
+
+    def pipeline(self, transaction=True):
+        assert transaction is False
+        return FakePipeline(self)
+
+    def __getattr__(self, command):
+        async def call(*args, **kwargs):
+            self.direct.append((command, args, kwargs))
+        return call
+
+
+def tick_ops(symbol, price):
+    return [
+        redis_op('hset', f"tick:{symbol}", mapping={'price': price}),
+        redis_op('lpush', f"prices:{symbol}", price),
+        redis_op('expire', f"tick:{symbol}", 60),
+    ]
+
+
+def test_messages_share_one_pipeline_and_hashes_are_merged():
+    client = FakeRedis()
+
+    async def scenario():
+        writer = RedisBatchWriter(lambda: client, batch_size=100, flush_interval=0.05)
+        for price in (10.0, 10.1, 10.2):
+            await writer.submit(tick_ops("AAPL", price))
+        await writer.flush()
+        await writer.close()
+        return writer.get_stats()
+
+    stats = asyncio.run(scenario())
+
+    assert len(client.pipelines) == 1
+    commands = client.pipelines[0]
+    assert commands[0] == ('hset', ("tick:AAPL",), {'mapping': {'price': 10.2}})
+    assert [c for c, _, _ in commands] == ['hset', 'lpush', 'lpush', 'lpush', 'expire']
+    assert stats['messages'] == 3
+    assert stats['commands_coalesced'] == 4
+
+
+def test_batch_size_bounds_each_pipeline():
+    client = FakeRedis()
+
+    async def scenario():
+        writer = RedisBatchWriter(lambda: client, batch_size=2, flush_interval=1.0)
+        for price in range(5):
+            await writer.submit([redis_op('lpush', "prices:AAPL", price)])
+        await writer.close()
+
+    asyncio.run(scenario())
+
+    assert [len(commands) for commands in client.pipelines] == [2, 2, 1]
+
+
+def test_failed_commands_are_counted_without_dropping_the_rest():
+    client = FakeRedis()
+
+    async def scenario():
+        writer = RedisBatchWriter(lambda: client)
+        await writer.submit([redis_op('lpush', "bad", 1), redis_op('lpush', "prices:AAPL", 1)])
+        await writer.close()
+        return writer.get_stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats['errors'] == 1
+    assert len(client.pipelines[0]) == 2
+
+
+def test_disabled_writer_executes_immediately():
+    client = FakeRedis()
+
+    async def scenario():
+        writer = RedisBatchWriter(lambda: client, enabled=False)
+        await writer.submit(tick_ops("AAPL", 10.0))
+
+    asyncio.run(scenario())
+
+    assert client.pipelines == []
+    assert [c for c, _, _ in client.direct] == ['hset', 'lpush', 'expire']
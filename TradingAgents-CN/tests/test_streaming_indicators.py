@@ -0,0 +1,86 @@
+"""Incremental streaming indicators against batch recomputation"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.streaming_indicators import (
+    RollingWindow, StreamingIndicatorBook, WilderRSI
+)
+
+
+@pytest.fixture
+def ticks():
+    rng = np.random.default_rng(2)
+    prices = 20 * np.exp(np.cumsum(rng.normal(0, 0.002, 2000)))
+    volumes = rng.integers(100, 5000, len(prices)).astype(float)
+    return prices, volumes
+
+
+def test_rolling_window_matches_pandas(ticks):
+    prices, _ = ticks
+    window = RollingWindow(20)
+    means, stds = [], []
+    for price in prices:
+        window.push(price)
+        means.append(window.mean)
+        stds.append(window.std())
+
+    expected = pd.Series(prices).rolling(20)
+    np.testing.assert_allclose(means[19:], expected.mean()[19:], rtol=1e-10)
+    np.testing.assert_allclose(stds[19:], expected.std()[19:], rtol=1e-7)
+
+
+def test_wilder_rsi_matches_batch_smoothing(ticks):
+    prices, _ = ticks
+    rsi = WilderRSI(14)
+    for price in prices:
+        rsi.push(price)
+
+    changes = np.diff(prices)
+    gains, losses = np.clip(changes, 0, None), np.clip(-changes, 0, None)
+    avg_gain, avg_loss = gains[:14].mean(), losses[:14].mean()
+    for gain, loss in zip(gains[14:], losses[14:]):
+        avg_gain = (avg_gain * 13 + gain) / 14
+        avg_loss = (avg_loss * 13 + loss) / 14
+
+    assert rsi.value == pytest.approx(100 - 100 / (1 + avg_gain / avg_loss), rel=1e-9)
+
+
+def test_book_snapshot_matches_batch_indicators(ticks):
+    prices, volumes = ticks
+    book = StreamingIndicatorBook()
+    start = datetime(2024, 3, 1, 9, 30)
+    for i, (price, volume) in enumerate(zip(prices, volumes)):
+        snapshot = book.update("600519", price, volume, start + timedelta(seconds=i))
+
+    series = pd.Series(prices)
+    assert snapshot['sma_5'] == pytest.approx(series.tail(5).mean(), rel=1e-10)
+    assert snapshot['sma_20'] == pytest.approx(series.tail(20).mean(), rel=1e-10)
+    assert snapshot['ema_12'] == pytest.approx(series.ewm(span=12, adjust=False).mean().iloc[-1], rel=1e-10)
+    assert snapshot['volatility'] == pytest.approx(series.pct_change().tail(20).std(), rel=1e-6)
+    assert snapshot['vwap'] == pytest.approx((prices * volumes).sum() / volumes.sum(), rel=1e-10)
+    assert snapshot['change_pct'] == pytest.approx((prices[-1] / prices[-2] - 1) * 100)
+
+
+def test_vwap_resets_each_session():
+    book = StreamingIndicatorBook()
+    book.update("AAPL", 100.0, 10, datetime(2024, 3, 1, 15, 59))
+
+    snapshot = book.update("AAPL", 120.0, 10, datetime(2024, 3, 4, 9, 30))
+
+    assert snapshot['vwap'] == 120.0
+
+
+def test_warm_start_rebuilds_the_same_state(ticks):
+    prices, volumes = ticks
+    live = StreamingIndicatorBook()
+    for price, volume in zip(prices, volumes):
+        expected = live.update("AAPL", price, volume)
+
+    restarted = StreamingIndicatorBook()
+    restarted.warm_start("AAPL", [(p, v, None) for p, v in zip(prices[:-1], volumes[:-1])])
+
+    assert restarted.update("AAPL", prices[-1], volumes[-1]) == pytest.approx(expected)
@@ -92,6 +92,14 @@ def create_news_analyst(llm, toolkit):
         except Exception:
             pass
 
+        # 市场扫描共享的宏观背景（每次扫描只生成一次）
+        market_context = state.get("market_context")
+        if market_context:
+            system_message += (
+                "\n\n📌 市场整体背景（本次市场扫描共享，宏观层面无需重复获取）：\n"
+                f"{market_context}"
+            )
+
         prompt = ChatPromptTemplate.from_messages(
             [
                 (
@@ -64,6 +64,7 @@ class AgentState(MessagesState):
         str, "Report from the News Researcher of current world affairs"
     ]
     fundamentals_report: Annotated[str, "Report from the Fundamentals Researcher"]
+    market_context: Annotated[str, "Market-wide context shared across a market scan"]
 
     # researcher team discussion step
     investment_debate_state: Annotated[
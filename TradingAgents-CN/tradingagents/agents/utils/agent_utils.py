@@ -12,6 +12,7 @@ from dateutil.relativedelta import relativedelta
 from langchain_openai import ChatOpenAI
 import tradingagents.dataflows.interface as interface
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.core.scan_context import shared_tool_call
 from langchain_core.messages import HumanMessage
 
 # 导入统一日志系统和工具日志装饰器
@@ -39,6 +40,41 @@ def create_msg_delete():
     return delete_messages
 
 
+def _get_china_market_overview(curr_date: str) -> str:
+    """获取中国股市整体概览（Toolkit.get_china_market_overview 的实现）"""
+    try:
+        # 使用Tushare获取主要指数数据
+        from tradingagents.dataflows.tushare_adapter import get_tushare_adapter
+
+        adapter = get_tushare_adapter()
+        if not adapter.provider or not adapter.provider.connected:
+            # 如果Tushare不可用，回退到TDX
+            logger.warning(f"⚠️ Tushare不可用，回退到TDX获取市场概览")
+            from tradingagents.dataflows.tdx_utils import get_china_market_overview
+            return get_china_market_overview()
+
+        # 使用Tushare获取主要指数信息
+        # 这里可以扩展为获取具体的指数数据
+        return f"""# 中国股市概览 - {curr_date}
+
+## 📊 主要指数
+- 上证指数: 数据获取中...
+- 深证成指: 数据获取中...
+- 创业板指: 数据获取中...
+- 科创50: 数据获取中...
+
+## 💡 说明
+市场概览功能正在从TDX迁移到Tushare，完整功能即将推出。
+当前可以使用股票数据获取功能分析个股。
+
+数据来源: Tushare专业数据源
+更新时间: {curr_date}
+"""
+
+    except Exception as e:
+        return f"中国市场概览获取失败: {str(e)}。正在从TDX迁移到Tushare数据源。"
+
+
 class Toolkit:
     _config = DEFAULT_CONFIG.copy()
 
@@ -69,7 +105,10 @@ class Toolkit:
             str: A formatted dataframe containing the latest global news from Reddit in the specified time frame.
         """
         
-        global_news_result = interface.get_reddit_global_news(curr_date, 7, 5)
+        # 市场级数据：市场扫描期间各股票共享同一结果
+        global_news_result = shared_tool_call(
+            "get_reddit_news", interface.get_reddit_global_news, curr_date, 7, 5
+        )
 
         return global_news_result
 
@@ -208,37 +247,8 @@ class Toolkit:
         Returns:
             str: 包含主要指数实时行情的市场概览报告
         """
-        try:
-            # 使用Tushare获取主要指数数据
-            from tradingagents.dataflows.tushare_adapter import get_tushare_adapter
-
-            adapter = get_tushare_adapter()
-            if not adapter.provider or not adapter.provider.connected:
-                # 如果Tushare不可用，回退到TDX
-                logger.warning(f"⚠️ Tushare不可用，回退到TDX获取市场概览")
-                from tradingagents.dataflows.tdx_utils import get_china_market_overview
-                return get_china_market_overview()
-
-            # 使用Tushare获取主要指数信息
-            # 这里可以扩展为获取具体的指数数据
-            return f"""# 中国股市概览 - {curr_date}
-
-## 📊 主要指数
-- 上证指数: 数据获取中...
-- 深证成指: 数据获取中...
-- 创业板指: 数据获取中...
-- 科创50: 数据获取中...
-
-## 💡 说明
-市场概览功能正在从TDX迁移到Tushare，完整功能即将推出。
-当前可以使用股票数据获取功能分析个股。
-
-数据来源: Tushare专业数据源
-更新时间: {curr_date}
-"""
-
-        except Exception as e:
-            return f"中国市场概览获取失败: {str(e)}。正在从TDX迁移到Tushare数据源。"
+        # 市场级数据：市场扫描期间各股票共享同一结果
+        return shared_tool_call("get_china_market_overview", _get_china_market_overview, curr_date)
 
     @staticmethod
     @tool
@@ -298,11 +308,11 @@ class Toolkit:
         Retrieve stock stats indicators for a given ticker symbol and indicator.
         Args:
             symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
-            indicator (str): Technical indicator to get the analysis and report of
+            indicator (str): Technical indicator to get the analysis and report of; pass several comma separated (e.g. "rsi,macd,boll") to get them in one call
             curr_date (str): The current trading date you are trading on, YYYY-mm-dd
             look_back_days (int): How many days to look back, default is 30
         Returns:
-            str: A formatted dataframe containing the stock stats indicators for the specified ticker symbol and indicator.
+            str: A formatted dataframe containing the stock stats indicators for the specified ticker symbol and indicator(s).
         """
 
         result_stockstats = interface.get_stock_stats_indicators_window(
@@ -327,11 +337,11 @@ class Toolkit:
         Retrieve stock stats indicators for a given ticker symbol and indicator.
         Args:
             symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
-            indicator (str): Technical indicator to get the analysis and report of
+            indicator (str): Technical indicator to get the analysis and report of; pass several comma separated (e.g. "rsi,macd,boll") to get them in one call
             curr_date (str): The current trading date you are trading on, YYYY-mm-dd
             look_back_days (int): How many days to look back, default is 30
         Returns:
-            str: A formatted dataframe containing the stock stats indicators for the specified ticker symbol and indicator.
+            str: A formatted dataframe containing the stock stats indicators for the specified ticker symbol and indicator(s).
         """
 
         result_stockstats = interface.get_stock_stats_indicators_window(
@@ -535,7 +545,10 @@ class Toolkit:
             str: A formatted string containing the latest macroeconomic news on the given date.
         """
 
-        openai_news_results = interface.get_global_news_openai(curr_date)
+        # 市场级数据：市场扫描期间各股票共享同一结果
+        openai_news_results = shared_tool_call(
+            "get_global_news_openai", interface.get_global_news_openai, curr_date
+        )
 
         return openai_news_results
 
@@ -0,0 +1,138 @@
+"""
+嵌入向量持久化缓存
+按 (提供商, 模型, 文本内容哈希) 缓存嵌入向量，所有记忆实例共享，
+相同的文本无论被哪个记忆实例请求，都只调用一次嵌入服务。
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# 导入统一日志系统
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("agents.utils.embedding_cache")
+
+
+def embedding_cache_key(provider: str, model: str, text: str) -> str:
+    """嵌入缓存键：提供商、模型和文本内容的SHA-256"""
+    digest = hashlib.sha256()
+    digest.update(f"{provider}\x00{model}\x00".encode("utf-8"))
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite持久化 + 进程内LRU的嵌入向量缓存（线程安全）"""
+
+    def __init__(self, db_path: str, memory_size: int = 2048):
+        """
+        Args:
+            db_path: SQLite数据库文件路径
+            memory_size: 进程内LRU缓存的最大条数
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    cache_key TEXT PRIMARY KEY,
+                    dimension INTEGER,
+                    vector BLOB
+                )
+            """)
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, vector: List[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """批量读取缓存，返回命中的 {key: vector}"""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+
+            # SQLite单次查询的参数个数有限，分块读取
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT cache_key, vector FROM embeddings WHERE cache_key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("f", blob).tolist()
+                    found[key] = vector
+                    self._remember(key, vector)
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]]):
+        """批量写入缓存"""
+        if not vectors:
+            return
+        rows = [(key, len(vector), array("f", vector).tobytes()) for key, vector in vectors.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (cache_key, dimension, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+            for key, vector in vectors.items():
+                self._remember(key, list(vector))
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return {"entries": total, "memory_entries": len(self._memory),
+                "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_embedding_caches: Dict[str, EmbeddingCache] = {}
+_embedding_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(cache_dir: Optional[str] = None) -> EmbeddingCache:
+    """
+    获取共享的嵌入缓存实例
+
+    Args:
+        cache_dir: 缓存目录，默认为环境变量 TRADINGAGENTS_EMBEDDING_CACHE_DIR，
+                   否则为 dataflows/data_cache/embeddings
+    """
+    if cache_dir is None:
+        cache_dir = os.getenv("TRADINGAGENTS_EMBEDDING_CACHE_DIR")
+    if cache_dir is None:
+        cache_dir = Path(__file__).resolve().parents[2] / "dataflows" / "data_cache" / "embeddings"
+
+    db_path = str(Path(cache_dir) / "embedding_cache.db")
+    with _embedding_caches_lock:
+        if db_path not in _embedding_caches:
+            _embedding_caches[db_path] = EmbeddingCache(db_path)
+            logger.info(f"📦 [嵌入缓存] 使用持久化嵌入缓存: {db_path}")
+        return _embedding_caches[db_path]
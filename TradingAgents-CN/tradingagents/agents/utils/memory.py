@@ -3,12 +3,17 @@ from chromadb.config import Settings
 from openai import OpenAI
 import os
 import threading
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from .embedding_cache import embedding_cache_key, get_embedding_cache
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("agents.utils.memory")
 
+# 记忆功能禁用或嵌入失败时返回的零向量维度
+EMPTY_EMBEDDING_DIM = 1024
+
 
 class ChromaDBManager:
     """单例ChromaDB管理器，避免并发创建集合的冲突"""
@@ -175,34 +180,73 @@ class FinancialSituationMemory:
             logger.warning("🚨 [嵌入模型] 无可用嵌入服务，记忆功能已禁用")
             logger.info("💡 提示：设置SILICONFLOW_API_KEY或OPENAI_API_KEY以启用记忆功能")
 
+        # 批量嵌入和共享的持久化嵌入缓存
+        self.embedding_batch_size = max(1, int(config.get("embedding_batch_size", 32)))
+        self.embedding_cache = None
+        if self.client != "DISABLED" and config.get("enable_caching", True):
+            try:
+                self.embedding_cache = get_embedding_cache(config.get("embedding_cache_dir"))
+            except Exception as e:
+                logger.warning(f"⚠️ [嵌入缓存] 初始化失败，不使用缓存: {e}")
+
         # 使用单例ChromaDB管理器
         self.chroma_manager = ChromaDBManager()
         self.situation_collection = self.chroma_manager.get_or_create_collection(name)
 
     def get_embedding(self, text):
         """Get embedding for a text using the configured provider"""
-        
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        批量获取嵌入向量
+
+        先查共享缓存，未命中的文本去重后按 embedding_batch_size 分批请求嵌入服务；
+        某一批失败时该批返回零向量（不写入缓存）。
+        """
         # 检查记忆功能是否被禁用
         if self.client == "DISABLED":
             # 内存功能已禁用，返回空向量
             logger.debug(f"⚠️ 记忆功能已禁用，返回空向量")
-            return [0.0] * 1024  # 返回1024维的零向量
-        
-        # 使用统一的OpenAI兼容接口（SiliconFlow/OpenAI/Ollama）
-        try:
-            response = self.client.embeddings.create(
-                model=self.embedding,
-                input=text
-            )
-            embedding = response.data[0].embedding
-            logger.debug(f"✅ [{self.embedding_provider}] 嵌入成功，维度: {len(embedding)}")
-            return embedding
-        
-        except Exception as e:
-            # 通用错误处理
-            logger.error(f"❌ [{self.embedding_provider}] 嵌入失败: {str(e)}")
-            logger.warning(f"⚠️ 记忆功能降级，返回空向量")
-            return [0.0] * 1024  # 返回空向量而不是抛出异常
+            return [[0.0] * EMPTY_EMBEDDING_DIM for _ in texts]
+
+        keys = [embedding_cache_key(self.embedding_provider, self.embedding, text) for text in texts]
+        vectors: Dict[str, List[float]] = {}
+        if self.embedding_cache is not None:
+            vectors.update(self.embedding_cache.get_many(keys))
+
+        # 未命中的文本去重后分批请求
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in pending:
+                pending[key] = text
+
+        if pending:
+            pending_items = list(pending.items())
+            fetched: Dict[str, List[float]] = {}
+            for start in range(0, len(pending_items), self.embedding_batch_size):
+                batch = pending_items[start:start + self.embedding_batch_size]
+                # 使用统一的OpenAI兼容接口（SiliconFlow/OpenAI/Ollama）
+                try:
+                    response = self.client.embeddings.create(
+                        model=self.embedding,
+                        input=[text for _, text in batch]
+                    )
+                    for item in sorted(response.data, key=lambda d: d.index):
+                        fetched[batch[item.index][0]] = item.embedding
+                    logger.debug(f"✅ [{self.embedding_provider}] 批量嵌入成功: {len(batch)}条，"
+                                 f"维度: {len(response.data[0].embedding)}")
+                except Exception as e:
+                    # 通用错误处理
+                    logger.error(f"❌ [{self.embedding_provider}] 嵌入失败: {str(e)}")
+                    logger.warning(f"⚠️ 记忆功能降级，返回空向量")
+
+            if fetched and self.embedding_cache is not None:
+                self.embedding_cache.put_many(fetched)
+            vectors.update(fetched)
+
+        # 失败的文本返回空向量而不是抛出异常
+        return [vectors.get(key) or [0.0] * EMPTY_EMBEDDING_DIM for key in keys]
 
     def add_situations(self, situations_and_advice):
         """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
@@ -210,7 +254,6 @@ class FinancialSituationMemory:
         situations = []
         advice = []
         ids = []
-        embeddings = []
 
         offset = self.situation_collection.count()
 
@@ -218,7 +261,8 @@ class FinancialSituationMemory:
             situations.append(situation)
             advice.append(recommendation)
             ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+
+        embeddings = self.get_embeddings(situations)
 
         self.situation_collection.add(
             documents=situations,
@@ -14,7 +14,7 @@ This module transforms TradingAgents-CN into an advanced AI-powered financial an
 
 # Import all AI components for easy access
 from .llm_orchestrator import AIOrchestrator, TaskPriority, OrchestratorStatus
-from .financial_rag import FinancialRAGSystem, FinancialDocument, RAGQuery, RAGResponse
+from .financial_rag import FinancialRAGSystem, FinancialDocument, RAGQuery, RAGResponse, IngestionReport
 from .intelligent_automation import (
     IntelligentAutomation, ReportType, AlertSeverity, AutomationTrigger,
     SmartAlert, ReportGenerator, SmartAlertSystem
@@ -55,6 +55,7 @@ __all__ = [
     'FinancialDocument',
     'RAGQuery', 
     'RAGResponse',
+    'IngestionReport',
     'CoordinationTask',
     'AgentOpinion',
     'ConsensusResult',
@@ -10,13 +10,15 @@ import asyncio
 import json
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Set, Union, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 import hashlib
 import pickle
-from collections import defaultdict
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Mapping
 import re
 
 # Vector database and embeddings
@@ -38,6 +40,8 @@ except ImportError:
 # TradingAgents imports
 from tradingagents.utils.logging_init import get_logger
 from tradingagents.dataflows import get_finnhub_news, get_YFin_data_window
+from .vector_index import LocalVectorIndex
+from .kb_store import SegmentedKnowledgeStore
 
 logger = get_logger("financial_rag")
 
@@ -82,6 +86,133 @@ class RAGResponse:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+def _document_record(document: FinancialDocument) -> Dict[str, Any]:
+    """Serialize a document body for the segment store (embedding is stored separately)"""
+    return {
+        'doc_id': document.doc_id,
+        'title': document.title,
+        'content': document.content,
+        'doc_type': document.doc_type,
+        'symbol': document.symbol,
+        'sector': document.sector,
+        'market': document.market,
+        'timestamp': document.timestamp.isoformat(),
+        'metadata': document.metadata,
+        'content_hash': content_hash(document)
+    }
+
+
+def _document_from_record(record: Dict[str, Any]) -> FinancialDocument:
+    """Rebuild a document from a segment store record"""
+    return FinancialDocument(
+        doc_id=record['doc_id'],
+        title=record['title'],
+        content=record['content'],
+        doc_type=record['doc_type'],
+        symbol=record.get('symbol'),
+        sector=record.get('sector'),
+        market=record.get('market'),
+        timestamp=datetime.fromisoformat(record['timestamp']),
+        metadata=record.get('metadata') or {},
+        embedding=record.get('embedding')
+    )
+
+
+class LazyDocumentMap(Mapping):
+    """
+    doc_id -> FinancialDocument view over the segment store
+    
+    Persisted documents are read from disk on access (with a small LRU of recently
+    read documents); documents added since the last save are held in memory until
+    flush() appends them as a new segment.
+    """
+    
+    def __init__(self, store: SegmentedKnowledgeStore, cache_size: int = 1024):
+        self.store = store
+        self.cache_size = cache_size
+        self.pending: Dict[str, FinancialDocument] = {}
+        self._cache: "OrderedDict[str, FinancialDocument]" = OrderedDict()
+    
+    def __getitem__(self, doc_id: str) -> FinancialDocument:
+        document = self.pending.get(doc_id)
+        if document is not None:
+            return document
+        
+        document = self._cache.get(doc_id)
+        if document is not None:
+            self._cache.move_to_end(doc_id)
+            return document
+        
+        record = self.store.read_record(doc_id)
+        if record is None:
+            raise KeyError(doc_id)
+        document = _document_from_record(record)
+        self._cache[doc_id] = document
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return document
+    
+    def __setitem__(self, doc_id: str, document: FinancialDocument):
+        self.pending[doc_id] = document
+        self._cache.pop(doc_id, None)
+    
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self.pending or doc_id in self.store.locators
+    
+    def __iter__(self):
+        persisted = list(self.store.locators)
+        yield from persisted
+        yield from (doc_id for doc_id in list(self.pending) if doc_id not in self.store.locators)
+    
+    def __len__(self) -> int:
+        locators = self.store.locators
+        return len(locators) + sum(1 for doc_id in self.pending if doc_id not in locators)
+    
+    def timestamp(self, doc_id: str) -> Optional[datetime]:
+        """Document timestamp without reading the document body"""
+        document = self.pending.get(doc_id)
+        if document is not None:
+            return document.timestamp
+        locator = self.store.locators.get(doc_id)
+        return datetime.fromisoformat(locator.timestamp) if locator is not None else None
+    
+    def flush(self) -> int:
+        """Append documents added since the last flush as one segment"""
+        documents = list(self.pending.values())
+        if not documents:
+            return 0
+        self.store.append(
+            [_document_record(doc) for doc in documents],
+            [doc.embedding for doc in documents]
+        )
+        for doc in documents:
+            # Documents replaced while the segment was being written stay pending
+            if self.pending.get(doc.doc_id) is doc:
+                del self.pending[doc.doc_id]
+        return len(documents)
+
+
+@dataclass
+class IngestionReport:
+    """Bulk ingestion statistics"""
+    submitted: int = 0
+    added: int = 0
+    unchanged: int = 0         # Same doc_id and content already stored
+    reused_embeddings: int = 0  # Duplicate content embedded once
+    embedded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def docs_per_second(self) -> float:
+        return self.added / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def content_hash(document: FinancialDocument) -> str:
+    """Hash of the embedded content (document type included, as it drives domain weighting)"""
+    return hashlib.sha256(f"{document.doc_type}\0{document.content}".encode('utf-8')).hexdigest()
+
+
 class FinancialEmbedding:
     """Financial domain-specific embedding system"""
     
@@ -145,6 +276,39 @@ class FinancialEmbedding:
             logger.error(f"Embedding failed: {e}")
             return self._fallback_embedding(text)
     
+    def embed_texts(self, texts: List[str], doc_types: Optional[List[str]] = None,
+                    batch_size: int = 64) -> List[np.ndarray]:
+        """
+        Create embeddings for many texts with one batched model call
+        
+        Args:
+            texts: Texts to embed
+            doc_types: Document type per text for domain weighting
+            batch_size: Model batch size
+            
+        Returns:
+            List[np.ndarray]: Embedding vector per text
+        """
+        if not texts:
+            return []
+        doc_types = doc_types or ["general"] * len(texts)
+        
+        try:
+            if self.model is not None:
+                base_embeddings = self.model.encode(
+                    texts, batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True
+                )
+                return [
+                    self._apply_domain_weighting(text, base_embedding, doc_type)
+                    for text, base_embedding, doc_type in zip(texts, base_embeddings, doc_types)
+                ]
+            else:
+                return [self._fallback_embedding(text) for text in texts]
+                
+        except Exception as e:
+            logger.error(f"Batch embedding failed, embedding one by one: {e}")
+            return [self.embed_text(text, doc_type) for text, doc_type in zip(texts, doc_types)]
+    
     def _apply_domain_weighting(self, text: str, base_embedding: np.ndarray, 
                                doc_type: str) -> np.ndarray:
         """Apply financial domain-specific weighting to embeddings"""
@@ -211,8 +375,10 @@ class FinancialEmbedding:
 class FinancialKnowledgeBase:
     """Financial knowledge base with vector storage"""
     
-    def __init__(self, storage_path: str = "financial_kb"):
+    def __init__(self, storage_path: str = "financial_kb", index_backend: str = "auto",
+                 embedding_batch_size: int = 64):
         self.storage_path = Path(storage_path)
+        self.embedding_batch_size = embedding_batch_size
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
         # Initialize vector database
@@ -227,9 +393,20 @@ class FinancialKnowledgeBase:
         self.symbol_index: Dict[str, List[str]] = defaultdict(list)
         self.date_index: Dict[str, List[str]] = defaultdict(list)
         self.type_index: Dict[str, List[str]] = defaultdict(list)
+        # Documents without a symbol match every symbol filter
+        self._unscoped_doc_ids: Set[str] = set()
+        # doc_id -> (symbol, date key, doc_type) it is currently indexed under
+        self._doc_index_keys: Dict[str, Tuple[Optional[str], str, str]] = {}
+        # Content hashes for ingestion dedup: doc_id -> hash, hash -> a doc_id with that content
+        self._doc_hashes: Dict[str, str] = {}
+        self._hash_owners: Dict[str, str] = {}
         
-        # Document storage
-        self.documents: Dict[str, FinancialDocument] = {}
+        # Document storage (segmented append-only store, bodies loaded on demand)
+        self.store = SegmentedKnowledgeStore(self.storage_path / "segments")
+        self.documents = LazyDocumentMap(self.store)
+        
+        # Local vector index (contiguous float32 matrix, optional HNSW/IVF)
+        self.vector_index = LocalVectorIndex(backend=index_backend)
         
         # Load existing knowledge base
         self._load_knowledge_base()
@@ -275,42 +452,164 @@ class FinancialKnowledgeBase:
         Returns:
             bool: Success status
         """
-        try:
-            # Generate embedding if not provided
-            if document.embedding is None:
-                document.embedding = self.embedding_system.embed_text(
-                    document.content, document.doc_type
-                )
-            
-            # Store in vector database
-            if self.collection is not None:
-                self.collection.add(
-                    embeddings=[document.embedding.tolist()],
-                    documents=[document.content],
-                    metadatas=[{
-                        "doc_id": document.doc_id,
-                        "title": document.title,
-                        "doc_type": document.doc_type,
-                        "symbol": document.symbol or "",
-                        "sector": document.sector or "",
-                        "market": document.market or "",
-                        "timestamp": document.timestamp.isoformat()
-                    }],
-                    ids=[document.doc_id]
-                )
+        return self.add_documents([document]).failed == 0
+    
+    def add_documents(self, documents: List[FinancialDocument],
+                      batch_size: Optional[int] = None) -> IngestionReport:
+        """
+        Add documents in bulk
+        
+        Documents are deduplicated by content hash before embedding, embedded in
+        batches and written to the vector database with one call per batch.
+        
+        Args:
+            documents: Financial documents to add
+            batch_size: Embedding/write batch size (defaults to embedding_batch_size)
             
+        Returns:
+            IngestionReport: Ingestion statistics including documents per second
+        """
+        batch_size = batch_size or self.embedding_batch_size
+        report = IngestionReport(submitted=len(documents))
+        started = time.perf_counter()
+        
+        # Last submission wins for repeated doc_ids; unchanged documents are skipped
+        latest: Dict[str, FinancialDocument] = {}
+        for document in documents:
+            latest[document.doc_id] = document
+        report.unchanged = len(documents) - len(latest)
+        pending = []
+        for document in latest.values():
+            digest = content_hash(document)
+            if self._doc_hashes.get(document.doc_id) == digest:
+                report.unchanged += 1
+            else:
+                pending.append((document, digest))
+        
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            try:
+                self._embed_batch(batch, report)
+                stored = self._store_batch([document for document, _ in batch])
+            except Exception as e:
+                logger.error(f"Failed to add document batch: {e}")
+                report.failed += len(batch)
+                continue
+            for document, digest in batch:
+                if document.doc_id in stored:
+                    self._register_content(document.doc_id, digest)
+            report.added += len(stored)
+            report.failed += len(batch) - len(stored)
+        
+        report.elapsed_seconds = time.perf_counter() - started
+        if len(documents) > 1:
+            logger.info(f"Bulk ingestion: {report.added}/{report.submitted} documents added "
+                        f"({report.docs_per_second:.1f} docs/s, {report.embedded} embedded, "
+                        f"{report.reused_embeddings} reused, {report.unchanged} unchanged, "
+                        f"{report.failed} failed)")
+        return report
+    
+    def _embed_batch(self, batch: List[Tuple[FinancialDocument, str]], report: IngestionReport):
+        """Embed documents lacking an embedding, once per distinct content"""
+        to_embed: Dict[str, FinancialDocument] = {}
+        reuse: List[Tuple[FinancialDocument, str]] = []
+        for document, digest in batch:
+            if document.embedding is not None:
+                continue
+            if digest in to_embed:
+                reuse.append((document, digest))
+                continue
+            owner = self._hash_owners.get(digest)
+            existing = self.documents.get(owner) if owner is not None else None
+            # The owner may have been re-ingested with other content since it was registered
+            if (existing is not None and existing.embedding is not None
+                    and content_hash(existing) == digest):
+                document.embedding = existing.embedding
+                report.reused_embeddings += 1
+            else:
+                to_embed[digest] = document
+        
+        if to_embed:
+            unique = list(to_embed.values())
+            embeddings = self.embedding_system.embed_texts(
+                [document.content for document in unique],
+                [document.doc_type for document in unique],
+                batch_size=len(unique)
+            )
+            for document, embedding in zip(unique, embeddings):
+                document.embedding = embedding
+            report.embedded += len(unique)
+        
+        for document, digest in reuse:
+            document.embedding = to_embed[digest].embedding
+            report.reused_embeddings += 1
+    
+    def _store_batch(self, batch: List[FinancialDocument]) -> Set[str]:
+        """
+        Write a batch to the vector database, document store and indexes
+        
+        Returns:
+            Set[str]: doc_ids that were stored (documents rejected by the vector database are skipped)
+        """
+        if self.collection is not None:
+            try:
+                self._add_to_collection(batch)
+            except Exception as e:
+                # One bad document fails the whole call - retry one by one to isolate it
+                logger.warning(f"Vector database batch add failed, retrying per document: {e}")
+                accepted = []
+                for document in batch:
+                    try:
+                        self._add_to_collection([document])
+                        accepted.append(document)
+                    except Exception as doc_error:
+                        logger.error(f"Failed to add document {document.doc_id}: {doc_error}")
+                batch = accepted
+        
+        for document in batch:
             # Store document
             self.documents[document.doc_id] = document
             
             # Update indexes
             self._update_indexes(document)
-            
-            logger.debug(f"Added document to knowledge base: {document.doc_id}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to add document: {e}")
-            return False
+        
+        same_dim = [document for document in batch if self.vector_index.accepts(document.embedding)]
+        if same_dim:
+            self.vector_index.add_batch(
+                [document.doc_id for document in same_dim],
+                np.stack([document.embedding for document in same_dim])
+            )
+        logger.debug(f"Added {len(batch)} documents to knowledge base")
+        return {document.doc_id for document in batch}
+    
+    def _add_to_collection(self, documents: List[FinancialDocument]):
+        """Add documents to the ChromaDB collection in one call"""
+        self.collection.upsert(
+            embeddings=[np.asarray(document.embedding).tolist() for document in documents],
+            documents=[document.content for document in documents],
+            metadatas=[{
+                "doc_id": document.doc_id,
+                "title": document.title,
+                "doc_type": document.doc_type,
+                "symbol": document.symbol or "",
+                "sector": document.sector or "",
+                "market": document.market or "",
+                "timestamp": document.timestamp.isoformat()
+            } for document in documents],
+            ids=[document.doc_id for document in documents]
+        )
+    
+    def _register_content(self, doc_id: str, digest: Optional[str]):
+        """Remember a document's content hash for ingestion dedup"""
+        previous = self._doc_hashes.get(doc_id)
+        if previous is not None and previous != digest and self._hash_owners.get(previous) == doc_id:
+            # doc_id no longer carries the old content
+            del self._hash_owners[previous]
+        if not digest:
+            self._doc_hashes.pop(doc_id, None)
+            return
+        self._doc_hashes[doc_id] = digest
+        self._hash_owners.setdefault(digest, doc_id)
     
     def query_documents(self, query: RAGQuery) -> List[FinancialDocument]:
         """
@@ -328,26 +627,13 @@ class FinancialKnowledgeBase:
                 query.query_text, query.query_type
             )
             
-            retrieved_docs = []
-            
-            if self.collection is not None:
-                # Query vector database
-                results = self.collection.query(
-                    query_embeddings=[query_embedding.tolist()],
-                    n_results=min(query.top_k * 2, 20),  # Get more results for filtering
-                    include=['documents', 'metadatas', 'distances']
-                )
-                
-                # Convert results to documents
-                for i in range(len(results['ids'][0])):
-                    doc_id = results['ids'][0][i]
-                    if doc_id in self.documents:
-                        doc = self.documents[doc_id]
-                        doc.relevance_score = 1.0 - results['distances'][0][i]  # Convert distance to similarity
-                        retrieved_docs.append(doc)
+            if len(self.vector_index) and self.vector_index.accepts(query_embedding):
+                # Filters are pushed down into the local index, so results are already filtered
+                retrieved_docs = self._index_search(query, query_embedding)
+            elif self.collection is not None:
+                retrieved_docs = self._chroma_search(query, query_embedding)
             else:
-                # Fallback: search in-memory documents
-                retrieved_docs = self._fallback_search(query, query_embedding)
+                retrieved_docs = []
             
             # Apply filters
             filtered_docs = self._apply_filters(retrieved_docs, query)
@@ -385,35 +671,143 @@ class FinancialKnowledgeBase:
         
         return filtered
     
-    def _fallback_search(self, query: RAGQuery, 
-                        query_embedding: np.ndarray) -> List[FinancialDocument]:
-        """Fallback search method when vector DB is not available"""
-        results = []
+    def _candidate_doc_ids(self, query: RAGQuery) -> Optional[Set[str]]:
+        """Resolve symbol/doc_type/date filters to document ids via the in-memory indexes"""
+        candidates: Optional[Set[str]] = None
         
-        for doc in self.documents.values():
-            if doc.embedding is not None:
-                similarity = self.embedding_system.compute_similarity(
-                    query_embedding, doc.embedding
-                )
+        def narrow(ids: Set[str]) -> Set[str]:
+            return ids if candidates is None else candidates & ids
+        
+        if query.symbols:
+            ids = set(self._unscoped_doc_ids)
+            for symbol in query.symbols:
+                ids.update(self.symbol_index.get(symbol, ()))
+            candidates = narrow(ids)
+        
+        if query.doc_types:
+            ids = set()
+            for doc_type in query.doc_types:
+                ids.update(self.type_index.get(doc_type, ()))
+            candidates = narrow(ids)
+        
+        if query.date_range:
+            start_date, end_date = query.date_range
+            first_day, last_day = start_date.date().isoformat(), end_date.date().isoformat()
+            ids = set()
+            for day, doc_ids in self.date_index.items():
+                if first_day < day < last_day:
+                    ids.update(doc_ids)
+                elif day == first_day or day == last_day:
+                    # Boundary days: check exact timestamps
+                    for doc_id in doc_ids:
+                        timestamp = self.documents.timestamp(doc_id)
+                        if timestamp is not None and start_date <= timestamp <= end_date:
+                            ids.add(doc_id)
+            candidates = narrow(ids)
+        
+        return candidates
+    
+    def _index_search(self, query: RAGQuery, 
+                      query_embedding: np.ndarray) -> List[FinancialDocument]:
+        """Search the local vector index with filters pushed down"""
+        candidate_ids = self._candidate_doc_ids(query)
+        candidate_rows = None
+        if candidate_ids is not None:
+            candidate_rows = self.vector_index.rows_for(candidate_ids)
+            if not len(candidate_rows):
+                return []
+        
+        results = []
+        for doc_id, similarity in self.vector_index.search(query_embedding, query.top_k, candidate_rows):
+            doc = self.documents.get(doc_id)
+            if doc is not None:
                 doc.relevance_score = similarity
                 results.append(doc)
-        
         return results
     
+    def _chroma_search(self, query: RAGQuery, 
+                       query_embedding: np.ndarray) -> List[FinancialDocument]:
+        """Search ChromaDB with symbol/doc_type filters as a metadata where-clause"""
+        conditions = []
+        if query.symbols:
+            conditions.append({"symbol": {"$in": list(query.symbols) + [""]}})
+        if query.doc_types:
+            conditions.append({"doc_type": {"$in": list(query.doc_types)}})
+        where = None
+        if len(conditions) == 1:
+            where = conditions[0]
+        elif conditions:
+            where = {"$and": conditions}
+        
+        results = self.collection.query(
+            query_embeddings=[query_embedding.tolist()],
+            # Over-fetch only for the date filter, which is applied afterwards
+            n_results=query.top_k * 2 if query.date_range else query.top_k,
+            where=where,
+            include=['documents', 'metadatas', 'distances']
+        )
+        
+        retrieved_docs = []
+        for i in range(len(results['ids'][0])):
+            doc_id = results['ids'][0][i]
+            if doc_id in self.documents:
+                doc = self.documents[doc_id]
+                doc.relevance_score = 1.0 - results['distances'][0][i]  # Convert distance to similarity
+                retrieved_docs.append(doc)
+        
+        if query.date_range:
+            start_date, end_date = query.date_range
+            retrieved_docs = [doc for doc in retrieved_docs 
+                              if start_date <= doc.timestamp <= end_date]
+        return retrieved_docs
+    
     def _update_indexes(self, document: FinancialDocument):
         """Update in-memory indexes"""
-        doc_id = document.doc_id
+        self._index_document(document.doc_id, document.symbol, 
+                             document.timestamp, document.doc_type)
+    
+    def _index_document(self, doc_id: str, symbol: Optional[str], 
+                        timestamp: datetime, doc_type: str):
+        """Add one document to the symbol/date/type indexes"""
+        # A re-ingested document replaces its previous version's entries
+        self._unindex_document(doc_id)
         
         # Symbol index
-        if document.symbol:
-            self.symbol_index[document.symbol].append(doc_id)
+        if symbol:
+            self.symbol_index[symbol].append(doc_id)
+        else:
+            self._unscoped_doc_ids.add(doc_id)
         
         # Date index (by day)
-        date_key = document.timestamp.date().isoformat()
+        date_key = timestamp.date().isoformat()
         self.date_index[date_key].append(doc_id)
         
         # Type index
-        self.type_index[document.doc_type].append(doc_id)
+        self.type_index[doc_type].append(doc_id)
+        self._doc_index_keys[doc_id] = (symbol, date_key, doc_type)
+    
+    def _unindex_document(self, doc_id: str):
+        """Remove a document from the symbol/date/type indexes"""
+        keys = self._doc_index_keys.pop(doc_id, None)
+        if keys is None:
+            return
+        symbol, date_key, doc_type = keys
+        if symbol:
+            self._remove_from_index(self.symbol_index, symbol, doc_id)
+        else:
+            self._unscoped_doc_ids.discard(doc_id)
+        self._remove_from_index(self.date_index, date_key, doc_id)
+        self._remove_from_index(self.type_index, doc_type, doc_id)
+    
+    @staticmethod
+    def _remove_from_index(index: Dict[str, List[str]], key: str, doc_id: str):
+        doc_ids = index.get(key)
+        if doc_ids is None:
+            return
+        doc_ids[:] = [existing for existing in doc_ids if existing != doc_id]
+        if not doc_ids:
+            # Keep symbol/date coverage stats accurate
+            del index[key]
     
     def ingest_news_data(self, symbol: str, days_back: int = 30) -> int:
         """
@@ -428,7 +822,7 @@ class FinancialKnowledgeBase:
         """
         try:
             news_data = get_finnhub_news(symbol, days_back=days_back)
-            added_count = 0
+            documents = []
             
             for news_item in news_data:
                 doc_id = f"news_{symbol}_{news_item.get('id', hash(news_item.get('summary', '')))}"
@@ -437,7 +831,7 @@ class FinancialKnowledgeBase:
                 if doc_id in self.documents:
                     continue
                 
-                document = FinancialDocument(
+                documents.append(FinancialDocument(
                     doc_id=doc_id,
                     title=news_item.get('headline', 'No Title'),
                     content=news_item.get('summary', ''),
@@ -449,13 +843,13 @@ class FinancialKnowledgeBase:
                         'url': news_item.get('url', ''),
                         'category': news_item.get('category', '')
                     }
-                )
-                
-                if self.add_document(document):
-                    added_count += 1
+                ))
+            
+            report = self.add_documents(documents)
             
-            logger.info(f"Ingested {added_count} news documents for {symbol}")
-            return added_count
+            logger.info(f"Ingested {report.added} news documents for {symbol} "
+                        f"({report.docs_per_second:.1f} docs/s)")
+            return report.added
             
         except Exception as e:
             logger.error(f"Failed to ingest news data for {symbol}: {e}")
@@ -479,7 +873,7 @@ class FinancialKnowledgeBase:
             if market_data is None or market_data.empty:
                 return 0
             
-            added_count = 0
+            documents = []
             
             # Create summary documents for different time periods
             periods = ['1D', '1W', '1M']  # Daily, Weekly, Monthly summaries
@@ -500,7 +894,7 @@ class FinancialKnowledgeBase:
                 
                 doc_id = f"market_{symbol}_{period}_{end_date}"
                 
-                document = FinancialDocument(
+                documents.append(FinancialDocument(
                     doc_id=doc_id,
                     title=f"{symbol} {period} Technical Summary",
                     content=summary,
@@ -516,13 +910,13 @@ class FinancialKnowledgeBase:
                             'close': float(grouped_data['Close'].iloc[-1])
                         }
                     }
-                )
-                
-                if self.add_document(document):
-                    added_count += 1
+                ))
             
-            logger.info(f"Ingested {added_count} market data documents for {symbol}")
-            return added_count
+            report = self.add_documents(documents)
+            
+            logger.info(f"Ingested {report.added} market data documents for {symbol} "
+                        f"({report.docs_per_second:.1f} docs/s)")
+            return report.added
             
         except Exception as e:
             logger.error(f"Failed to ingest market data for {symbol}: {e}")
@@ -575,39 +969,68 @@ Data Points: {len(data)}
             return f"{symbol} technical data for {period}"
     
     def _load_knowledge_base(self):
-        """Load existing knowledge base from disk"""
+        """Load existing knowledge base from disk (indexes and embeddings only)"""
         try:
-            kb_file = self.storage_path / "knowledge_base.pkl"
-            if kb_file.exists():
-                with open(kb_file, 'rb') as f:
-                    data = pickle.load(f)
-                    self.documents = data.get('documents', {})
-                    self.symbol_index = data.get('symbol_index', defaultdict(list))
-                    self.date_index = data.get('date_index', defaultdict(list))
-                    self.type_index = data.get('type_index', defaultdict(list))
+            if self.store.exists():
+                for locator in self.store.open().values():
+                    self._index_document(locator.doc_id, locator.symbol,
+                                         datetime.fromisoformat(locator.timestamp), locator.doc_type)
+                    self._register_content(locator.doc_id, locator.content_hash)
+                for doc_ids, embeddings in self.store.iter_embeddings():
+                    self.vector_index.add_batch(doc_ids, embeddings)
                 
-                logger.info(f"Loaded {len(self.documents)} documents from knowledge base")
+                logger.info(f"Loaded {len(self.documents)} documents from knowledge base "
+                            f"({len(self.store.segments)} segments)")
+            else:
+                self.store.open()
+                kb_file = self.storage_path / "knowledge_base.pkl"
+                if kb_file.exists():
+                    self._migrate_pickle(kb_file)
         except Exception as e:
             logger.warning(f"Failed to load existing knowledge base: {e}")
     
+    def _migrate_pickle(self, kb_file: Path):
+        """Import a legacy whole-pickle knowledge base into the segment store"""
+        with open(kb_file, 'rb') as f:
+            data = pickle.load(f)
+        documents: Dict[str, FinancialDocument] = data.get('documents', {})
+        
+        by_dimension: Dict[int, List[FinancialDocument]] = defaultdict(list)
+        for doc in documents.values():
+            self.documents[doc.doc_id] = doc
+            self._update_indexes(doc)
+            self._register_content(doc.doc_id, content_hash(doc))
+            if doc.embedding is not None:
+                by_dimension[len(doc.embedding)].append(doc)
+        
+        if by_dimension:
+            # Index the dominant embedding dimension (mixed dimensions come from model fallbacks)
+            docs = max(by_dimension.values(), key=len)
+            self.vector_index.add_batch(
+                [doc.doc_id for doc in docs],
+                np.stack([doc.embedding for doc in docs])
+            )
+        
+        self.save_knowledge_base()
+        logger.info(f"Migrated {len(documents)} documents from {kb_file.name} to the segment store; "
+                    f"the pickle file is no longer read")
+    
     def save_knowledge_base(self):
-        """Save knowledge base to disk"""
+        """Append documents added since the last save as a new segment"""
         try:
-            kb_file = self.storage_path / "knowledge_base.pkl"
-            data = {
-                'documents': self.documents,
-                'symbol_index': dict(self.symbol_index),
-                'date_index': dict(self.date_index),
-                'type_index': dict(self.type_index)
-            }
-            
-            with open(kb_file, 'wb') as f:
-                pickle.dump(data, f)
-            
-            logger.info("Knowledge base saved successfully")
+            saved = self.documents.flush()
+            logger.info(f"Knowledge base saved successfully ({saved} new documents)")
         except Exception as e:
             logger.error(f"Failed to save knowledge base: {e}")
     
+    def compact_knowledge_base(self) -> bool:
+        """Merge all segments into one (also runs automatically in the background)"""
+        try:
+            return self.store.compact()
+        except Exception as e:
+            logger.error(f"Failed to compact knowledge base: {e}")
+            return False
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get knowledge base statistics"""
         return {
@@ -622,7 +1045,9 @@ Data Points: {len(data)}
                 'latest': max(self.date_index.keys()) if self.date_index else None
             },
             'storage_path': str(self.storage_path),
-            'vector_db_available': self.collection is not None
+            'vector_db_available': self.collection is not None,
+            'vector_index': self.vector_index.stats(),
+            'storage': self.store.stats()
         }
 
 
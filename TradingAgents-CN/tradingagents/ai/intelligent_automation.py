@@ -24,6 +24,7 @@ import jinja2
 
 # TradingAgents imports
 from tradingagents.utils.logging_init import get_logger
+from tradingagents.utils import indicator_kernels as kernels
 from tradingagents.dataflows import get_YFin_data_window, get_china_stock_data_unified
 from tradingagents.services.mailer.email_sender import EmailSender
 
@@ -234,17 +235,8 @@ class MarketConditionMonitor:
     def _calculate_rsi(self, prices: pd.Series, window: int = 14) -> pd.Series:
         """Calculate RSI indicator"""
         try:
-            delta = prices.diff()
-            gain = np.where(delta > 0, delta, 0)
-            loss = np.where(delta < 0, -delta, 0)
-            
-            avg_gain = pd.Series(gain).rolling(window=window).mean()
-            avg_loss = pd.Series(loss).rolling(window=window).mean()
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi
+            rsi = kernels.rsi(kernels.as_float_array(prices), window)
+            return pd.Series(rsi, index=prices.index)
         except Exception as e:
             logger.error(f"RSI calculation failed: {e}")
             return pd.Series()
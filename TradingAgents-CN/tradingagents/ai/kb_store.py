@@ -0,0 +1,386 @@
+"""
+Segmented Append-Only Storage for the Financial Knowledge Base
+
+Each save appends one immutable segment instead of rewriting the whole knowledge base:
+
+- <segment>.docs.jsonl   document bodies, one JSON record per line
+- <segment>.emb.npy      float32 embedding matrix, opened memory-mapped
+- <segment>.index.json   per-document locators (byte offset, embedding row) and the
+                         metadata needed to rebuild symbol/date/type indexes without
+                         reading any document body
+
+manifest.json lists the committed segments. A segment becomes visible only when the
+manifest is atomically replaced, so a crash mid-save leaves the previous state intact;
+files of uncommitted or compacted-away segments are removed on the next open.
+When a document id appears in several segments, the latest segment wins. Compaction
+merges all segments into one (dropping superseded versions) and can run in a
+background thread while new segments keep being appended.
+"""
+
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from tradingagents.utils.logging_init import get_logger
+
+logger = get_logger("kb_store")
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class DocumentLocator:
+    """Where a document lives inside a segment, plus the fields indexes are built from"""
+    doc_id: str
+    segment: str
+    offset: int
+    length: int
+    row: int  # Row in the segment embedding matrix, -1 when the embedding is stored inline
+    doc_type: str
+    symbol: Optional[str]
+    timestamp: str  # ISO format
+    content_hash: Optional[str] = None
+
+
+def _fsync_write(path: Path, data: bytes):
+    with open(path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _fsync_dir(path: Path):
+    """Persist a rename on POSIX (directories cannot be opened on Windows)"""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SegmentedKnowledgeStore:
+    """Append-only segment store with memory-mapped embeddings and lazy document bodies"""
+
+    def __init__(self, path: Path, max_segments: int = 16, background_compaction: bool = True):
+        """
+        Args:
+            path: Store directory
+            max_segments: Compact once more segments than this are committed
+            background_compaction: Run automatic compaction in a daemon thread
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_segments = max_segments
+        self.background_compaction = background_compaction
+
+        self.dim: Optional[int] = None
+        self.segments: List[str] = []
+        self.locators: Dict[str, DocumentLocator] = {}
+        self._next_segment = 0
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._handles: Dict[str, Any] = {}
+        self._matrices: Dict[str, np.ndarray] = {}
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.path / "manifest.json"
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def open(self) -> Dict[str, DocumentLocator]:
+        """Load the manifest and segment locators (no document bodies are read)"""
+        with self._lock:
+            if self.exists():
+                manifest = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+                self.dim = manifest.get('dim')
+                self.segments = list(manifest.get('segments', []))
+                self._next_segment = manifest.get('next_segment', len(self.segments))
+
+            self.locators = {}
+            for segment in self.segments:
+                for locator in self._read_index(segment):
+                    self.locators[locator.doc_id] = locator
+
+            self._remove_orphans()
+            return self.locators
+
+    def append(self, records: Sequence[Dict[str, Any]], embeddings: Sequence[Optional[np.ndarray]]) -> Optional[str]:
+        """
+        Commit documents as a new segment
+
+        Args:
+            records: JSON-serializable document records with doc_id, doc_type, symbol, timestamp
+                     (and optionally content_hash)
+            embeddings: Embedding per record (None when the document has none)
+
+        Returns:
+            Optional[str]: Segment name, None when there was nothing to write
+        """
+        if not records:
+            return None
+
+        with self._lock:
+            if self.dim is None:
+                dims = [len(e) for e in embeddings if e is not None]
+                self.dim = max(set(dims), key=dims.count) if dims else None
+            name = self._allocate_segment()
+
+        # Segment files are written outside the lock; they stay invisible until the manifest commit
+        lines, locators, matrix_rows = [], [], []
+        offset = 0
+        for record, embedding in zip(records, embeddings):
+            record = dict(record)
+            row = -1
+            if embedding is not None:
+                if len(embedding) == self.dim:
+                    row = len(matrix_rows)
+                    matrix_rows.append(np.asarray(embedding, dtype=np.float32))
+                else:
+                    record['embedding'] = np.asarray(embedding, dtype=float).tolist()
+            line = json.dumps(record, ensure_ascii=False, default=str).encode('utf-8') + b'\n'
+            locators.append(DocumentLocator(
+                doc_id=record['doc_id'], segment=name, offset=offset, length=len(line), row=row,
+                doc_type=record['doc_type'], symbol=record.get('symbol'), timestamp=record['timestamp'],
+                content_hash=record.get('content_hash')
+            ))
+            lines.append(line)
+            offset += len(line)
+
+        matrix = (np.stack(matrix_rows) if matrix_rows
+                  else np.zeros((0, self.dim or 0), dtype=np.float32))
+        self._write_segment(name, b''.join(lines), matrix, locators)
+
+        with self._lock:
+            self.segments.append(name)
+            self._write_manifest()
+            for locator in locators:
+                self.locators[locator.doc_id] = locator
+
+        logger.debug(f"Committed segment {name} with {len(locators)} documents")
+        self._maybe_compact()
+        return name
+
+    def read_record(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Read one document body (plus its embedding) from its segment"""
+        with self._lock:
+            locator = self.locators.get(doc_id)
+            if locator is None:
+                return None
+            handle = self._handle(locator.segment)
+            handle.seek(locator.offset)
+            record = json.loads(handle.read(locator.length))
+            if locator.row >= 0:
+                record['embedding'] = np.array(self._matrix(locator.segment)[locator.row])
+            elif record.get('embedding') is not None:
+                record['embedding'] = np.asarray(record['embedding'])
+            return record
+
+    def iter_embeddings(self):
+        """
+        Yield (doc_ids, embeddings) per segment for the current version of each document
+
+        Rows are gathered from the memory-mapped matrix of each segment in turn.
+        """
+        with self._lock:
+            segments = list(self.segments)
+            locators = dict(self.locators)
+        by_segment: Dict[str, List[DocumentLocator]] = {segment: [] for segment in segments}
+        for locator in locators.values():
+            if locator.row >= 0 and locator.segment in by_segment:
+                by_segment[locator.segment].append(locator)
+        for segment in segments:
+            current = sorted(by_segment[segment], key=lambda l: l.row)
+            if current:
+                rows = np.fromiter((l.row for l in current), dtype=np.int64)
+                yield [l.doc_id for l in current], self._matrix(segment)[rows]
+
+    def compact(self) -> bool:
+        """Merge all committed segments into one, dropping superseded document versions"""
+        with self._compaction_lock:
+            return self._compact()
+
+    def _compact(self) -> bool:
+        with self._lock:
+            snapshot = list(self.segments)
+            if len(snapshot) <= 1:
+                return False
+            snapshot_set = set(snapshot)
+            live = [l for l in self.locators.values() if l.segment in snapshot_set]
+            name = self._allocate_segment()
+
+        order = {segment: i for i, segment in enumerate(snapshot)}
+        live.sort(key=lambda l: (order[l.segment], l.offset))
+
+        # Bodies are copied byte-for-byte; embedding rows are gathered per source segment
+        new_locators, source_rows = [], {segment: [] for segment in snapshot}
+        offset = row = 0
+        with open(self.path / f"{name}.docs.jsonl", 'wb') as out:
+            handles = {segment: open(self.path / f"{segment}.docs.jsonl", 'rb') for segment in snapshot}
+            try:
+                for locator in live:
+                    source = handles[locator.segment]
+                    source.seek(locator.offset)
+                    out.write(source.read(locator.length))
+                    new_row = -1
+                    if locator.row >= 0:
+                        source_rows[locator.segment].append(locator.row)
+                        new_row, row = row, row + 1
+                    new_locators.append(DocumentLocator(**{**asdict(locator), 'segment': name,
+                                                           'offset': offset, 'row': new_row}))
+                    offset += locator.length
+            finally:
+                for handle in handles.values():
+                    handle.close()
+            out.flush()
+            os.fsync(out.fileno())
+
+        matrix = np.lib.format.open_memmap(
+            self.path / f"{name}.emb.npy", mode='w+', dtype=np.float32, shape=(row, self.dim or 0)
+        )
+        start = 0
+        for segment in snapshot:
+            rows = source_rows[segment]
+            if rows:
+                matrix[start:start + len(rows)] = self._matrix(segment)[np.asarray(rows, dtype=np.int64)]
+                start += len(rows)
+        matrix.flush()
+        del matrix
+        _fsync_write(self.path / f"{name}.index.json",
+                     json.dumps([asdict(l) for l in new_locators], ensure_ascii=False).encode('utf-8'))
+
+        with self._lock:
+            # Segments appended meanwhile keep their place after the merged one
+            self.segments = [name] + self.segments[len(snapshot):]
+            self._write_manifest()
+            for locator in new_locators:
+                current = self.locators.get(locator.doc_id)
+                if current is not None and current.segment in snapshot_set:
+                    self.locators[locator.doc_id] = locator
+            for segment in snapshot:
+                self._release(segment)
+                self._delete_segment_files(segment)
+
+        logger.info(f"Compacted {len(snapshot)} segments into {name} ({len(new_locators)} documents)")
+        return True
+
+    def wait_for_compaction(self, timeout: Optional[float] = None):
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def close(self):
+        self.wait_for_compaction()
+        with self._lock:
+            for segment in list(self._handles) + list(self._matrices):
+                self._release(segment)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'segments': len(self.segments),
+            'documents': len(self.locators),
+            'embedding_dimension': self.dim,
+            'compacting': self._compaction_thread is not None and self._compaction_thread.is_alive()
+        }
+
+    # ------------------------------------------------------------------ internals
+
+    def _allocate_segment(self) -> str:
+        name = f"seg-{self._next_segment:06d}"
+        self._next_segment += 1
+        return name
+
+    def _write_segment(self, name: str, body: bytes, matrix: np.ndarray, locators: List[DocumentLocator]):
+        _fsync_write(self.path / f"{name}.docs.jsonl", body)
+        with open(self.path / f"{name}.emb.npy", 'wb') as f:
+            np.save(f, matrix)
+            f.flush()
+            os.fsync(f.fileno())
+        _fsync_write(self.path / f"{name}.index.json",
+                     json.dumps([asdict(l) for l in locators], ensure_ascii=False).encode('utf-8'))
+
+    def _write_manifest(self):
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'dim': self.dim,
+            'next_segment': self._next_segment,
+            'segments': self.segments
+        }
+        tmp_path = self.manifest_path.with_suffix('.json.tmp')
+        _fsync_write(tmp_path, json.dumps(manifest, indent=2).encode('utf-8'))
+        os.replace(tmp_path, self.manifest_path)
+        _fsync_dir(self.path)
+
+    def _read_index(self, segment: str) -> List[DocumentLocator]:
+        entries = json.loads((self.path / f"{segment}.index.json").read_text(encoding='utf-8'))
+        return [DocumentLocator(**entry) for entry in entries]
+
+    def _handle(self, segment: str):
+        handle = self._handles.get(segment)
+        if handle is None:
+            handle = open(self.path / f"{segment}.docs.jsonl", 'rb')
+            self._handles[segment] = handle
+        return handle
+
+    def _matrix(self, segment: str) -> np.ndarray:
+        matrix = self._matrices.get(segment)
+        if matrix is None:
+            matrix = np.load(self.path / f"{segment}.emb.npy", mmap_mode='r')
+            self._matrices[segment] = matrix
+        return matrix
+
+    def _release(self, segment: str):
+        handle = self._handles.pop(segment, None)
+        if handle is not None:
+            handle.close()
+        self._matrices.pop(segment, None)
+
+    def _delete_segment_files(self, segment: str):
+        for suffix in ('.docs.jsonl', '.emb.npy', '.index.json'):
+            try:
+                (self.path / f"{segment}{suffix}").unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # Still mapped elsewhere (Windows); removed as an orphan on the next open
+                logger.debug(f"Deferred removal of {segment}{suffix}: {e}")
+
+    def _remove_orphans(self):
+        committed = set(self.segments)
+        for path in self.path.glob("seg-*"):
+            segment = path.name.split('.', 1)[0]
+            if segment not in committed:
+                self._delete_segment_files(segment)
+        tmp_path = self.manifest_path.with_suffix('.json.tmp')
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    def _maybe_compact(self):
+        if len(self.segments) <= self.max_segments:
+            return
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        if not self.background_compaction:
+            self.compact()
+            return
+
+        def run():
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"Knowledge base compaction failed: {e}")
+
+        self._compaction_thread = threading.Thread(target=run, name="kb-compaction", daemon=True)
+        self._compaction_thread.start()
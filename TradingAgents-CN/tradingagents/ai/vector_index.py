@@ -0,0 +1,326 @@
+"""
+Local Vector Index for the Financial RAG System
+
+Keeps document embeddings in one contiguous float32 matrix (rows are L2-normalized,
+so cosine similarity is a single matrix-vector product) and answers top-k queries
+with batched scoring. Large indexes can switch to an approximate backend:
+
+- "hnsw": hnswlib graph index (optional dependency)
+- "ivf": inverted-file index built with spherical k-means in NumPy
+- "exact": always score every (candidate) row
+
+Callers can restrict a search to a set of candidate rows, which is how the knowledge
+base pushes symbol/doc_type/date filters down instead of post-filtering results.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+from tradingagents.utils.logging_init import get_logger
+
+logger = get_logger("vector_index")
+
+
+class LocalVectorIndex:
+    """In-memory vector index over a contiguous float32 embedding matrix"""
+
+    BACKENDS = ("auto", "exact", "hnsw", "ivf")
+
+    def __init__(self,
+                 backend: str = "auto",
+                 ann_threshold: int = 50_000,
+                 exact_candidate_limit: int = 20_000,
+                 hnsw_m: int = 16,
+                 hnsw_ef_construction: int = 200,
+                 hnsw_ef_search: int = 64,
+                 ivf_nprobe: int = 8):
+        """
+        Args:
+            backend: "auto" (hnsw if hnswlib is installed, else ivf), "exact", "hnsw" or "ivf"
+            ann_threshold: Minimum number of vectors before the approximate backend is used
+            exact_candidate_limit: Filtered searches with at most this many candidates are scored exactly
+            hnsw_m: HNSW graph degree
+            hnsw_ef_construction: HNSW build-time candidate list size
+            hnsw_ef_search: HNSW query-time candidate list size (raised to k when needed)
+            ivf_nprobe: Number of IVF lists probed per query
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown vector index backend: {backend}")
+        if backend == "hnsw" and not HNSWLIB_AVAILABLE:
+            logger.warning("hnswlib not available - vector index falls back to IVF")
+            backend = "ivf"
+        if backend == "auto":
+            backend = "hnsw" if HNSWLIB_AVAILABLE else "ivf"
+
+        self.backend = backend
+        self.ann_threshold = ann_threshold
+        self.exact_candidate_limit = exact_candidate_limit
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivf_nprobe = ivf_nprobe
+
+        self.dim: Optional[int] = None
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+        # Approximate structures, built lazily on the first large query
+        self._hnsw = None
+        self._hnsw_size = 0
+        self._ivf_centroids: Optional[np.ndarray] = None
+        self._ivf_lists: List[List[int]] = []
+        self._ivf_trained_size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    def accepts(self, embedding: np.ndarray) -> bool:
+        """Whether an embedding has the index dimension (any dimension before the first add)"""
+        return self.dim is None or np.asarray(embedding).shape[-1] == self.dim
+
+    def add(self, doc_id: str, embedding: np.ndarray) -> bool:
+        """Add or replace a single vector"""
+        return self.add_batch([doc_id], np.asarray(embedding)[None, :]) == 1
+
+    def add_batch(self, doc_ids: Sequence[str], embeddings: np.ndarray) -> int:
+        """
+        Add or replace vectors in bulk
+
+        Args:
+            doc_ids: Document ids, one per row
+            embeddings: (n, dim) array
+
+        Returns:
+            int: Number of vectors stored (rows with a foreign dimension are skipped)
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or len(doc_ids) != embeddings.shape[0] or not len(doc_ids):
+            return 0
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = embeddings.shape[1]
+                self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+            if embeddings.shape[1] != self.dim:
+                logger.warning(f"Skipping {len(doc_ids)} embeddings with dimension "
+                               f"{embeddings.shape[1]} (index dimension {self.dim})")
+                return 0
+
+            vectors = self._normalize(embeddings)
+
+            # Replace existing rows in place, append the rest
+            new_ids, new_positions, replaced = [], [], False
+            for i, doc_id in enumerate(doc_ids):
+                row = self._rows.get(doc_id)
+                if row is not None:
+                    self._matrix[row] = vectors[i]
+                    replaced = True
+                else:
+                    self._rows[doc_id] = self._size + len(new_ids)
+                    new_ids.append(doc_id)
+                    new_positions.append(i)
+            if replaced:
+                # Replaced rows may belong to another IVF list / HNSW neighbourhood now
+                self._reset_ann()
+
+            if new_ids:
+                start = self._size
+                self._reserve(start + len(new_ids))
+                self._matrix[start:start + len(new_ids)] = vectors[new_positions]
+                self._ids.extend(new_ids)
+                self._size += len(new_ids)
+                self._extend_ann(start, self._size)
+
+            return len(doc_ids)
+
+    def rows_for(self, doc_ids: Iterable[str]) -> np.ndarray:
+        """Map document ids to matrix rows (unknown ids are ignored)"""
+        rows = self._rows
+        return np.fromiter((rows[d] for d in doc_ids if d in rows), dtype=np.int64)
+
+    def search(self, query: np.ndarray, top_k: int,
+               candidate_rows: Optional[np.ndarray] = None) -> List[Tuple[str, float]]:
+        """
+        Top-k cosine similarity search
+
+        Args:
+            query: Query embedding
+            top_k: Number of results
+            candidate_rows: Restrict the search to these rows (pushed-down filters)
+
+        Returns:
+            List[Tuple[str, float]]: (doc_id, similarity) sorted by similarity
+        """
+        with self._lock:
+            if not self._size or top_k <= 0 or not self.accepts(query):
+                return []
+            q = self._normalize(np.asarray(query, dtype=np.float32)[None, :])[0]
+
+            if candidate_rows is not None:
+                candidate_rows = np.unique(candidate_rows)
+                if not len(candidate_rows):
+                    return []
+                if len(candidate_rows) <= self.exact_candidate_limit or not self._use_ann():
+                    return self._exact(q, top_k, candidate_rows)
+                mask = np.zeros(self._size, dtype=bool)
+                mask[candidate_rows] = True
+                hits = self._ann(q, top_k, mask)
+                if len(hits) >= min(top_k, len(candidate_rows)):
+                    return hits
+                # Filter too selective for the probed neighbourhood - score candidates exactly
+                return self._exact(q, top_k, candidate_rows)
+
+            if self._use_ann():
+                return self._ann(q, top_k, None)
+            return self._exact(q, top_k, None)
+
+    def stats(self) -> Dict[str, object]:
+        """Index statistics"""
+        return {
+            'vectors': self._size,
+            'dimension': self.dim,
+            'backend': self.backend,
+            'ann_active': self._use_ann(),
+            'memory_mb': round(self._matrix.nbytes / (1024 * 1024), 2)
+        }
+
+    # ------------------------------------------------------------------ internals
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32, copy=False)
+
+    def _reserve(self, size: int):
+        capacity = self._matrix.shape[0]
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2, 1024)
+        grown = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+
+    def _top_k(self, scores: np.ndarray, rows: Optional[np.ndarray], top_k: int) -> List[Tuple[str, float]]:
+        k = min(top_k, len(scores))
+        if k < len(scores):
+            part = np.argpartition(-scores, k - 1)[:k]
+        else:
+            part = np.arange(len(scores))
+        order = part[np.argsort(-scores[part], kind="stable")]
+        if rows is not None:
+            return [(self._ids[rows[i]], float(scores[i])) for i in order]
+        return [(self._ids[i], float(scores[i])) for i in order]
+
+    def _exact(self, q: np.ndarray, top_k: int, rows: Optional[np.ndarray]) -> List[Tuple[str, float]]:
+        if rows is None:
+            return self._top_k(self._matrix[:self._size] @ q, None, top_k)
+        return self._top_k(self._matrix[rows] @ q, rows, top_k)
+
+    def _use_ann(self) -> bool:
+        return self.backend != "exact" and self._size >= self.ann_threshold
+
+    def _ann(self, q: np.ndarray, top_k: int, mask: Optional[np.ndarray]) -> List[Tuple[str, float]]:
+        if self.backend == "hnsw":
+            return self._hnsw_search(q, top_k, mask)
+        return self._ivf_search(q, top_k, mask)
+
+    def _reset_ann(self):
+        self._hnsw = None
+        self._hnsw_size = 0
+        self._ivf_centroids = None
+        self._ivf_lists = []
+        self._ivf_trained_size = 0
+
+    def _extend_ann(self, start: int, end: int):
+        """Keep already-built approximate structures in sync with appended rows"""
+        if self._hnsw is not None:
+            if end > self._hnsw.get_max_elements():
+                self._hnsw.resize_index(max(end, 2 * self._hnsw.get_max_elements()))
+            self._hnsw.add_items(self._matrix[start:end], np.arange(start, end))
+            self._hnsw_size = end
+        if self._ivf_centroids is not None:
+            if end > 4 * self._ivf_trained_size:
+                # Data has outgrown the trained partition - retrain on next query
+                self._reset_ann()
+                return
+            assign = np.argmax(self._matrix[start:end] @ self._ivf_centroids.T, axis=1)
+            for row, list_id in zip(range(start, end), assign):
+                self._ivf_lists[list_id].append(row)
+
+    def _hnsw_search(self, q: np.ndarray, top_k: int, mask: Optional[np.ndarray]) -> List[Tuple[str, float]]:
+        if self._hnsw is None:
+            index = hnswlib.Index(space="ip", dim=self.dim)
+            index.init_index(max_elements=max(self._matrix.shape[0], self._size),
+                             ef_construction=self.hnsw_ef_construction, M=self.hnsw_m)
+            index.add_items(self._matrix[:self._size], np.arange(self._size))
+            self._hnsw = index
+            self._hnsw_size = self._size
+            logger.info(f"Built HNSW index over {self._size} vectors")
+
+        # Over-fetch when filtering so enough candidates survive the mask
+        fetch = top_k if mask is None else min(self._size, top_k * 8)
+        self._hnsw.set_ef(max(self.hnsw_ef_search, fetch))
+        labels, distances = self._hnsw.knn_query(q, k=min(fetch, self._hnsw_size))
+        hits = []
+        for label, distance in zip(labels[0], distances[0]):
+            if mask is not None and not mask[label]:
+                continue
+            hits.append((self._ids[label], float(1.0 - distance)))
+            if len(hits) == top_k:
+                break
+        return hits
+
+    def _train_ivf(self, iterations: int = 10, sample_size: int = 50_000):
+        n = self._size
+        nlist = int(np.clip(np.sqrt(n), 16, 4096))
+        rng = np.random.default_rng(0)
+        sample = self._matrix[rng.choice(n, size=min(n, sample_size), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=nlist)
+            empty = counts == 0
+            sums[empty] = centroids[empty]
+            centroids = self._normalize(sums)
+
+        # Assign all rows in chunks to bound the temporary score matrix
+        assign = np.empty(n, dtype=np.int64)
+        for start in range(0, n, 65_536):
+            stop = min(n, start + 65_536)
+            assign[start:stop] = np.argmax(self._matrix[start:stop] @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(nlist + 1))
+        self._ivf_lists = [order[bounds[i]:bounds[i + 1]].tolist() for i in range(nlist)]
+        self._ivf_centroids = centroids
+        self._ivf_trained_size = n
+        logger.info(f"Trained IVF index with {nlist} lists over {n} vectors")
+
+    def _ivf_search(self, q: np.ndarray, top_k: int, mask: Optional[np.ndarray]) -> List[Tuple[str, float]]:
+        if self._ivf_centroids is None:
+            self._train_ivf()
+        centroid_scores = self._ivf_centroids @ q
+        nprobe = min(self.ivf_nprobe, len(centroid_scores))
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        rows = np.concatenate([np.asarray(self._ivf_lists[i], dtype=np.int64) for i in probe])
+        if mask is not None:
+            rows = rows[mask[rows]]
+        if not len(rows):
+            return []
+        return self._exact(q, top_k, rows)
@@ -17,11 +17,27 @@ import random
 import time
 from datetime import datetime
 
+from tradingagents.core.scan_context import (
+    MACRO_SUMMARY_KEY,
+    ScanSharedContext,
+    activate_scan_context,
+)
 from tradingagents.utils.logging_manager import get_logger
 
 logger = get_logger('market_orchestrator')
 
 
+# 各市场在扫描开始时预取一次的市场级工具（Toolkit 方法名）
+MARKET_WIDE_TOOLS: Dict[str, List[str]] = {
+    'A股': ['get_china_market_overview', 'get_global_news_openai'],
+    '港股': ['get_global_news_openai'],
+    '美股': ['get_global_news_openai', 'get_reddit_news'],
+}
+
+# 宏观摘要中每个工具输出保留的最大字符数
+MACRO_SOURCE_MAX_CHARS = 3000
+
+
 @dataclass
 class OrchestratorConfig:
     market_type: str
@@ -66,6 +82,14 @@ class MarketScanOrchestrator:
                 logger.warning(f'TradingAgentsGraph 初始化失败，使用离线兜底: {e}')
                 ta_graph = None
 
+        # 扫描范围的共享上下文：市场级工具结果和宏观摘要只计算一次
+        scan_context = ScanSharedContext(scan_id=f"{cfg.market_type}-{int(start_ts)}")
+        trade_date = datetime.now().strftime('%Y-%m-%d')
+        macro_summary = ''
+        if ta_graph is not None:
+            self._emit('预取市场级数据', 10, 100)
+            macro_summary = self._prepare_shared_context(scan_context, cfg, trade_date, ta_graph)
+
         # 并发评估
         self._emit('开始并发评估', 12, 100)
         results: List[Dict[str, Any]] = []
@@ -77,29 +101,30 @@ class MarketScanOrchestrator:
         def _eval_symbol(sym: str) -> Dict[str, Any]:
             try:
                 if ta_graph is not None:
-                    # 选取一个近似日期；在真实实现可传当天/用户日期
-                    trade_date = datetime.now().strftime('%Y-%m-%d')
-                    # 如果启用多模型扩展，优先使用既有多模型调用方式
-                    use_multi = bool(llm_cfg.get('use_ensemble')) or (os.getenv('MULTI_MODEL_ENABLED', 'false').lower() == 'true')
-                    collab_mode = (llm_cfg.get('collaboration_mode') or os.getenv('DEFAULT_COLLABORATION_MODE') or 'sequential')
-                    selected_agents = llm_cfg.get('selected_agents')  # 可选
-                    if use_multi and getattr(ta_graph, 'multi_model_extension', None):
-                        result = ta_graph.analyze_with_collaboration(
-                            company_name=sym,
-                            trade_date=trade_date,
-                            collaboration_mode=collab_mode,
-                            selected_agents=selected_agents
-                        )
-                        return self._map_multi_model_result_to_row(sym, result)
-                    else:
-                        # 单模型既有调用
-                        _, decision = ta_graph.propagate(sym, trade_date)
-                        return self._map_decision_to_row(sym, decision)
+                    with activate_scan_context(scan_context):
+                        return _eval_symbol_with_graph(sym)
                 else:
                     return self._offline_eval(sym)
             except Exception as e:
                 return {'__error__': f'{e}', 'symbol': sym}
 
+        def _eval_symbol_with_graph(sym: str) -> Dict[str, Any]:
+            # 如果启用多模型扩展，优先使用既有多模型调用方式
+            use_multi = bool(llm_cfg.get('use_ensemble')) or (os.getenv('MULTI_MODEL_ENABLED', 'false').lower() == 'true')
+            collab_mode = (llm_cfg.get('collaboration_mode') or os.getenv('DEFAULT_COLLABORATION_MODE') or 'sequential')
+            selected_agents = llm_cfg.get('selected_agents')  # 可选
+            if use_multi and getattr(ta_graph, 'multi_model_extension', None):
+                result = ta_graph.analyze_with_collaboration(
+                    company_name=sym,
+                    trade_date=trade_date,
+                    collaboration_mode=collab_mode,
+                    selected_agents=selected_agents
+                )
+                return self._map_multi_model_result_to_row(sym, result)
+            # 单模型既有调用，注入本次扫描共享的宏观摘要
+            _, decision = ta_graph.propagate(sym, trade_date, market_context=macro_summary)
+            return self._map_decision_to_row(sym, decision)
+
         completed = 0
         total = len(symbols)
         with futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
@@ -129,6 +154,7 @@ class MarketScanOrchestrator:
             'actual_cost': round(min(cfg.budget_limit or 0.0, (len(rankings) * 0.002)), 4),
             'scan_duration': f'{duration_sec}秒',
             'errors': errors[:20],  # 限制数量
+            'shared_context': scan_context.get_stats(),
         }
 
         self._emit('完成', 100, 100)
@@ -148,6 +174,76 @@ class MarketScanOrchestrator:
         except Exception:
             pass
 
+    def _prepare_shared_context(
+        self,
+        scan_context: ScanSharedContext,
+        cfg: OrchestratorConfig,
+        trade_date: str,
+        ta_graph: Any,
+    ) -> str:
+        """预取市场级工具结果并生成宏观摘要（每次扫描一次），返回摘要文本"""
+        market = (cfg.market_type or '').strip()
+        tool_names = next(
+            (tools for key, tools in MARKET_WIDE_TOOLS.items() if key in market),
+            MARKET_WIDE_TOOLS['美股'],
+        )
+        toolkit = getattr(ta_graph, 'toolkit', None)
+        if toolkit is None:
+            return ''
+
+        outputs: Dict[str, str] = {}
+
+        def _fetch(name: str) -> None:
+            tool = getattr(toolkit, name, None)
+            if tool is None:
+                return
+            try:
+                # 在共享上下文中调用，结果按 (工具名, 参数) 缓存，后续各股票直接复用
+                with activate_scan_context(scan_context):
+                    result = tool.invoke({'curr_date': trade_date})
+                if result:
+                    outputs[name] = str(result)
+            except Exception as e:
+                logger.warning(f'市场级工具 {name} 预取失败: {e}')
+
+        with futures.ThreadPoolExecutor(max_workers=max(1, len(tool_names))) as ex:
+            list(ex.map(_fetch, tool_names))
+
+        if not outputs:
+            return ''
+
+        llm = getattr(ta_graph, 'quick_thinking_llm', None)
+        summary = scan_context.get_or_compute(
+            MACRO_SUMMARY_KEY,
+            lambda: self._summarize_market_inputs(market, trade_date, outputs, llm),
+        )
+        logger.info(f'扫描共享上下文就绪：预取 {len(outputs)} 个市场级工具，宏观摘要 {len(summary)} 字符')
+        return summary
+
+    def _summarize_market_inputs(
+        self,
+        market: str,
+        trade_date: str,
+        outputs: Dict[str, str],
+        llm: Any = None,
+    ) -> str:
+        sections = '\n\n'.join(
+            f'### {name}\n{text[:MACRO_SOURCE_MAX_CHARS]}' for name, text in outputs.items()
+        )
+        if llm is not None:
+            try:
+                prompt = (
+                    f'请将以下{market}市场级数据（{trade_date}）压缩为不超过300字的中文宏观摘要，'
+                    f'保留对个股有影响的关键事件、政策与指数走势：\n\n{sections}'
+                )
+                response = llm.invoke(prompt)
+                content = getattr(response, 'content', None) or str(response)
+                if content.strip():
+                    return content.strip()
+            except Exception as e:
+                logger.warning(f'宏观摘要生成失败，使用原始数据截断: {e}')
+        return sections
+
     def _analyze_llm_config(self, ai_cfg: Optional[Dict[str, Any]]) -> Tuple[bool, Dict[str, Any]]:
         ai_cfg = ai_cfg or {}
         # 允许显式禁用LLM
@@ -7,6 +7,8 @@ import os
 import json
 import time
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Dict, Any, List, Optional, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -43,6 +45,71 @@ class CollaborationResult:
     error_message: str = None
 
 
+class _AgentCancelToken:
+    """
+    并行协作中单个智能体的取消令牌
+
+    记录该智能体线程当前占用的信号量（调度名额、提供商并发名额）；
+    超时取消时由主线程立即释放这些名额，之后该线程不再获取新的名额。
+    started_at 为截止时间的起点：获得调度名额时开始计时，第一次拿到提供商
+    并发名额时重新计时（排队等待提供商名额的时间不计入该智能体的预算）。
+    等待提供商名额最多到整个协作的截止时间（queue_deadline），名额被并行协作
+    之外的调用长期占用时不会无限阻塞。
+    """
+
+    def __init__(self, queue_deadline: Optional[float] = None):
+        self._lock = threading.Lock()
+        self._held: List[threading.BoundedSemaphore] = []
+        self._provider_acquired = False
+        self.cancelled = False
+        self.started_at: Optional[float] = None
+        self.queue_deadline = queue_deadline
+
+    def start_clock(self):
+        self.started_at = time.monotonic()
+
+    def acquire(self, semaphore: threading.BoundedSemaphore, provider: bool = False) -> bool:
+        """获取名额；令牌已取消或等待提供商名额超时时返回False"""
+        first_provider = provider and not self._provider_acquired
+        if first_provider:
+            # 等待提供商名额期间暂停计时，但最多等到协作截止时间
+            admitted_at = self.started_at
+            self.started_at = None
+            timeout = None
+            if self.queue_deadline is not None:
+                timeout = max(0.0, self.queue_deadline - time.monotonic())
+            if not semaphore.acquire(timeout=timeout):
+                self.started_at = admitted_at
+                return False
+        else:
+            semaphore.acquire()
+        with self._lock:
+            if self.cancelled:
+                semaphore.release()
+                return False
+            self._held.append(semaphore)
+        if first_provider:
+            self._provider_acquired = True
+            self.start_clock()
+        return True
+
+    def release(self, semaphore: threading.BoundedSemaphore):
+        """归还名额（取消时已归还的不再重复释放）"""
+        with self._lock:
+            for i, held in enumerate(self._held):
+                if held is semaphore:
+                    del self._held[i]
+                    semaphore.release()
+                    return
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            for semaphore in self._held:
+                semaphore.release()
+            self._held.clear()
+
+
 @dataclass
 class SessionMetrics:
     """会话性能指标"""
@@ -79,6 +146,16 @@ class MultiModelManager:
         self.max_cost_per_session = config.get('max_cost_per_session', 1.0)
         self.max_concurrent_tasks = config.get('max_concurrent_tasks', 5)
         self.enable_caching = config.get('enable_caching', True)
+
+        # 并行协作：单个智能体的截止时间（秒）和各提供商的并发上限
+        self.parallel_agent_timeout = config.get('parallel_agent_timeout', 180)
+        self.provider_concurrency_limits: Dict[str, int] = config.get('provider_concurrency_limits', {})
+        self._provider_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._provider_semaphores_lock = threading.Lock()
+        # 并行任务会并发更新会话指标
+        self._session_lock = threading.Lock()
+        # 并行协作线程的取消令牌（线程局部）
+        self._agent_local = threading.local()
         
         # 策略与绑定（来自 multi_model_config.yaml 或上层传入）
         self.agent_bindings: Dict[str, Any] = config.get('agent_bindings', {})
@@ -731,37 +808,108 @@ class MultiModelManager:
                                       task_description: str,
                                       participating_agents: List[str],
                                       context: Dict[str, Any]) -> CollaborationResult:
-        """执行并行协作"""
-        individual_results = []
-        total_cost = 0.0
-        total_time = 0
+        """
+        执行并行协作
+
+        各智能体在独立线程中并发执行，同时运行的数量不超过 max_concurrent_tasks
+        （各提供商的并发数另受信号量限制）。每个智能体的截止时间从它真正开始运行时计算
+        （排队等待调度名额或提供商名额的时间不计入）；排队本身受整个协作的截止时间
+        collaboration_timeout 限制（默认 智能体数 × agent_timeout，足够所有智能体串行执行），
+        提供商名额被协作之外的调用占住时，排队中的智能体到期后同样记为超时；
+        超时的智能体被取消并记为失败，其占用的名额立即释放给排队中的智能体，
+        其余结果照常汇总。total_time 为真实的墙钟耗时（毫秒）。
+        """
+        individual_results: List[Optional[TaskResult]] = [None] * len(participating_agents)
         participating_models = []
-        
-        start_time = datetime.now()
-        
-        # 并行执行各个智能体的分析
-        for agent_role in participating_agents:
-            prompt = f"请作为{agent_role}从你的专业角度分析以下任务：\n{task_description}"
-            
-            result = self.execute_task(
-                agent_role=agent_role,
-                task_prompt=prompt,
-                task_type=self._get_agent_task_type(agent_role),
-                context=context
-            )
-            
-            individual_results.append(result)
-            total_cost += result.actual_cost
-            
+        timed_out_agents = []
+
+        start = time.monotonic()
+        agent_timeout = context.get('agent_timeout', self.parallel_agent_timeout)
+        admission = threading.BoundedSemaphore(max(1, min(len(participating_agents), self.max_concurrent_tasks)))
+        collaboration_deadline = start + context.get(
+            'collaboration_timeout', agent_timeout * max(1, len(participating_agents)))
+        tokens = [_AgentCancelToken(queue_deadline=collaboration_deadline) for _ in participating_agents]
+
+        def run_agent(index: int, agent_role: str) -> TaskResult:
+            token = tokens[index]
+            if not token.acquire(admission):
+                return self._failed_agent_result(agent_role, "已取消")
+            token.start_clock()
+            self._agent_local.cancel_token = token
+            try:
+                prompt = f"请作为{agent_role}从你的专业角度分析以下任务：\n{task_description}"
+                return self.execute_task(
+                    agent_role=agent_role,
+                    task_prompt=prompt,
+                    task_type=self._get_agent_task_type(agent_role),
+                    context=context
+                )
+            finally:
+                self._agent_local.cancel_token = None
+                token.release(admission)
+
+        # 每个智能体一个线程：超时线程无法强制结束，不能让它占住固定线程池的工位
+        executor = ThreadPoolExecutor(max_workers=max(1, len(participating_agents)),
+                                      thread_name_prefix="parallel-agent")
+        pending = {}
+        try:
+            # 并行执行各个智能体的分析
+            for index, agent_role in enumerate(participating_agents):
+                pending[executor.submit(run_agent, index, agent_role)] = index
+
+            while pending:
+                now = time.monotonic()
+                for future, index in list(pending.items()):
+                    started_at = tokens[index].started_at
+                    if future.done():
+                        continue
+                    expired = (now - started_at >= agent_timeout if started_at is not None
+                               else now >= collaboration_deadline)
+                    if expired:
+                        del pending[future]
+                        self._time_out_agent(index, participating_agents, tokens, individual_results,
+                                             timed_out_agents, agent_timeout)
+                if not pending:
+                    break
+
+                deadlines = []
+                for index in pending.values():
+                    started_at = tokens[index].started_at
+                    deadlines.append(collaboration_deadline if started_at is None
+                                     else started_at + agent_timeout)
+                # 排队中的智能体开始运行后需要重新计算截止时间，因此最多等待0.5秒
+                timeout = min([0.5] + [deadline - now for deadline in deadlines])
+                done, _ = wait(list(pending), timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        individual_results[index] = future.result()
+                    except Exception as e:
+                        individual_results[index] = self._failed_agent_result(
+                            participating_agents[index], f"执行异常: {e}"
+                        )
+        finally:
+            # 异常退出时取消尚未完成的智能体
+            for future, index in pending.items():
+                self._time_out_agent(index, participating_agents, tokens, individual_results,
+                                     timed_out_agents, agent_timeout)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if timed_out_agents:
+            logger.warning(f"并行协作中以下智能体超时: {timed_out_agents}")
+
+        for result in individual_results:
             if result.model_used:
                 participating_models.append(result.model_used.name)
-        
-        # 并行执行的总时间是最长的单个任务时间
-        total_time = max((result.execution_time for result in individual_results), default=0)
-        
-        # 生成最终结果汇总
-        final_result = self._synthesize_parallel_results(individual_results, task_description)
-        
+
+        total_cost = sum(result.actual_cost for result in individual_results)
+        # 真实墙钟耗时（毫秒），而不是单个任务耗时的最大值
+        total_time = int((time.monotonic() - start) * 1000)
+
+        # 生成最终结果汇总（只汇总成功的结果）
+        successful_results = [result for result in individual_results if result.success]
+        final_result = self._synthesize_parallel_results(successful_results, task_description)
+
         return CollaborationResult(
             final_result=final_result,
             participating_models=participating_models,
@@ -769,12 +917,38 @@ class MultiModelManager:
             collaboration_metadata={
                 "mode": "parallel",
                 "agents": len(participating_agents),
-                "session_id": context.get('session_id')
+                "session_id": context.get('session_id'),
+                "wall_clock_ms": total_time,
+                "sum_agent_time_ms": sum(result.execution_time for result in individual_results),
+                "timed_out_agents": timed_out_agents,
+                "failed_agents": [
+                    participating_agents[i] for i, result in enumerate(individual_results)
+                    if not result.success
+                ],
             },
             total_cost=total_cost,
             total_time=total_time,
             success=all(result.success for result in individual_results)
         )
+
+    def _time_out_agent(self, index: int, agents: List[str], tokens: List[_AgentCancelToken],
+                        results: List[Optional[TaskResult]], timed_out: List[str], agent_timeout: float):
+        """取消超时的智能体：释放其名额并记录失败占位结果"""
+        tokens[index].cancel()
+        timed_out.append(agents[index])
+        results[index] = self._failed_agent_result(agents[index], f"超过截止时间 {agent_timeout}秒")
+
+    def _failed_agent_result(self, agent_role: str, reason: str) -> TaskResult:
+        """并行协作中单个智能体失败/超时时的占位结果"""
+        return TaskResult(
+            result=f"{agent_role} 分析未完成：{reason}",
+            model_used=None,
+            execution_time=0,
+            actual_cost=0.0,
+            token_usage={},
+            success=False,
+            error_message=reason
+        )
     
     def _execute_debate_collaboration(self,
                                     task_description: str,
@@ -891,6 +1065,32 @@ class MultiModelManager:
             if model_name in client.get_supported_models():
                 return client
         return None
+
+    def _get_provider_key_for_model(self, model_name: str) -> Optional[str]:
+        """根据模型名称获取对应的提供商配置键（如 siliconflow、google_ai）"""
+        for provider_key, client in self.clients.items():
+            if model_name in client.get_supported_models():
+                return provider_key
+        return None
+
+    def _get_provider_semaphore(self, provider_key: str) -> threading.BoundedSemaphore:
+        """
+        获取提供商的并发信号量
+
+        上限优先取 provider_concurrency_limits[provider]，其次取该提供商配置中的
+        max_concurrency，默认 max_concurrent_tasks。
+        """
+        with self._provider_semaphores_lock:
+            semaphore = self._provider_semaphores.get(provider_key)
+            if semaphore is None:
+                provider_config = self.config.get(provider_key)
+                limit = self.provider_concurrency_limits.get(provider_key)
+                if limit is None and isinstance(provider_config, dict):
+                    limit = provider_config.get('max_concurrency')
+                limit = max(1, int(limit or self.max_concurrent_tasks))
+                semaphore = threading.BoundedSemaphore(limit)
+                self._provider_semaphores[provider_key] = semaphore
+            return semaphore
     
     def _get_default_model(self, available_models: Dict[str, ModelSpec], task_spec: TaskSpec) -> ModelSpec:
         """
@@ -1096,6 +1296,10 @@ class MultiModelManager:
     
     def _update_session_metrics(self, session_id: str, result: TaskResult, selection: ModelSelection) -> None:
         """更新会话指标"""
+        with self._session_lock:
+            self._update_session_metrics_locked(session_id, result, selection)
+
+    def _update_session_metrics_locked(self, session_id: str, result: TaskResult, selection: ModelSelection) -> None:
         if session_id not in self.active_sessions:
             self.active_sessions[session_id] = SessionMetrics(
                 session_id=session_id,
@@ -1232,12 +1436,33 @@ class MultiModelManager:
             )
         
         try:
-            return client.execute_task(
-                model_name=model_name,
-                prompt=task_prompt,
-                task_spec=task_spec,
-                **context.get('model_params', {})
-            )
+            # 按提供商限制并发请求数
+            provider_key = self._get_provider_key_for_model(model_name)
+            semaphore = self._get_provider_semaphore(provider_key or 'default')
+            token = getattr(self._agent_local, 'cancel_token', None)
+            if token is None:
+                with semaphore:
+                    return client.execute_task(
+                        model_name=model_name,
+                        prompt=task_prompt,
+                        task_spec=task_spec,
+                        **context.get('model_params', {})
+                    )
+
+            # 并行协作中的智能体：超时取消时名额由主线程提前释放
+            if not token.acquire(semaphore, provider=True):
+                if token.cancelled:
+                    raise RuntimeError("智能体已超时取消")
+                raise RuntimeError(f"等待提供商 {provider_key or 'default'} 并发名额超时")
+            try:
+                return client.execute_task(
+                    model_name=model_name,
+                    prompt=task_prompt,
+                    task_spec=task_spec,
+                    **context.get('model_params', {})
+                )
+            finally:
+                token.release(semaphore)
         except Exception as e:
             return TaskResult(
                 result=f"模型 {model_name} 执行失败: {str(e)}",
@@ -0,0 +1,254 @@
+"""
+Routing Performance Store
+智能路由的进程内模型性能统计与后台批量持久化：
+
+- ModelPerformanceStore: 按 (模型, 提供商, 任务类型) 维护 EWMA 延迟、成功率和成本，
+  路由决策直接读内存，不再每个候选模型查询一次数据库；
+- RoutingStatsWriter: 后台守护线程，把路由决策和性能快照攒批后用一个连接 executemany 写入，
+  同一批次内同一模型的性能快照只写最新一条。
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# 导入统一日志系统
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger('smart_routing_engine')
+
+PerformanceKey = Tuple[str, str, str]
+
+
+@dataclass
+class RollingPerformance:
+    """单个 (模型, 提供商, 任务类型) 的滚动性能统计"""
+    model_name: str
+    provider: str
+    task_type: str
+    avg_response_time: float
+    success_rate: float
+    avg_cost: float = 0.0
+    samples: int = 0
+    last_updated: str = ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'avg_response_time': self.avg_response_time,
+            'success_rate': self.success_rate,
+            'avg_cost': self.avg_cost,
+            'samples': self.samples,
+            'last_updated': self.last_updated,
+        }
+
+
+class ModelPerformanceStore:
+    """进程内模型性能统计（线程安全，EWMA更新）"""
+
+    def __init__(self, alpha: float = 0.3):
+        """
+        Args:
+            alpha: EWMA平滑系数，越大越偏向最新样本
+        """
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._entries: Dict[PerformanceKey, RollingPerformance] = {}
+        # (模型, 任务类型) -> 最近更新的条目，对应原先按 last_updated 倒序取第一条
+        self._latest: Dict[Tuple[str, str], RollingPerformance] = {}
+
+    def load(self, rows: List[Tuple]) -> int:
+        """
+        从数据库行重建内存统计
+
+        Args:
+            rows: (model_name, provider, task_type, avg_response_time, success_rate, avg_cost, last_updated)
+        """
+        with self._lock:
+            for model_name, provider, task_type, avg_time, success_rate, avg_cost, last_updated in rows:
+                entry = RollingPerformance(
+                    model_name=model_name,
+                    provider=provider,
+                    task_type=task_type,
+                    avg_response_time=float(avg_time),
+                    success_rate=float(success_rate),
+                    avg_cost=float(avg_cost or 0.0),
+                    samples=1,
+                    last_updated=last_updated or '',
+                )
+                self._entries[(model_name, provider, task_type)] = entry
+                latest = self._latest.get((model_name, task_type))
+                if latest is None or entry.last_updated >= latest.last_updated:
+                    self._latest[(model_name, task_type)] = entry
+            return len(rows)
+
+    def record(self, model_name: str, provider: str, task_type: str,
+               execution_time: float, success: bool, cost: float = None) -> RollingPerformance:
+        """记录一次执行结果，返回更新后的统计快照"""
+        success_value = 1.0 if success else 0.0
+        now = datetime.now().isoformat()
+        key = (model_name, provider, task_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = RollingPerformance(
+                    model_name=model_name,
+                    provider=provider,
+                    task_type=task_type,
+                    avg_response_time=float(execution_time),
+                    success_rate=success_value,
+                    avg_cost=float(cost or 0.0),
+                )
+                self._entries[key] = entry
+            else:
+                a = self.alpha
+                entry.avg_response_time = (1 - a) * entry.avg_response_time + a * execution_time
+                entry.success_rate = (1 - a) * entry.success_rate + a * success_value
+                if cost is not None:
+                    entry.avg_cost = (1 - a) * entry.avg_cost + a * cost
+            entry.samples += 1
+            entry.last_updated = now
+            self._latest[(model_name, task_type)] = entry
+            return RollingPerformance(**vars(entry))
+
+    def get(self, model_name: str, task_type: str) -> Optional[Dict[str, Any]]:
+        """获取模型在某任务类型上的最新统计"""
+        with self._lock:
+            entry = self._latest.get((model_name, task_type))
+            return entry.to_dict() if entry else None
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(entry.to_dict(), model_name=entry.model_name, provider=entry.provider,
+                         task_type=entry.task_type) for entry in self._entries.values()]
+
+
+class RoutingStatsWriter:
+    """路由统计的后台批量写入器"""
+
+    _STOP = object()
+
+    def __init__(self, database_path: str, flush_interval: float = 2.0, batch_size: int = 200):
+        """
+        Args:
+            database_path: SQLite数据库路径
+            flush_interval: 最长攒批时间（秒）
+            batch_size: 单批最大记录数，达到后立即写入
+        """
+        self.database_path = database_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._stats = {'decisions_written': 0, 'performance_written': 0, 'batches': 0, 'errors': 0}
+        self._thread = threading.Thread(target=self._run, name='routing-stats-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log_decision(self, row: Tuple) -> None:
+        """排队写入一条路由决策（参数顺序同 routing_decisions 插入语句）"""
+        if not self._closed:
+            self._queue.put(('decision', row))
+
+    def log_performance(self, entry: RollingPerformance) -> None:
+        """排队写入一条性能快照"""
+        if not self._closed:
+            self._queue.put(('performance', entry))
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """等待已排队的记录全部写入"""
+        if self._closed or not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(('flush', done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """写入剩余记录并停止后台线程"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self._stats, pending=self._queue.qsize())
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(self.database_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error:
+            pass
+
+        decisions: List[Tuple] = []
+        performance: Dict[PerformanceKey, RollingPerformance] = {}
+        waiters: List[threading.Event] = []
+        deadline = None
+        stopping = False
+
+        while not stopping:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                stopping = True
+            elif item is not None:
+                kind, payload = item
+                if kind == 'decision':
+                    decisions.append(payload)
+                elif kind == 'performance':
+                    performance[(payload.model_name, payload.provider, payload.task_type)] = payload
+                else:
+                    waiters.append(payload)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            pending = len(decisions) + len(performance)
+            due = deadline is not None and time.monotonic() >= deadline
+            if stopping or waiters or due or pending >= self.batch_size:
+                if pending:
+                    self._write_batch(conn, decisions, list(performance.values()))
+                decisions, performance = [], {}
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+                deadline = None
+
+        conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, decisions: List[Tuple],
+                     performance: List[RollingPerformance]) -> None:
+        try:
+            with conn:
+                if decisions:
+                    conn.executemany("""
+                        INSERT INTO routing_decisions
+                        (session_id, agent_role, task_type, selected_model, selected_provider,
+                         routing_reason, confidence_score, execution_time, cost_estimate)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, decisions)
+                if performance:
+                    conn.executemany("""
+                        INSERT INTO model_performance
+                        (model_name, provider, task_type, avg_response_time, success_rate, avg_cost, last_updated)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(model_name, provider, task_type) DO UPDATE SET
+                            avg_response_time = excluded.avg_response_time,
+                            success_rate = excluded.success_rate,
+                            avg_cost = excluded.avg_cost,
+                            last_updated = excluded.last_updated
+                    """, [(e.model_name, e.provider, e.task_type, e.avg_response_time,
+                           e.success_rate, e.avg_cost, e.last_updated) for e in performance])
+            self._stats['decisions_written'] += len(decisions)
+            self._stats['performance_written'] += len(performance)
+            self._stats['batches'] += 1
+        except Exception as e:
+            self._stats['errors'] += 1
+            logger.warning(f"路由统计批量写入失败（丢弃{len(decisions) + len(performance)}条）: {e}")
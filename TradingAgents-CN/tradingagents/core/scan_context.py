@@ -0,0 +1,116 @@
+"""
+Scan-scoped Shared Context
+市场扫描期间跨股票共享的上下文：
+
+- 市场级工具（全球宏观新闻、A股市场概览、Reddit全球新闻等）每次扫描只获取一次；
+- 请求合并（single-flight）：多个工作线程同时请求同一工具结果时，只有一个线程真正调用，
+  其余线程等待同一结果；
+- 宏观摘要每次扫描只生成一次，注入到每只股票的分析流程中。
+
+工具函数通过 shared_tool_call 接入：未激活扫描上下文时直接调用，行为与原来一致。
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('market_orchestrator')
+
+_ACTIVE_SCAN_CONTEXT: contextvars.ContextVar[Optional['ScanSharedContext']] = contextvars.ContextVar(
+    'active_scan_context', default=None
+)
+
+MACRO_SUMMARY_KEY = '__macro_summary__'
+
+
+class ScanSharedContext:
+    """一次市场扫描范围内的共享结果缓存（线程安全，带请求合并）"""
+
+    def __init__(self, scan_id: Optional[str] = None):
+        self.scan_id = scan_id
+        self._lock = threading.Lock()
+        self._results: Dict[Hashable, Future] = {}
+        self._stats = {'computed': 0, 'hits': 0, 'coalesced': 0, 'failed': 0}
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        获取共享结果；首次请求的线程负责计算，并发请求同一key的线程等待该次计算
+
+        计算失败时异常会传给所有等待者，且不缓存失败结果（下一次请求会重新计算）。
+        """
+        with self._lock:
+            future = self._results.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._results[key] = future
+            elif future.done():
+                self._stats['hits'] += 1
+            else:
+                self._stats['coalesced'] += 1
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._results.pop(key, None)
+                self._stats['failed'] += 1
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._stats['computed'] += 1
+        future.set_result(value)
+        return value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """返回已完成的共享结果，未计算或计算中返回None"""
+        with self._lock:
+            future = self._results.get(key)
+        if future is None or not future.done() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._results))
+
+
+def get_active_scan_context() -> Optional[ScanSharedContext]:
+    """当前线程/上下文中激活的扫描上下文"""
+    return _ACTIVE_SCAN_CONTEXT.get()
+
+
+@contextmanager
+def activate_scan_context(context: ScanSharedContext) -> Iterator[ScanSharedContext]:
+    """
+    在当前线程激活扫描上下文
+
+    LangGraph/LangChain 的内部线程池会复制 contextvars，因此图中工具节点也能看到该上下文。
+    """
+    token = _ACTIVE_SCAN_CONTEXT.set(context)
+    try:
+        yield context
+    finally:
+        _ACTIVE_SCAN_CONTEXT.reset(token)
+
+
+def shared_tool_call(tool_name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    调用市场级工具：扫描期间按 (工具名, 参数) 共享结果并合并并发请求，否则直接调用
+    """
+    context = get_active_scan_context()
+    if context is None:
+        return fn(*args, **kwargs)
+
+    key = (tool_name, args, tuple(sorted(kwargs.items())))
+    return context.get_or_compute(key, lambda: fn(*args, **kwargs))
@@ -14,6 +14,7 @@ from pathlib import Path
 from .base_multi_model_adapter import (
     ModelSpec, TaskSpec, ModelSelection, TaskComplexity, ModelProvider
 )
+from .routing_performance_store import ModelPerformanceStore, RoutingStatsWriter
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
@@ -187,6 +188,19 @@ class SmartRoutingEngine:
         # 初始化数据库表结构（如果需要）
         self._initialize_database_tables()
         
+        # 进程内性能统计：路由时直接读内存，启动时从数据库恢复
+        self.performance_store = ModelPerformanceStore(alpha=self.config.get('performance_ewma_alpha', 0.3))
+        self._rehydrate_performance_store()
+        
+        # 后台批量写入路由决策和性能快照（内存数据库无法跨连接共享，不做持久化）
+        self.stats_writer = None
+        if self.database_path != ":memory:" and self.config.get('async_stats_writer', True):
+            self.stats_writer = RoutingStatsWriter(
+                self.database_path,
+                flush_interval=self.config.get('stats_flush_interval', 2.0),
+                batch_size=self.config.get('stats_batch_size', 200)
+            )
+        
         # 验证路由引擎可用性
         usability_status = self._validate_engine_usability()
         if usability_status['usable']:
@@ -804,29 +818,25 @@ class SmartRoutingEngine:
         return max(0.0, min(total_score, 1.0))
     
     def _get_historical_performance(self, model_name: str, task_type: str) -> Optional[Dict[str, float]]:
-        """获取模型历史性能数据"""
+        """获取模型历史性能数据（读取进程内统计）"""
+        return self.performance_store.get(model_name, task_type)
+    
+    def _rehydrate_performance_store(self) -> None:
+        """从数据库恢复进程内性能统计"""
+        if self.database_path == ":memory:":
+            return
         try:
             with sqlite3.connect(self.database_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT avg_response_time, success_rate, last_updated
+                rows = conn.execute("""
+                    SELECT model_name, provider, task_type, avg_response_time, success_rate,
+                           avg_cost, last_updated
                     FROM model_performance
-                    WHERE model_name = ? AND task_type = ?
-                    ORDER BY last_updated DESC
-                    LIMIT 1
-                """, (model_name, task_type))
-                
-                result = cursor.fetchone()
-                if result:
-                    return {
-                        'avg_response_time': result[0],
-                        'success_rate': result[1],
-                        'last_updated': result[2]
-                    }
+                """).fetchall()
+            loaded = self.performance_store.load(rows)
+            if loaded:
+                logger.debug(f"已从数据库恢复{loaded}条模型性能统计")
         except Exception as e:
-            logger.warning(f"获取历史性能数据失败: {e}")
-        
-        return None
+            logger.warning(f"恢复模型性能统计失败（从空统计开始）: {e}")
     
     def _generate_routing_reasoning(self,
                                   selected_model: str,
@@ -909,6 +919,7 @@ class SmartRoutingEngine:
                         success_rate REAL NOT NULL,
                         cost_efficiency REAL DEFAULT 1.0,
                         quality_score REAL DEFAULT 1.0,
+                        avg_cost REAL DEFAULT 0.0,
                         last_updated TEXT NOT NULL,
                         created_at TEXT DEFAULT (datetime('now')),
                         UNIQUE(model_name, provider, task_type)
@@ -932,6 +943,11 @@ class SmartRoutingEngine:
                     )
                 """)
                 
+                # 旧版本的模型性能表没有 avg_cost 列
+                columns = {row[1] for row in cursor.execute("PRAGMA table_info(model_performance)")}
+                if 'avg_cost' not in columns:
+                    cursor.execute("ALTER TABLE model_performance ADD COLUMN avg_cost REAL DEFAULT 0.0")
+                
                 conn.commit()
                 logger.debug("数据库表结构初始化完成")
                 
@@ -1005,29 +1021,20 @@ class SmartRoutingEngine:
                             agent_role: str,
                             task_spec: TaskSpec,
                             context: Dict[str, Any]) -> None:
-        """记录路由决策到数据库"""
-        try:
-            with sqlite3.connect(self.database_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO routing_decisions 
-                    (session_id, agent_role, task_type, selected_model, selected_provider,
-                     routing_reason, confidence_score, execution_time, cost_estimate)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    context.get('session_id', 'unknown'),
-                    agent_role,
-                    task_spec.task_type,
-                    decision.selected_model,
-                    decision.provider,
-                    decision.reasoning,
-                    decision.confidence_score,
-                    decision.estimated_time,
-                    decision.estimated_cost
-                ))
-                conn.commit()
-        except Exception as e:
-            logger.warning(f"路由决策记录失败: {e}")
+        """记录路由决策（由后台写入器批量写入数据库）"""
+        if self.stats_writer is None:
+            return
+        self.stats_writer.log_decision((
+            context.get('session_id', 'unknown'),
+            agent_role,
+            task_spec.task_type,
+            decision.selected_model,
+            decision.provider,
+            decision.reasoning,
+            decision.confidence_score,
+            decision.estimated_time,
+            decision.estimated_cost
+        ))
     
     def reset_diversity_tracker(self) -> None:
         """重置多样化跟踪器"""
@@ -1053,50 +1060,31 @@ class SmartRoutingEngine:
                                execution_time: int,
                                success: bool,
                                cost: float = None) -> None:
-        """更新模型性能数据"""
+        """更新模型性能数据（内存EWMA统计立即生效，数据库异步批量写入）"""
         try:
-            with sqlite3.connect(self.database_path) as conn:
-                cursor = conn.cursor()
-                
-                # 获取现有数据
-                cursor.execute("""
-                    SELECT avg_response_time, success_rate, last_updated
-                    FROM model_performance
-                    WHERE model_name = ? AND provider = ? AND task_type = ?
-                """, (model_name, provider, task_type))
-                
-                existing = cursor.fetchone()
-                
-                if existing:
-                    # 更新现有记录
-                    old_time, old_success_rate, _ = existing
-                    # 简单的移动平均
-                    new_avg_time = (old_time + execution_time) / 2
-                    new_success_rate = (old_success_rate + (1.0 if success else 0.0)) / 2
-                    
-                    cursor.execute("""
-                        UPDATE model_performance 
-                        SET avg_response_time = ?, success_rate = ?, last_updated = ?
-                        WHERE model_name = ? AND provider = ? AND task_type = ?
-                    """, (new_avg_time, new_success_rate, datetime.now().isoformat(),
-                          model_name, provider, task_type))
-                else:
-                    # 插入新记录
-                    cursor.execute("""
-                        INSERT INTO model_performance 
-                        (model_name, provider, task_type, avg_response_time, success_rate, last_updated)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (model_name, provider, task_type, execution_time,
-                          1.0 if success else 0.0, datetime.now().isoformat()))
-                
-                conn.commit()
-                
+            entry = self.performance_store.record(model_name, provider, task_type,
+                                                  execution_time, success, cost)
+            if self.stats_writer is not None:
+                self.stats_writer.log_performance(entry)
         except Exception as e:
             logger.warning(f"性能数据更新失败: {e}")
     
+    def flush_statistics(self, timeout: float = 10.0) -> bool:
+        """等待排队中的路由统计写入数据库"""
+        if self.stats_writer is None:
+            return True
+        return self.stats_writer.flush(timeout)
+    
+    def close(self) -> None:
+        """写入剩余统计并停止后台写入线程"""
+        if self.stats_writer is not None:
+            self.stats_writer.close()
+    
     def get_routing_statistics(self, time_window_hours: int = 24) -> Dict[str, Any]:
         """获取路由统计信息"""
         try:
+            # 先落盘排队中的决策，保证统计包含最近的路由
+            self.flush_statistics()
             with sqlite3.connect(self.database_path) as conn:
                 cursor = conn.cursor()
                 
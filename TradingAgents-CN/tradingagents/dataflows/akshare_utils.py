@@ -14,11 +14,14 @@ from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
 warnings.filterwarnings('ignore')
 
+from .rate_limiter import get_rate_limiter
+
 class AKShareProvider:
     """AKShare数据提供器"""
 
     def __init__(self):
         """初始化AKShare提供器"""
+        self.rate_limiter = get_rate_limiter()  # 与其他实例/线程共享AKShare限额
         try:
             import akshare as ak
             self.ak = ak
@@ -66,6 +69,10 @@ class AKShareProvider:
             logger.error(f"⚠️ AKShare超时配置失败: {e}")
             logger.info(f"🔧 使用默认超时设置")
     
+    def _wait_for_rate_limit(self):
+        """等待AKShare限流许可"""
+        self.rate_limiter.acquire('akshare')
+
     def get_stock_data(self, symbol: str, start_date: str = None, end_date: str = None) -> Optional[pd.DataFrame]:
         """获取股票历史数据"""
         if not self.connected:
@@ -79,6 +86,7 @@ class AKShareProvider:
                 symbol = symbol.replace('.SZ', '').replace('.SS', '')
             
             # 获取数据
+            self._wait_for_rate_limit()
             data = self.ak.stock_zh_a_hist(
                 symbol=symbol,
                 period="daily",
@@ -100,6 +108,7 @@ class AKShareProvider:
         
         try:
             # 获取股票基本信息
+            self._wait_for_rate_limit()
             stock_list = self.ak.stock_info_a_code_name()
             stock_info = stock_list[stock_list['code'] == symbol]
             
@@ -150,6 +159,7 @@ class AKShareProvider:
 
             def fetch_hist_data():
                 try:
+                    self._wait_for_rate_limit()
                     result[0] = self.ak.stock_hk_hist(
                         symbol=hk_symbol,
                         period="daily",
@@ -244,6 +254,7 @@ class AKShareProvider:
 
             def fetch_data():
                 try:
+                    self._wait_for_rate_limit()
                     result[0] = self.ak.stock_hk_spot_em()
                 except Exception as e:
                     exception[0] = e
@@ -347,6 +358,7 @@ class AKShareProvider:
             # 1. 优先获取主要财务指标
             try:
                 logger.debug(f"📊 尝试获取{symbol}主要财务指标...")
+                self._wait_for_rate_limit()
                 main_indicators = self.ak.stock_financial_abstract(symbol=symbol)
                 if main_indicators is not None and not main_indicators.empty:
                     financial_data['main_indicators'] = main_indicators
@@ -360,6 +372,7 @@ class AKShareProvider:
             # 2. 尝试获取资产负债表（可能失败，降级为debug日志）
             try:
                 logger.debug(f"📊 尝试获取{symbol}资产负债表...")
+                self._wait_for_rate_limit()
                 balance_sheet = self.ak.stock_balance_sheet_by_report_em(symbol=symbol)
                 if balance_sheet is not None and not balance_sheet.empty:
                     financial_data['balance_sheet'] = balance_sheet
@@ -372,6 +385,7 @@ class AKShareProvider:
             # 3. 尝试获取利润表（可能失败，降级为debug日志）
             try:
                 logger.debug(f"📊 尝试获取{symbol}利润表...")
+                self._wait_for_rate_limit()
                 income_statement = self.ak.stock_profit_sheet_by_report_em(symbol=symbol)
                 if income_statement is not None and not income_statement.empty:
                     financial_data['income_statement'] = income_statement
@@ -384,6 +398,7 @@ class AKShareProvider:
             # 4. 尝试获取现金流量表（可能失败，降级为debug日志）
             try:
                 logger.debug(f"📊 尝试获取{symbol}现金流量表...")
+                self._wait_for_rate_limit()
                 cash_flow = self.ak.stock_cash_flow_sheet_by_report_em(symbol=symbol)
                 if cash_flow is not None and not cash_flow.empty:
                     financial_data['cash_flow'] = cash_flow
@@ -572,6 +587,7 @@ def get_stock_news_em(symbol: str) -> pd.DataFrame:
         def fetch_news():
             try:
                 logger.debug(f"[东方财富新闻] 线程开始执行 stock_news_em API调用: {symbol}")
+                provider._wait_for_rate_limit()
                 thread_start = time.time()
                 result[0] = provider.ak.stock_news_em(symbol=symbol)
                 thread_end = time.time()
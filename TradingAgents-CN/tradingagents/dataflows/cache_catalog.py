@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+缓存元数据目录
+使用单个嵌入式SQLite表替代逐键的 *_meta.json 元数据文件，
+按 (symbol, data_type, market_type, data_source, cached_at) 建立索引，
+精确匹配、部分匹配和日期区间覆盖查询均走索引，无需扫描目录。
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+
+# 独立成列的元数据字段，其余字段保存在 metadata JSON 中
+_INDEXED_FIELDS = (
+    'symbol', 'data_type', 'market_type', 'data_source',
+    'start_date', 'end_date', 'file_path', 'file_format', 'cached_at',
+)
+
+
+class CacheCatalog:
+    """基于SQLite的缓存元数据目录"""
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        初始化元数据目录
+
+        Args:
+            db_path: SQLite数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_schema()
+
+    def _init_schema(self):
+        """创建表和索引"""
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    cache_key TEXT PRIMARY KEY,
+                    symbol TEXT,
+                    data_type TEXT,
+                    market_type TEXT,
+                    data_source TEXT,
+                    start_date TEXT,
+                    end_date TEXT,
+                    file_path TEXT,
+                    file_format TEXT,
+                    cached_at TEXT,
+                    metadata TEXT
+                )
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cache_lookup
+                ON cache_entries (symbol, data_type, market_type, data_source, cached_at)
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cache_range
+                ON cache_entries (symbol, data_type, start_date, end_date)
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cache_age
+                ON cache_entries (cached_at)
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS series_ranges (
+                    series_key TEXT,
+                    start_date TEXT,
+                    end_date TEXT,
+                    PRIMARY KEY (series_key, start_date)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS catalog_info (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+
+    @staticmethod
+    def _row_to_metadata(row: sqlite3.Row) -> Dict[str, Any]:
+        metadata = json.loads(row['metadata']) if row['metadata'] else {}
+        for field in _INDEXED_FIELDS:
+            metadata[field] = row[field]
+        metadata['cache_key'] = row['cache_key']
+        return metadata
+
+    def put(self, cache_key: str, metadata: Dict[str, Any]):
+        """写入或覆盖一条元数据"""
+        values = [metadata.get(field) for field in _INDEXED_FIELDS]
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO cache_entries
+                (cache_key, symbol, data_type, market_type, data_source,
+                 start_date, end_date, file_path, file_format, cached_at, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [cache_key, *values, json.dumps(metadata, ensure_ascii=False)],
+            )
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """按缓存键读取元数据"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM cache_entries WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return self._row_to_metadata(row) if row else None
+
+    def delete(self, cache_key: str):
+        """删除一条元数据"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache_entries WHERE cache_key = ?", (cache_key,))
+
+    def find(self, symbol: str = None, data_type: str = None, market_type: str = None,
+             data_source: str = None, newer_than: str = None, older_than: str = None,
+             limit: int = None) -> List[Dict[str, Any]]:
+        """
+        按条件查找元数据，结果按缓存时间从新到旧排列
+
+        Args:
+            symbol: 股票代码
+            data_type: 数据类型
+            market_type: 市场类型
+            data_source: 数据源，None表示不限
+            newer_than: 只返回 cached_at 不早于该ISO时间的记录
+            older_than: 只返回 cached_at 早于该ISO时间的记录
+            limit: 最多返回条数
+        """
+        clauses, params = [], []
+        for column, value in (('symbol', symbol), ('data_type', data_type),
+                              ('market_type', market_type), ('data_source', data_source)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if newer_than is not None:
+            clauses.append("cached_at >= ?")
+            params.append(newer_than)
+        if older_than is not None:
+            clauses.append("cached_at < ?")
+            params.append(older_than)
+
+        sql = "SELECT * FROM cache_entries"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY cached_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_metadata(row) for row in rows]
+
+    def find_covering(self, symbol: str, data_type: str, start_date: str, end_date: str,
+                      market_type: str = None, data_source: str = None,
+                      newer_than: str = None) -> Optional[Dict[str, Any]]:
+        """查找日期区间完整覆盖 [start_date, end_date] 的最新一条记录"""
+        clauses = ["symbol = ?", "data_type = ?", "start_date <= ?", "end_date >= ?"]
+        params: List[Any] = [symbol, data_type, start_date, end_date]
+        if market_type is not None:
+            clauses.append("market_type = ?")
+            params.append(market_type)
+        if data_source is not None:
+            clauses.append("data_source = ?")
+            params.append(data_source)
+        if newer_than is not None:
+            clauses.append("cached_at >= ?")
+            params.append(newer_than)
+
+        sql = ("SELECT * FROM cache_entries WHERE " + " AND ".join(clauses)
+               + " ORDER BY cached_at DESC LIMIT 1")
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return self._row_to_metadata(row) if row else None
+
+    def get_ranges(self, series_key: str) -> List[Tuple[str, str]]:
+        """读取某条时间序列已覆盖的日期区间（按开始日期排序）"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start_date, end_date FROM series_ranges WHERE series_key = ? ORDER BY start_date",
+                (series_key,),
+            ).fetchall()
+        return [(row['start_date'], row['end_date']) for row in rows]
+
+    def set_ranges(self, series_key: str, ranges: List[Tuple[str, str]]):
+        """整体替换某条时间序列的已覆盖区间"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM series_ranges WHERE series_key = ?", (series_key,))
+            self._conn.executemany(
+                "INSERT INTO series_ranges (series_key, start_date, end_date) VALUES (?, ?, ?)",
+                [(series_key, start, end) for start, end in ranges],
+            )
+
+    def get_info(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM catalog_info WHERE key = ?", (key,)
+            ).fetchone()
+        return row['value'] if row else None
+
+    def set_info(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO catalog_info (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def migrate_json_metadata(self, metadata_dir: Union[str, Path]) -> int:
+        """
+        一次性导入旧的 *_meta.json 元数据文件
+
+        Returns:
+            int: 导入的记录数（已迁移过则为0）
+        """
+        if self.get_info('json_metadata_migrated'):
+            return 0
+
+        migrated = 0
+        for metadata_file in Path(metadata_dir).glob("*_meta.json"):
+            try:
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                cache_key = metadata_file.name[:-len("_meta.json")]
+                if self.get(cache_key) is None:
+                    self.put(cache_key, metadata)
+                    migrated += 1
+            except Exception as e:
+                logger.warning(f"⚠️ 迁移元数据失败 {metadata_file.name}: {e}")
+
+        self.set_info('json_metadata_migrated', '1')
+        if migrated:
+            logger.info(f"📦 已将 {migrated} 个JSON元数据文件迁移到缓存目录数据库")
+        return migrated
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -13,6 +13,9 @@ from pathlib import Path
 from typing import Optional, Dict, Any, Union
 import hashlib
 
+from .cache_catalog import CacheCatalog
+from .frame_storage import get_frame_storage, get_storage_for_path, load_frame
+
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
@@ -51,6 +54,13 @@ class StockDataCache:
                         self.china_fundamentals_dir, self.metadata_dir]:
             dir_path.mkdir(exist_ok=True)
 
+        # DataFrame存储后端（parquet/feather/csv，见 TRADINGAGENTS_CACHE_FORMAT）
+        self.frame_storage = get_frame_storage()
+
+        # 元数据目录（SQLite索引），首次启动时迁移旧的JSON元数据文件
+        self.catalog = CacheCatalog(self.metadata_dir / "cache_catalog.db")
+        self.catalog.migrate_json_metadata(self.metadata_dir)
+
         # 缓存配置 - 针对不同市场设置不同的TTL
         self.cache_config = {
             'us_stock_data': {
@@ -132,34 +142,30 @@ class StockDataCache:
 
         return base_dir / f"{cache_key}.{file_format}"
     
-    def _get_metadata_path(self, cache_key: str) -> Path:
-        """获取元数据文件路径"""
-        return self.metadata_dir / f"{cache_key}_meta.json"
-    
     def _save_metadata(self, cache_key: str, metadata: Dict[str, Any]):
         """保存元数据"""
-        metadata_path = self._get_metadata_path(cache_key)
         metadata['cached_at'] = datetime.now().isoformat()
-        
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        self.catalog.put(cache_key, metadata)
     
     def _load_metadata(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """加载元数据"""
-        metadata_path = self._get_metadata_path(cache_key)
-        if not metadata_path.exists():
-            return None
-        
         try:
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self.catalog.get(cache_key)
         except Exception as e:
             logger.error(f"⚠️ 加载元数据失败: {e}")
             return None
+
+    def find_metadata(self, symbol: str = None, data_type: str = None,
+                      market_type: str = None, data_source: str = None) -> list:
+        """按条件查找缓存元数据（按缓存时间从新到旧）"""
+        return self.catalog.find(symbol=symbol, data_type=data_type,
+                                 market_type=market_type, data_source=data_source)
     
-    def is_cache_valid(self, cache_key: str, max_age_hours: int = None, symbol: str = None, data_type: str = None) -> bool:
+    def is_cache_valid(self, cache_key: str, max_age_hours: int = None, symbol: str = None,
+                       data_type: str = None, metadata: Dict[str, Any] = None) -> bool:
         """检查缓存是否有效 - 支持智能TTL配置"""
-        metadata = self._load_metadata(cache_key)
+        if metadata is None:
+            metadata = self._load_metadata(cache_key)
         if not metadata:
             return False
 
@@ -215,9 +221,15 @@ class StockDataCache:
 
         # 保存数据
         if isinstance(data, pd.DataFrame):
-            cache_path = self._get_cache_path("stock_data", cache_key, "csv", symbol)
-            data.to_csv(cache_path, index=True)
+            cache_path = self.frame_storage.save(
+                data,
+                self._get_cache_path("stock_data", cache_key, self.frame_storage.format_name, symbol),
+                index=True
+            )
+            # 列类型无法转换为Arrow时后端会回退为CSV，按实际写入的文件记录格式
+            file_format = get_storage_for_path(cache_path).format_name
         else:
+            file_format = 'txt'
             cache_path = self._get_cache_path("stock_data", cache_key, "txt", symbol)
             with open(cache_path, 'w', encoding='utf-8') as f:
                 f.write(str(data))
@@ -231,7 +243,7 @@ class StockDataCache:
             'end_date': end_date,
             'data_source': data_source,
             'file_path': str(cache_path),
-            'file_format': 'csv' if isinstance(data, pd.DataFrame) else 'txt'
+            'file_format': file_format
         }
         self._save_metadata(cache_key, metadata)
 
@@ -241,8 +253,14 @@ class StockDataCache:
         logger.info(f"💾 {desc}已缓存: {symbol} ({data_source}) -> {cache_key}")
         return cache_key
     
-    def load_stock_data(self, cache_key: str) -> Optional[Union[pd.DataFrame, str]]:
-        """从缓存加载股票数据"""
+    def load_stock_data(self, cache_key: str, columns: list = None) -> Optional[Union[pd.DataFrame, str]]:
+        """
+        从缓存加载股票数据
+
+        Args:
+            cache_key: 缓存键
+            columns: 只读取指定列（仅DataFrame缓存有效），如 ["Close"]
+        """
         metadata = self._load_metadata(cache_key)
         if not metadata:
             return None
@@ -252,8 +270,8 @@ class StockDataCache:
             return None
         
         try:
-            if metadata['file_format'] == 'csv':
-                return pd.read_csv(cache_path, index_col=0)
+            if metadata['file_format'] in ('csv', 'parquet', 'feather'):
+                return load_frame(cache_path, columns=columns, index=True)
             else:
                 with open(cache_path, 'r', encoding='utf-8') as f:
                     return f.read()
@@ -261,6 +279,47 @@ class StockDataCache:
             logger.error(f"⚠️ 加载缓存数据失败: {e}")
             return None
     
+    def convert_cached_frames(self, format_name: str = None, remove_csv: bool = True) -> int:
+        """
+        将已有的CSV股票数据缓存转换为当前的二进制存储格式
+
+        Args:
+            format_name: 目标格式（parquet | feather），None时使用当前配置
+            remove_csv: 转换后是否删除原CSV文件
+
+        Returns:
+            int: 转换的缓存条目数
+        """
+        storage = get_frame_storage(format_name) if format_name else self.frame_storage
+        if storage.format_name == 'csv':
+            return 0
+
+        converted = 0
+        for metadata in self.catalog.find(data_type='stock_data'):
+            if metadata.get('file_format') != 'csv':
+                continue
+            csv_path = Path(metadata['file_path'])
+            if not csv_path.exists():
+                continue
+            try:
+                data = pd.read_csv(csv_path, index_col=0)
+                if not storage.accepts(data, index=True):
+                    # 不能调用 save：其CSV回退会覆盖源文件
+                    logger.warning(f"⚠️ 列类型无法转换为{storage.format_name}，保留CSV缓存: {csv_path.name}")
+                    continue
+                new_path = storage.save(data, csv_path, index=True)
+                metadata.update(file_path=str(new_path), file_format=storage.format_name)
+                # 保留原缓存时间，不走 _save_metadata
+                self.catalog.put(metadata.pop('cache_key'), metadata)
+                if remove_csv:
+                    csv_path.unlink()
+                converted += 1
+            except Exception as e:
+                logger.error(f"❌ 转换缓存文件失败 {csv_path.name}: {e}")
+
+        logger.info(f"📦 已将 {converted} 个CSV股票数据缓存转换为{storage.format_name}")
+        return converted
+    
     def find_cached_stock_data(self, symbol: str, start_date: str = None,
                               end_date: str = None, data_source: str = None,
                               max_age_hours: int = None) -> Optional[str]:
@@ -291,32 +350,35 @@ class StockDataCache:
                                             source=data_source,
                                             market=market_type)
 
+        desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
+
         # 检查精确匹配
         if self.is_cache_valid(search_key, max_age_hours, symbol, 'stock_data'):
-            desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
             logger.info(f"🎯 找到精确匹配的{desc}: {symbol} -> {search_key}")
             return search_key
 
+        newer_than = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
+
+        # 查找日期区间完整覆盖请求范围的缓存
+        if start_date and end_date:
+            metadata = self.catalog.find_covering(symbol, 'stock_data', start_date, end_date,
+                                                  market_type=market_type,
+                                                  data_source=data_source,
+                                                  newer_than=newer_than)
+            if metadata and self.is_cache_valid(metadata['cache_key'], max_age_hours, symbol,
+                                                'stock_data', metadata=metadata):
+                logger.info(f"📐 找到区间覆盖的{desc}: {symbol} -> {metadata['cache_key']}")
+                return metadata['cache_key']
+
         # 如果没有精确匹配，查找部分匹配（相同股票代码的其他缓存）
-        for metadata_file in self.metadata_dir.glob(f"*_meta.json"):
-            try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-
-                if (metadata.get('symbol') == symbol and
-                    metadata.get('data_type') == 'stock_data' and
-                    metadata.get('market_type') == market_type and
-                    (data_source is None or metadata.get('data_source') == data_source)):
-
-                    cache_key = metadata_file.stem.replace('_meta', '')
-                    if self.is_cache_valid(cache_key, max_age_hours, symbol, 'stock_data'):
-                        desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
-                        logger.info(f"📋 找到部分匹配的{desc}: {symbol} -> {cache_key}")
-                        return cache_key
-            except Exception:
-                continue
+        for metadata in self.catalog.find(symbol=symbol, data_type='stock_data',
+                                          market_type=market_type, data_source=data_source,
+                                          newer_than=newer_than, limit=1):
+            if self.is_cache_valid(metadata['cache_key'], max_age_hours, symbol,
+                                   'stock_data', metadata=metadata):
+                logger.info(f"📋 找到部分匹配的{desc}: {symbol} -> {metadata['cache_key']}")
+                return metadata['cache_key']
 
-        desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
         logger.error(f"❌ 未找到有效的{desc}缓存: {symbol}")
         return None
     
@@ -411,24 +473,16 @@ class StockDataCache:
             cache_type = f"{market_type}_fundamentals"
             max_age_hours = self.cache_config.get(cache_type, {}).get('ttl_hours', 24)
         
-        # 查找匹配的缓存
-        for metadata_file in self.metadata_dir.glob(f"*_meta.json"):
-            try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
-                if (metadata.get('symbol') == symbol and
-                    metadata.get('data_type') == 'fundamentals' and
-                    metadata.get('market_type') == market_type and
-                    (data_source is None or metadata.get('data_source') == data_source)):
-                    
-                    cache_key = metadata_file.stem.replace('_meta', '')
-                    if self.is_cache_valid(cache_key, max_age_hours, symbol, 'fundamentals'):
-                        desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
-                        logger.info(f"🎯 找到匹配的{desc}缓存: {symbol} ({data_source}) -> {cache_key}")
-                        return cache_key
-            except Exception:
-                continue
+        # 查找匹配的缓存（索引查询，只取TTL内最新的一条）
+        newer_than = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
+        for metadata in self.catalog.find(symbol=symbol, data_type='fundamentals',
+                                          market_type=market_type, data_source=data_source,
+                                          newer_than=newer_than, limit=1):
+            cache_key = metadata['cache_key']
+            if self.is_cache_valid(cache_key, max_age_hours, symbol, 'fundamentals', metadata=metadata):
+                desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
+                logger.info(f"🎯 找到匹配的{desc}缓存: {symbol} ({data_source}) -> {cache_key}")
+                return cache_key
         
         desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
         logger.error(f"❌ 未找到有效的{desc}缓存: {symbol} ({data_source})")
@@ -439,22 +493,17 @@ class StockDataCache:
         cutoff_time = datetime.now() - timedelta(days=max_age_days)
         cleared_count = 0
         
-        for metadata_file in self.metadata_dir.glob("*_meta.json"):
+        for metadata in self.catalog.find(older_than=cutoff_time.isoformat()):
             try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
-                cached_at = datetime.fromisoformat(metadata['cached_at'])
-                if cached_at < cutoff_time:
-                    # 删除数据文件
-                    data_file = Path(metadata['file_path'])
-                    if data_file.exists():
-                        data_file.unlink()
-                    
-                    # 删除元数据文件
-                    metadata_file.unlink()
-                    cleared_count += 1
-                    
+                # 删除数据文件
+                data_file = Path(metadata['file_path'])
+                if data_file.exists():
+                    data_file.unlink()
+
+                # 删除元数据记录
+                self.catalog.delete(metadata['cache_key'])
+                cleared_count += 1
+
             except Exception as e:
                 logger.warning(f"⚠️ 清理缓存时出错: {e}")
         
@@ -470,11 +519,8 @@ class StockDataCache:
             'total_size_mb': 0
         }
         
-        for metadata_file in self.metadata_dir.glob("*_meta.json"):
+        for metadata in self.catalog.find():
             try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
                 data_type = metadata.get('data_type', 'unknown')
                 if data_type == 'stock_data':
                     stats['stock_data_count'] += 1
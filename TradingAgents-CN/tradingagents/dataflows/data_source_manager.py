@@ -6,11 +6,14 @@
 
 import os
 import time
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait as wait_futures
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 import warnings
 import pandas as pd
 
+from .source_health import SourceHealthTracker
+
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
@@ -35,8 +38,31 @@ class ChinaDataSource(Enum):
 class DataSourceManager:
     """数据源管理器"""
 
+    # 备用数据源优先级: AKShare > Tushare > BaoStock > TDX
+    FALLBACK_ORDER = [
+        ChinaDataSource.AKSHARE,
+        ChinaDataSource.TUSHARE,
+        ChinaDataSource.BAOSTOCK,
+        ChinaDataSource.TDX
+    ]
+
+    # 各数据源日线的复权口径（Tushare适配器使用前复权，AKShare为不复权）
+    SOURCE_ADJUSTMENTS = {
+        ChinaDataSource.TUSHARE: 'qfq',
+    }
+
+    # 对冲请求延迟的上下限（秒），无延迟样本时使用默认值
+    HEDGE_MIN_DELAY = 0.2
+    HEDGE_MAX_DELAY = 10.0
+    HEDGE_DEFAULT_DELAY = 2.0
+
     def __init__(self):
         """初始化数据源管理器"""
+        # 按实时延迟/错误率排序数据源；可选对冲请求：首选数据源超过其p95延迟仍未返回时并行请求下一个
+        self.health = SourceHealthTracker()
+        self.hedged_requests = os.getenv('DATA_SOURCE_HEDGED_REQUESTS', 'false').lower() in ('true', '1', 'yes')
+        self._hedge_executor = None
+
         self.default_source = self._get_default_source()
         self.available_sources = self._check_available_sources()
         # Prefer the default if available; otherwise fall back to the first available source
@@ -49,6 +75,7 @@ class DataSourceManager:
         logger.info(f"   默认数据源: {self.default_source.value}")
         logger.info(f"   可用数据源: {[s.value for s in self.available_sources]}")
         logger.info(f"   当前数据源: {self.current_source.value}")
+        logger.info(f"   对冲请求: {'启用' if self.hedged_requests else '禁用'}")
 
     def _get_default_source(self) -> ChinaDataSource:
         """获取默认数据源"""
@@ -328,75 +355,158 @@ class DataSourceManager:
         logger.info(f"🔍 [股票代码追踪] 当前数据源: {self.current_source.value}")
 
         start_time = time.time()
+        order = self.get_source_order()
+
+        if self.hedged_requests and len(order) > 1:
+            source, result = self._fetch_hedged(order, symbol, start_date, end_date)
+        else:
+            source, result = self._fetch_in_order(order, symbol, start_date, end_date)
+
+        # 记录详细的输出结果
+        duration = time.time() - start_time
+        result_length = len(result) if result else 0
+
+        if self._is_valid_result(result):
+            logger.info(f"✅ [数据获取] 成功获取股票数据",
+                       extra={
+                           'symbol': symbol,
+                           'start_date': start_date,
+                           'end_date': end_date,
+                           'data_source': source.value,
+                           'duration': duration,
+                           'result_length': result_length,
+                           'result_preview': result[:200] + '...' if result_length > 200 else result,
+                           'event_type': 'data_fetch_success'
+                       })
+        else:
+            logger.error(f"❌ [数据获取] 所有数据源都无法获取有效数据",
+                        extra={
+                            'symbol': symbol,
+                            'start_date': start_date,
+                            'end_date': end_date,
+                            'data_source': source.value if source else None,
+                            'duration': duration,
+                            'result_length': result_length,
+                            'event_type': 'data_fetch_warning'
+                        })
+        return result
+
+    @staticmethod
+    def _is_valid_result(result: Optional[str]) -> bool:
+        return bool(result) and "❌" not in result and "错误" not in result
+
+    def get_source_order(self) -> List[ChinaDataSource]:
+        """按实时健康度排序的数据源（当前数据源为首选，有粘性）"""
+        configured = [self.current_source] + [
+            s for s in self.FALLBACK_ORDER
+            if s != self.current_source and s in self.available_sources
+        ]
+        return self.health.rank(configured)
+
+    def get_source_health(self) -> Dict[str, Dict]:
+        """各数据源的实时延迟/错误率统计"""
+        return self.health.get_stats()
 
+    def _fetch_from_source(self, source: ChinaDataSource, symbol: str,
+                           start_date: str, end_date: str) -> str:
+        """调用单个数据源并记录延迟和成功率"""
+        start_time = time.time()
         try:
-            # 根据数据源调用相应的获取方法
-            if self.current_source == ChinaDataSource.TUSHARE:
+            if source == ChinaDataSource.TUSHARE:
                 logger.info(f"🔍 [股票代码追踪] 调用 Tushare 数据源，传入参数: symbol='{symbol}'")
                 result = self._get_tushare_data(symbol, start_date, end_date)
-            elif self.current_source == ChinaDataSource.AKSHARE:
+            elif source == ChinaDataSource.AKSHARE:
                 result = self._get_akshare_data(symbol, start_date, end_date)
-            elif self.current_source == ChinaDataSource.BAOSTOCK:
+            elif source == ChinaDataSource.BAOSTOCK:
                 result = self._get_baostock_data(symbol, start_date, end_date)
-            elif self.current_source == ChinaDataSource.TDX:
+            elif source == ChinaDataSource.TDX:
                 result = self._get_tdx_data(symbol, start_date, end_date)
             else:
-                result = f"❌ 不支持的数据源: {self.current_source.value}"
-
-            # 记录详细的输出结果
-            duration = time.time() - start_time
-            result_length = len(result) if result else 0
-            is_success = result and "❌" not in result and "错误" not in result
-
-            if is_success:
-                logger.info(f"✅ [数据获取] 成功获取股票数据",
-                           extra={
-                               'symbol': symbol,
-                               'start_date': start_date,
-                               'end_date': end_date,
-                               'data_source': self.current_source.value,
-                               'duration': duration,
-                               'result_length': result_length,
-                               'result_preview': result[:200] + '...' if result_length > 200 else result,
-                               'event_type': 'data_fetch_success'
-                           })
-                return result
-            else:
-                logger.warning(f"⚠️ [数据获取] 数据质量异常，尝试降级到其他数据源",
-                              extra={
-                                  'symbol': symbol,
-                                  'start_date': start_date,
-                                  'end_date': end_date,
-                                  'data_source': self.current_source.value,
-                                  'duration': duration,
-                                  'result_length': result_length,
-                                  'result_preview': result[:200] + '...' if result_length > 200 else result,
-                                  'event_type': 'data_fetch_warning'
-                              })
-
-                # 数据质量异常时也尝试降级到其他数据源
-                fallback_result = self._try_fallback_sources(symbol, start_date, end_date)
-                if fallback_result and "❌" not in fallback_result and "错误" not in fallback_result:
-                    logger.info(f"✅ [数据获取] 降级成功获取数据")
-                    return fallback_result
-                else:
-                    logger.error(f"❌ [数据获取] 所有数据源都无法获取有效数据")
-                    return result  # 返回原始结果（包含错误信息）
-
+                result = f"❌ 不支持的数据源: {source.value}"
         except Exception as e:
-            duration = time.time() - start_time
-            logger.error(f"❌ [数据获取] 异常失败: {e}",
+            logger.error(f"❌ [数据获取] {source.value}异常失败: {e}",
                         extra={
                             'symbol': symbol,
-                            'start_date': start_date,
-                            'end_date': end_date,
-                            'data_source': self.current_source.value,
-                            'duration': duration,
+                            'data_source': source.value,
+                            'duration': time.time() - start_time,
                             'error': str(e),
                             'event_type': 'data_fetch_exception'
                         }, exc_info=True)
-            return self._try_fallback_sources(symbol, start_date, end_date)
-    
+            result = f"❌ {source.value}获取{symbol}数据失败: {e}"
+
+        self.health.record(source, time.time() - start_time, self._is_valid_result(result))
+        return result
+
+    def _fetch_in_order(self, order: List[ChinaDataSource], symbol: str,
+                        start_date: str, end_date: str) -> Tuple[Optional[ChinaDataSource], str]:
+        """按顺序尝试数据源，返回第一个有效结果；全部失败时返回首选数据源的结果"""
+        first_source, first_result = None, f"❌ 所有数据源都无法获取{symbol}的数据"
+        for index, source in enumerate(order):
+            if index > 0:
+                logger.info(f"🔄 尝试备用数据源: {source.value}")
+            result = self._fetch_from_source(source, symbol, start_date, end_date)
+            if self._is_valid_result(result):
+                if index > 0:
+                    logger.info(f"✅ 备用数据源{source.value}获取成功")
+                return source, result
+            logger.warning(f"⚠️ 数据源{source.value}返回错误结果，尝试降级到其他数据源")
+            if first_source is None:
+                first_source, first_result = source, result
+        return first_source, first_result
+
+    def _hedge_delay(self, source: ChinaDataSource) -> float:
+        p95 = self.health.p95_latency(source)
+        if p95 is None:
+            return self.HEDGE_DEFAULT_DELAY
+        return min(self.HEDGE_MAX_DELAY, max(self.HEDGE_MIN_DELAY, p95))
+
+    def _fetch_hedged(self, order: List[ChinaDataSource], symbol: str,
+                      start_date: str, end_date: str) -> Tuple[Optional[ChinaDataSource], str]:
+        """
+        对冲请求：首选数据源超过其p95延迟仍未返回时，并行请求下一个数据源，取先返回的有效结果
+
+        落后的请求继续在后台完成，结果只用于更新健康度统计。
+        """
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='data-source-hedge')
+
+        pending = {}
+        remaining = list(order)
+        first_source, first_result = None, f"❌ 所有数据源都无法获取{symbol}的数据"
+
+        def launch():
+            source = remaining.pop(0)
+            future = self._hedge_executor.submit(self._fetch_from_source, source, symbol, start_date, end_date)
+            pending[future] = source
+            return source
+
+        primary = launch()
+        delay = self._hedge_delay(primary)
+        while pending:
+            done, _ = wait_futures(list(pending), timeout=delay if remaining else None,
+                                   return_when=FIRST_COMPLETED)
+            if not done:
+                # 超过对冲延迟仍无结果：并行请求下一个数据源
+                hedge = launch()
+                logger.info(f"⏱️ {primary.value}超过{delay:.2f}s未返回，对冲请求{hedge.value}")
+                delay = self._hedge_delay(hedge)
+                continue
+
+            for future in done:
+                source = pending.pop(future)
+                result = future.result()
+                if self._is_valid_result(result):
+                    return source, result
+                logger.warning(f"⚠️ 数据源{source.value}返回错误结果，尝试降级到其他数据源")
+                if first_source is None:
+                    first_source, first_result = source, result
+            if not pending and remaining:
+                # 已发出的请求都失败了，立即请求下一个数据源
+                primary = launch()
+                delay = self._hedge_delay(primary)
+
+        return first_source, first_result
+
     def _get_tushare_data(self, symbol: str, start_date: str, end_date: str) -> str:
         """使用Tushare获取数据 - 直接调用适配器，避免循环调用"""
         logger.debug(f"📊 [Tushare] 调用参数: symbol={symbol}, start_date={start_date}, end_date={end_date}")
@@ -416,7 +526,9 @@ class DataSourceManager:
             logger.info(f"🔍 [DataSourceManager详细日志] 开始调用tushare_adapter...")
 
             adapter = get_tushare_adapter()
-            data = adapter.get_stock_data(symbol, start_date, end_date)
+            data = self._get_cached_dataframe(
+                ChinaDataSource.TUSHARE, symbol, start_date, end_date, adapter.get_stock_data
+            )
 
             if data is not None and not data.empty:
                 # 获取股票基本信息
@@ -478,7 +590,9 @@ class DataSourceManager:
             # 这里需要实现AKShare的统一接口
             from .akshare_utils import get_akshare_provider
             provider = get_akshare_provider()
-            data = provider.get_stock_data(symbol, start_date, end_date)
+            data = self._get_cached_dataframe(
+                ChinaDataSource.AKSHARE, symbol, start_date, end_date, provider.get_stock_data
+            )
 
             duration = time.time() - start_time
 
@@ -530,7 +644,9 @@ class DataSourceManager:
         # 这里需要实现BaoStock的统一接口
         from .baostock_utils import get_baostock_provider
         provider = get_baostock_provider()
-        data = provider.get_stock_data(symbol, start_date, end_date)
+        data = self._get_cached_dataframe(
+            ChinaDataSource.BAOSTOCK, symbol, start_date, end_date, provider.get_stock_data
+        )
         
         if data is not None and not data.empty:
             result = f"股票代码: {symbol}\n"
@@ -557,6 +673,26 @@ class DataSourceManager:
         from .tdx_utils import get_china_stock_data
         return get_china_stock_data(symbol, start_date, end_date)
     
+    def _get_cached_dataframe(self, source: ChinaDataSource, symbol: str,
+                              start_date: str, end_date: str, fetch) -> Optional[pd.DataFrame]:
+        """
+        通过日期区间缓存获取日线数据，只为本地缺失的日期缺口调用数据源
+
+        Args:
+            source: 数据源（不同数据源、不同复权口径分开缓存）
+            fetch: fetch(symbol, start_date, end_date) -> DataFrame
+        """
+        if not start_date or not end_date:
+            return fetch(symbol, start_date, end_date)
+
+        try:
+            from .range_cache import get_range_cache
+            return get_range_cache().get(symbol, start_date, end_date, fetch, source=source.value,
+                                         adjustment=self.SOURCE_ADJUSTMENTS.get(source))
+        except Exception as e:
+            logger.warning(f"⚠️ 区间缓存不可用，直接请求{source.value}: {e}")
+            return fetch(symbol, start_date, end_date)
+
     def _get_volume_safely(self, data) -> float:
         """安全地获取成交量数据，支持多种列名"""
         try:
@@ -577,46 +713,12 @@ class DataSourceManager:
             return 0
 
     def _try_fallback_sources(self, symbol: str, start_date: str, end_date: str) -> str:
-        """尝试备用数据源 - 避免递归调用"""
+        """尝试备用数据源（按健康度排序）- 避免递归调用"""
         logger.error(f"🔄 {self.current_source.value}失败，尝试备用数据源...")
 
-        # 备用数据源优先级: AKShare > Tushare > BaoStock > TDX
-        fallback_order = [
-            ChinaDataSource.AKSHARE,
-            ChinaDataSource.TUSHARE,
-            ChinaDataSource.BAOSTOCK,
-            ChinaDataSource.TDX
-        ]
-
-        for source in fallback_order:
-            if source != self.current_source and source in self.available_sources:
-                try:
-                    logger.info(f"🔄 尝试备用数据源: {source.value}")
-
-                    # 直接调用具体的数据源方法，避免递归
-                    if source == ChinaDataSource.TUSHARE:
-                        result = self._get_tushare_data(symbol, start_date, end_date)
-                    elif source == ChinaDataSource.AKSHARE:
-                        result = self._get_akshare_data(symbol, start_date, end_date)
-                    elif source == ChinaDataSource.BAOSTOCK:
-                        result = self._get_baostock_data(symbol, start_date, end_date)
-                    elif source == ChinaDataSource.TDX:
-                        result = self._get_tdx_data(symbol, start_date, end_date)
-                    else:
-                        logger.warning(f"⚠️ 未知数据源: {source.value}")
-                        continue
-
-                    if "❌" not in result:
-                        logger.info(f"✅ 备用数据源{source.value}获取成功")
-                        return result
-                    else:
-                        logger.warning(f"⚠️ 备用数据源{source.value}返回错误结果")
-
-                except Exception as e:
-                    logger.error(f"❌ 备用数据源{source.value}也失败: {e}")
-                    continue
-        
-        return f"❌ 所有数据源都无法获取{symbol}的数据"
+        order = [s for s in self.get_source_order() if s != self.current_source]
+        source, result = self._fetch_in_order(order, symbol, start_date, end_date)
+        return result if source is not None else f"❌ 所有数据源都无法获取{symbol}的数据"
     
     def get_stock_info(self, symbol: str) -> Dict:
         """获取股票基本信息，支持降级机制"""
@@ -712,8 +814,10 @@ class DataSourceManager:
         """使用AKShare获取股票基本信息"""
         try:
             import akshare as ak
+            from .rate_limiter import get_rate_limiter
 
             # 尝试获取个股信息
+            get_rate_limiter().acquire('akshare')
             stock_info = ak.stock_individual_info_em(symbol=symbol)
 
             if stock_info is not None and not stock_info.empty:
@@ -5,6 +5,8 @@ import os
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
 
+from .offline_data_cache import get_offline_dataset_cache, load_date_indexed_json
+
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -36,8 +38,8 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             logger.warning(f"⚠️ [DEBUG] 请确保已下载相关数据或检查数据目录配置")
             return {}
         
-        with open(data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # 每个文件只解析一次（进程级LRU缓存，文件修改后自动重新加载）
+        data = get_offline_dataset_cache().get(data_path, load_date_indexed_json)
     except FileNotFoundError:
         logger.error(f"❌ [ERROR] 文件未找到: {data_path}")
         return {}
@@ -49,8 +51,4 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
         return {}
 
     # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+    return data.range(start_date, end_date)
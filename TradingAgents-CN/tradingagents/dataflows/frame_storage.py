@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+OHLCV数据帧存储后端
+为缓存和离线price_data目录提供可插拔的存储格式：
+- parquet: 列式压缩存储，保留dtype，支持列裁剪（默认，需要pyarrow）
+- feather: Arrow IPC格式，支持内存映射零拷贝读取（需要pyarrow）
+- csv: 兼容旧数据的文本格式（无pyarrow时的回退）
+
+格式可通过环境变量 TRADINGAGENTS_CACHE_FORMAT 指定。
+"""
+
+import os
+from pathlib import Path
+from typing import Optional, List, Union
+
+import pandas as pd
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    feather = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+# pandas -> Arrow 转换失败时抛出的异常（如object列混合了字符串和数字）
+ARROW_CONVERSION_ERRORS = (pa.ArrowInvalid, pa.ArrowTypeError) if PYARROW_AVAILABLE else ()
+
+# 离线YFin价格文件的基础文件名（不含扩展名）
+PRICE_DATA_STEM = "{symbol}-YFin-data-2015-01-01-2025-03-25"
+
+_KNOWN_EXTENSIONS = (".csv", ".parquet", ".feather")
+
+
+class FrameStorage:
+    """数据帧存储后端基类"""
+
+    format_name = "base"
+    extension = ""
+
+    def save(self, data: pd.DataFrame, path: Union[str, Path], index: bool = True) -> Path:
+        """保存数据帧，返回实际写入的文件路径（二进制格式转换失败时为CSV路径）"""
+        raise NotImplementedError
+
+    def accepts(self, data: pd.DataFrame, index: bool = True) -> bool:
+        """数据帧能否以本格式保存（不能时 save 会回退为CSV）"""
+        return True
+
+    def load(self, path: Union[str, Path], columns: Optional[List[str]] = None,
+             index: bool = True) -> pd.DataFrame:
+        """
+        读取数据帧
+
+        Args:
+            path: 文件路径
+            columns: 只读取指定列（列裁剪），None表示全部
+            index: 文件中是否保存了索引
+        """
+        raise NotImplementedError
+
+    def with_extension(self, path: Union[str, Path]) -> Path:
+        # 不使用 with_suffix：BRK.B、0700.HK 等代码本身带点号
+        path = Path(path)
+        if path.suffix.lower() in _KNOWN_EXTENSIONS:
+            path = path.with_name(path.name[:-len(path.suffix)])
+        return path.with_name(path.name + self.extension)
+
+
+class CsvFrameStorage(FrameStorage):
+    """CSV存储（兼容旧缓存）"""
+
+    format_name = "csv"
+    extension = ".csv"
+
+    def save(self, data: pd.DataFrame, path: Union[str, Path], index: bool = True) -> Path:
+        path = self.with_extension(path)
+        data.to_csv(path, index=index)
+        return path
+
+    def load(self, path: Union[str, Path], columns: Optional[List[str]] = None,
+             index: bool = True) -> pd.DataFrame:
+        if index:
+            data = pd.read_csv(path, index_col=0)
+            return data[columns] if columns else data
+        return pd.read_csv(path, usecols=columns)
+
+
+def _arrow_conversion(data: pd.DataFrame, index: bool):
+    """返回 (Arrow表, None)，列类型无法转换时返回 (None, 异常)"""
+    try:
+        return pa.Table.from_pandas(data, preserve_index=index), None
+    except ARROW_CONVERSION_ERRORS as e:
+        return None, e
+
+
+def _to_arrow_table(data: pd.DataFrame, path: Path, index: bool):
+    """转换为Arrow表，列类型无法转换时返回None（调用方回退为CSV）"""
+    table, error = _arrow_conversion(data, index)
+    if error is not None:
+        logger.warning(f"⚠️ 数据帧无法转换为Arrow格式，回退为CSV存储 {path.name}: {error}")
+    return table
+
+
+class ParquetFrameStorage(FrameStorage):
+    """Parquet列式存储"""
+
+    format_name = "parquet"
+    extension = ".parquet"
+
+    def save(self, data: pd.DataFrame, path: Union[str, Path], index: bool = True) -> Path:
+        path = self.with_extension(path)
+        table = _to_arrow_table(data, path, index)
+        if table is None:
+            return CsvFrameStorage().save(data, path, index=index)
+        pq.write_table(table, path, compression="zstd")
+        return path
+
+    def accepts(self, data: pd.DataFrame, index: bool = True) -> bool:
+        return _arrow_conversion(data, index)[1] is None
+
+    def load(self, path: Union[str, Path], columns: Optional[List[str]] = None,
+             index: bool = True) -> pd.DataFrame:
+        # use_pandas_metadata 会在列裁剪时自动带上索引列
+        table = pq.read_table(path, columns=columns, use_pandas_metadata=index)
+        return table.to_pandas()
+
+
+class FeatherFrameStorage(FrameStorage):
+    """Arrow IPC (Feather v2) 存储，读取时内存映射"""
+
+    format_name = "feather"
+    extension = ".feather"
+
+    def save(self, data: pd.DataFrame, path: Union[str, Path], index: bool = True) -> Path:
+        path = self.with_extension(path)
+        table = _to_arrow_table(data, path, index)
+        if table is None:
+            return CsvFrameStorage().save(data, path, index=index)
+        feather.write_feather(table, str(path), compression="uncompressed")
+        return path
+
+    def accepts(self, data: pd.DataFrame, index: bool = True) -> bool:
+        return _arrow_conversion(data, index)[1] is None
+
+    def load(self, path: Union[str, Path], columns: Optional[List[str]] = None,
+             index: bool = True) -> pd.DataFrame:
+        # 未压缩的IPC文件可零拷贝映射，列裁剪只物化所需列
+        table = feather.read_table(str(path), memory_map=True)
+        if columns:
+            index_columns = []
+            if index:
+                pandas_meta = table.schema.pandas_metadata or {}
+                index_columns = [c for c in pandas_meta.get('index_columns', [])
+                                 if isinstance(c, str)]
+            table = table.select(list(columns) + index_columns)
+        return table.to_pandas()
+
+
+_STORAGE_CLASSES = {
+    cls.format_name: cls
+    for cls in (CsvFrameStorage, ParquetFrameStorage, FeatherFrameStorage)
+}
+_EXTENSION_TO_FORMAT = {cls.extension: name for name, cls in _STORAGE_CLASSES.items()}
+
+
+def get_frame_storage(format_name: str = None) -> FrameStorage:
+    """
+    获取存储后端
+
+    Args:
+        format_name: parquet | feather | csv，None时读取环境变量 TRADINGAGENTS_CACHE_FORMAT，
+                     默认parquet；pyarrow不可用时回退为csv
+    """
+    if format_name is None:
+        format_name = os.getenv("TRADINGAGENTS_CACHE_FORMAT", "parquet")
+    format_name = format_name.lower()
+
+    if format_name not in _STORAGE_CLASSES:
+        logger.warning(f"⚠️ 未知的缓存存储格式 {format_name}，使用csv")
+        format_name = "csv"
+    if format_name != "csv" and not PYARROW_AVAILABLE:
+        format_name = "csv"
+
+    return _STORAGE_CLASSES[format_name]()
+
+
+def get_storage_for_path(path: Union[str, Path]) -> FrameStorage:
+    """根据文件扩展名选择存储后端"""
+    format_name = _EXTENSION_TO_FORMAT.get(Path(path).suffix.lower(), "csv")
+    return _STORAGE_CLASSES[format_name]()
+
+
+def load_frame(path: Union[str, Path], columns: Optional[List[str]] = None,
+               index: bool = True) -> pd.DataFrame:
+    """按扩展名读取数据帧"""
+    return get_storage_for_path(path).load(path, columns=columns, index=index)
+
+
+def find_price_data_file(symbol: str, data_dir: Union[str, Path]) -> Optional[Path]:
+    """查找离线价格文件，优先使用二进制格式"""
+    stem = os.path.join(str(data_dir), PRICE_DATA_STEM.format(symbol=symbol))
+    candidates = [".feather", ".parquet"] if PYARROW_AVAILABLE else []
+    for extension in candidates + [".csv"]:
+        path = Path(stem + extension)
+        if path.exists():
+            return path
+    return None
+
+
+def read_price_data(symbol: str, data_dir: Union[str, Path],
+                    columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    读取离线YFin价格数据
+
+    Args:
+        symbol: 股票代码
+        data_dir: price_data目录
+        columns: 只读取指定列，如 ["Date", "Close"]
+    """
+    path = find_price_data_file(symbol, data_dir)
+    if path is None:
+        raise FileNotFoundError(
+            f"{PRICE_DATA_STEM.format(symbol=symbol)}.csv not found in {data_dir}"
+        )
+    return load_frame(path, columns=columns, index=False)
+
+
+def convert_csv_directory(directory: Union[str, Path], format_name: str = "parquet",
+                          index: bool = False, remove_csv: bool = False) -> int:
+    """
+    将目录中已有的CSV文件转换为二进制存储格式
+
+    Args:
+        directory: 目录路径
+        format_name: 目标格式（parquet | feather）
+        index: CSV首列是否为索引（缓存文件为True，离线price_data为False）
+        remove_csv: 转换成功后是否删除原CSV
+
+    Returns:
+        int: 转换的文件数
+    """
+    storage = get_frame_storage(format_name)
+    if storage.format_name == "csv":
+        logger.warning("⚠️ pyarrow不可用，跳过CSV转换")
+        return 0
+
+    converted = 0
+    for csv_path in Path(directory).glob("*.csv"):
+        target = storage.with_extension(csv_path)
+        if target.exists() and target.stat().st_mtime >= csv_path.stat().st_mtime:
+            continue
+        try:
+            data = pd.read_csv(csv_path, index_col=0) if index else pd.read_csv(csv_path)
+            if not storage.accepts(data, index=index):
+                # 不能调用 save：其CSV回退会覆盖源文件
+                logger.warning(f"⚠️ 列类型无法转换为{storage.format_name}，保留CSV: {csv_path.name}")
+                continue
+            storage.save(data, target, index=index)
+            converted += 1
+            if remove_csv:
+                csv_path.unlink()
+        except Exception as e:
+            logger.error(f"❌ 转换失败 {csv_path.name}: {e}")
+
+    logger.info(f"📦 已将 {converted} 个CSV文件转换为{storage.format_name}: {directory}")
+    return converted
@@ -1,10 +1,11 @@
 from typing import Annotated, Dict
 import time
 import os
-from .reddit_utils import fetch_top_from_category
+from .reddit_utils import fetch_top_from_category_range
 from .chinese_finance_utils import get_chinese_social_sentiment
 from .googlenews_utils import *
 from .finnhub_utils import get_data_in_range
+from .offline_data_cache import get_offline_dataset_cache, load_simfin_statements
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import setup_dataflow_logging
@@ -50,7 +51,6 @@ from datetime import datetime
 import json
 import os
 import pandas as pd
-from tqdm import tqdm
 from openai import OpenAI
 from io import StringIO
 
@@ -63,6 +63,7 @@ except ImportError as e:
     yf = None
     YF_AVAILABLE = False
 from .config import get_config, set_config, DATA_DIR
+from .frame_storage import read_price_data
 
 
 def get_finnhub_news(
@@ -214,26 +215,17 @@ def get_simfin_balance_sheet(
         "us",
         f"us-balance-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
+    # Parsed once per process (grouped by ticker, sorted by publish date) and reloaded when the file changes
+    statements = get_offline_dataset_cache().get(data_path, load_simfin_statements)
 
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Latest report for the ticker that was published on or before the current date
+    latest_balance_sheet = statements.latest(ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_balance_sheet is None:
         logger.info(f"No balance sheet available before the given current date.")
         return ""
 
-    # Get the most recent balance sheet by selecting the row with the latest Publish Date
-    latest_balance_sheet = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_balance_sheet = latest_balance_sheet.drop("SimFinId")
 
@@ -261,26 +253,17 @@ def get_simfin_cashflow(
         "us",
         f"us-cashflow-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    # Parsed once per process (grouped by ticker, sorted by publish date) and reloaded when the file changes
+    statements = get_offline_dataset_cache().get(data_path, load_simfin_statements)
 
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Latest report for the ticker that was published on or before the current date
+    latest_cash_flow = statements.latest(ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_cash_flow is None:
         logger.info(f"No cash flow statement available before the given current date.")
         return ""
 
-    # Get the most recent cash flow statement by selecting the row with the latest Publish Date
-    latest_cash_flow = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_cash_flow = latest_cash_flow.drop("SimFinId")
 
@@ -308,26 +291,17 @@ def get_simfin_income_statements(
         "us",
         f"us-income-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    # Parsed once per process (grouped by ticker, sorted by publish date) and reloaded when the file changes
+    statements = get_offline_dataset_cache().get(data_path, load_simfin_statements)
 
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Latest report for the ticker that was published on or before the current date
+    latest_income = statements.latest(ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_income is None:
         logger.info(f"No income statement available before the given current date.")
         return ""
 
-    # Get the most recent income statement by selecting the row with the latest Publish Date
-    latest_income = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_income = latest_income.drop("SimFinId")
 
@@ -406,26 +380,16 @@ def get_reddit_global_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {start_date}", total=total_iterations)
-
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            max_limit_per_day,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-        pbar.update(1)
-
-    pbar.close()
+    # one indexed read for the whole window instead of one corpus scan per day
+    posts_by_date = fetch_top_from_category_range(
+        "global_news",
+        before,
+        start_date.strftime("%Y-%m-%d"),
+        max_limit_per_day,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
+    )
+    posts = [post for day_posts in posts_by_date.values() for post in day_posts]
+    curr_date = start_date + relativedelta(days=1)
 
     if len(posts) == 0:
         return ""
@@ -460,31 +424,17 @@ def get_reddit_company_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {ticker} on {start_date}",
-        total=total_iterations,
+    # one indexed read for the whole window; ticker matches are precomputed in the index
+    posts_by_date = fetch_top_from_category_range(
+        "company_news",
+        before,
+        start_date.strftime("%Y-%m-%d"),
+        max_limit_per_day,
+        ticker,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
     )
-
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            max_limit_per_day,
-            ticker,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-
-        pbar.update(1)
-
-    pbar.close()
+    posts = [post for day_posts in posts_by_date.values() for post in day_posts]
+    curr_date = start_date + relativedelta(days=1)
 
     if len(posts) == 0:
         return ""
@@ -501,7 +451,9 @@ def get_reddit_company_news(
 
 def get_stock_stats_indicators_window(
     symbol: Annotated[str, "ticker symbol of the company"],
-    indicator: Annotated[str, "technical indicator to get the analysis and report of"],
+    indicator: Annotated[
+        str, "technical indicator(s) to get the analysis and report of, comma separated"
+    ],
     curr_date: Annotated[
         str, "The current trading date you are trading on, YYYY-mm-dd"
     ],
@@ -582,57 +534,54 @@ def get_stock_stats_indicators_window(
         ),
     }
 
-    if indicator not in best_ind_params:
-        raise ValueError(
-            f"Indicator {indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
-        )
+    indicators = (
+        [i.strip() for i in indicator.split(",") if i.strip()]
+        if isinstance(indicator, str)
+        else list(indicator)
+    )
+    for ind in indicators:
+        if ind not in best_ind_params:
+            raise ValueError(
+                f"Indicator {ind} is not supported. Please choose from: {list(best_ind_params.keys())}"
+            )
 
     end_date = curr_date
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date - relativedelta(days=look_back_days)
 
-    if not online:
-        # read from YFin data
-        data = pd.read_csv(
-            os.path.join(
-                DATA_DIR,
-                f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-            )
+    # 价格文件只读取一次，所有指标在整条序列上计算后按窗口切片
+    try:
+        windows = StockstatsUtils.get_stock_stats_window(
+            symbol,
+            indicators,
+            end_date,
+            look_back_days,
+            os.path.join(DATA_DIR, "market_data", "price_data"),
+            online=online,
         )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        dates_in_df = data["Date"].astype(str).str[:10]
-
-        ind_string = ""
-        while curr_date >= before:
-            # only do the trading dates
-            if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
-                indicator_value = get_stockstats_indicator(
-                    symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-                )
-
-                ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
-            curr_date = curr_date - relativedelta(days=1)
-    else:
-        # online gathering
-        ind_string = ""
-        while curr_date >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-            )
-
-            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
-            curr_date = curr_date - relativedelta(days=1)
+    except Exception as e:
+        if not online:
+            raise
+        logger.error(f"❌ 获取 {symbol} 技术指标失败: {e}")
+        windows = {
+            ind: [
+                ((curr_date - relativedelta(days=offset)).strftime("%Y-%m-%d"), "")
+                for offset in range(look_back_days + 1)
+            ]
+            for ind in indicators
+        }
 
-    result_str = (
-        f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
-        + ind_string
-        + "\n\n"
-        + best_ind_params.get(indicator, "No description available.")
-    )
+    sections = []
+    for ind in indicators:
+        ind_string = "".join(f"{day}: {value}\n" for day, value in windows[ind])
+        sections.append(
+            f"## {ind} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
+            + ind_string
+            + "\n\n"
+            + best_ind_params.get(ind, "No description available.")
+        )
 
-    return result_str
+    return "\n\n".join(sections)
 
 
 def get_stockstats_indicator(
@@ -674,16 +623,11 @@ def get_YFin_data_window(
     before = date_obj - relativedelta(days=look_back_days)
     start_date = before.strftime("%Y-%m-%d")
 
-    # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
-    )
+    # read in data (parquet/feather when converted, csv otherwise)
+    data = read_price_data(symbol, os.path.join(DATA_DIR, "market_data", "price_data"))
 
     # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
+    data["DateOnly"] = data["Date"].astype(str).str[:10]
 
     # Filter data between the start and end dates (inclusive)
     filtered_data = data[
@@ -755,13 +699,8 @@ def get_YFin_data(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
-    # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
-    )
+    # read in data (parquet/feather when converted, csv otherwise)
+    data = read_price_data(symbol, os.path.join(DATA_DIR, "market_data", "price_data"))
 
     if end_date > "2025-03-25":
         raise Exception(
@@ -769,7 +708,7 @@ def get_YFin_data(
         )
 
     # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
+    data["DateOnly"] = data["Date"].astype(str).str[:10]
 
     # Filter data between the start and end dates (inclusive)
     filtered_data = data[
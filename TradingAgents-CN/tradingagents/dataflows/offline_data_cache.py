@@ -0,0 +1,169 @@
+"""
+离线数据集进程级缓存
+FinnHub格式化JSON和SimFin财报CSV在一次分析和一次市场扫描中会被同一股票反复读取，
+这里把每个文件只解析一次，转换为按日期索引的结构，放入按大小限制的LRU缓存：
+
+- 以文件路径为键，文件 mtime/大小 变化时自动重新加载；
+- 缓存总量按源文件大小估算，超过上限时淘汰最久未使用的数据集；
+- 同一文件的并发首次加载只解析一次。
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+
+class DateIndexedData:
+    """按日期键（YYYY-MM-DD）排序的数据，二分查找区间"""
+
+    __slots__ = ('keys', 'values')
+
+    def __init__(self, data: Dict[str, Any]):
+        items = sorted(data.items())
+        self.keys = [key for key, _ in items]
+        self.values = [value for _, value in items]
+
+    def range(self, start_date: str, end_date: str, skip_empty: bool = True) -> Dict[str, Any]:
+        """start_date <= 日期 <= end_date 的数据（与字符串比较语义一致）"""
+        lo = bisect_left(self.keys, start_date)
+        hi = bisect_right(self.keys, end_date)
+        return {
+            self.keys[i]: self.values[i]
+            for i in range(lo, hi)
+            if not skip_empty or len(self.values[i]) > 0
+        }
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class SimFinStatementTable:
+    """SimFin财报表：按股票分组、按发布日期排序，查询某日之前最新发布的一期"""
+
+    def __init__(self, df: pd.DataFrame):
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+        # 稳定排序：同一发布日期的多行保持文件中的原始顺序
+        self._by_ticker: Dict[str, pd.DataFrame] = {
+            ticker: group.sort_values("Publish Date", kind="mergesort")
+            for ticker, group in df.groupby("Ticker", sort=False)
+        }
+
+    def latest(self, ticker: str, curr_date: str) -> Optional[pd.Series]:
+        """curr_date（含）之前发布的最新一期；有多行同日发布时取文件中靠前的一行"""
+        group = self._by_ticker.get(ticker)
+        if group is None:
+            return None
+        curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+        dates = group["Publish Date"].values
+        pos = dates.searchsorted(curr_date_dt.to_datetime64(), side="right") - 1
+        if pos < 0:
+            return None
+        first = dates.searchsorted(dates[pos], side="left")
+        return group.iloc[first]
+
+
+class OfflineDatasetCache:
+    """按文件mtime失效、按总大小限制的LRU数据集缓存（线程安全）"""
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], Any, int]]" = OrderedDict()
+        self._loading: Dict[Tuple[str, str], threading.Lock] = {}
+        self._total_bytes = 0
+        self.stats = {'hits': 0, 'loads': 0, 'reloads': 0, 'evictions': 0}
+
+    def get(self, path: str, loader: Callable[[str], Any], kind: Optional[str] = None) -> Any:
+        """
+        获取解析后的数据集
+
+        Args:
+            path: 数据文件路径
+            loader: loader(path) -> 解析结果，异常不会被缓存
+            kind: 同一文件的不同解析方式用不同kind区分，默认使用loader名称
+        """
+        key = (os.path.abspath(path), kind or getattr(loader, '__name__', repr(loader)))
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[1]
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # 等待期间其他线程可能已经加载完成
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == signature:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return entry[1]
+
+            value = loader(path)
+
+            with self._lock:
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self._total_bytes -= old[2]
+                    self.stats['reloads'] += 1
+                self._entries[key] = (signature, value, stat.st_size)
+                self._total_bytes += stat.st_size
+                self.stats['loads'] += 1
+                self._evict()
+                self._loading.pop(key, None)
+            return value
+
+    def _evict(self) -> None:
+        # 至少保留刚加载的数据集
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.stats['evictions'] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), cached_bytes=self._total_bytes)
+
+
+def load_date_indexed_json(path: str) -> DateIndexedData:
+    with open(path, "r", encoding="utf-8") as f:
+        return DateIndexedData(json.load(f))
+
+
+def load_simfin_statements(path: str) -> SimFinStatementTable:
+    return SimFinStatementTable(pd.read_csv(path, sep=";"))
+
+
+# 全局缓存实例
+_offline_cache = None
+_offline_cache_lock = threading.Lock()
+
+
+def get_offline_dataset_cache() -> OfflineDatasetCache:
+    """获取全局离线数据集缓存（TRADINGAGENTS_OFFLINE_CACHE_MB 设置上限，默认512MB）"""
+    global _offline_cache
+    if _offline_cache is None:
+        with _offline_cache_lock:
+            if _offline_cache is None:
+                max_mb = float(os.getenv('TRADINGAGENTS_OFFLINE_CACHE_MB', '512'))
+                _offline_cache = OfflineDatasetCache(int(max_mb * 1024 * 1024))
+    return _offline_cache
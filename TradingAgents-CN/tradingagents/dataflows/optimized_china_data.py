@@ -5,12 +5,12 @@
 """
 
 import os
-import time
 import random
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from .cache_manager import get_cache
 from .config import get_config
+from .rate_limiter import get_rate_limiter
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -23,21 +23,13 @@ class OptimizedChinaDataProvider:
     def __init__(self):
         self.cache = get_cache()
         self.config = get_config()
-        self.last_api_call = 0
-        self.min_api_interval = 0.5  # Tushare数据接口调用间隔较短
+        self.rate_limiter = get_rate_limiter()  # 与其他实例/线程共享Tushare限额
         
         logger.info(f"📊 优化A股数据提供器初始化完成")
     
     def _wait_for_rate_limit(self):
         """等待API限制"""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_api_call
-        
-        if time_since_last_call < self.min_api_interval:
-            wait_time = self.min_api_interval - time_since_last_call
-            time.sleep(wait_time)
-        
-        self.last_api_call = time.time()
+        self.rate_limiter.acquire('tushare')
     
     def get_stock_data(self, symbol: str, start_date: str, end_date: str, 
                       force_refresh: bool = False) -> str:
@@ -139,22 +131,16 @@ class OptimizedChinaDataProvider:
         # 检查缓存（除非强制刷新）
         if not force_refresh:
             # 查找基本面数据缓存
-            for metadata_file in self.cache.metadata_dir.glob(f"*_meta.json"):
+            for metadata in self.cache.find_metadata(symbol=symbol, data_type='fundamentals',
+                                                     market_type='china'):
                 try:
-                    import json
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    
-                    if (metadata.get('symbol') == symbol and 
-                        metadata.get('data_type') == 'fundamentals' and
-                        metadata.get('market_type') == 'china'):
-                        
-                        cache_key = metadata_file.stem.replace('_meta', '')
-                        if self.cache.is_cache_valid(cache_key, symbol=symbol, data_type='fundamentals'):
-                            cached_data = self.cache.load_stock_data(cache_key)
-                            if cached_data:
-                                logger.info(f"⚡ 从缓存加载A股基本面数据: {symbol}")
-                                return cached_data
+                    cache_key = metadata['cache_key']
+                    if self.cache.is_cache_valid(cache_key, symbol=symbol, data_type='fundamentals',
+                                                 metadata=metadata):
+                        cached_data = self.cache.load_stock_data(cache_key)
+                        if cached_data:
+                            logger.info(f"⚡ 从缓存加载A股基本面数据: {symbol}")
+                            return cached_data
                 except Exception:
                     continue
         
@@ -1064,21 +1050,12 @@ class OptimizedChinaDataProvider:
         """尝试获取过期的缓存数据作为备用"""
         try:
             # 查找任何相关的缓存，不考虑TTL
-            for metadata_file in self.cache.metadata_dir.glob(f"*_meta.json"):
+            for metadata in self.cache.find_metadata(symbol=symbol, data_type='stock_data',
+                                                     market_type='china'):
                 try:
-                    import json
-
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    
-                    if (metadata.get('symbol') == symbol and 
-                        metadata.get('data_type') == 'stock_data' and
-                        metadata.get('market_type') == 'china'):
-                        
-                        cache_key = metadata_file.stem.replace('_meta', '')
-                        cached_data = self.cache.load_stock_data(cache_key)
-                        if cached_data:
-                            return cached_data + "\n\n⚠️ 注意: 使用的是过期缓存数据"
+                    cached_data = self.cache.load_stock_data(metadata['cache_key'])
+                    if cached_data:
+                        return cached_data + "\n\n⚠️ 注意: 使用的是过期缓存数据"
                 except Exception:
                     continue
         except Exception:
@@ -5,7 +5,6 @@
 """
 
 import os
-import time
 import random
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -13,6 +12,7 @@ import yfinance as yf
 import pandas as pd
 from .cache_manager import get_cache
 from .config import get_config
+from .rate_limiter import get_rate_limiter
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -25,22 +25,13 @@ class OptimizedUSDataProvider:
     def __init__(self):
         self.cache = get_cache()
         self.config = get_config()
-        self.last_api_call = 0
-        self.min_api_interval = 1.0  # 最小API调用间隔（秒）
+        self.rate_limiter = get_rate_limiter()  # 按上游API共享的限额
         
         logger.info(f"📊 优化美股数据提供器初始化完成")
     
-    def _wait_for_rate_limit(self):
+    def _wait_for_rate_limit(self, api: str = 'finnhub'):
         """等待API限制"""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_api_call
-        
-        if time_since_last_call < self.min_api_interval:
-            wait_time = self.min_api_interval - time_since_last_call
-            logger.info(f"⏳ API限制等待 {wait_time:.1f}s...")
-            time.sleep(wait_time)
-        
-        self.last_api_call = time.time()
+        self.rate_limiter.acquire(api)
     
     def get_stock_data(self, symbol: str, start_date: str, end_date: str, 
                       force_refresh: bool = False) -> str:
@@ -130,7 +121,7 @@ class OptimizedUSDataProvider:
                         # 备用方案：Yahoo Finance
                         logger.info(f"🔄 使用Yahoo Finance备用方案获取港股数据: {symbol}")
 
-                        self._wait_for_rate_limit()
+                        self._wait_for_rate_limit('yfinance')
                         ticker = yf.Ticker(symbol)  # 港股代码保持原格式
                         data = ticker.history(start=start_date, end=end_date)
 
@@ -143,7 +134,7 @@ class OptimizedUSDataProvider:
                 else:
                     # 美股使用Yahoo Finance
                     logger.info(f"🇺🇸 从Yahoo Finance API获取美股数据: {symbol}")
-                    self._wait_for_rate_limit()
+                    self._wait_for_rate_limit('yfinance_us')
 
                     # 获取数据
                     ticker = yf.Ticker(symbol.upper())
@@ -244,20 +235,12 @@ class OptimizedUSDataProvider:
         """尝试获取过期的缓存数据作为备用"""
         try:
             # 查找任何相关的缓存，不考虑TTL
-            for metadata_file in self.cache.metadata_dir.glob(f"*_meta.json"):
+            for metadata in self.cache.find_metadata(symbol=symbol, data_type='stock_data',
+                                                     market_type='us'):
                 try:
-                    import json
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    
-                    if (metadata.get('symbol') == symbol and 
-                        metadata.get('data_type') == 'stock_data' and
-                        metadata.get('market_type') == 'us'):
-                        
-                        cache_key = metadata_file.stem.replace('_meta', '')
-                        cached_data = self.cache.load_stock_data(cache_key)
-                        if cached_data:
-                            return cached_data + "\n\n⚠️ 注意: 使用的是过期缓存数据"
+                    cached_data = self.cache.load_stock_data(metadata['cache_key'])
+                    if cached_data:
+                        return cached_data + "\n\n⚠️ 注意: 使用的是过期缓存数据"
                 except Exception:
                     continue
         except Exception:
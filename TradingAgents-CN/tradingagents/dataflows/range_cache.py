@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+按日期区间感知的OHLCV缓存
+每个标的/数据源维护一条连续的日线序列和已覆盖的日期区间：
+- 重叠或相邻的下载结果合并为同一条序列
+- 任意已覆盖的子区间直接从本地切片返回
+- 只为缺失的边缘/中间缺口调用数据源
+- 覆盖区间按数据源实际返回的日期记录；节假日等无交易的短缺口记为"已覆盖(空)"
+- 复权序列（如前复权）按复权口径分开存储，补缺口时用相邻的已缓存K线校验复权基准，
+  基准变化（期间发生分红/送转）则整条序列作废重建，避免不同基准的K线混在一起
+"""
+
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .cache_catalog import CacheCatalog
+from .frame_storage import get_frame_storage, load_frame
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+DateRange = Tuple[str, str]
+
+# 常见的日期列名（Tushare标准化后/AKShare/BaoStock/yfinance）
+DATE_COLUMNS = ('date', 'trade_date', '日期', 'Date')
+CLOSE_COLUMNS = ('close', '收盘', 'Close')
+
+# 无数据的缺口边缘不超过该天数时视为休市（A股最长假期约9天），否则视为数据源没有返回完整区间
+MAX_HOLIDAY_DAYS = 10
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value[:10], "%Y-%m-%d")
+
+
+def _format_date(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d")
+
+
+def merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+    """合并重叠或相邻（相差一天）的日期区间"""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and _parse_date(start) <= _parse_date(merged[-1][1]) + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(start: str, end: str, covered: List[DateRange]) -> List[DateRange]:
+    """计算 [start, end] 中未被 covered 覆盖的缺口"""
+    gaps: List[DateRange] = []
+    cursor = _parse_date(start)
+    end_dt = _parse_date(end)
+    for covered_start, covered_end in merge_ranges(covered):
+        cs, ce = _parse_date(covered_start), _parse_date(covered_end)
+        if ce < cursor:
+            continue
+        if cs > end_dt:
+            break
+        if cs > cursor:
+            gaps.append((_format_date(cursor), _format_date(cs - timedelta(days=1))))
+        cursor = max(cursor, ce + timedelta(days=1))
+        if cursor > end_dt:
+            break
+    if cursor <= end_dt:
+        gaps.append((_format_date(cursor), _format_date(end_dt)))
+    return gaps
+
+
+def _has_weekday(start: str, end: str) -> bool:
+    day = _parse_date(start)
+    end_dt = _parse_date(end)
+    while day <= end_dt:
+        if day.weekday() < 5:
+            return True
+        day += timedelta(days=1)
+    return False
+
+
+def find_date_column(data: pd.DataFrame) -> Optional[str]:
+    for column in DATE_COLUMNS:
+        if column in data.columns:
+            return column
+    return None
+
+
+def find_close_column(data: pd.DataFrame) -> Optional[str]:
+    for column in CLOSE_COLUMNS:
+        if column in data.columns:
+            return column
+    return None
+
+
+def covered_span(gap_start: str, gap_end: str, dates: List[str]) -> Optional[DateRange]:
+    """
+    根据数据源实际返回的日期推断缺口中已确认的区间
+
+    返回日期之外的边缘只有在足够短（可视为休市）时才并入；
+    没有返回任何日期时，只有不含工作日或足够短的缺口才记为已覆盖（空）。
+    """
+    if not dates:
+        short = (_parse_date(gap_end) - _parse_date(gap_start)).days < MAX_HOLIDAY_DAYS
+        return (gap_start, gap_end) if short or not _has_weekday(gap_start, gap_end) else None
+    first, last = min(dates), max(dates)
+    if (_parse_date(first) - _parse_date(gap_start)).days <= MAX_HOLIDAY_DAYS:
+        first = gap_start
+    if (_parse_date(gap_end) - _parse_date(last)).days <= MAX_HOLIDAY_DAYS:
+        last = gap_end
+    return first, last
+
+
+class OHLCVRangeCache:
+    """按标的维护日期区间的日线数据缓存"""
+
+    def __init__(self, cache_dir: str = None, catalog: CacheCatalog = None):
+        """
+        初始化区间缓存
+
+        Args:
+            cache_dir: 序列文件目录，默认 tradingagents/dataflows/data_cache/ohlcv_series
+            catalog: 记录已覆盖区间的元数据目录，默认与 StockDataCache 共用同一个数据库
+        """
+        base_dir = Path(__file__).parent / "data_cache"
+        self.series_dir = Path(cache_dir) if cache_dir else base_dir / "ohlcv_series"
+        self.series_dir.mkdir(parents=True, exist_ok=True)
+        self.catalog = catalog or CacheCatalog(base_dir / "metadata" / "cache_catalog.db")
+        self.storage = get_frame_storage()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _series_key(self, symbol: str, source: str, adjustment: Optional[str] = None) -> str:
+        return f"{symbol}_{source}_{adjustment}" if adjustment else f"{symbol}_{source}"
+
+    def _series_lock(self, series_key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(series_key, threading.Lock())
+
+    def _series_path(self, series_key: str) -> Path:
+        return self.series_dir / f"{series_key}{self.storage.extension}"
+
+    def _load_series(self, series_key: str) -> Optional[pd.DataFrame]:
+        for path in self.series_dir.glob(f"{series_key}.*"):
+            try:
+                return load_frame(path, index=False)
+            except Exception as e:
+                logger.warning(f"⚠️ 读取区间缓存失败 {path.name}: {e}")
+        return None
+
+    def _save_series(self, series_key: str, data: pd.DataFrame):
+        for path in self.series_dir.glob(f"{series_key}.*"):
+            if path.suffix != self.storage.extension:
+                path.unlink()
+        self.storage.save(data, self._series_path(series_key), index=False)
+
+    @staticmethod
+    def _date_keys(data: pd.DataFrame, date_column: str) -> pd.Series:
+        return pd.to_datetime(data[date_column].astype(str)).dt.strftime("%Y-%m-%d")
+
+    def _merge(self, existing: Optional[pd.DataFrame], new_data: pd.DataFrame) -> pd.DataFrame:
+        """合并新旧数据，相同日期以新数据为准"""
+        frames = [df for df in (existing, new_data) if df is not None and not df.empty]
+        merged = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].copy()
+        date_column = find_date_column(merged)
+        keys = self._date_keys(merged, date_column)
+        merged = merged.assign(_range_key=keys)
+        merged = merged.drop_duplicates('_range_key', keep='last').sort_values('_range_key')
+        return merged.drop(columns='_range_key').reset_index(drop=True)
+
+    def missing_ranges(self, symbol: str, start_date: str, end_date: str,
+                       source: str = "default", adjustment: Optional[str] = None) -> List[DateRange]:
+        """返回请求区间中尚未缓存的缺口"""
+        covered = self.catalog.get_ranges(self._series_key(symbol, source, adjustment))
+        return subtract_ranges(start_date, end_date, covered)
+
+    def get(self, symbol: str, start_date: str, end_date: str,
+            fetcher: Callable[[str, str, str], Optional[pd.DataFrame]],
+            source: str = "default", adjustment: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        获取 [start_date, end_date] 的日线数据，只为缺口调用 fetcher
+
+        Args:
+            symbol: 股票代码
+            start_date: 开始日期 YYYY-MM-DD
+            end_date: 结束日期 YYYY-MM-DD
+            fetcher: fetcher(symbol, gap_start, gap_end) -> DataFrame
+            source: 数据源名称，不同数据源分开存储
+            adjustment: 复权方式（如 'qfq'），None 表示不复权；复权序列会校验复权基准
+
+        Returns:
+            DataFrame: 区间内的数据；无任何数据时返回None
+        """
+        series_key = self._series_key(symbol, source, adjustment)
+        with self._series_lock(series_key):
+            covered = self.catalog.get_ranges(series_key)
+            gaps = subtract_ranges(start_date, end_date, covered)
+            series = self._load_series(series_key)
+
+            if gaps:
+                logger.info(f"📐 [区间缓存] {symbol}({source}) 需补齐缺口: {gaps}")
+            else:
+                logger.debug(f"⚡ [区间缓存] {symbol}({source}) {start_date}~{end_date} 全部命中")
+
+            changed = False
+            for gap_start, gap_end in gaps:
+                anchor = self._anchor_date(series, gap_start, gap_end) if adjustment else None
+                fetch_start, fetch_end = gap_start, gap_end
+                if anchor is not None:
+                    # 多取一根已缓存的相邻K线，用来校验复权基准
+                    fetch_start, fetch_end = min(gap_start, anchor), max(gap_end, anchor)
+                data = self._fetch(symbol, fetch_start, fetch_end, fetcher)
+                if data is None:
+                    continue
+
+                if anchor is not None and not data.empty and not self._same_basis(series, data, anchor):
+                    logger.info(f"🔄 [区间缓存] {symbol}({source}) 复权基准已变化，重建整条序列")
+                    series, covered, changed = None, [], True
+                    data = self._fetch(symbol, start_date, end_date, fetcher)
+                    if data is not None:
+                        series, changed = self._absorb(series, data, start_date, end_date, covered)
+                    break
+
+                series, absorbed = self._absorb(series, data, gap_start, gap_end, covered)
+                changed = changed or absorbed
+
+            if changed:
+                if series is None or series.empty:
+                    for path in self.series_dir.glob(f"{series_key}.*"):
+                        path.unlink()
+                else:
+                    self._save_series(series_key, series)
+            if gaps:
+                self.catalog.set_ranges(series_key, merge_ranges(covered))
+
+        if series is None or series.empty:
+            return None
+        keys = self._date_keys(series, find_date_column(series))
+        window = series[(keys >= start_date) & (keys <= end_date)]
+        return window.reset_index(drop=True) if not window.empty else None
+
+    def _fetch(self, symbol: str, start: str, end: str, fetcher) -> Optional[pd.DataFrame]:
+        """调用数据源；失败或结果不可用时返回None（不记录覆盖）"""
+        try:
+            data = fetcher(symbol, start, end)
+        except Exception as e:
+            logger.warning(f"⚠️ [区间缓存] {symbol} 缺口 {start}~{end} 获取失败: {e}")
+            return None
+        if not isinstance(data, pd.DataFrame):
+            return None
+        if not data.empty and find_date_column(data) is None:
+            return None
+        return data
+
+    def _absorb(self, series: Optional[pd.DataFrame], data: pd.DataFrame,
+                gap_start: str, gap_end: str, covered: List[DateRange]) -> Tuple[Optional[pd.DataFrame], bool]:
+        """把缺口内实际返回的K线并入序列，并按返回的日期记录覆盖区间"""
+        changed = False
+        dates: List[str] = []
+        if not data.empty:
+            keys = self._date_keys(data, find_date_column(data))
+            # 数据源可能返回请求区间以外的数据（如部分匹配的降级结果），只采用缺口内的K线
+            in_gap = (keys >= gap_start) & (keys <= gap_end)
+            data = data[in_gap.values]
+            dates = keys[in_gap].tolist()
+            if dates:
+                series = self._merge(series, data)
+                changed = True
+
+        span = covered_span(gap_start, gap_end, dates)
+        if span is not None:
+            # 当日数据可能未收盘，已覆盖区间最多记到昨天
+            covered_end = min(span[1], _format_date(datetime.now() - timedelta(days=1)))
+            if span[0] <= covered_end:
+                covered.append((span[0], covered_end))
+        return series, changed
+
+    def _anchor_date(self, series: Optional[pd.DataFrame], gap_start: str, gap_end: str) -> Optional[str]:
+        """缺口之前最近的一根已缓存K线（没有则取缺口之后最近的一根）"""
+        if series is None or series.empty or find_close_column(series) is None:
+            return None
+        keys = self._date_keys(series, find_date_column(series))
+        before = keys[keys < gap_start]
+        if not before.empty:
+            return before.max()
+        after = keys[keys > gap_end]
+        return after.min() if not after.empty else None
+
+    def _same_basis(self, series: pd.DataFrame, data: pd.DataFrame, anchor: str) -> bool:
+        """比较锚点K线在缓存与新数据中的收盘价，判断复权基准是否一致"""
+        close_column = find_close_column(data)
+        if close_column is None or find_close_column(series) is None:
+            return True
+        new_rows = data[(self._date_keys(data, find_date_column(data)) == anchor).values]
+        old_rows = series[(self._date_keys(series, find_date_column(series)) == anchor).values]
+        if new_rows.empty or old_rows.empty:
+            return True
+        new_close = float(new_rows[close_column].iloc[-1])
+        old_close = float(old_rows[find_close_column(series)].iloc[-1])
+        return abs(new_close - old_close) <= 1e-6 * max(1.0, abs(old_close))
+
+    def invalidate(self, symbol: str, source: str = "default", adjustment: Optional[str] = None):
+        """删除某个标的的区间缓存"""
+        series_key = self._series_key(symbol, source, adjustment)
+        with self._series_lock(series_key):
+            self.catalog.set_ranges(series_key, [])
+            for path in self.series_dir.glob(f"{series_key}.*"):
+                path.unlink()
+
+
+# 全局区间缓存实例
+_range_cache = None
+
+def get_range_cache() -> OHLCVRangeCache:
+    """获取全局区间缓存实例（与 StockDataCache 共用元数据目录）"""
+    global _range_cache
+    if _range_cache is None:
+        from .cache_manager import get_cache
+        _range_cache = OHLCVRangeCache(catalog=get_cache().catalog)
+    return _range_cache
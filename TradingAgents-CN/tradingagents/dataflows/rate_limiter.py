@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+数据源限流服务
+按上游API（tushare、finnhub、yfinance、akshare等）共享令牌桶，替代各数据提供器各自维护的
+last_api_call + time.sleep：
+
+- 令牌桶支持突发容量，按预约方式扣减令牌（令牌可为负），并发调用者按到达顺序排队，
+  每个调用者只等待自己那一份，不会重复睡眠；
+- 进程内线程安全；可选通过文件锁（同一主机多进程）或Redis（多主机）共享桶状态；
+- 同步调用 acquire() 阻塞当前线程，协程中使用 await acquire_async() 不阻塞事件循环。
+
+配置（环境变量）:
+    TRADINGAGENTS_RATE_LIMIT_BACKEND   local | file | redis，默认 local
+    TRADINGAGENTS_RATE_LIMIT_DIR       file 后端的状态目录
+    TRADINGAGENTS_RATE_LIMIT_REDIS_URL redis 后端地址，默认使用 REDIS_CONNECTION_STRING
+    TRADINGAGENTS_RATE_LIMIT_<API>     覆盖某个API的限额，格式 "每秒速率[:突发容量]"，如 "2:5"
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """单个上游API的限额"""
+    rate: float       # 每秒补充的令牌数
+    capacity: float   # 桶容量（允许的突发请求数）
+
+
+# 默认限额，与各数据提供器原来的最小调用间隔一致，并允许少量突发
+DEFAULT_LIMITS: Dict[str, RateLimit] = {
+    'tushare': RateLimit(rate=2.0, capacity=5),   # 原间隔0.5秒
+    'finnhub': RateLimit(rate=1.0, capacity=5),   # 免费版60次/分钟
+    'yfinance': RateLimit(rate=0.5, capacity=2),     # 港股，原间隔2秒
+    'yfinance_us': RateLimit(rate=1.0, capacity=2),  # 美股，原间隔1秒
+    'akshare': RateLimit(rate=2.0, capacity=4),      # AKShareProvider的所有接口调用
+}
+
+
+def _reserve(tokens: float, updated: float, now: float, limit: RateLimit,
+             amount: float) -> Tuple[float, float]:
+    """补充令牌后预约 amount 个，返回 (剩余令牌, 需等待秒数)"""
+    tokens = min(limit.capacity, tokens + max(0.0, now - updated) * limit.rate)
+    tokens -= amount
+    wait = -tokens / limit.rate if tokens < 0 else 0.0
+    return tokens, wait
+
+
+class LocalBucketBackend:
+    """进程内令牌桶状态"""
+
+    name = 'local'
+    blocking_io = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def reserve(self, api: str, limit: RateLimit, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(api, (limit.capacity, now))
+            tokens, wait = _reserve(tokens, updated, now, limit, amount)
+            self._buckets[api] = (tokens, now)
+            return wait
+
+
+class FileLockBucketBackend:
+    """基于文件锁的令牌桶状态，同一主机上的多个进程共享"""
+
+    name = 'file'
+    blocking_io = True
+
+    def __init__(self, state_dir: Optional[str] = None):
+        if not FCNTL_AVAILABLE:
+            raise RuntimeError("当前平台不支持fcntl文件锁")
+        self.state_dir = Path(state_dir or Path(tempfile.gettempdir()) / "tradingagents_rate_limits")
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def reserve(self, api: str, limit: RateLimit, amount: float) -> float:
+        path = self.state_dir / f"{api}.json"
+        with self._lock, open(path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                now = time.time()
+                try:
+                    state = json.loads(content) if content else {}
+                except ValueError:
+                    state = {}
+                tokens, wait = _reserve(state.get('tokens', limit.capacity), state.get('updated', now),
+                                        now, limit, amount)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({'tokens': tokens, 'updated': now}))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+
+
+class RedisBucketBackend:
+    """基于Redis的令牌桶状态，多主机共享；用Lua脚本保证原子性，时间取Redis服务器时钟"""
+
+    name = 'redis'
+    blocking_io = True
+
+    _SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local amount = tonumber(ARGV[3])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate) - amount
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+    if tokens < 0 then
+        return tostring(-tokens / rate)
+    end
+    return '0'
+    """
+
+    def __init__(self, redis_url: str, key_prefix: str = 'rate_limit:'):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("redis 未安装")
+        self.client = redis.Redis.from_url(redis_url)
+        self.key_prefix = key_prefix
+        self._script = self.client.register_script(self._SCRIPT)
+
+    def reserve(self, api: str, limit: RateLimit, amount: float) -> float:
+        wait = self._script(keys=[f"{self.key_prefix}{api}"], args=[limit.rate, limit.capacity, amount])
+        return float(wait)
+
+
+class RateLimiterService:
+    """按上游API共享的令牌桶限流服务"""
+
+    def __init__(self, backend=None, limits: Optional[Dict[str, RateLimit]] = None):
+        self.backend = backend or LocalBucketBackend()
+        self.limits: Dict[str, RateLimit] = dict(DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def configure(self, api: str, rate: float, capacity: Optional[float] = None) -> None:
+        """设置某个上游API的限额（capacity默认等于1秒的令牌数，至少为1）"""
+        self.limits[api] = RateLimit(rate=rate, capacity=capacity if capacity else max(1.0, rate))
+
+    def _limit(self, api: str) -> Optional[RateLimit]:
+        limit = self.limits.get(api)
+        if limit is None or limit.rate <= 0:
+            return None
+        return limit
+
+    def _reserve(self, api: str, limit: RateLimit, amount: float) -> float:
+        try:
+            return self.backend.reserve(api, limit, amount)
+        except Exception as e:
+            # 共享后端不可用时退回进程内限流，避免数据获取整体失败
+            logger.warning(f"⚠️ 限流后端{self.backend.name}不可用，改用进程内限流: {e}")
+            self.backend = LocalBucketBackend()
+            return self.backend.reserve(api, limit, amount)
+
+    def _record(self, api: str, wait: float) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(api, {'requests': 0, 'throttled': 0, 'total_wait': 0.0})
+            stats['requests'] += 1
+            if wait > 0:
+                stats['throttled'] += 1
+                stats['total_wait'] += wait
+
+    def acquire(self, api: str, amount: float = 1.0) -> float:
+        """
+        获取调用许可，必要时阻塞当前线程
+
+        Returns:
+            float: 实际等待的秒数
+        """
+        limit = self._limit(api)
+        if limit is None:
+            return 0.0
+        wait = self._reserve(api, limit, amount)
+        self._record(api, wait)
+        if wait > 0:
+            if wait >= 1.0:
+                logger.info(f"⏳ {api} API限流等待 {wait:.1f}s...")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, api: str, amount: float = 1.0) -> float:
+        """协程版本的 acquire，等待期间不阻塞事件循环"""
+        limit = self._limit(api)
+        if limit is None:
+            return 0.0
+        if self.backend.blocking_io:
+            wait = await asyncio.get_running_loop().run_in_executor(None, self._reserve, api, limit, amount)
+        else:
+            wait = self._reserve(api, limit, amount)
+        self._record(api, wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        with self._stats_lock:
+            return {api: dict(stats) for api, stats in self._stats.items()}
+
+
+def _limits_from_env() -> Dict[str, RateLimit]:
+    limits = {}
+    prefix = 'TRADINGAGENTS_RATE_LIMIT_'
+    reserved = {'BACKEND', 'DIR', 'REDIS_URL'}
+    for name, value in os.environ.items():
+        if not name.startswith(prefix) or name[len(prefix):] in reserved:
+            continue
+        try:
+            rate, _, capacity = value.partition(':')
+            rate = float(rate)
+            limits[name[len(prefix):].lower()] = RateLimit(rate=rate, capacity=float(capacity or max(1.0, rate)))
+        except ValueError:
+            logger.warning(f"⚠️ 无效的限流配置 {name}={value}，应为 \"速率[:容量]\"")
+    return limits
+
+
+def _backend_from_env():
+    backend = os.getenv('TRADINGAGENTS_RATE_LIMIT_BACKEND', 'local').lower()
+    try:
+        if backend == 'file':
+            return FileLockBucketBackend(os.getenv('TRADINGAGENTS_RATE_LIMIT_DIR'))
+        if backend == 'redis':
+            redis_url = (os.getenv('TRADINGAGENTS_RATE_LIMIT_REDIS_URL')
+                         or os.getenv('REDIS_CONNECTION_STRING', 'redis://localhost:6379/0'))
+            return RedisBucketBackend(redis_url)
+    except Exception as e:
+        logger.warning(f"⚠️ 限流后端{backend}初始化失败，使用进程内限流: {e}")
+    return LocalBucketBackend()
+
+
+# 全局实例
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiterService:
+    """获取全局限流服务实例"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiterService(_backend_from_env(), _limits_from_env())
+                logger.info(f"🚦 数据源限流服务初始化完成（后端: {_rate_limiter.backend.name}）")
+    return _rate_limiter
@@ -6,14 +6,16 @@
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable, Tuple
 import time
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.news_dedup import get_near_duplicate_detector
 logger = get_logger('agents')
 
 
@@ -28,12 +30,40 @@ class NewsItem:
     url: str
     urgency: str  # high, medium, low
     relevance_score: float
+    also_reported_by: int = 0  # 近似重复聚类后，另有多少个来源报道了同一内容
+
+
+@dataclass
+class SourceFetchResult:
+    """单个新闻源的获取情况"""
+    source: str
+    status: str  # ok, empty, error, timeout, skipped
+    elapsed: float = 0.0
+    count: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class NewsFetchResult:
+    """新闻聚合结果（含各新闻源耗时）"""
+    news: List[NewsItem]
+    source_results: List[SourceFetchResult] = field(default_factory=list)
+    total_time: float = 0.0
+    fetch_mode: str = 'concurrent'
 
 
 class RealtimeNewsAggregator:
     """实时新闻聚合器"""
     
-    def __init__(self):
+    def __init__(self, fetch_mode: str = None, source_timeout: float = None,
+                 total_budget: float = None, source_timeouts: Dict[str, float] = None):
+        """
+        Args:
+            fetch_mode: concurrent（默认，并发请求）| sequential（逐个请求）
+            source_timeout: 单个新闻源的截止时间（秒），同时用作HTTP请求超时
+            total_budget: 一次聚合的总时间预算（秒）
+            source_timeouts: 按新闻源名称覆盖截止时间（同时用作该源的HTTP请求超时），如 {'中文财经': 12}
+        """
         self.headers = {
             'User-Agent': 'TradingAgents-CN/1.0'
         }
@@ -42,93 +72,156 @@ class RealtimeNewsAggregator:
         self.finnhub_key = os.getenv('FINNHUB_API_KEY')
         self.alpha_vantage_key = os.getenv('ALPHA_VANTAGE_API_KEY')
         self.newsapi_key = os.getenv('NEWSAPI_KEY')
+
+        # 抓取模式和时间预算
+        self.fetch_mode = (fetch_mode or os.getenv('NEWS_FETCH_MODE', 'concurrent')).lower()
+        self.source_timeout = source_timeout or float(os.getenv('NEWS_SOURCE_TIMEOUT', '8'))
+        self.total_budget = total_budget or float(os.getenv('NEWS_TOTAL_BUDGET', '15'))
+        self.source_timeouts = source_timeouts or {}
+
+        # 近似重复聚类的相似度阈值
+        self.dedup_threshold = float(os.getenv('NEWS_DEDUP_THRESHOLD', '0.6'))
         
     def get_realtime_stock_news(self, ticker: str, hours_back: int = 6) -> List[NewsItem]:
         """
         获取实时股票新闻
         优先级：专业API > 新闻API > 搜索引擎
         """
-        logger.info(f"[新闻聚合器] 开始获取 {ticker} 的实时新闻，回溯时间: {hours_back}小时")
-        start_time = datetime.now()
-        all_news = []
-        
-        # 1. FinnHub实时新闻 (最高优先级)
-        logger.info(f"[新闻聚合器] 尝试从 FinnHub 获取 {ticker} 的新闻")
-        finnhub_start = datetime.now()
-        finnhub_news = self._get_finnhub_realtime_news(ticker, hours_back)
-        finnhub_time = (datetime.now() - finnhub_start).total_seconds()
-        
-        if finnhub_news:
-            logger.info(f"[新闻聚合器] 成功从 FinnHub 获取 {len(finnhub_news)} 条新闻，耗时: {finnhub_time:.2f}秒")
-        else:
-            logger.info(f"[新闻聚合器] FinnHub 未返回新闻，耗时: {finnhub_time:.2f}秒")
-            
-        all_news.extend(finnhub_news)
-        
-        # 2. Alpha Vantage新闻
-        logger.info(f"[新闻聚合器] 尝试从 Alpha Vantage 获取 {ticker} 的新闻")
-        av_start = datetime.now()
-        av_news = self._get_alpha_vantage_news(ticker, hours_back)
-        av_time = (datetime.now() - av_start).total_seconds()
-        
-        if av_news:
-            logger.info(f"[新闻聚合器] 成功从 Alpha Vantage 获取 {len(av_news)} 条新闻，耗时: {av_time:.2f}秒")
-        else:
-            logger.info(f"[新闻聚合器] Alpha Vantage 未返回新闻，耗时: {av_time:.2f}秒")
-            
-        all_news.extend(av_news)
-        
-        # 3. NewsAPI (如果配置了)
-        if self.newsapi_key:
-            logger.info(f"[新闻聚合器] 尝试从 NewsAPI 获取 {ticker} 的新闻")
-            newsapi_start = datetime.now()
-            newsapi_news = self._get_newsapi_news(ticker, hours_back)
-            newsapi_time = (datetime.now() - newsapi_start).total_seconds()
-            
-            if newsapi_news:
-                logger.info(f"[新闻聚合器] 成功从 NewsAPI 获取 {len(newsapi_news)} 条新闻，耗时: {newsapi_time:.2f}秒")
+        return self.fetch_news(ticker, hours_back).news
+
+    def _timeout_for(self, name: str) -> float:
+        """新闻源的截止时间，按名称覆盖优先"""
+        return self.source_timeouts.get(name, self.source_timeout)
+
+    def _news_sources(self) -> List[Tuple[str, Callable[[str, int], List[NewsItem]], bool]]:
+        """按优先级返回 (名称, 获取函数, 是否启用) 列表，合并去重时靠前的来源优先保留"""
+        return [
+            ('FinnHub', self._get_finnhub_realtime_news, bool(self.finnhub_key)),
+            ('Alpha Vantage', self._get_alpha_vantage_news, bool(self.alpha_vantage_key)),
+            ('NewsAPI', self._get_newsapi_news, bool(self.newsapi_key)),
+            ('中文财经', self._get_chinese_finance_news, True),
+        ]
+
+    def fetch_news(self, ticker: str, hours_back: int = 6) -> NewsFetchResult:
+        """
+        获取实时股票新闻，并返回各新闻源的耗时和状态
+
+        concurrent 模式下所有新闻源同时请求，每个新闻源有独立的截止时间，
+        总耗时不超过 total_budget，超时未返回的新闻源直接放弃；
+        sequential 模式保持逐个请求的旧行为。
+        """
+        logger.info(f"[新闻聚合器] 开始获取 {ticker} 的实时新闻，回溯时间: {hours_back}小时，模式: {self.fetch_mode}")
+        start_time = time.monotonic()
+
+        sources = self._news_sources()
+        source_results: Dict[str, SourceFetchResult] = {}
+        source_news: Dict[str, List[NewsItem]] = {}
+
+        enabled = []
+        for name, fetch, is_enabled in sources:
+            if is_enabled:
+                enabled.append((name, fetch))
             else:
-                logger.info(f"[新闻聚合器] NewsAPI 未返回新闻，耗时: {newsapi_time:.2f}秒")
-                
-            all_news.extend(newsapi_news)
-        else:
-            logger.info(f"[新闻聚合器] NewsAPI 密钥未配置，跳过此新闻源")
-        
-        # 4. 中文财经新闻源
-        logger.info(f"[新闻聚合器] 尝试获取 {ticker} 的中文财经新闻")
-        chinese_start = datetime.now()
-        chinese_news = self._get_chinese_finance_news(ticker, hours_back)
-        chinese_time = (datetime.now() - chinese_start).total_seconds()
-        
-        if chinese_news:
-            logger.info(f"[新闻聚合器] 成功获取 {len(chinese_news)} 条中文财经新闻，耗时: {chinese_time:.2f}秒")
+                logger.info(f"[新闻聚合器] {name} 密钥未配置，跳过此新闻源")
+                source_results[name] = SourceFetchResult(source=name, status='skipped')
+
+        if self.fetch_mode == 'sequential':
+            for name, fetch in enabled:
+                source_results[name], source_news[name] = self._timed_fetch(name, fetch, ticker, hours_back)
         else:
-            logger.info(f"[新闻聚合器] 未获取到中文财经新闻，耗时: {chinese_time:.2f}秒")
-            
-        all_news.extend(chinese_news)
-        
+            self._fetch_concurrently(enabled, ticker, hours_back, source_results, source_news)
+
+        # 按新闻源优先级合并
+        all_news = []
+        for name, _, _ in sources:
+            all_news.extend(source_news.get(name, []))
+
         # 去重和排序
         logger.info(f"[新闻聚合器] 开始对 {len(all_news)} 条新闻进行去重和排序")
-        dedup_start = datetime.now()
         unique_news = self._deduplicate_news(all_news)
         sorted_news = sorted(unique_news, key=lambda x: x.publish_time, reverse=True)
-        dedup_time = (datetime.now() - dedup_start).total_seconds()
-        
-        # 记录去重结果
-        removed_count = len(all_news) - len(unique_news)
-        logger.info(f"[新闻聚合器] 新闻去重完成，移除了 {removed_count} 条重复新闻，剩余 {len(sorted_news)} 条，耗时: {dedup_time:.2f}秒")
-        
-        # 记录总体情况
-        total_time = (datetime.now() - start_time).total_seconds()
-        logger.info(f"[新闻聚合器] {ticker} 的新闻聚合完成，总共获取 {len(sorted_news)} 条新闻，总耗时: {total_time:.2f}秒")
-        
+
+        total_time = time.monotonic() - start_time
+        timings = ", ".join(
+            f"{name}: {result.status} {result.elapsed:.2f}s"
+            for name, result in source_results.items() if result.status != 'skipped'
+        )
+        logger.info(f"[新闻聚合器] {ticker} 的新闻聚合完成，总共获取 {len(sorted_news)} 条新闻，"
+                    f"总耗时: {total_time:.2f}秒 ({timings})")
+
         # 记录一些新闻标题示例
         if sorted_news:
             sample_titles = [item.title for item in sorted_news[:3]]
             logger.info(f"[新闻聚合器] 新闻标题示例: {', '.join(sample_titles)}")
-        
-        return sorted_news
-    
+
+        return NewsFetchResult(
+            news=sorted_news,
+            source_results=[source_results[name] for name, _, _ in sources],
+            total_time=total_time,
+            fetch_mode=self.fetch_mode,
+        )
+
+    def _timed_fetch(self, name: str, fetch: Callable[[str, int], List[NewsItem]],
+                     ticker: str, hours_back: int) -> Tuple[SourceFetchResult, List[NewsItem]]:
+        """调用单个新闻源并记录耗时"""
+        source_start = time.monotonic()
+        try:
+            news = fetch(ticker, hours_back) or []
+            status, error = ('ok' if news else 'empty'), None
+        except Exception as e:
+            news, status, error = [], 'error', str(e)
+        elapsed = time.monotonic() - source_start
+
+        if news:
+            logger.info(f"[新闻聚合器] 成功从 {name} 获取 {len(news)} 条新闻，耗时: {elapsed:.2f}秒")
+        else:
+            logger.info(f"[新闻聚合器] {name} 未返回新闻，耗时: {elapsed:.2f}秒")
+
+        result = SourceFetchResult(source=name, status=status, elapsed=elapsed,
+                                   count=len(news), error=error)
+        return result, news
+
+    def _fetch_concurrently(self, enabled: List[Tuple[str, Callable[[str, int], List[NewsItem]]]],
+                            ticker: str, hours_back: int,
+                            source_results: Dict[str, SourceFetchResult],
+                            source_news: Dict[str, List[NewsItem]]):
+        """并发请求所有新闻源，按各自截止时间和总预算收集结果"""
+        if not enabled:
+            return
+
+        start = time.monotonic()
+        budget_deadline = start + self.total_budget
+        executor = ThreadPoolExecutor(max_workers=len(enabled), thread_name_prefix="news-fetch")
+        pending = {}
+        deadlines = {}
+        for name, fetch in enabled:
+            future = executor.submit(self._timed_fetch, name, fetch, ticker, hours_back)
+            pending[future] = name
+            deadlines[name] = min(start + self._timeout_for(name), budget_deadline)
+
+        try:
+            while pending:
+                now = time.monotonic()
+                for future, name in list(pending.items()):
+                    if now >= deadlines[name]:
+                        future.cancel()
+                        del pending[future]
+                        logger.warning(f"⚠️ [新闻聚合器] {name} 超过截止时间，放弃等待 ({now - start:.2f}秒)")
+                        source_results[name] = SourceFetchResult(source=name, status='timeout',
+                                                                 elapsed=now - start)
+                if not pending:
+                    break
+
+                next_deadline = min(deadlines[name] for name in pending.values())
+                done, _ = wait(list(pending), timeout=max(0.0, next_deadline - now),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    source_results[name], source_news[name] = future.result()
+        finally:
+            # 不等待超时的新闻源线程结束，它们会在各自的请求超时后退出
+            executor.shutdown(wait=False)
+
     def _get_finnhub_realtime_news(self, ticker: str, hours_back: int) -> List[NewsItem]:
         """获取FinnHub实时新闻"""
         if not self.finnhub_key:
@@ -148,7 +241,8 @@ class RealtimeNewsAggregator:
                 'token': self.finnhub_key
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = requests.get(url, params=params, headers=self.headers,
+                                    timeout=self._timeout_for('FinnHub'))
             response.raise_for_status()
             
             news_data = response.json()
@@ -193,7 +287,8 @@ class RealtimeNewsAggregator:
                 'limit': 50
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = requests.get(url, params=params, headers=self.headers,
+                                    timeout=self._timeout_for('Alpha Vantage'))
             response.raise_for_status()
             
             data = response.json()
@@ -253,7 +348,8 @@ class RealtimeNewsAggregator:
                 'apiKey': self.newsapi_key
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = requests.get(url, params=params, headers=self.headers,
+                                    timeout=self._timeout_for('NewsAPI'))
             response.raise_for_status()
             
             data = response.json()
@@ -425,7 +521,11 @@ class RealtimeNewsAggregator:
             import feedparser
             
             logger.info(f"[RSS解析] 尝试获取RSS源内容")
-            feed = feedparser.parse(rss_url)
+            # feedparser直接请求URL时没有超时，先用requests按中文财经源的超时获取
+            response = requests.get(rss_url, headers=self.headers,
+                                    timeout=self._timeout_for('中文财经'))
+            response.raise_for_status()
+            feed = feedparser.parse(response.content)
             
             if not feed or not feed.entries:
                 logger.warning(f"[RSS解析] RSS源未返回有效内容")
@@ -580,13 +680,28 @@ class RealtimeNewsAggregator:
             # 添加到结果集
             seen_titles.add(title_key)
             unique_news.append(item)
+
+        # 近似重复聚类：同一事件被多家媒体转载、标题略有差异时只保留优先级最高的一条
+        detector = get_near_duplicate_detector(self.dedup_threshold)
+        clusters = detector.cluster_items(
+            unique_news,
+            text_fn=lambda item: f"{item.title} {item.content}",
+            source_fn=lambda item: item.source,
+        )
+        near_duplicate_count = len(unique_news) - len(clusters)
+        clustered_news = []
+        for cluster in clusters:
+            representative = unique_news[cluster.representative]
+            representative.also_reported_by = cluster.also_reported_by
+            clustered_news.append(representative)
         
         # 记录去重结果
         time_taken = (datetime.now() - start_time).total_seconds()
-        logger.info(f"[新闻去重] 去重完成，原始新闻: {len(news_items)}条，去重后: {len(unique_news)}条，")
-        logger.info(f"[新闻去重] 去除重复: {duplicate_count}条，标题过短: {short_title_count}条，耗时: {time_taken:.2f}秒")
+        logger.info(f"[新闻去重] 去重完成，原始新闻: {len(news_items)}条，去重后: {len(clustered_news)}条，")
+        logger.info(f"[新闻去重] 去除重复: {duplicate_count}条，近似重复: {near_duplicate_count}条，"
+                    f"标题过短: {short_title_count}条，耗时: {time_taken:.2f}秒")
         
-        return unique_news
+        return clustered_news
     
     def format_news_report(self, news_items: List[NewsItem], ticker: str) -> str:
         """格式化新闻报告"""
@@ -625,14 +740,20 @@ class RealtimeNewsAggregator:
             report += "## 🚨 紧急新闻\n\n"
             for news in high_urgency[:3]:  # 最多显示3条
                 report += f"### {news.title}\n"
-                report += f"**来源**: {news.source} | **时间**: {news.publish_time.strftime('%H:%M')}\n"
+                report += f"**来源**: {news.source} | **时间**: {news.publish_time.strftime('%H:%M')}"
+                if news.also_reported_by:
+                    report += f" | 另有{news.also_reported_by}个来源报道"
+                report += "\n"
                 report += f"{news.content}\n\n"
         
         if medium_urgency:
             report += "## 📢 重要新闻\n\n"
             for news in medium_urgency[:5]:  # 最多显示5条
                 report += f"### {news.title}\n"
-                report += f"**来源**: {news.source} | **时间**: {news.publish_time.strftime('%H:%M')}\n"
+                report += f"**来源**: {news.source} | **时间**: {news.publish_time.strftime('%H:%M')}"
+                if news.also_reported_by:
+                    report += f" | 另有{news.also_reported_by}个来源报道"
+                report += "\n"
                 report += f"{news.content}\n\n"
         
         # 添加时效性说明
@@ -0,0 +1,253 @@
+"""
+Date-partitioned index for offline Reddit JSONL dumps.
+
+The raw dumps (``<data_path>/<category>/<subreddit>.jsonl``) are scanned once per
+category and split into compact per-day files::
+
+    <data_path>/.reddit_index/<category>/manifest.json
+    <data_path>/.reddit_index/<category>/<YYYY-MM-DD>.jsonl
+
+Each indexed record keeps only the fields the news tools use plus the tickers
+(from ``ticker_to_company``) whose company name or symbol appears in the title
+or text, so company filtering is a set lookup instead of per-line regexes.
+The manifest stores the size and mtime of every dump file; the category is
+re-indexed when a dump changes. Rebuilds are written to a unique staging
+directory and swapped in under an exclusive file lock (``<category>.lock``);
+readers hold a shared lock, so processes sharing a data path never see a
+half-replaced index.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+INDEX_DIR_NAME = ".reddit_index"
+INDEX_VERSION = 1
+
+_category_locks: Dict[str, threading.Lock] = {}
+_category_locks_guard = threading.Lock()
+
+
+def search_terms(ticker: str, ticker_to_company: Dict[str, str]) -> List[str]:
+    """Company names (split on " OR ") plus the ticker itself, as used for matching"""
+    company = ticker_to_company.get(ticker, ticker)
+    terms = company.split(" OR ") if "OR" in company else [company]
+    return terms + [ticker]
+
+
+def compile_ticker_patterns(ticker_to_company: Dict[str, str]) -> Dict[str, "re.Pattern"]:
+    # Terms are regular expressions, as in the original per-line matching
+    return {
+        ticker: re.compile("|".join(f"(?:{term})" for term in search_terms(ticker, ticker_to_company)),
+                           re.IGNORECASE)
+        for ticker in ticker_to_company
+    }
+
+
+def post_date(created_utc: float) -> str:
+    return datetime.fromtimestamp(created_utc, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _category_lock(path: str) -> threading.Lock:
+    with _category_locks_guard:
+        return _category_locks.setdefault(path, threading.Lock())
+
+
+@contextmanager
+def _index_file_lock(category_index: str, exclusive: bool):
+    """Cross-process lock on a category index (no-op where fcntl is unavailable)"""
+    if not FCNTL_AVAILABLE:
+        yield
+        return
+    os.makedirs(os.path.dirname(category_index), exist_ok=True)
+    with open(f"{category_index}.lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RedditDateIndex:
+    """Per-(category, date) partitions of the Reddit dumps under one data path"""
+
+    def __init__(self, data_path: str, ticker_to_company: Dict[str, str]):
+        self.data_path = data_path
+        self.index_root = os.path.join(data_path, INDEX_DIR_NAME)
+        self.ticker_to_company = ticker_to_company
+        self._patterns = None
+
+    def _dump_files(self, category: str) -> Dict[str, Tuple[int, float]]:
+        category_dir = os.path.join(self.data_path, category)
+        files = {}
+        for name in os.listdir(category_dir):
+            if name.endswith(".jsonl"):
+                stat = os.stat(os.path.join(category_dir, name))
+                files[name] = (stat.st_size, stat.st_mtime)
+        return files
+
+    def _load_manifest(self, category: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.index_root, category, "manifest.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def ensure_index(self, category: str) -> str:
+        """Build or refresh the index of a category; returns its directory"""
+        category_index = os.path.join(self.index_root, category)
+        with _category_lock(category_index), _index_file_lock(category_index, exclusive=True):
+            files = self._dump_files(category)
+            manifest = self._load_manifest(category)
+            expected = {name: list(stat) for name, stat in files.items()}
+            if manifest and manifest.get("version") == INDEX_VERSION and manifest.get("files") == expected:
+                return category_index
+            self._build(category, category_index, expected)
+        return category_index
+
+    def _build(self, category: str, category_index: str, files: Dict[str, List]) -> None:
+        if self._patterns is None:
+            self._patterns = compile_ticker_patterns(self.ticker_to_company)
+        match_tickers = "company" in category
+
+        os.makedirs(self.index_root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f"{category}.building.", dir=self.index_root)
+        try:
+            self._write_partitions(category, staging, files, match_tickers)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        # Move the old index aside and the new one into place (both renames are atomic),
+        # then delete the old copy; readers are excluded by the file lock meanwhile
+        retired = None
+        if os.path.exists(category_index):
+            retired = tempfile.mkdtemp(prefix=f"{category}.retired.", dir=self.index_root)
+            os.replace(category_index, os.path.join(retired, "index"))
+        os.replace(staging, category_index)
+        if retired is not None:
+            shutil.rmtree(retired, ignore_errors=True)
+
+    def _write_partitions(self, category: str, staging: str, files: Dict[str, List],
+                          match_tickers: bool) -> None:
+
+        # Records are appended per day in dump file order, so per-subreddit order is preserved
+        handles = {}
+        days: Dict[str, int] = {}
+        try:
+            for data_file in files:
+                with open(os.path.join(self.data_path, category, data_file), "rb") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        parsed = json.loads(line)
+                        day = post_date(parsed["created_utc"])
+                        record = {
+                            "subreddit": data_file,
+                            "title": parsed["title"],
+                            "content": parsed["selftext"],
+                            "url": parsed["url"],
+                            "upvotes": parsed["ups"],
+                            "posted_date": day,
+                        }
+                        if match_tickers:
+                            record["tickers"] = [
+                                ticker for ticker, pattern in self._patterns.items()
+                                if pattern.search(parsed["title"]) or pattern.search(parsed["selftext"])
+                            ]
+                        handle = handles.get(day)
+                        if handle is None:
+                            handle = handles[day] = open(os.path.join(staging, f"{day}.jsonl"), "w",
+                                                         encoding="utf-8")
+                        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        days[day] = days.get(day, 0) + 1
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+        with open(os.path.join(staging, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "files": files, "days": days}, f)
+
+    def iter_day(self, category: str, date: str) -> Iterator[Dict]:
+        """Indexed records of one day (the index must be current)"""
+        path = os.path.join(self.index_root, category, f"{date}.jsonl")
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def fetch_range(self, category: str, start_date: str, end_date: str, max_limit: int,
+                    query: Optional[str] = None) -> Dict[str, List[Dict]]:
+        """
+        Top posts per day between start_date and end_date (inclusive)
+
+        Same selection as ``fetch_top_from_category`` for each day: at most
+        ``max_limit // number of category entries`` posts per subreddit, by upvotes.
+        """
+        entries = os.listdir(os.path.join(self.data_path, category))
+        if max_limit < len(entries):
+            raise ValueError(
+                "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
+            )
+        limit_per_subreddit = max_limit // len(entries)
+        subreddit_order = [name for name in entries if name.endswith(".jsonl")]
+
+        self.ensure_index(category)
+        filter_pattern = None
+        if "company" in category and query and query not in self.ticker_to_company:
+            # Not precomputed: match this query at read time
+            filter_pattern = compile_ticker_patterns({query: query})[query]
+
+        # Shared lock: a rebuild in another process cannot swap the index mid-read
+        with _index_file_lock(os.path.join(self.index_root, category), exclusive=False):
+            results = {}
+            day = datetime.strptime(start_date, "%Y-%m-%d")
+            last = datetime.strptime(end_date, "%Y-%m-%d")
+            while day <= last:
+                date = day.strftime("%Y-%m-%d")
+                by_subreddit: Dict[str, List[Dict]] = {}
+                for record in self.iter_day(category, date):
+                    if "company" in category and query:
+                        if filter_pattern is not None:
+                            if not (filter_pattern.search(record["title"]) or filter_pattern.search(record["content"])):
+                                continue
+                        elif query not in record.get("tickers", ()):
+                            continue
+                    by_subreddit.setdefault(record["subreddit"], []).append(record)
+
+                posts = []
+                for subreddit in subreddit_order:
+                    subreddit_posts = by_subreddit.get(subreddit, [])
+                    subreddit_posts.sort(key=lambda x: x["upvotes"], reverse=True)
+                    posts.extend(
+                        {key: post[key] for key in ("title", "content", "url", "upvotes", "posted_date")}
+                        for post in subreddit_posts[:limit_per_subreddit]
+                    )
+                results[date] = posts
+                day += timedelta(days=1)
+        return results
+
+
+_indexes: Dict[Tuple[str, int], RedditDateIndex] = {}
+_indexes_guard = threading.Lock()
+
+
+def get_reddit_index(data_path: str, ticker_to_company: Dict[str, str]) -> RedditDateIndex:
+    key = (os.path.abspath(data_path), id(ticker_to_company))
+    with _indexes_guard:
+        if key not in _indexes:
+            _indexes[key] = RedditDateIndex(data_path, ticker_to_company)
+        return _indexes[key]
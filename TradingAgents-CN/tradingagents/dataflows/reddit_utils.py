@@ -7,6 +7,11 @@ from typing import Annotated
 import os
 import re
 
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+from .reddit_index import get_reddit_index
+
 ticker_to_company = {
     "AAPL": "Apple",
     "MSFT": "Microsoft",
@@ -61,6 +66,47 @@ def fetch_top_from_category(
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
+    return fetch_top_from_category_range(
+        category, date, date, max_limit, query, data_path=data_path
+    )[date]
+
+
+def fetch_top_from_category_range(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    """Top posts for every day in the range, keyed by date.
+
+    Reads the date-partitioned index (built once per category, see reddit_index),
+    falling back to scanning the raw dumps if the index cannot be written.
+    """
+    try:
+        index = get_reddit_index(data_path, ticker_to_company)
+        return index.fetch_range(category, start_date, end_date, max_limit, query)
+    except (OSError, ValueError) as e:
+        if isinstance(e, ValueError) and "REDDIT FETCHING ERROR" in str(e):
+            raise
+        logger.warning(f"Reddit index unavailable, scanning raw dumps: {e}")
+
+    results = {}
+    day = datetime.strptime(start_date, "%Y-%m-%d")
+    while day <= datetime.strptime(end_date, "%Y-%m-%d"):
+        date = day.strftime("%Y-%m-%d")
+        results[date] = _scan_top_from_category(category, date, max_limit, query, data_path)
+        day += timedelta(days=1)
+    return results
+
+
+def _scan_top_from_category(category, date, max_limit, query=None, data_path="reddit_data"):
     base_path = data_path
 
     all_content = []
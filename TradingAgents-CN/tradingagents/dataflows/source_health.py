@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+数据源健康度统计
+按数据源记录实时延迟和错误率，供 DataSourceManager 按健康度排序数据源、计算对冲请求延迟：
+
+- 延迟和错误率使用EWMA，近期表现权重更高；
+- 保留最近若干次成功请求的耗时，用于估计p95延迟；
+- 连续失败达到阈值后进入冷却期，冷却期内排到健康数据源之后，过后自动重新尝试。
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Hashable, List, Optional, Sequence
+
+
+@dataclass
+class SourceHealth:
+    """单个数据源的实时统计"""
+    latency_ewma: Optional[float] = None          # 成功请求的延迟
+    failure_latency_ewma: Optional[float] = None  # 失败请求的耗时（超时/报错前等待的时间）
+    error_rate: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_failure: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=100))
+
+    def p95(self) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+class SourceHealthTracker:
+    """数据源延迟/错误率统计与排序（线程安全）"""
+
+    def __init__(self, alpha: float = 0.2, failure_threshold: int = 3, cooldown: float = 60.0,
+                 error_rate_threshold: float = 0.5, preference_factor: float = 3.0,
+                 default_latency: float = 1.0):
+        """
+        Args:
+            alpha: EWMA平滑系数
+            failure_threshold: 连续失败多少次进入冷却
+            cooldown: 冷却时长（秒）
+            error_rate_threshold: 错误率达到该值视为不健康
+            preference_factor: 首选数据源的粘性，其他数据源需要快这么多倍才会排到它前面
+            default_latency: 尚无样本时假定的延迟（秒）
+        """
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.error_rate_threshold = error_rate_threshold
+        self.preference_factor = preference_factor
+        self.default_latency = default_latency
+        self._lock = threading.Lock()
+        self._sources: Dict[Hashable, SourceHealth] = {}
+
+    def record(self, source: Hashable, duration: float, success: bool) -> None:
+        """记录一次请求结果"""
+        with self._lock:
+            health = self._sources.setdefault(source, SourceHealth())
+            a = self.alpha
+            health.requests += 1
+            health.error_rate = (1 - a) * health.error_rate + a * (0.0 if success else 1.0)
+            # 成功与失败的耗时分开统计：快速失败不能让数据源显得快
+            if success:
+                health.latency_ewma = self._ewma(health.latency_ewma, duration)
+                health.consecutive_failures = 0
+                health.latencies.append(duration)
+            else:
+                health.failure_latency_ewma = self._ewma(health.failure_latency_ewma, duration)
+                health.failures += 1
+                health.consecutive_failures += 1
+                health.last_failure = time.time()
+
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        return value if current is None else (1 - self.alpha) * current + self.alpha * value
+
+    def is_healthy(self, source: Hashable) -> bool:
+        with self._lock:
+            return self._is_healthy(self._sources.get(source))
+
+    def _is_healthy(self, health: Optional[SourceHealth]) -> bool:
+        if health is None:
+            return True
+        if (health.consecutive_failures >= self.failure_threshold
+                and time.time() - health.last_failure < self.cooldown):
+            return False
+        return health.error_rate < self.error_rate_threshold or health.consecutive_failures == 0
+
+    @staticmethod
+    def _tier(health: Optional[SourceHealth], healthy: bool) -> int:
+        """0: 最近一次请求成功或尚无样本；1: 最近在失败；2: 不健康（冷却中/错误率过高）"""
+        if not healthy:
+            return 2
+        if health is not None and (health.consecutive_failures > 0 or health.latency_ewma is None):
+            return 1
+        return 0
+
+    def _score(self, health: Optional[SourceHealth], retry_cost: float) -> float:
+        """
+        期望耗时：成功延迟 + 失败次数期望 × (失败耗时 + 改用下一个数据源的耗时)
+
+        按成功概率p折算，失败次数期望为 (1-p)/p；从未成功的数据源视为无穷大。
+        """
+        if health is None:
+            return self.default_latency
+        if health.latency_ewma is None:
+            return float('inf')
+        p_fail = min(health.error_rate, 0.95)
+        failure_latency = health.failure_latency_ewma or 0.0
+        return health.latency_ewma + p_fail / (1 - p_fail) * (failure_latency + retry_cost)
+
+    def rank(self, sources: Sequence[Hashable]) -> List[Hashable]:
+        """
+        按健康度排序数据源
+
+        Args:
+            sources: 按配置优先级排列的数据源，第一个为首选数据源
+
+        Returns:
+            最近成功的数据源在前（按期望耗时，首选数据源有粘性），最近失败的其次，不健康的在后
+        """
+        if not sources:
+            return []
+        preferred = sources[0]
+        with self._lock:
+            healths = [self._sources.get(source) for source in sources]
+            entries = []
+            for priority, (source, health) in enumerate(zip(sources, healths)):
+                # 失败后的代价：改用其他数据源中最快的那个
+                others = [h.latency_ewma for h in healths
+                          if h is not None and h is not health and h.latency_ewma is not None]
+                retry_cost = min(others) if others else self.default_latency
+                score = self._score(health, retry_cost)
+                if source == preferred:
+                    # 首选数据源尚无样本时先尝试它
+                    score = 0.0 if health is None else score / self.preference_factor
+                healthy = self._is_healthy(health)
+                entries.append((self._tier(health, healthy), score, priority, source))
+        entries.sort(key=lambda entry: entry[:3])
+        return [entry[3] for entry in entries]
+
+    def p95_latency(self, source: Hashable) -> Optional[float]:
+        with self._lock:
+            health = self._sources.get(source)
+            return health.p95() if health else None
+
+    def get_stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                getattr(source, 'value', str(source)): {
+                    'healthy': self._is_healthy(health),
+                    'latency_ewma': health.latency_ewma,
+                    'failure_latency_ewma': health.failure_latency_ewma,
+                    'p95_latency': health.p95(),
+                    'error_rate': health.error_rate,
+                    'requests': health.requests,
+                    'failures': health.failures,
+                    'consecutive_failures': health.consecutive_failures,
+                }
+                for source, health in self._sources.items()
+            }
@@ -1,9 +1,168 @@
 import pandas as pd
 import yfinance as yf
 from stockstats import wrap
-from typing import Annotated
+from typing import Annotated, Dict, List, Sequence, Tuple, Union
+from collections import OrderedDict
+from datetime import datetime, timedelta
 import os
+import threading
 from .config import get_config
+from .frame_storage import find_price_data_file, get_frame_storage, load_frame
+
+NOT_TRADING_DAY = "N/A: Not a trading day (weekend or holiday)"
+
+
+class _PriceHistory:
+    """单个标的的价格历史及其已计算的指标列"""
+
+    __slots__ = ("stock_df", "dates", "positions", "values", "lock")
+
+    def __init__(self, data: pd.DataFrame):
+        self.dates = data["Date"].astype(str).str[:10].tolist()
+        self.positions = {date: pos for pos, date in enumerate(self.dates)}
+        # stockstats 会就地改写列名并设置索引，这里包装一份副本
+        self.stock_df = wrap(data.copy())
+        self.values: Dict[str, list] = {}
+        self.lock = threading.Lock()
+
+    def get_values(self, indicator: str) -> list:
+        """整列计算指标（每个指标只计算一次）"""
+        with self.lock:
+            if indicator not in self.values:
+                self.values[indicator] = self.stock_df[indicator].values.tolist()
+            return self.values[indicator]
+
+
+class StockstatsIndicatorEngine:
+    """
+    整段窗口技术指标引擎
+
+    每个标的的价格文件只读取一次，指标在整条序列上一次性向量化计算，
+    回看窗口直接从计算结果中切片，避免逐日重复读取CSV和重算指标。
+    """
+
+    def __init__(self, max_symbols: int = 64):
+        self.max_symbols = max_symbols
+        self._histories: "OrderedDict[Tuple[str, float], _PriceHistory]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_history(self, symbol: str, data_dir: str, online: bool) -> _PriceHistory:
+        if online:
+            data_file = self._ensure_online_data(symbol)
+        else:
+            data_file = find_price_data_file(symbol, data_dir)
+            if data_file is None:
+                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+            data_file = str(data_file)
+
+        key = (data_file, os.path.getmtime(data_file))
+        with self._lock:
+            history = self._histories.get(key)
+            if history is not None:
+                self._histories.move_to_end(key)
+                return history
+
+        history = _PriceHistory(load_frame(data_file, index=False))
+        with self._lock:
+            # 同一文件的旧版本（mtime变化）直接淘汰
+            for stale_key in [k for k in self._histories if k[0] == data_file]:
+                del self._histories[stale_key]
+            self._histories[key] = history
+            while len(self._histories) > self.max_symbols:
+                self._histories.popitem(last=False)
+        return history
+
+    @staticmethod
+    def _ensure_online_data(symbol: str) -> str:
+        """确保当天的在线价格缓存文件存在，返回文件路径"""
+        today_date = pd.Timestamp.today()
+        start_date = (today_date - pd.DateOffset(years=15)).strftime("%Y-%m-%d")
+        end_date = today_date.strftime("%Y-%m-%d")
+
+        config = get_config()
+        os.makedirs(config["data_cache_dir"], exist_ok=True)
+
+        stem = os.path.join(
+            config["data_cache_dir"],
+            f"{symbol}-YFin-data-{start_date}-{end_date}",
+        )
+        for extension in (".parquet", ".feather", ".csv"):
+            if os.path.exists(stem + extension):
+                return stem + extension
+
+        data = yf.download(
+            symbol,
+            start=start_date,
+            end=end_date,
+            multi_level_index=False,
+            progress=False,
+            auto_adjust=True,
+        )
+        data = data.reset_index()
+        return str(get_frame_storage().save(data, stem, index=False))
+
+    def get_indicator_value(
+        self, symbol: str, indicator: str, curr_date: str, data_dir: str, online: bool = False
+    ):
+        """获取单个交易日的指标值，非交易日返回提示字符串"""
+        history = self._get_history(symbol, data_dir, online)
+        pos = history.positions.get(curr_date[:10])
+        if pos is None:
+            return NOT_TRADING_DAY
+        return history.get_values(indicator)[pos]
+
+    def get_indicator_window(
+        self,
+        symbol: str,
+        indicators: Sequence[str],
+        curr_date: str,
+        look_back_days: int,
+        data_dir: str,
+        online: bool = False,
+        trading_days_only: bool = True,
+    ) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        一次性获取多个指标在回看窗口内的取值
+
+        Returns:
+            Dict[str, List[Tuple[str, str]]]: 指标 -> [(日期, 取值)]，日期从近到远排列；
+            trading_days_only为False时非交易日以提示字符串填充
+        """
+        history = self._get_history(symbol, data_dir, online)
+        end = datetime.strptime(curr_date, "%Y-%m-%d")
+        days = [
+            (end - timedelta(days=offset)).strftime("%Y-%m-%d")
+            for offset in range(look_back_days + 1)
+        ]
+
+        result = {}
+        for indicator in indicators:
+            values = history.get_values(indicator)
+            rows = []
+            for day in days:
+                pos = history.positions.get(day)
+                if pos is not None:
+                    rows.append((day, str(values[pos])))
+                elif not trading_days_only:
+                    rows.append((day, NOT_TRADING_DAY))
+            result[indicator] = rows
+        return result
+
+    def clear(self):
+        """清空已加载的价格历史"""
+        with self._lock:
+            self._histories.clear()
+
+
+# 全局指标引擎实例
+_indicator_engine = None
+
+def get_indicator_engine() -> StockstatsIndicatorEngine:
+    """获取全局指标引擎实例"""
+    global _indicator_engine
+    if _indicator_engine is None:
+        _indicator_engine = StockstatsIndicatorEngine()
+    return _indicator_engine
 
 
 class StockstatsUtils:
@@ -25,63 +184,39 @@ class StockstatsUtils:
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
     ):
-        df = None
-        data = None
-
-        if not online:
-            try:
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
-
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
-
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
-            return indicator_value
-        else:
-            return "N/A: Not a trading day (weekend or holiday)"
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
+        return get_indicator_engine().get_indicator_value(
+            symbol, indicator, curr_date, data_dir, online=online
+        )
+
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicators: Annotated[
+            Union[str, List[str]], "one or more indicators, list or comma separated"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        look_back_days: Annotated[int, "how many days to look back"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> Dict[str, List[Tuple[str, str]]]:
+        if isinstance(indicators, str):
+            indicators = [i.strip() for i in indicators.split(",") if i.strip()]
+        # 离线数据只返回交易日，在线模式保留非交易日占位（与逐日查询的输出一致）
+        return get_indicator_engine().get_indicator_window(
+            symbol,
+            indicators,
+            curr_date,
+            look_back_days,
+            data_dir,
+            online=online,
+            trading_days_only=not online,
+        )
@@ -0,0 +1,194 @@
+"""
+Micro-batched Redis Writer for the Streaming Pipeline
+
+Streaming handlers describe their Redis writes as operations instead of awaiting
+each command. The writer accumulates operations from many messages for a short
+window (``batch_size`` messages or ``flush_interval`` seconds, whichever comes
+first) and sends them in one non-transactional pipeline per batch:
+
+- HSET mappings to the same key within a batch are merged (latest value wins)
+- EXPIRE commands are de-duplicated per key and sent after all other commands
+- a bounded queue applies backpressure: ``submit`` waits while ``max_pending``
+  messages are buffered
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (command name, positional args, keyword args), applied as getattr(pipeline, command)(*args, **kwargs)
+RedisOp = Tuple[str, tuple, Dict[str, Any]]
+
+
+def redis_op(command: str, *args, **kwargs) -> RedisOp:
+    """Build a Redis operation for ``RedisBatchWriter.submit``"""
+    return command, args, kwargs
+
+
+class RedisBatchWriter:
+    """Buffers Redis operations and flushes them in pipelined batches"""
+
+    _STOP = object()
+
+    def __init__(self, client_factory: Callable[[], Any], batch_size: int = 256,
+                 flush_interval: float = 0.005, max_pending: int = 10000,
+                 enabled: bool = True, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            client_factory: Returns the Redis client used for a batch
+            batch_size: Maximum number of messages per pipeline
+            flush_interval: Maximum time (seconds) a message waits for its batch to fill
+            max_pending: Buffered messages before ``submit`` blocks
+            enabled: False executes every operation immediately (unbatched)
+        """
+        self.client_factory = client_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.enabled = enabled
+        self.logger = logger or logging.getLogger("streaming_pipeline")
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.stats = {
+            'messages': 0,
+            'batches': 0,
+            'commands': 0,
+            'commands_coalesced': 0,
+            'errors': 0,
+            'backpressure_waits': 0,
+        }
+
+    def _ensure_started(self) -> None:
+        # Created lazily so the queue and task bind to the running event loop
+        if self._task is None or self._task.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, operations: List[RedisOp]) -> None:
+        """Queue the operations of one message, waiting if the buffer is full"""
+        if not operations:
+            return
+        if not self.enabled or self._closed:
+            await self._execute_unbatched(operations)
+            return
+
+        self._ensure_started()
+        if self._queue.full():
+            self.stats['backpressure_waits'] += 1
+        await self._queue.put(operations)
+
+    async def flush(self) -> None:
+        """Wait until everything submitted so far has been written"""
+        if self._task is None or self._task.done():
+            return
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put(done)
+        await done
+
+    async def close(self) -> None:
+        """Flush remaining operations and stop the background task"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None and not self._task.done():
+            await self._queue.put(self._STOP)
+            await self._task
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['pending'] = self._queue.qsize() if self._queue is not None else 0
+        stats['avg_batch_size'] = stats['messages'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch: List[RedisOp] = []
+            waiters = []
+            messages = 0
+
+            item = await self._queue.get()
+            deadline = loop.time() + self.flush_interval
+            while True:
+                if item is self._STOP:
+                    stopping = True
+                elif isinstance(item, asyncio.Future):
+                    waiters.append(item)
+                else:
+                    batch.extend(item)
+                    messages += 1
+
+                if stopping or waiters or messages >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            if batch:
+                await self._execute_batch(batch, messages)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    @staticmethod
+    def _coalesce(batch: List[RedisOp]) -> List[RedisOp]:
+        operations: List[RedisOp] = []
+        hashes: Dict[Any, Dict[str, Any]] = {}
+        expires: Dict[Any, Any] = {}
+        for command, args, kwargs in batch:
+            if command == 'hset' and len(args) == 1 and set(kwargs) == {'mapping'}:
+                key = args[0]
+                if key in hashes:
+                    hashes[key].update(kwargs['mapping'])
+                    continue
+                hashes[key] = dict(kwargs['mapping'])
+                operations.append(('hset', (key,), {'mapping': hashes[key]}))
+            elif command == 'expire' and len(args) == 2 and not kwargs:
+                expires[args[0]] = args[1]
+            else:
+                operations.append((command, args, kwargs))
+        operations.extend(('expire', (key, ttl), {}) for key, ttl in expires.items())
+        return operations
+
+    async def _execute_batch(self, batch: List[RedisOp], messages: int) -> None:
+        operations = self._coalesce(batch)
+        try:
+            pipe = self.client_factory().pipeline(transaction=False)
+            for command, args, kwargs in operations:
+                getattr(pipe, command)(*args, **kwargs)
+            results = await pipe.execute(raise_on_error=False)
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                self.stats['errors'] += len(errors)
+                self.logger.error(f"Redis batch: {len(errors)}/{len(operations)} commands failed: {errors[0]}")
+        except Exception as e:
+            self.stats['errors'] += len(operations)
+            self.logger.error(f"Redis batch write failed ({messages} messages dropped): {e}")
+        self.stats['messages'] += messages
+        self.stats['batches'] += 1
+        self.stats['commands'] += len(operations)
+        self.stats['commands_coalesced'] += len(batch) - len(operations)
+
+    async def _execute_unbatched(self, operations: List[RedisOp]) -> None:
+        client = self.client_factory()
+        for command, args, kwargs in operations:
+            try:
+                await getattr(client, command)(*args, **kwargs)
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.logger.error(f"Redis {command} failed: {e}")
+        self.stats['messages'] += 1
+        self.stats['commands'] += len(operations)
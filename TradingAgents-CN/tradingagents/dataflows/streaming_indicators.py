@@ -0,0 +1,248 @@
+"""
+Incremental Streaming Indicators for TradingAgents-CN
+
+Per-symbol technical indicator state that is updated in O(1) per trade instead of
+re-reading the recent price history and recomputing every indicator per tick:
+
+- SMA and rolling variance over fixed-size ring buffers (sliding Welford update)
+- EMA with a single running value
+- Wilder RSI seeded with the simple average of the first ``period`` price changes
+- Session VWAP from running price*volume and volume sums
+
+All state lives in ``__slots__`` objects backed by ``array('d')`` buffers, so a
+process can follow thousands of symbols with a few hundred bytes per indicator.
+"""
+
+import math
+import threading
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+
+class RollingWindow:
+    """Fixed-size ring buffer with O(1) running mean and variance"""
+
+    __slots__ = ('capacity', '_buffer', '_head', 'count', 'mean', '_m2')
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._buffer = array('d', bytes(8 * capacity))
+        self._head = 0
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value: float) -> None:
+        if self.count < self.capacity:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+        else:
+            evicted = self._buffer[self._head]
+            old_mean = self.mean
+            self.mean += (value - evicted) / self.capacity
+            self._m2 += (value - evicted) * (value - self.mean + evicted - old_mean)
+            if self._m2 < 0.0:
+                self._m2 = 0.0
+        self._buffer[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.capacity
+
+    def variance(self, ddof: int = 1) -> float:
+        if self.count <= ddof:
+            return 0.0
+        return self._m2 / (self.count - ddof)
+
+    def std(self, ddof: int = 1) -> float:
+        return math.sqrt(self.variance(ddof))
+
+
+class EMA:
+    """Exponential moving average seeded with the first observation"""
+
+    __slots__ = ('alpha', 'value')
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1.0)
+        self.value: Optional[float] = None
+
+    def push(self, value: float) -> float:
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class WilderRSI:
+    """Wilder-smoothed RSI
+
+    The first ``period`` price changes are averaged; after that the average gain
+    and loss follow ``avg = (avg * (period - 1) + x) / period``.
+    """
+
+    __slots__ = ('period', '_previous', '_seen', 'avg_gain', 'avg_loss')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._previous: Optional[float] = None
+        self._seen = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def push(self, price: float) -> None:
+        previous, self._previous = self._previous, price
+        if previous is None:
+            return
+        change = price - previous
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        if self._seen < self.period:
+            self._seen += 1
+            self.avg_gain += (gain - self.avg_gain) / self._seen
+            self.avg_loss += (loss - self.avg_loss) / self._seen
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+    @property
+    def ready(self) -> bool:
+        return self._seen >= self.period
+
+    @property
+    def value(self) -> float:
+        """RSI in [0, 100]; 50.0 until ``period`` changes have been seen"""
+        if not self.ready:
+            return 50.0
+        if self.avg_loss == 0:
+            return 100.0 if self.avg_gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+
+class SessionVWAP:
+    """Volume-weighted average price, reset when the trading date changes"""
+
+    __slots__ = ('session', '_pv', '_volume')
+
+    def __init__(self):
+        self.session = None
+        self._pv = 0.0
+        self._volume = 0.0
+
+    def push(self, price: float, volume: float, timestamp: Optional[datetime] = None) -> float:
+        session = timestamp.date() if timestamp is not None else None
+        if session != self.session:
+            self.session = session
+            self._pv = 0.0
+            self._volume = 0.0
+        if volume > 0:
+            self._pv += price * volume
+            self._volume += volume
+        return self._pv / self._volume if self._volume > 0 else price
+
+
+class SymbolIndicatorState:
+    """All streaming indicators of one symbol, updated once per trade"""
+
+    __slots__ = ('symbol', 'sma', 'ema', 'rsi', 'volatility', 'vwap',
+                 'last_price', 'previous_price', 'ticks')
+
+    def __init__(self, symbol: str, sma_windows: Sequence[int] = (5, 20),
+                 ema_spans: Sequence[int] = (12, 26), rsi_period: int = 14,
+                 volatility_window: int = 20):
+        self.symbol = symbol
+        self.sma = tuple((window, RollingWindow(window)) for window in sma_windows)
+        self.ema = tuple((span, EMA(span)) for span in ema_spans)
+        self.rsi = WilderRSI(rsi_period)
+        # Rolling standard deviation of simple tick returns
+        self.volatility = RollingWindow(volatility_window)
+        self.vwap = SessionVWAP()
+        self.last_price: Optional[float] = None
+        self.previous_price: Optional[float] = None
+        self.ticks = 0
+
+    def update(self, price: float, volume: float = 0.0,
+               timestamp: Optional[datetime] = None) -> Dict[str, float]:
+        """Apply one trade and return the current indicator values"""
+        self.previous_price, self.last_price = self.last_price, price
+        self.ticks += 1
+
+        for _, window in self.sma:
+            window.push(price)
+        for _, average in self.ema:
+            average.push(price)
+        self.rsi.push(price)
+        if self.previous_price:
+            self.volatility.push(price / self.previous_price - 1.0)
+        vwap = self.vwap.push(price, volume or 0.0, timestamp)
+
+        return self._snapshot(vwap)
+
+    def _snapshot(self, vwap: float) -> Dict[str, float]:
+        indicators = {}
+        # Until a window fills, SMA is the mean of the prices seen so far
+        for window_size, window in self.sma:
+            indicators[f'sma_{window_size}'] = window.mean
+        for span, average in self.ema:
+            indicators[f'ema_{span}'] = average.value
+        indicators['rsi'] = self.rsi.value
+        if self.previous_price:
+            indicators['change_pct'] = (self.last_price - self.previous_price) / self.previous_price * 100
+        else:
+            indicators['change_pct'] = 0.0
+        indicators['volatility'] = self.volatility.std()
+        indicators['vwap'] = vwap
+        return indicators
+
+
+class StreamingIndicatorBook:
+    """Indicator states for all followed symbols"""
+
+    def __init__(self, **state_kwargs):
+        """
+        Args:
+            **state_kwargs: Passed to every ``SymbolIndicatorState`` (sma_windows,
+                            ema_spans, rsi_period, volatility_window)
+        """
+        self._state_kwargs = state_kwargs
+        self._states: Dict[str, SymbolIndicatorState] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._states
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def get_state(self, symbol: str) -> SymbolIndicatorState:
+        state = self._states.get(symbol)
+        if state is None:
+            with self._lock:
+                state = self._states.setdefault(
+                    symbol, SymbolIndicatorState(symbol, **self._state_kwargs))
+        return state
+
+    def update(self, symbol: str, price: float, volume: float = 0.0,
+               timestamp: Optional[datetime] = None) -> Dict[str, float]:
+        return self.get_state(symbol).update(price, volume, timestamp)
+
+    def warm_start(self, symbol: str,
+                   history: Iterable[Tuple[float, float, Optional[datetime]]]) -> SymbolIndicatorState:
+        """Rebuild a symbol's state from (price, volume, timestamp) points in time order"""
+        state = SymbolIndicatorState(symbol, **self._state_kwargs)
+        for price, volume, timestamp in history:
+            state.update(price, volume, timestamp)
+        with self._lock:
+            self._states[symbol] = state
+        return state
+
+    def remove(self, symbol: str) -> None:
+        with self._lock:
+            self._states.pop(symbol, None)
@@ -21,8 +21,9 @@ import websocket
 from urllib.parse import urlencode
 import aioredis
 import aiohttp
-import numpy as np
-import pandas as pd
+
+from tradingagents.dataflows.streaming_batch_writer import RedisBatchWriter, RedisOp, redis_op
+from tradingagents.dataflows.streaming_indicators import StreamingIndicatorBook
 
 
 class StreamingDataType(Enum):
@@ -88,6 +89,21 @@ class StreamingDataManager:
         # Real-time feature store
         self.feature_cache = {}
         
+        # Incremental per-symbol indicator state (O(1) per trade)
+        self.indicator_book = StreamingIndicatorBook(**config.get('streaming_indicators', {}))
+        # Per-symbol locks so concurrent first ticks warm-start a symbol only once
+        self._warm_start_locks: Dict[str, asyncio.Lock] = {}
+        
+        # Micro-batched, pipelined Redis writes
+        self.redis_writer = RedisBatchWriter(
+            lambda: aioredis.Redis(connection_pool=self.redis_pool),
+            batch_size=config.get('redis_batch_size', 256),
+            flush_interval=config.get('redis_flush_interval', 0.005),
+            max_pending=config.get('redis_max_pending', 10000),
+            enabled=config.get('redis_batching', True),
+            logger=self.logger
+        )
+        
         # Initialize components
         asyncio.create_task(self._initialize_redis())
     
@@ -337,11 +353,10 @@ class StreamingDataManager:
             self.processing_stats['messages_processed'] += 1
             self.processing_stats['last_message_time'] = datetime.now()
             
-            # Store in Redis streams
-            await self._store_in_redis_stream(message)
-            
-            # Update real-time cache
-            await self._update_real_time_cache(message)
+            # Queue Redis stream and real-time cache writes; the writer pipelines them in batches
+            operations = self._redis_stream_operations(message)
+            operations.extend(await self._real_time_cache_operations(message))
+            await self.redis_writer.submit(operations)
             
             # Call registered handlers
             handlers = self.message_handlers.get(message.data_type, [])
@@ -358,32 +373,23 @@ class StreamingDataManager:
             self.logger.error(f"Message routing failed: {e}")
             self.processing_stats['messages_failed'] += 1
     
-    async def _store_in_redis_stream(self, message: StreamMessage):
-        """Store message in Redis stream for persistence and replay"""
-        try:
-            redis_client = aioredis.Redis(connection_pool=self.redis_pool)
-            
-            # Create stream key
-            stream_key = f"stream:{message.data_type.value}:{message.symbol}"
-            
-            # Convert message to dictionary
-            message_dict = message.to_dict()
-            
-            # Store in Redis stream with automatic trimming
-            await redis_client.xadd(
-                stream_key,
-                message_dict,
-                maxlen=10000  # Keep last 10k messages per stream
-            )
-            
-        except Exception as e:
-            self.logger.error(f"Failed to store message in Redis stream: {e}")
+    def _redis_stream_operations(self, message: StreamMessage) -> List[RedisOp]:
+        """Redis stream entry for persistence and replay"""
+        stream_key = f"stream:{message.data_type.value}:{message.symbol}"
+        
+        # Stream fields must be flat; nested values are stored as JSON
+        fields = {
+            key: json.dumps(value, default=str) if isinstance(value, (dict, list)) or value is None else value
+            for key, value in message.to_dict().items()
+        }
+        
+        # Keep last 10k messages per stream
+        return [redis_op('xadd', stream_key, fields, maxlen=10000)]
     
-    async def _update_real_time_cache(self, message: StreamMessage):
-        """Update real-time cache with latest data"""
+    async def _real_time_cache_operations(self, message: StreamMessage) -> List[RedisOp]:
+        """Real-time cache updates for the latest data"""
+        operations = []
         try:
-            redis_client = aioredis.Redis(connection_pool=self.redis_pool)
-            
             if message.data_type == StreamingDataType.MARKET_TICK:
                 # Update latest price cache
                 cache_key = f"latest_price:{message.symbol}"
@@ -394,11 +400,11 @@ class StreamingDataManager:
                     'source': message.source
                 }
                 
-                await redis_client.hset(cache_key, mapping=price_data)
-                await redis_client.expire(cache_key, 300)  # 5 minutes TTL
+                operations.append(redis_op('hset', cache_key, mapping=price_data))
+                operations.append(redis_op('expire', cache_key, 300))  # 5 minutes TTL
                 
                 # Update price history for technical indicators
-                await self._update_technical_indicators(message)
+                operations.extend(await self._technical_indicator_operations(message))
             
             elif message.data_type == StreamingDataType.NEWS_ARTICLE:
                 # Update news cache
@@ -411,128 +417,77 @@ class StreamingDataManager:
                     'sentiment': message.data.get('sentiment_score', 0.0)
                 }
                 
-                await redis_client.lpush(news_key, json.dumps(news_data))
-                await redis_client.ltrim(news_key, 0, 99)  # Keep latest 100 news items
-                await redis_client.expire(news_key, 86400)  # 24 hours TTL
+                operations.append(redis_op('lpush', news_key, json.dumps(news_data)))
+                operations.append(redis_op('ltrim', news_key, 0, 99))  # Keep latest 100 news items
+                operations.append(redis_op('expire', news_key, 86400))  # 24 hours TTL
             
         except Exception as e:
             self.logger.error(f"Failed to update real-time cache: {e}")
+        return operations
     
-    async def _update_technical_indicators(self, message: StreamMessage):
+    async def _technical_indicator_operations(self, message: StreamMessage) -> List[RedisOp]:
         """Update real-time technical indicators"""
         try:
-            redis_client = aioredis.Redis(connection_pool=self.redis_pool)
-            
             symbol = message.symbol
             price = float(message.data.get('price', 0))
+            volume = float(message.data.get('volume') or 0)
             timestamp = message.timestamp
             
-            # Store price in time series
             price_series_key = f"price_series:{symbol}"
+            if symbol not in self.indicator_book:
+                await self._ensure_warm_started(symbol)
+            
+            # Constant-time update of the symbol's indicator state
+            indicators = self.indicator_book.update(symbol, price, volume, timestamp)
+            
+            # Store price in time series (replay and warm start after restarts)
             price_point = {
                 'timestamp': timestamp.isoformat(),
                 'price': price,
                 'volume': message.data.get('volume', 0)
             }
-            
-            await redis_client.zadd(
-                price_series_key,
-                {json.dumps(price_point): timestamp.timestamp()}
-            )
-            
-            # Trim old data (keep last 1000 points)
-            await redis_client.zremrangebyrank(price_series_key, 0, -1001)
-            await redis_client.expire(price_series_key, 3600)  # 1 hour TTL
-            
-            # Calculate real-time indicators
-            indicators = await self._calculate_real_time_indicators(symbol, price)
-            
-            # Store indicators
             indicators_key = f"indicators:{symbol}"
-            await redis_client.hset(indicators_key, mapping=indicators)
-            await redis_client.expire(indicators_key, 300)  # 5 minutes TTL
+            
+            return [
+                redis_op('zadd', price_series_key, {json.dumps(price_point): timestamp.timestamp()}),
+                # Trim old data (keep last 1000 points)
+                redis_op('zremrangebyrank', price_series_key, 0, -1001),
+                redis_op('expire', price_series_key, 3600),  # 1 hour TTL
+                redis_op('hset', indicators_key, mapping=indicators),
+                redis_op('expire', indicators_key, 300),  # 5 minutes TTL
+            ]
             
         except Exception as e:
             self.logger.error(f"Failed to update technical indicators: {e}")
+            return []
+    
+    async def _ensure_warm_started(self, symbol: str):
+        """Warm-start a symbol under its lock; later ticks wait instead of rebuilding the state"""
+        lock = self._warm_start_locks.setdefault(symbol, asyncio.Lock())
+        async with lock:
+            if symbol not in self.indicator_book:
+                redis_client = aioredis.Redis(connection_pool=self.redis_pool)
+                await self._warm_start_indicators(redis_client, symbol)
+        self._warm_start_locks.pop(symbol, None)
     
-    async def _calculate_real_time_indicators(self, symbol: str, current_price: float) -> Dict[str, float]:
-        """Calculate real-time technical indicators"""
+    async def _warm_start_indicators(self, redis_client, symbol: str):
+        """Seed a symbol's indicator state from its stored price series (once per symbol)"""
+        history = []
         try:
-            redis_client = aioredis.Redis(connection_pool=self.redis_pool)
-            
-            # Get recent price data
-            price_series_key = f"price_series:{symbol}"
-            recent_data = await redis_client.zrevrange(price_series_key, 0, 49, withscores=True)
-            
-            if len(recent_data) < 2:
-                return {'sma_5': current_price, 'sma_20': current_price, 'rsi': 50.0}
-            
-            # Extract prices
-            prices = []
-            for data_json, timestamp in recent_data:
+            points = await redis_client.zrange(f"price_series:{symbol}", 0, -1)
+            for data_json in points:
                 try:
                     data = json.loads(data_json)
-                    prices.append(float(data['price']))
-                except:
+                    history.append((float(data['price']), float(data.get('volume') or 0),
+                                    datetime.fromisoformat(data['timestamp'])))
+                except (KeyError, TypeError, ValueError):
                     continue
-            
-            prices = np.array(prices[::-1])  # Reverse to get chronological order
-            
-            indicators = {}
-            
-            # Simple Moving Averages
-            if len(prices) >= 5:
-                indicators['sma_5'] = float(np.mean(prices[-5:]))
-            else:
-                indicators['sma_5'] = float(np.mean(prices))
-            
-            if len(prices) >= 20:
-                indicators['sma_20'] = float(np.mean(prices[-20:]))
-            else:
-                indicators['sma_20'] = float(np.mean(prices))
-            
-            # RSI calculation
-            if len(prices) >= 14:
-                indicators['rsi'] = self._calculate_rsi(prices, 14)
-            else:
-                indicators['rsi'] = 50.0
-            
-            # Price change percentage
-            if len(prices) >= 2:
-                indicators['change_pct'] = ((prices[-1] - prices[-2]) / prices[-2]) * 100
-            else:
-                indicators['change_pct'] = 0.0
-            
-            return indicators
-            
         except Exception as e:
-            self.logger.error(f"Failed to calculate indicators: {e}")
-            return {'sma_5': current_price, 'sma_20': current_price, 'rsi': 50.0}
-    
-    def _calculate_rsi(self, prices: np.ndarray, period: int = 14) -> float:
-        """Calculate Relative Strength Index"""
-        try:
-            if len(prices) < period + 1:
-                return 50.0
-            
-            deltas = np.diff(prices)
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
-            
-            avg_gain = np.mean(gains[-period:])
-            avg_loss = np.mean(losses[-period:])
-            
-            if avg_loss == 0:
-                return 100.0
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return float(rsi)
-            
-        except Exception as e:
-            self.logger.error(f"RSI calculation error: {e}")
-            return 50.0
+            self.logger.warning(f"Failed to load price history for {symbol}: {e}")
+        
+        self.indicator_book.warm_start(symbol, history)
+        if history:
+            self.logger.info(f"Warm-started indicators for {symbol} from {len(history)} points")
     
     def _update_processing_rate(self):
         """Update processing rate statistics"""
@@ -566,6 +521,7 @@ class StreamingDataManager:
                 'active_connections': len(self.websocket_connections),
                 'active_streams': len(self.active_streams),
                 'processing_stats': self.processing_stats,
+                'redis_writer': self.redis_writer.get_stats(),
                 'redis_status': {
                     'connected_clients': redis_info.get('connected_clients', 0),
                     'used_memory_mb': redis_info.get('used_memory', 0) / (1024 * 1024),
@@ -599,6 +555,9 @@ class StreamingDataManager:
             self.websocket_connections.clear()
             self.active_streams.clear()
             
+            # Write buffered Redis operations before closing the pool
+            await self.redis_writer.close()
+            
             # Close Redis connection pool
             if self.redis_pool:
                 await self.redis_pool.disconnect()
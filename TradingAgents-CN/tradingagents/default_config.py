@@ -39,7 +39,9 @@ DEFAULT_CONFIG = {
     # 性能和成本限制
     "max_budget": 2.0,
     "max_concurrent_tasks": 5,
+    "parallel_analysts": False,  # 分析师并行执行（各自独立的消息通道，汇合后进入辩论）
     "enable_caching": True,
+    "embedding_batch_size": 32,  # 记忆嵌入每次请求的最大文本数
     
     # ========================================
     # 业务层配置 (Business Level)
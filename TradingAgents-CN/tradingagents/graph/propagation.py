@@ -20,9 +20,12 @@ class Propagator:
         self.max_recur_limit = max_recur_limit
 
     def create_initial_state(
-        self, company_name: str, trade_date: str
+        self, company_name: str, trade_date: str, market_context: str = ""
     ) -> Dict[str, Any]:
-        """Create the initial state for the agent graph."""
+        """Create the initial state for the agent graph.
+
+        market_context: 市场扫描时共享的宏观/市场级摘要（单只股票分析时为空）
+        """
         return {
             "messages": [("human", company_name)],
             "company_of_interest": company_name,
@@ -43,6 +46,7 @@ class Propagator:
             "fundamentals_report": "",
             "sentiment_report": "",
             "news_report": "",
+            "market_context": market_context or "",
         }
 
     def get_graph_args(self) -> Dict[str, Any]:
@@ -1,6 +1,7 @@
 # TradingAgents/graph/setup.py
 
 from typing import Dict, Any
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
@@ -15,6 +16,14 @@ from .conditional_logic import ConditionalLogic
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
+# 各分析师写入AgentState的报告字段
+ANALYST_REPORT_KEYS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
 
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
@@ -159,13 +168,14 @@ class GraphSetup:
         # Create workflow
         workflow = StateGraph(AgentState)
 
-        # Add analyst nodes to the graph
-        for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
-            workflow.add_node(
-                f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
-            )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
+        # Add analyst nodes to the graph (parallel mode adds them as isolated branches)
+        if not self.config.get("parallel_analysts", False):
+            for analyst_type, node in analyst_nodes.items():
+                workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+                workflow.add_node(
+                    f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
+                )
+                workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
         workflow.add_node("Bull Researcher", bull_researcher_node)
@@ -178,30 +188,12 @@ class GraphSetup:
         workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
+        if self.config.get("parallel_analysts", False):
+            self._connect_parallel_analysts(
+                workflow, selected_analysts, analyst_nodes, delete_nodes, tool_nodes
             )
-            workflow.add_edge(current_tools, current_analyst)
-
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+        else:
+            self._connect_sequential_analysts(workflow, selected_analysts)
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -251,3 +243,87 @@ class GraphSetup:
 
         # Compile and return
         return workflow.compile()
+
+    def _connect_sequential_analysts(self, workflow: StateGraph, selected_analysts):
+        """Chain the analysts one after another, then hand off to Bull Researcher."""
+        # Start with the first analyst
+        first_analyst = selected_analysts[0]
+        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+
+        # Connect analysts in sequence
+        for i, analyst_type in enumerate(selected_analysts):
+            current_analyst = f"{analyst_type.capitalize()} Analyst"
+            current_tools = f"tools_{analyst_type}"
+            current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+            # Add conditional edges for current analyst
+            workflow.add_conditional_edges(
+                current_analyst,
+                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                [current_tools, current_clear],
+            )
+            workflow.add_edge(current_tools, current_analyst)
+
+            # Connect to next analyst or to Bull Researcher if this is the last analyst
+            if i < len(selected_analysts) - 1:
+                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                workflow.add_edge(current_clear, next_analyst)
+            else:
+                workflow.add_edge(current_clear, "Bull Researcher")
+
+    def _connect_parallel_analysts(
+        self, workflow: StateGraph, selected_analysts, analyst_nodes, delete_nodes, tool_nodes
+    ):
+        """Fan out from START to every analyst concurrently and join before Bull Researcher.
+
+        Each analyst runs its own tool loop in a compiled sub-graph with an isolated
+        message channel and only writes its report back, so branches never see each
+        other's tool messages and the final AgentState fields match sequential mode.
+        """
+        branch_names = []
+        for analyst_type in selected_analysts:
+            branch_name = f"{analyst_type.capitalize()} Analyst"
+            workflow.add_node(
+                branch_name,
+                self._create_analyst_branch(
+                    analyst_type,
+                    analyst_nodes[analyst_type],
+                    delete_nodes[analyst_type],
+                    tool_nodes[analyst_type],
+                ),
+            )
+            workflow.add_edge(START, branch_name)
+            branch_names.append(branch_name)
+
+        # 屏障节点：等待所有分析师完成后再进入多空辩论
+        workflow.add_node("Analyst Join", create_msg_delete())
+        workflow.add_edge(branch_names, "Analyst Join")
+        workflow.add_edge("Analyst Join", "Bull Researcher")
+        logger.info(f"🔀 [并行分析] 分析师并行执行: {selected_analysts}")
+
+    def _create_analyst_branch(self, analyst_type, analyst_node, delete_node, tool_node):
+        """Compile one analyst's tool loop into a node that returns only its report."""
+        analyst_name = f"{analyst_type.capitalize()} Analyst"
+        tools_name = f"tools_{analyst_type}"
+        clear_name = f"Msg Clear {analyst_type.capitalize()}"
+        report_key = ANALYST_REPORT_KEYS[analyst_type]
+
+        branch = StateGraph(AgentState)
+        branch.add_node(analyst_name, analyst_node)
+        branch.add_node(tools_name, tool_node)
+        branch.add_node(clear_name, delete_node)
+        branch.add_edge(START, analyst_name)
+        branch.add_conditional_edges(
+            analyst_name,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            [tools_name, clear_name],
+        )
+        branch.add_edge(tools_name, analyst_name)
+        branch.add_edge(clear_name, END)
+        branch_graph = branch.compile()
+
+        def analyst_branch(state: AgentState, config: RunnableConfig):
+            result = branch_graph.invoke(state, config)
+            return {report_key: result.get(report_key, "")}
+
+        return analyst_branch
@@ -19,6 +19,8 @@ from .feature_engineering import (
     TimeSeriesFeatureEngine
 )
 
+from .feature_store import IncrementalFeatureStore, get_feature_store
+
 from .models import (
     PricePredictionModel,
     TradingSignalClassifier,
@@ -57,6 +59,8 @@ __all__ = [
     "SentimentAnalysisEngine",
     "MarketMicrostructureEngine",
     "TimeSeriesFeatureEngine",
+    "IncrementalFeatureStore",
+    "get_feature_store",
     
     # Models
     "PricePredictionModel",
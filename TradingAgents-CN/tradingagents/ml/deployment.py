@@ -431,9 +431,11 @@ class ABTestingFramework:
 class InferenceService:
     """Real-time inference service for model predictions"""
     
-    def __init__(self, config: DeploymentConfig, model_registry: ModelRegistry):
+    def __init__(self, config: DeploymentConfig, model_registry: ModelRegistry,
+                 feature_store: Optional[Any] = None):
         self.config = config
         self.model_registry = model_registry
+        self.feature_store = feature_store  # IncrementalFeatureStore for symbol-level predictions
         self.loaded_models = {}
         self.prediction_cache = {}
         
@@ -541,6 +543,26 @@ class InferenceService:
                 'success': False
             }
     
+    def predict_symbol(self, model_key: str, symbol: str, market_data: pd.DataFrame,
+                       use_cache: bool = True) -> Dict:
+        """Predict on the latest bar of a symbol using features served by the feature store
+        
+        Time-series features are recomputed only for new bars; technical and
+        microstructure blocks are recomputed over the full history (stored rows are
+        kept), and normalization is refit on every call. Columns follow the model's
+        training feature order.
+        """
+        if self.feature_store is None:
+            raise ValueError("InferenceService has no feature store configured")
+        if model_key not in self.loaded_models:
+            raise ValueError(f"Model {model_key} not loaded")
+        
+        metadata = self.loaded_models[model_key]['metadata']
+        features = self.feature_store.latest_features(
+            symbol, market_data, feature_names=metadata.feature_names or None
+        )
+        return self.predict(model_key, features, use_cache=use_cache)
+    
     def _get_cached_prediction(self, cache_key: str) -> Optional[Dict]:
         """Get cached prediction result"""
         
@@ -22,6 +22,9 @@ from tradingagents.dataflows import (
     get_finnhub_news
 )
 
+# Shared NumPy indicator kernels
+from tradingagents.utils import indicator_kernels as kernels
+
 # Import logging system
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("feature_engineering")
@@ -38,11 +41,17 @@ class FeatureConfig:
     time_series_features: bool = True
     normalize_features: bool = True
     scaler_type: str = "robust"  # "standard" or "robust"
+    feature_dtype: str = "float64"  # "float32" halves technical feature memory
     
 
 class BaseFeatureEngine(ABC):
     """Base class for feature engineering engines"""
     
+    # Bars of history (including the current bar) that one feature row depends on.
+    # None means some features depend on the whole history (cumulative sums, EWMs,
+    # recursive indicators), so incremental updates must recompute from the start.
+    max_lookback: Optional[int] = None
+    
     def __init__(self, config: FeatureConfig):
         self.config = config
         self.features_computed = {}
@@ -67,9 +76,51 @@ class BaseFeatureEngine(ABC):
         return features
 
 
+class _FeatureMatrix:
+    """Preallocated column store for one engine's features
+    
+    Kernels write straight into matrix columns; the DataFrame is built once at
+    the end instead of growing column by column.
+    """
+    
+    def __init__(self, index: pd.Index, capacity: int, dtype=np.float64):
+        self.index = index
+        self.dtype = np.dtype(dtype)
+        self._matrix = np.empty((len(index), capacity), dtype=self.dtype)
+        self._columns: Dict[str, int] = {}
+    
+    def __setitem__(self, name: str, values: np.ndarray) -> None:
+        position = self._columns.get(name)
+        if position is None:
+            position = len(self._columns)
+            if position == self._matrix.shape[1]:
+                grown = np.empty((self._matrix.shape[0], 2 * position), dtype=self.dtype)
+                grown[:, :position] = self._matrix
+                self._matrix = grown
+            self._columns[name] = position
+        self._matrix[:, position] = values
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._matrix[:, self._columns[name]]
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+    
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+    
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self._matrix[:, :len(self._columns)], index=self.index,
+                            columns=self.columns, copy=False)
+
+
 class TechnicalIndicatorEngine(BaseFeatureEngine):
     """Engine for computing technical indicators"""
     
+    # Expected column count, used to preallocate the feature matrix
+    feature_capacity = 96
+    
     def __init__(self, config: FeatureConfig):
         super().__init__(config)
         
@@ -77,243 +128,203 @@ class TechnicalIndicatorEngine(BaseFeatureEngine):
         """Extract technical indicator features"""
         logger.info("Extracting technical indicator features")
         
-        features = pd.DataFrame(index=data.index)
+        features = _FeatureMatrix(data.index, self.feature_capacity, self.config.feature_dtype)
+        prices = {
+            column: kernels.as_float_array(data[column].values)
+            for column in ('Open', 'High', 'Low', 'Close', 'Volume')
+        }
         
         try:
-            # Price-based indicators
-            features = self._add_price_indicators(data, features)
-            
-            # Volume-based indicators  
-            features = self._add_volume_indicators(data, features)
-            
-            # Momentum indicators
-            features = self._add_momentum_indicators(data, features)
-            
-            # Volatility indicators
-            features = self._add_volatility_indicators(data, features)
-            
-            # Trend indicators
-            features = self._add_trend_indicators(data, features)
-            
-            # Support/Resistance indicators
-            features = self._add_support_resistance_indicators(data, features)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Price-based indicators
+                self._add_price_indicators(prices, features)
+                
+                # Volume-based indicators  
+                self._add_volume_indicators(prices, features)
+                
+                # Momentum indicators
+                self._add_momentum_indicators(prices, features)
+                
+                # Volatility indicators
+                self._add_volatility_indicators(prices, features)
+                
+                # Trend indicators
+                self._add_trend_indicators(prices, features)
+                
+                # Support/Resistance indicators
+                self._add_support_resistance_indicators(prices, features)
             
             logger.info(f"Generated {len(features.columns)} technical indicators")
             
         except Exception as e:
             logger.error(f"Error extracting technical features: {e}")
             
-        return self.normalize_features(features)
+        return self.normalize_features(features.to_frame())
     
-    def _add_price_indicators(self, data: pd.DataFrame, features: pd.DataFrame) -> pd.DataFrame:
+    def _add_price_indicators(self, prices: Dict[str, np.ndarray], features: _FeatureMatrix) -> None:
         """Add price-based technical indicators"""
+        close, high, low = prices['Close'], prices['High'], prices['Low']
         
         # Simple Moving Averages
         for period in [5, 10, 20, 50, 100, 200]:
-            features[f'sma_{period}'] = data['Close'].rolling(window=period).mean()
-            features[f'sma_{period}_ratio'] = data['Close'] / features[f'sma_{period}']
+            features[f'sma_{period}'] = kernels.rolling_mean(close, period)
+            features[f'sma_{period}_ratio'] = close / features[f'sma_{period}']
             
         # Exponential Moving Averages
         for period in [12, 26, 50, 200]:
-            features[f'ema_{period}'] = data['Close'].ewm(span=period).mean()
-            features[f'ema_{period}_ratio'] = data['Close'] / features[f'ema_{period}']
+            features[f'ema_{period}'] = kernels.ema(close, period)
+            features[f'ema_{period}_ratio'] = close / features[f'ema_{period}']
             
         # Price position within recent range
         for period in [14, 30, 60]:
-            high_roll = data['High'].rolling(window=period).max()
-            low_roll = data['Low'].rolling(window=period).min()
-            features[f'price_position_{period}'] = (data['Close'] - low_roll) / (high_roll - low_roll)
+            high_roll = kernels.rolling_max(high, period)
+            low_roll = kernels.rolling_min(low, period)
+            features[f'price_position_{period}'] = (close - low_roll) / (high_roll - low_roll)
             
         # Gaps
-        features['gap'] = (data['Open'] - data['Close'].shift(1)) / data['Close'].shift(1)
-        features['gap_filled'] = np.where(
-            features['gap'] > 0,
-            (data['Low'] <= data['Close'].shift(1)).astype(int),
-            (data['High'] >= data['Close'].shift(1)).astype(int)
-        )
-        
-        return features
+        prev_close = kernels.shift(close)
+        gap = (prices['Open'] - prev_close) / prev_close
+        features['gap'] = gap
+        features['gap_filled'] = np.where(gap > 0, low <= prev_close, high >= prev_close)
     
-    def _add_volume_indicators(self, data: pd.DataFrame, features: pd.DataFrame) -> pd.DataFrame:
+    def _add_volume_indicators(self, prices: Dict[str, np.ndarray], features: _FeatureMatrix) -> None:
         """Add volume-based indicators"""
+        close, high, low, volume = prices['Close'], prices['High'], prices['Low'], prices['Volume']
         
         # Volume moving averages
         for period in [10, 20, 50]:
-            features[f'volume_ma_{period}'] = data['Volume'].rolling(window=period).mean()
-            features[f'volume_ratio_{period}'] = data['Volume'] / features[f'volume_ma_{period}']
+            features[f'volume_ma_{period}'] = kernels.rolling_mean(volume, period)
+            features[f'volume_ratio_{period}'] = volume / features[f'volume_ma_{period}']
             
         # On-Balance Volume (OBV)
-        price_change = data['Close'].diff()
-        features['obv'] = (np.sign(price_change) * data['Volume']).cumsum()
-        features['obv_ma_10'] = features['obv'].rolling(window=10).mean()
+        obv = kernels.cumsum_skipna(np.sign(kernels.diff(close)) * volume)
+        features['obv'] = obv
+        features['obv_ma_10'] = kernels.rolling_mean(obv, 10)
         
         # Volume Price Trend (VPT)
-        features['vpt'] = (data['Volume'] * (data['Close'].pct_change())).cumsum()
+        features['vpt'] = kernels.cumsum_skipna(volume * kernels.pct_change(close))
         
         # Accumulation/Distribution Line
-        clv = ((data['Close'] - data['Low']) - (data['High'] - data['Close'])) / (data['High'] - data['Low'])
-        clv = clv.fillna(0)
-        features['ad_line'] = (clv * data['Volume']).cumsum()
+        clv = ((close - low) - (high - close)) / (high - low)
+        clv = np.where(np.isnan(clv), 0.0, clv)
+        features['ad_line'] = kernels.cumsum_skipna(clv * volume)
         
         # Volume Weighted Average Price (VWAP)
-        typical_price = (data['High'] + data['Low'] + data['Close']) / 3
-        features['vwap'] = (typical_price * data['Volume']).cumsum() / data['Volume'].cumsum()
-        features['vwap_ratio'] = data['Close'] / features['vwap']
+        typical_price = (high + low + close) / 3
+        vwap = kernels.cumsum_skipna(typical_price * volume) / kernels.cumsum_skipna(volume)
+        features['vwap'] = vwap
+        features['vwap_ratio'] = close / vwap
         
-        return features
-        
-    def _add_momentum_indicators(self, data: pd.DataFrame, features: pd.DataFrame) -> pd.DataFrame:
+    def _add_momentum_indicators(self, prices: Dict[str, np.ndarray], features: _FeatureMatrix) -> None:
         """Add momentum indicators"""
+        close, high, low = prices['Close'], prices['High'], prices['Low']
         
         # RSI (Relative Strength Index)
         for period in [14, 21, 30]:
-            delta = data['Close'].diff()
-            gain = np.where(delta > 0, delta, 0)
-            loss = np.where(delta < 0, -delta, 0)
-            
-            avg_gain = pd.Series(gain).rolling(window=period).mean()
-            avg_loss = pd.Series(loss).rolling(window=period).mean()
-            
-            rs = avg_gain / avg_loss
-            features[f'rsi_{period}'] = 100 - (100 / (1 + rs))
+            features[f'rsi_{period}'] = kernels.rsi(close, period)
             
         # MACD (Moving Average Convergence Divergence)
-        ema12 = data['Close'].ewm(span=12).mean()
-        ema26 = data['Close'].ewm(span=26).mean()
-        features['macd'] = ema12 - ema26
-        features['macd_signal'] = features['macd'].ewm(span=9).mean()
-        features['macd_histogram'] = features['macd'] - features['macd_signal']
+        macd_line, signal_line, histogram = kernels.macd(close, 12, 26, 9)
+        features['macd'] = macd_line
+        features['macd_signal'] = signal_line
+        features['macd_histogram'] = histogram
         
         # Stochastic Oscillator
         for period in [14, 21]:
-            low_min = data['Low'].rolling(window=period).min()
-            high_max = data['High'].rolling(window=period).max()
-            features[f'stoch_k_{period}'] = 100 * ((data['Close'] - low_min) / (high_max - low_min))
-            features[f'stoch_d_{period}'] = features[f'stoch_k_{period}'].rolling(window=3).mean()
+            low_min = kernels.rolling_min(low, period)
+            high_max = kernels.rolling_max(high, period)
+            features[f'stoch_k_{period}'] = 100 * ((close - low_min) / (high_max - low_min))
+            features[f'stoch_d_{period}'] = kernels.rolling_mean(features[f'stoch_k_{period}'], 3)
             
         # Williams %R
         for period in [14, 21]:
-            high_max = data['High'].rolling(window=period).max()
-            low_min = data['Low'].rolling(window=period).min()
-            features[f'williams_r_{period}'] = -100 * ((high_max - data['Close']) / (high_max - low_min))
+            high_max = kernels.rolling_max(high, period)
+            low_min = kernels.rolling_min(low, period)
+            features[f'williams_r_{period}'] = -100 * ((high_max - close) / (high_max - low_min))
             
         # Rate of Change (ROC)
         for period in [10, 20, 30]:
-            features[f'roc_{period}'] = data['Close'].pct_change(periods=period) * 100
-            
-        return features
+            features[f'roc_{period}'] = kernels.pct_change(close, period) * 100
     
-    def _add_volatility_indicators(self, data: pd.DataFrame, features: pd.DataFrame) -> pd.DataFrame:
+    def _add_volatility_indicators(self, prices: Dict[str, np.ndarray], features: _FeatureMatrix) -> None:
         """Add volatility indicators"""
+        close = prices['Close']
         
         # Bollinger Bands
         for period in [20, 50]:
-            sma = data['Close'].rolling(window=period).mean()
-            std = data['Close'].rolling(window=period).std()
-            
-            features[f'bb_upper_{period}'] = sma + (2 * std)
-            features[f'bb_lower_{period}'] = sma - (2 * std)
-            features[f'bb_width_{period}'] = (features[f'bb_upper_{period}'] - features[f'bb_lower_{period}']) / sma
-            features[f'bb_position_{period}'] = (data['Close'] - features[f'bb_lower_{period}']) / (features[f'bb_upper_{period}'] - features[f'bb_lower_{period}'])
+            sma, upper, lower = kernels.bollinger_bands(close, period, 2.0)
+            features[f'bb_upper_{period}'] = upper
+            features[f'bb_lower_{period}'] = lower
+            features[f'bb_width_{period}'] = (upper - lower) / sma
+            features[f'bb_position_{period}'] = (close - lower) / (upper - lower)
             
         # Average True Range (ATR)
-        high_low = data['High'] - data['Low']
-        high_close_prev = np.abs(data['High'] - data['Close'].shift(1))
-        low_close_prev = np.abs(data['Low'] - data['Close'].shift(1))
-        
-        true_range = np.maximum(high_low, np.maximum(high_close_prev, low_close_prev))
+        true_range = kernels.true_range(prices['High'], prices['Low'], close)
         
         for period in [14, 21]:
-            features[f'atr_{period}'] = true_range.rolling(window=period).mean()
-            features[f'atr_ratio_{period}'] = features[f'atr_{period}'] / data['Close']
+            features[f'atr_{period}'] = kernels.rolling_mean(true_range, period)
+            features[f'atr_ratio_{period}'] = features[f'atr_{period}'] / close
             
         # Historical Volatility
+        returns = kernels.pct_change(close)
         for period in [10, 20, 30]:
-            returns = data['Close'].pct_change()
-            features[f'hist_vol_{period}'] = returns.rolling(window=period).std() * np.sqrt(252)
-            
-        return features
+            features[f'hist_vol_{period}'] = kernels.rolling_std(returns, period) * np.sqrt(252)
     
-    def _add_trend_indicators(self, data: pd.DataFrame, features: pd.DataFrame) -> pd.DataFrame:
+    def _add_trend_indicators(self, prices: Dict[str, np.ndarray], features: _FeatureMatrix) -> None:
         """Add trend indicators"""
+        close = prices['Close']
         
         # Average Directional Index (ADX)
-        high_diff = data['High'].diff()
-        low_diff = data['Low'].diff()
+        high_diff = kernels.diff(prices['High'])
+        low_diff = kernels.diff(prices['Low'])
         
-        plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0)
-        minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0)
+        plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0.0)
+        minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0.0)
         
         # ATR for ADX calculation
-        atr_14 = features.get('atr_14', data['Close'].rolling(14).std())  # fallback
+        atr_14 = features['atr_14'] if 'atr_14' in features else kernels.rolling_std(close, 14)  # fallback
         
-        plus_di = 100 * (pd.Series(plus_dm).rolling(14).sum() / atr_14)
-        minus_di = 100 * (pd.Series(minus_dm).rolling(14).sum() / atr_14)
+        plus_di = 100 * (kernels.rolling_sum(plus_dm, 14) / atr_14)
+        minus_di = 100 * (kernels.rolling_sum(minus_dm, 14) / atr_14)
         
         dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
-        features['adx'] = dx.rolling(14).mean()
+        features['adx'] = kernels.rolling_mean(dx, 14)
         features['plus_di'] = plus_di
         features['minus_di'] = minus_di
         
         # Parabolic SAR (simplified)
-        features['sar'] = self._calculate_parabolic_sar(data)
+        features['sar'] = kernels.parabolic_sar_simplified(prices['High'], prices['Low'])
         
         # Moving Average Convergence Divergence of different periods
         for short, long_period in [(5, 20), (10, 30), (20, 50)]:
-            short_ma = data['Close'].rolling(short).mean()
-            long_ma = data['Close'].rolling(long_period).mean()
+            short_ma = features[f'sma_{short}'] if f'sma_{short}' in features else kernels.rolling_mean(close, short)
+            long_ma = kernels.rolling_mean(close, long_period)
             features[f'ma_diff_{short}_{long_period}'] = (short_ma - long_ma) / long_ma
-            
-        return features
     
-    def _add_support_resistance_indicators(self, data: pd.DataFrame, features: pd.DataFrame) -> pd.DataFrame:
+    def _add_support_resistance_indicators(self, prices: Dict[str, np.ndarray], features: _FeatureMatrix) -> None:
         """Add support and resistance level indicators"""
+        close = prices['Close']
         
         # Pivot Points
-        features['pivot_point'] = (data['High'].shift(1) + data['Low'].shift(1) + data['Close'].shift(1)) / 3
-        features['resistance_1'] = 2 * features['pivot_point'] - data['Low'].shift(1)
-        features['support_1'] = 2 * features['pivot_point'] - data['High'].shift(1)
-        features['resistance_2'] = features['pivot_point'] + (data['High'].shift(1) - data['Low'].shift(1))
-        features['support_2'] = features['pivot_point'] - (data['High'].shift(1) - data['Low'].shift(1))
+        for name, level in kernels.pivot_points(prices['High'], prices['Low'], close).items():
+            features[name] = level
         
         # Distance from pivot levels
-        features['dist_from_pivot'] = (data['Close'] - features['pivot_point']) / features['pivot_point']
-        features['dist_from_r1'] = (data['Close'] - features['resistance_1']) / features['resistance_1']
-        features['dist_from_s1'] = (data['Close'] - features['support_1']) / features['support_1']
+        for name, level in [('pivot', 'pivot_point'), ('r1', 'resistance_1'), ('s1', 'support_1')]:
+            features[f'dist_from_{name}'] = (close - features[level]) / features[level]
         
         # Fibonacci Retracements (simplified)
         for period in [20, 50]:
-            high_max = data['High'].rolling(period).max()
-            low_min = data['Low'].rolling(period).min()
-            price_range = high_max - low_min
-            
-            features[f'fib_23.6_{period}'] = high_max - 0.236 * price_range
-            features[f'fib_38.2_{period}'] = high_max - 0.382 * price_range
-            features[f'fib_50.0_{period}'] = high_max - 0.500 * price_range
-            features[f'fib_61.8_{period}'] = high_max - 0.618 * price_range
-            
-        return features
+            levels = kernels.fibonacci_levels(prices['High'], prices['Low'], period,
+                                              kernels.DEFAULT_FIBONACCI_RATIOS)
+            for column, ratio in enumerate(kernels.DEFAULT_FIBONACCI_RATIOS):
+                features[f'fib_{ratio * 100:.1f}_{period}'] = levels[:, column]
     
     def _calculate_parabolic_sar(self, data: pd.DataFrame) -> pd.Series:
         """Calculate Parabolic SAR indicator"""
         # Simplified Parabolic SAR calculation
-        sar = pd.Series(index=data.index, dtype=float)
-        
-        if len(data) < 2:
-            return sar
-            
-        # Initialize
-        sar.iloc[0] = data['Low'].iloc[0]
-        af = 0.02
-        max_af = 0.2
-        
-        for i in range(1, len(data)):
-            if i == 1:
-                sar.iloc[i] = data['High'].iloc[0]
-            else:
-                sar.iloc[i] = sar.iloc[i-1] + af * (data['High'].iloc[i-1] - sar.iloc[i-1])
-                
-        return sar
+        sar = kernels.parabolic_sar_simplified(data['High'].values, data['Low'].values)
+        return pd.Series(sar, index=data.index, dtype=float)
 
 
 class FundamentalAnalysisEngine(BaseFeatureEngine):
@@ -631,6 +642,9 @@ class MarketMicrostructureEngine(BaseFeatureEngine):
 class TimeSeriesFeatureEngine(BaseFeatureEngine):
     """Engine for time-series specific features"""
     
+    # Longest dependency: 50-bar rolling windows over returns (51 closes), lag-20 returns (22 closes)
+    max_lookback = 52
+    
     def extract_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """Extract time-series features"""
         logger.info("Extracting time-series features")
@@ -791,6 +805,12 @@ def create_comprehensive_features(data: pd.DataFrame,
         ts_features = ts_engine.extract_features(data)
         all_features = pd.concat([all_features, ts_features], axis=1)
     
+    return finalize_features(all_features)
+
+
+def finalize_features(all_features: pd.DataFrame) -> pd.DataFrame:
+    """Drop mostly-empty features and fill remaining gaps (shared by the feature store)"""
+    
     # Remove features with too many NaN values
     nan_threshold = 0.5  # Remove features with >50% NaN values
     nan_ratios = all_features.isnull().sum() / len(all_features)
@@ -798,7 +818,7 @@ def create_comprehensive_features(data: pd.DataFrame,
     all_features = all_features[features_to_keep]
     
     # Forward fill remaining NaN values
-    all_features = all_features.fillna(method='ffill').fillna(method='bfill')
+    all_features = all_features.ffill().bfill()
     
     logger.info(f"Generated {len(all_features.columns)} total features")
     
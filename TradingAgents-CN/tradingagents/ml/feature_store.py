@@ -0,0 +1,271 @@
+"""Incremental Feature Store for Stock Market Features
+
+Persists raw (un-normalized) price-derived feature blocks per symbol, keyed by
+(feature set version, feature dtype, symbol, date), in columnar storage. When new bars are
+appended only the rows from the first new/changed bar onward are recomputed:
+
+- engines with a bounded ``max_lookback`` recompute just a tail slice of
+  ``max_lookback`` bars before the first dirty row;
+- engines whose features depend on the whole history (cumulative sums, EWMs)
+  are recomputed from the start, but stored rows before the dirty point are kept.
+
+Features are causal, so earlier rows never change when bars are appended.
+Normalization, NaN filtering and filling are applied at serve time exactly as in
+``create_comprehensive_features``, so served matrices match a full rebuild.
+"""
+
+import os
+import threading
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import (
+    FeatureConfig, finalize_features,
+    TechnicalIndicatorEngine, FundamentalAnalysisEngine,
+    SentimentAnalysisEngine, MarketMicrostructureEngine,
+    TimeSeriesFeatureEngine
+)
+from tradingagents.dataflows.frame_storage import get_frame_storage, load_frame
+
+# Import logging system
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("feature_engineering")
+
+# Bump whenever a stored engine's feature definitions change
+FEATURE_SET_VERSION = "2"
+
+# Price-derived engines whose raw output is stored: block name -> (engine class, FeatureConfig flag)
+STORED_ENGINES = {
+    'technical': (TechnicalIndicatorEngine, 'technical_indicators'),
+    'microstructure': (MarketMicrostructureEngine, 'microstructure_features'),
+    'time_series': (TimeSeriesFeatureEngine, 'time_series_features'),
+}
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+_BARS_BLOCK = '_bars'
+
+
+class IncrementalFeatureStore:
+    """Per-symbol persistent feature store with dirty-row recomputation"""
+
+    def __init__(self, store_dir: Optional[str] = None, config: Optional[FeatureConfig] = None,
+                 storage_format: Optional[str] = None):
+        """
+        Args:
+            store_dir: Root directory, defaults to TRADINGAGENTS_FEATURE_STORE_DIR or
+                       dataflows/data_cache/feature_store
+            config: Feature configuration (which engines are enabled, normalization)
+            storage_format: parquet | feather | csv, see ``get_frame_storage``
+        """
+        if store_dir is None:
+            store_dir = os.getenv("TRADINGAGENTS_FEATURE_STORE_DIR")
+        if store_dir is None:
+            store_dir = Path(__file__).resolve().parents[1] / "dataflows" / "data_cache" / "feature_store"
+
+        self.config = config or FeatureConfig()
+        # Raw blocks are computed in the configured dtype, so each dtype gets its own store
+        self.root = Path(store_dir) / f"v{FEATURE_SET_VERSION}-{self.config.feature_dtype}"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.storage = get_frame_storage(storage_format)
+
+        # Raw engines never normalize; normalization happens at serve time
+        raw_config = replace(self.config, normalize_features=False)
+        self._raw_engines = {
+            name: engine_cls(raw_config)
+            for name, (engine_cls, flag) in STORED_ENGINES.items()
+            if getattr(self.config, flag)
+        }
+
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {'rows_reused': 0, 'rows_computed': 0, 'full_rebuilds': 0}
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _block_path(self, symbol: str, block: str) -> Path:
+        return self.root / symbol / f"{block}{self.storage.extension}"
+
+    def _load_block(self, symbol: str, block: str, datetime_index: bool) -> Optional[pd.DataFrame]:
+        for path in (self.root / symbol).glob(f"{block}.*"):
+            try:
+                frame = load_frame(path)
+            except Exception as e:
+                logger.warning(f"Failed to read feature store block {path}: {e}")
+                return None
+            if datetime_index:
+                # CSV storage round-trips dates as strings
+                frame.index = pd.to_datetime(frame.index)
+            return frame
+        return None
+
+    def _save_block(self, symbol: str, block: str, frame: pd.DataFrame) -> None:
+        symbol_dir = self.root / symbol
+        symbol_dir.mkdir(parents=True, exist_ok=True)
+        for path in symbol_dir.glob(f"{block}.*"):
+            if path.suffix != self.storage.extension:
+                path.unlink()
+        self.storage.save(frame, self._block_path(symbol, block))
+
+    @staticmethod
+    def _bar_hashes(data: pd.DataFrame) -> pd.DataFrame:
+        columns = [col for col in BAR_COLUMNS if col in data.columns]
+        hashes = pd.util.hash_pandas_object(data[columns], index=False).values.view(np.int64)
+        return pd.DataFrame({'bar_hash': hashes}, index=data.index)
+
+    @staticmethod
+    def _first_dirty_row(stored: Optional[pd.DataFrame], current: pd.DataFrame) -> int:
+        """Position of the first bar that is new or differs from the stored bars"""
+        if stored is None or stored.empty:
+            return 0
+        n = min(len(stored), len(current))
+        same = ((stored.index[:n] == current.index[:n]) &
+                (stored['bar_hash'].values[:n] == current['bar_hash'].values[:n]))
+        return n if same.all() else int(np.argmin(same))
+
+    def update(self, symbol: str, data: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Bring the stored raw feature blocks up to date with ``data``
+
+        Args:
+            symbol: Stock symbol
+            data: Full OHLCV history (same start as previous calls, new bars appended)
+
+        Returns:
+            Dict of raw feature blocks aligned with ``data.index``
+        """
+        datetime_index = isinstance(data.index, pd.DatetimeIndex)
+        with self._symbol_lock(symbol):
+            bars = self._bar_hashes(data)
+            stored_bars = self._load_block(symbol, _BARS_BLOCK, datetime_index)
+            dirty = self._first_dirty_row(stored_bars, bars)
+
+            blocks = {}
+            changed = False
+            for name, engine in self._raw_engines.items():
+                stored = self._load_block(symbol, name, datetime_index) if dirty > 0 else None
+                block_dirty = min(dirty, len(stored)) if stored is not None else 0
+                blocks[name] = self._compute_block(engine, data, stored, block_dirty)
+                changed = changed or block_dirty < len(data)
+
+            # A shorter prefix of the stored history is served without touching the store
+            if changed:
+                for name, block in blocks.items():
+                    self._save_block(symbol, name, block)
+                self._save_block(symbol, _BARS_BLOCK, bars)
+
+        return blocks
+
+    def _compute_block(self, engine, data: pd.DataFrame, stored: Optional[pd.DataFrame],
+                       dirty: int) -> pd.DataFrame:
+        """Reuse stored rows before ``dirty`` and compute the rest
+
+        Only engines with a bounded ``max_lookback`` run on a tail slice; the others
+        run on the full history and just the rows from ``dirty`` onward are kept.
+        """
+        if dirty >= len(data):
+            self.stats['rows_reused'] += len(data)
+            return stored.iloc[:len(data)]
+
+        if dirty == 0 or engine.max_lookback is None:
+            start = 0
+        else:
+            start = max(0, dirty - engine.max_lookback)
+
+        fresh = engine.extract_features(data.iloc[start:]).iloc[dirty - start:]
+        if dirty == 0:
+            self.stats['full_rebuilds'] += 1
+            self.stats['rows_computed'] += len(fresh)
+            return fresh
+
+        if list(fresh.columns) != list(stored.columns):
+            # Feature set depends on history length (e.g. conditional columns): rebuild the block
+            logger.info(f"Feature columns changed for {type(engine).__name__}, rebuilding block")
+            return self._compute_block(engine, data, None, 0)
+
+        self.stats['rows_reused'] += dirty
+        self.stats['rows_computed'] += len(fresh)
+        return pd.concat([stored.iloc[:dirty], fresh])
+
+    def get_features(self, symbol: str, data: pd.DataFrame,
+                     fundamentals: Optional[Dict] = None,
+                     news_data: Optional[List] = None,
+                     start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """Feature matrix for ``data``, equivalent to ``create_comprehensive_features``
+
+        Stored blocks are updated incrementally; fundamental and sentiment features
+        depend on per-call inputs and are computed fresh. Normalization and
+        ``finalize_features`` run over the whole served history on every call.
+        """
+        blocks = self.update(symbol, data)
+        config = self.config
+
+        all_features = pd.DataFrame(index=data.index)
+        parts = []
+        if config.technical_indicators:
+            parts.append(self._normalize(TechnicalIndicatorEngine, blocks['technical']))
+        if config.fundamental_features:
+            parts.append(FundamentalAnalysisEngine(config).extract_features(data, fundamentals))
+        if config.sentiment_features:
+            parts.append(SentimentAnalysisEngine(config).extract_features(data, news_data))
+        if config.microstructure_features:
+            parts.append(self._normalize(MarketMicrostructureEngine, blocks['microstructure']))
+        if config.time_series_features:
+            parts.append(self._normalize(TimeSeriesFeatureEngine, blocks['time_series']))
+
+        if parts:
+            all_features = pd.concat([all_features] + parts, axis=1)
+        features = finalize_features(all_features)
+
+        if start is not None or end is not None:
+            features = features.loc[start:end]
+        return features
+
+    def _normalize(self, engine_cls, block: pd.DataFrame) -> pd.DataFrame:
+        # Fresh engine per call: scalers are fit on the served rows, as in the engines
+        return engine_cls(self.config).normalize_features(block.copy())
+
+    def latest_features(self, symbol: str, data: pd.DataFrame,
+                        feature_names: Optional[List[str]] = None,
+                        fundamentals: Optional[Dict] = None,
+                        news_data: Optional[List] = None) -> np.ndarray:
+        """Feature vector of the latest bar, shaped (1, n_features) for model inference
+
+        Args:
+            feature_names: Column order the model was trained with; missing features are 0
+        """
+        features = self.get_features(symbol, data, fundamentals=fundamentals, news_data=news_data)
+        latest = features.iloc[[-1]]
+        if feature_names:
+            missing = [name for name in feature_names if name not in latest.columns]
+            if missing:
+                logger.warning(f"{symbol}: {len(missing)} model features missing from store, filled with 0")
+            latest = latest.reindex(columns=feature_names, fill_value=0.0)
+        return latest.values.astype(float)
+
+    def invalidate(self, symbol: str) -> None:
+        """Delete all stored blocks for a symbol"""
+        with self._symbol_lock(symbol):
+            for path in (self.root / symbol).glob("*.*"):
+                path.unlink()
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+
+_feature_stores: Dict[str, IncrementalFeatureStore] = {}
+_feature_stores_lock = threading.Lock()
+
+
+def get_feature_store(store_dir: Optional[str] = None,
+                      config: Optional[FeatureConfig] = None) -> IncrementalFeatureStore:
+    """Shared feature store instance per (directory, feature config)"""
+    key = f"{store_dir}|{config!r}"
+    with _feature_stores_lock:
+        if key not in _feature_stores:
+            _feature_stores[key] = IncrementalFeatureStore(store_dir, config)
+        return _feature_stores[key]
@@ -29,6 +29,7 @@ from .deployment import InferenceService, ModelRegistry, DeploymentConfig
 
 # Import logging system
 from tradingagents.utils.logging_init import get_logger
+from tradingagents.utils import indicator_kernels as kernels
 logger = get_logger("ml_integration")
 
 
@@ -700,13 +701,7 @@ class MLEnhancedChartingArtist(BaseSpecializedAgent):
     
     def _calculate_rsi(self, prices: pd.Series, window: int = 14) -> pd.Series:
         """Calculate RSI"""
-        delta = prices.diff()
-        gain = np.where(delta > 0, delta, 0)
-        loss = np.where(delta < 0, -delta, 0)
-        avg_gain = pd.Series(gain).rolling(window).mean()
-        avg_loss = pd.Series(loss).rolling(window).mean()
-        rs = avg_gain / avg_loss
-        return 100 - (100 / (1 + rs))
+        return pd.Series(kernels.rsi(kernels.as_float_array(prices), window), index=prices.index)
     
     async def _create_prediction_overlay(self, data: pd.DataFrame, predictions: Dict) -> Dict:
         """Create price prediction overlay for charts"""
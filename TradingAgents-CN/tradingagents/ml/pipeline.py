@@ -10,7 +10,10 @@ from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import json
+import random
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Import ML pipeline components
@@ -20,6 +23,7 @@ from .feature_engineering import (
     SentimentAnalysisEngine, MarketMicrostructureEngine,
     TimeSeriesFeatureEngine
 )
+from .feature_store import IncrementalFeatureStore
 from .models import (
     ModelConfig, create_model,
     PricePredictionModel, TradingSignalClassifier,
@@ -41,9 +45,11 @@ from tradingagents.dataflows import (
     get_YFin_data_window, get_china_stock_data_unified,
     get_finnhub_news
 )
+from tradingagents.dataflows.rate_limiter import get_rate_limiter
 
 # Import logging system
 from tradingagents.utils.logging_init import get_logger
+from tradingagents.utils import indicator_kernels as kernels
 logger = get_logger("ml_pipeline")
 
 
@@ -58,6 +64,8 @@ class PipelineConfig:
     
     # Feature engineering
     feature_config: FeatureConfig = None
+    use_feature_store: bool = True  # Incremental per-symbol feature store
+    feature_store_dir: Optional[str] = None  # Defaults to <output_dir>/feature_store
     
     # Model training
     model_configs: Dict[str, ModelConfig] = None
@@ -68,6 +76,12 @@ class PipelineConfig:
     # Deployment
     deployment_config: DeploymentConfig = None
     
+    # Data ingestion
+    ingestion_workers: int = 8  # Concurrent symbol downloads
+    source_rate_limits: Dict[str, float] = None  # Max calls per second per source ("market", "news")
+    ingestion_max_retries: int = 3
+    ingestion_backoff_seconds: float = 1.0  # Base delay, doubled on every retry
+    
     # Pipeline settings
     auto_retrain: bool = True
     retrain_frequency_days: int = 30
@@ -100,6 +114,9 @@ class PipelineConfig:
         
         if self.deployment_config is None:
             self.deployment_config = DeploymentConfig()
+        
+        if self.source_rate_limits is None:
+            self.source_rate_limits = {"market": 5.0, "news": 1.0}  # Finnhub free tier is the tightest
 
 
 class MLPipeline:
@@ -110,12 +127,28 @@ class MLPipeline:
         self.output_dir = Path(config.output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Incremental feature store shared by training and inference
+        self.feature_store = None
+        if config.use_feature_store:
+            self.feature_store = IncrementalFeatureStore(
+                config.feature_store_dir or str(self.output_dir / "feature_store"),
+                config.feature_config
+            )
+        
         # Initialize pipeline components
         self.model_registry = ModelRegistry(config.deployment_config)
-        self.inference_service = InferenceService(config.deployment_config, self.model_registry)
+        self.inference_service = InferenceService(
+            config.deployment_config, self.model_registry, feature_store=self.feature_store
+        )
         self.ab_testing = ABTestingFramework(config.deployment_config)
         self.monitor = ModelMonitor(config.deployment_config)
         
+        # Per-source buckets on the shared data-source rate limiter, so ingestion workers
+        # coordinate with each other and with other processes using the same backend
+        self.rate_limiter = get_rate_limiter()
+        for source, rate in (config.source_rate_limits or {}).items():
+            self.rate_limiter.configure(self._rate_limit_key(source), rate, capacity=1.0)
+        
         # Pipeline state
         self.pipeline_runs = []
         self.trained_models = {}
@@ -133,13 +166,9 @@ class MLPipeline:
         pipeline_id = f"pipeline_{pipeline_start_time.strftime('%Y%m%d_%H%M%S')}"
         
         try:
-            # Step 1: Data ingestion and preparation
-            logger.info("Step 1: Data ingestion and preparation")
-            data_results = self._ingest_and_prepare_data(symbols)
-            
-            # Step 2: Feature engineering
-            logger.info("Step 2: Feature engineering")
-            feature_results = self._engineer_features(data_results)
+            # Steps 1-2: Concurrent data ingestion, features engineered as each symbol arrives
+            logger.info("Step 1-2: Data ingestion and feature engineering")
+            data_results, feature_results = self._ingest_and_engineer(symbols)
             
             # Step 3: Model training
             logger.info("Step 3: Model training")
@@ -195,69 +224,152 @@ class MLPipeline:
     def _ingest_and_prepare_data(self, symbols: List[str]) -> Dict:
         """Ingest and prepare data for ML pipeline"""
         
-        data_results = {
+        data_results = self._empty_data_results(symbols)
+        for symbol, symbol_data in self._iter_ingested_symbols(symbols):
+            self._add_symbol_data(data_results, symbol, symbol_data)
+        
+        return self._order_by_symbols(data_results, symbols)
+    
+    def _ingest_and_engineer(self, symbols: List[str]) -> Tuple[Dict, Dict]:
+        """Ingest symbols concurrently and engineer features as soon as each one arrives
+        
+        Downloads run on the worker pool while feature engineering runs on the
+        calling thread, so CPU work overlaps with the remaining network fetches.
+        """
+        data_results = self._empty_data_results(symbols)
+        feature_results = self._empty_feature_results()
+        
+        for symbol, symbol_data in self._iter_ingested_symbols(symbols):
+            self._add_symbol_data(data_results, symbol, symbol_data)
+            self._engineer_symbol_features(
+                feature_results, symbol, symbol_data['market_data'],
+                symbol_data['news_data'], data_results['fundamental_data'].get(symbol, {})
+            )
+        
+        data_results = self._order_by_symbols(data_results, symbols)
+        feature_results = self._order_by_symbols(feature_results, symbols)
+        if feature_results['features']:
+            # Same convention as _engineer_features: names of the first symbol in input order
+            feature_results['feature_names'] = list(next(iter(feature_results['features'].values())).columns)
+        return data_results, feature_results
+    
+    @staticmethod
+    def _empty_data_results(symbols: List[str]) -> Dict:
+        return {
             'symbols': symbols,
             'market_data': {},
             'news_data': {},
             'fundamental_data': {},
             'data_quality': {}
         }
+    
+    @staticmethod
+    def _add_symbol_data(data_results: Dict, symbol: str, symbol_data: Dict) -> None:
+        data_results['market_data'][symbol] = symbol_data['market_data']
+        if symbol_data['news_data'] is not None:
+            data_results['news_data'][symbol] = symbol_data['news_data']
+        data_results['data_quality'][symbol] = symbol_data['data_quality']
+    
+    @staticmethod
+    def _order_by_symbols(results: Dict, symbols: List[str]) -> Dict:
+        """Restore input symbol order in per-symbol dicts (completion order is arbitrary)"""
+        return {
+            key: {symbol: value[symbol] for symbol in symbols if symbol in value}
+            if isinstance(value, dict) else value
+            for key, value in results.items()
+        }
+    
+    def _iter_ingested_symbols(self, symbols: List[str]):
+        """Yield (symbol, symbol_data) in completion order using a bounded worker pool"""
+        workers = max(1, min(self.config.ingestion_workers, len(symbols)))
+        logger.info(f"Ingesting {len(symbols)} symbols with {workers} workers")
         
-        for symbol in symbols:
-            try:
-                logger.info(f"Ingesting data for {symbol}")
-                
-                # Get market data
-                if self.config.market_type == "US":
-                    market_data = get_YFin_data_window(
-                        symbol, 
-                        self.config.start_date, 
-                        self.config.end_date
-                    )
-                elif self.config.market_type == "CN":
-                    market_data = get_china_stock_data_unified(
-                        symbol,
-                        start_date=self.config.start_date,
-                        end_date=self.config.end_date
-                    )
-                else:
-                    logger.warning(f"Market type {self.config.market_type} not fully supported")
-                    continue
-                
-                if market_data is None or market_data.empty:
-                    logger.warning(f"No market data retrieved for {symbol}")
-                    continue
-                
-                # Ensure required columns exist
-                required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-                missing_columns = [col for col in required_columns if col not in market_data.columns]
-                
-                if missing_columns:
-                    logger.error(f"Missing required columns for {symbol}: {missing_columns}")
-                    continue
-                
-                data_results['market_data'][symbol] = market_data
-                
-                # Get news data (if available)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ml-ingest") as executor:
+            futures = {executor.submit(self._ingest_symbol, symbol): symbol for symbol in symbols}
+            for future in as_completed(futures):
+                symbol = futures[future]
                 try:
-                    if self.config.market_type == "US":
-                        news_data = get_finnhub_news(symbol, days_back=90)
-                        data_results['news_data'][symbol] = news_data
+                    symbol_data = future.result()
                 except Exception as e:
-                    logger.warning(f"Could not retrieve news data for {symbol}: {e}")
-                    data_results['news_data'][symbol] = []
-                
-                # Data quality assessment
-                data_quality = self._assess_data_quality(market_data)
-                data_results['data_quality'][symbol] = data_quality
-                
-                logger.info(f"Data ingestion completed for {symbol}: {len(market_data)} records")
-                
-            except Exception as e:
-                logger.error(f"Failed to ingest data for {symbol}: {e}")
-                continue
+                    logger.error(f"Failed to ingest data for {symbol}: {e}")
+                    continue
+                if symbol_data is not None:
+                    yield symbol, symbol_data
+    
+    def _ingest_symbol(self, symbol: str) -> Optional[Dict]:
+        """Fetch and check market data, news and data quality for one symbol"""
+        logger.info(f"Ingesting data for {symbol}")
+        
+        # Get market data
+        if self.config.market_type == "US":
+            market_data = self._call_source(
+                "market", get_YFin_data_window,
+                symbol, 
+                self.config.start_date, 
+                self.config.end_date
+            )
+        elif self.config.market_type == "CN":
+            market_data = self._call_source(
+                "market", get_china_stock_data_unified,
+                symbol,
+                start_date=self.config.start_date,
+                end_date=self.config.end_date
+            )
+        else:
+            logger.warning(f"Market type {self.config.market_type} not fully supported")
+            return None
+        
+        if market_data is None or market_data.empty:
+            logger.warning(f"No market data retrieved for {symbol}")
+            return None
+        
+        # Ensure required columns exist
+        required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+        missing_columns = [col for col in required_columns if col not in market_data.columns]
+        
+        if missing_columns:
+            logger.error(f"Missing required columns for {symbol}: {missing_columns}")
+            return None
+        
+        # Get news data (if available)
+        news_data = None
+        try:
+            if self.config.market_type == "US":
+                news_data = self._call_source("news", get_finnhub_news, symbol, days_back=90)
+        except Exception as e:
+            logger.warning(f"Could not retrieve news data for {symbol}: {e}")
+            news_data = []
+        
+        # Data quality assessment
+        data_quality = self._assess_data_quality(market_data)
         
-        return data_results
+        logger.info(f"Data ingestion completed for {symbol}: {len(market_data)} records")
+        return {
+            'market_data': market_data,
+            'news_data': news_data,
+            'data_quality': data_quality
+        }
+    
+    @staticmethod
+    def _rate_limit_key(source: str) -> str:
+        """Bucket name for an ingestion source on the shared rate limiter"""
+        return f"ml_{source}"
+    
+    def _call_source(self, source: str, fetch_fn, *args, **kwargs):
+        """Call a data source under its rate limit, retrying with exponential backoff"""
+        max_retries = max(0, self.config.ingestion_max_retries)
+        
+        for attempt in range(max_retries + 1):
+            self.rate_limiter.acquire(self._rate_limit_key(source))
+            try:
+                return fetch_fn(*args, **kwargs)
+            except Exception as e:
+                if attempt >= max_retries:
+                    raise
+                delay = self.config.ingestion_backoff_seconds * (2 ** attempt)
+                delay *= 0.5 + random.random()  # Jitter so workers don't retry in lockstep
+                logger.warning(f"{source} fetch failed ({e}), retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+                time.sleep(delay)
     
     def _assess_data_quality(self, data: pd.DataFrame) -> Dict:
         """Assess data quality and completeness"""
@@ -299,55 +411,70 @@ class MLPipeline:
     def _engineer_features(self, data_results: Dict) -> Dict:
         """Engineer features for all symbols"""
         
-        feature_results = {
+        feature_results = self._empty_feature_results()
+        
+        for symbol, market_data in data_results['market_data'].items():
+            self._engineer_symbol_features(
+                feature_results, symbol, market_data,
+                data_results['news_data'].get(symbol, []),
+                data_results['fundamental_data'].get(symbol, {})
+            )
+        
+        return feature_results
+    
+    @staticmethod
+    def _empty_feature_results() -> Dict:
+        return {
             'features': {},
             'feature_names': [],
             'feature_stats': {}
         }
-        
-        for symbol, market_data in data_results['market_data'].items():
-            try:
-                logger.info(f"Engineering features for {symbol}")
-                
-                # Get additional data
-                news_data = data_results['news_data'].get(symbol, [])
-                fundamental_data = data_results['fundamental_data'].get(symbol, {})
-                
-                # Create comprehensive features
+    
+    def _engineer_symbol_features(self, feature_results: Dict, symbol: str, market_data: pd.DataFrame,
+                                  news_data: Any, fundamental_data: Dict) -> None:
+        """Engineer features for one symbol and add them to feature_results"""
+        try:
+            logger.info(f"Engineering features for {symbol}")
+            
+            # Create comprehensive features (stored rows are reused when the store is enabled)
+            if self.feature_store is not None:
+                features = self.feature_store.get_features(
+                    symbol, market_data,
+                    fundamentals=fundamental_data,
+                    news_data=news_data or []
+                )
+            else:
                 features = create_comprehensive_features(
                     data=market_data,
                     config=self.config.feature_config,
                     fundamentals=fundamental_data,
-                    news_data=news_data
+                    news_data=news_data or []
                 )
+            
+            if features is not None and not features.empty:
+                feature_results['features'][symbol] = features
                 
-                if features is not None and not features.empty:
-                    feature_results['features'][symbol] = features
-                    
-                    # Feature statistics
-                    feature_stats = {
-                        'total_features': len(features.columns),
-                        'feature_names': list(features.columns),
-                        'data_points': len(features),
-                        'missing_values': features.isnull().sum().sum(),
-                        'completeness': 1 - (features.isnull().sum().sum() / features.size)
-                    }
-                    
-                    feature_results['feature_stats'][symbol] = feature_stats
-                    
-                    # Update global feature names
-                    if not feature_results['feature_names']:
-                        feature_results['feature_names'] = list(features.columns)
-                    
-                    logger.info(f"Features engineered for {symbol}: {len(features.columns)} features, {len(features)} samples")
-                else:
-                    logger.warning(f"No features generated for {symbol}")
-                    
-            except Exception as e:
-                logger.error(f"Feature engineering failed for {symbol}: {e}")
-                continue
-        
-        return feature_results
+                # Feature statistics
+                feature_stats = {
+                    'total_features': len(features.columns),
+                    'feature_names': list(features.columns),
+                    'data_points': len(features),
+                    'missing_values': features.isnull().sum().sum(),
+                    'completeness': 1 - (features.isnull().sum().sum() / features.size)
+                }
+                
+                feature_results['feature_stats'][symbol] = feature_stats
+                
+                # Update global feature names
+                if not feature_results['feature_names']:
+                    feature_results['feature_names'] = list(features.columns)
+                
+                logger.info(f"Features engineered for {symbol}: {len(features.columns)} features, {len(features)} samples")
+            else:
+                logger.warning(f"No features generated for {symbol}")
+                
+        except Exception as e:
+            logger.error(f"Feature engineering failed for {symbol}: {e}")
     
     def _train_models(self, feature_results: Dict) -> Dict:
         """Train models for all configured tasks"""
@@ -578,17 +705,7 @@ class MLPipeline:
     
     def _calculate_rsi(self, prices: pd.Series, window: int = 14) -> pd.Series:
         """Calculate RSI indicator"""
-        delta = prices.diff()
-        gain = np.where(delta > 0, delta, 0)
-        loss = np.where(delta < 0, -delta, 0)
-        
-        avg_gain = pd.Series(gain).rolling(window=window).mean()
-        avg_loss = pd.Series(loss).rolling(window=window).mean()
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        return pd.Series(kernels.rsi(kernels.as_float_array(prices), window), index=prices.index)
     
     def _create_validation_target(self, data: pd.DataFrame, task_name: str) -> Optional[pd.Series]:
         """Create validation target from market data"""
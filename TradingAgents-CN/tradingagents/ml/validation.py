@@ -193,6 +193,146 @@ class TimeSeriesValidator(BaseValidator):
         return aggregated
 
 
+def _encode_signals(signals: np.ndarray) -> np.ndarray:
+    """Encode 'BUY'/'SELL'/'HOLD' strings (or signed numbers) as +1/-1/0"""
+    signals = np.asarray(signals)
+    if signals.dtype.kind in 'biuf':
+        return np.sign(np.nan_to_num(signals.astype(float))).astype(np.int8)
+    codes = np.zeros(signals.shape, dtype=np.int8)
+    codes[signals == 'BUY'] = 1
+    codes[signals == 'SELL'] = -1
+    return codes
+
+
+def _forward_fill(values: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Forward-fill ``values`` from the rows where ``mask`` is set (along axis 0)
+    
+    Returns the filled array and a boolean array marking rows that have a prior mask hit.
+    """
+    rows = np.arange(values.shape[0]).reshape(-1, *([1] * (values.ndim - 1)))
+    source = np.where(mask, rows, -1)
+    np.maximum.accumulate(source, axis=0, out=source)
+    filled = np.take_along_axis(values, np.maximum(source, 0), axis=0)
+    return filled, source >= 0
+
+
+def vectorized_backtest(signals: np.ndarray, prices: np.ndarray,
+                        initial_capital: float = 100000.0,
+                        transaction_cost: float = 0.001,
+                        position_fraction: float = 0.2,
+                        expected_returns: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Array backtest kernel for long/flat strategies
+    
+    Same rules as the original bar-by-bar loop: a BUY while flat invests
+    ``position_fraction`` of portfolio value (plus transaction cost), a SELL
+    while long closes the whole position, everything else holds. Because cash
+    only changes at trades, equity is the product of per-trade growth factors
+    times the mark-to-market of the open position, so the whole path is
+    computed with cumulative array operations.
+    
+    Args:
+        signals: (dates,) or (dates, symbols) array of 'BUY'/'SELL'/'HOLD' or +1/-1/0
+        prices: close prices with the same shape as ``signals``
+        initial_capital: starting cash per symbol
+        transaction_cost: proportional cost applied to both buys and sells
+        position_fraction: fraction of portfolio value invested per entry
+        expected_returns: if given, a BUY only enters when the expected return is positive
+        
+    Returns:
+        Dict of arrays shaped like ``prices``: 'values', 'cash', 'shares',
+        'daily_returns', 'entries', 'exits', plus 'num_trades' per symbol
+    """
+    prices = np.asarray(prices, dtype=float)
+    codes = _encode_signals(signals)
+    
+    buy = codes == 1
+    if expected_returns is not None:
+        buy &= np.asarray(expected_returns, dtype=float) > 0
+    if position_fraction <= 0 or position_fraction * (1 + transaction_cost) > 1:
+        buy[:] = False  # position too small or unaffordable, entries never fill
+    sell = codes == -1
+    
+    # Long/flat state: the latest effective BUY/SELL decides the position
+    last_event, seen = _forward_fill(buy.astype(np.int8), buy | sell)
+    holding = seen & (last_event == 1)
+    previous = np.zeros_like(holding)
+    previous[1:] = holding[:-1]
+    entries = holding & ~previous
+    exits = previous & ~holding
+    
+    entry_price, _ = _forward_fill(prices, entries)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(holding | exits, prices / entry_price, 1.0)
+    
+    # Per entry with capital K: cash becomes K * kept, shares are K * fraction / entry price
+    kept = 1 - position_fraction * (1 + transaction_cost)
+    growth = np.where(exits, kept + position_fraction * (1 - transaction_cost) * ratio, 1.0)
+    basis = initial_capital * np.cumprod(growth, axis=0)
+    values = basis * np.where(holding, kept + position_fraction * ratio, 1.0)
+    cash = np.where(holding, basis * kept, basis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = np.where(holding, basis * position_fraction / entry_price, 0.0)
+    
+    daily_returns = np.zeros_like(values)
+    if len(values) > 1:
+        daily_returns[1:] = (values[1:] - values[:-1]) / values[:-1]
+    
+    return {
+        'values': values,
+        'cash': cash,
+        'shares': shares,
+        'daily_returns': daily_returns,
+        'entries': entries,
+        'exits': exits,
+        'num_trades': entries.sum(axis=0) + exits.sum(axis=0)
+    }
+
+
+def calculate_performance_metrics_batch(daily_values: np.ndarray, daily_returns: np.ndarray,
+                                        num_trades: np.ndarray,
+                                        initial_capital: float) -> Dict[str, np.ndarray]:
+    """Column-wise version of ``BacktestingFramework._calculate_performance_metrics``
+    
+    Args:
+        daily_values: (dates, symbols) equity curves
+        daily_returns: (dates, symbols) daily returns, first row 0
+        num_trades: (symbols,) trade counts
+        initial_capital: starting capital per symbol
+    """
+    daily_values = np.asarray(daily_values, dtype=float)
+    daily_returns = np.asarray(daily_returns, dtype=float)
+    days = daily_values.shape[0]
+    if days == 0:
+        return {}
+    
+    zeros = np.zeros(daily_values.shape[1:])
+    final_value = daily_values[-1]
+    metrics = {'total_return': (final_value - initial_capital) / initial_capital}
+    metrics['annualized_return'] = (final_value / initial_capital) ** (252 / days) - 1 if days > 1 else zeros
+    metrics['volatility'] = np.std(daily_returns, axis=0) * np.sqrt(252) if days > 1 else zeros
+    
+    # Sharpe ratio (assuming 2% risk-free rate)
+    risk_free_rate = 0.02
+    volatility = metrics['volatility']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        metrics['sharpe_ratio'] = np.where(
+            volatility > 0, (metrics['annualized_return'] - risk_free_rate) / volatility, 0.0)
+    
+    if days > 1:
+        peak = np.maximum.accumulate(daily_values, axis=0)
+        metrics['max_drawdown'] = np.min((daily_values - peak) / peak, axis=0)
+    else:
+        metrics['max_drawdown'] = zeros
+    
+    metrics['win_rate'] = np.mean(daily_returns > 0, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        metrics['calmar_ratio'] = np.where(
+            metrics['max_drawdown'] < 0,
+            metrics['annualized_return'] / np.abs(metrics['max_drawdown']), 0.0)
+    metrics['num_trades'] = np.asarray(num_trades)
+    return metrics
+
+
 class BacktestingFramework(BaseValidator):
     """Comprehensive backtesting framework for trading strategies"""
     
@@ -248,119 +388,127 @@ class BacktestingFramework(BaseValidator):
     
     def _run_backtest(self, signals: pd.Series, prices: pd.DataFrame, 
                      returns: pd.Series) -> Dict:
-        """Run backtesting simulation"""
-        
-        # Initialize portfolio
-        portfolio = {
-            'cash': self.config.initial_capital,
-            'positions': 0,
-            'portfolio_value': self.config.initial_capital,
-            'trades': [],
-            'daily_returns': [],
-            'daily_values': []
-        }
-        
-        self.portfolio_history = []
+        """Run backtesting simulation (vectorized, see ``vectorized_backtest``)"""
         
         # Align signals with prices
         aligned_signals, aligned_prices = signals.align(prices['Close'], join='inner')
+        dates = aligned_prices.index
+        fraction, require_positive = self._position_fraction()
+        expected_returns = returns.reindex(dates).fillna(0).values if require_positive else None
+        
+        arrays = vectorized_backtest(
+            aligned_signals.values, aligned_prices.values.astype(float),
+            initial_capital=self.config.initial_capital,
+            transaction_cost=self.config.transaction_cost,
+            position_fraction=fraction,
+            expected_returns=expected_returns
+        )
         
-        for date, signal in aligned_signals.items():
-            if date not in aligned_prices.index:
-                continue
-                
-            current_price = aligned_prices[date]
-            
-            # Calculate current portfolio value
-            portfolio_value = portfolio['cash'] + (portfolio['positions'] * current_price)
-            
-            # Execute trading logic
-            if signal == 'BUY' and portfolio['positions'] <= 0:
-                # Calculate position size
-                position_size = self._calculate_position_size(
-                    portfolio_value, current_price, signal, returns.get(date, 0)
-                )
-                
-                if position_size > 0:
-                    # Buy
-                    cost = position_size * current_price * (1 + self.config.transaction_cost)
-                    if cost <= portfolio['cash']:
-                        portfolio['cash'] -= cost
-                        portfolio['positions'] += position_size
-                        
-                        portfolio['trades'].append({
-                            'date': date,
-                            'action': 'BUY',
-                            'quantity': position_size,
-                            'price': current_price,
-                            'cost': cost
-                        })
-                        
-            elif signal == 'SELL' and portfolio['positions'] > 0:
-                # Sell all positions
-                proceeds = portfolio['positions'] * current_price * (1 - self.config.transaction_cost)
-                portfolio['cash'] += proceeds
-                
-                portfolio['trades'].append({
-                    'date': date,
+        # Trade log only touches entry/exit bars
+        price_values = aligned_prices.values
+        trades = []
+        for i in np.flatnonzero(arrays['entries'] | arrays['exits']):
+            quantity = arrays['shares'][i] if arrays['entries'][i] else arrays['shares'][i - 1]
+            if arrays['entries'][i]:
+                trades.append({
+                    'date': dates[i],
+                    'action': 'BUY',
+                    'quantity': quantity,
+                    'price': price_values[i],
+                    'cost': quantity * price_values[i] * (1 + self.config.transaction_cost)
+                })
+            else:
+                trades.append({
+                    'date': dates[i],
                     'action': 'SELL',
-                    'quantity': portfolio['positions'],
-                    'price': current_price,
-                    'proceeds': proceeds
+                    'quantity': quantity,
+                    'price': price_values[i],
+                    'proceeds': quantity * price_values[i] * (1 - self.config.transaction_cost)
                 })
-                
-                portfolio['positions'] = 0
-            
-            # Update portfolio tracking
-            portfolio_value = portfolio['cash'] + (portfolio['positions'] * current_price)
-            portfolio['portfolio_value'] = portfolio_value
-            portfolio['daily_values'].append(portfolio_value)
+        
+        # Columnar history instead of one dict per bar
+        self.portfolio_history = pd.DataFrame({
+            'date': dates,
+            'cash': arrays['cash'],
+            'positions': arrays['shares'],
+            'portfolio_value': arrays['values'],
+            'signal': aligned_signals.values,
+            'price': price_values
+        })
+        
+        has_bars = len(dates) > 0
+        return {
+            'cash': arrays['cash'][-1] if has_bars else self.config.initial_capital,
+            'positions': arrays['shares'][-1] if has_bars else 0,
+            'portfolio_value': arrays['values'][-1] if has_bars else self.config.initial_capital,
+            'trades': trades,
+            'daily_returns': arrays['daily_returns'],
+            'daily_values': arrays['values'],
+            'dates': dates
+        }
+    
+    def run_batch_backtest(self, signals: pd.DataFrame, prices: pd.DataFrame,
+                           expected_returns: Optional[pd.DataFrame] = None) -> Dict:
+        """Backtest a whole universe at once
+        
+        Args:
+            signals: dates x symbols, 'BUY'/'SELL'/'HOLD' strings or +1/-1/0
+            prices: dates x symbols close prices
+            expected_returns: dates x symbols, only used by the kelly sizing method
             
-            # Calculate daily return
-            if len(portfolio['daily_values']) > 1:
-                daily_return = (portfolio_value - portfolio['daily_values'][-2]) / portfolio['daily_values'][-2]
-                portfolio['daily_returns'].append(daily_return)
+        Returns:
+            Dict with 'equity', 'daily_returns', 'positions' DataFrames (dates x symbols)
+            and a 'metrics' DataFrame (symbols x metrics, same metrics as
+            ``_calculate_performance_metrics``)
+        """
+        aligned_signals, aligned_prices = signals.align(prices, join='inner')
+        fraction, require_positive = self._position_fraction()
+        expected = None
+        if require_positive:
+            if expected_returns is None:
+                expected = np.zeros(aligned_prices.shape)
             else:
-                portfolio['daily_returns'].append(0)
-            
-            # Store history
-            self.portfolio_history.append({
-                'date': date,
-                'cash': portfolio['cash'],
-                'positions': portfolio['positions'],
-                'portfolio_value': portfolio_value,
-                'signal': signal,
-                'price': current_price
-            })
-        
-        return portfolio
+                expected = expected_returns.reindex_like(aligned_prices).fillna(0).values
+        
+        arrays = vectorized_backtest(
+            aligned_signals.values, aligned_prices.values.astype(float),
+            initial_capital=self.config.initial_capital,
+            transaction_cost=self.config.transaction_cost,
+            position_fraction=fraction,
+            expected_returns=expected
+        )
+        metrics = calculate_performance_metrics_batch(
+            arrays['values'], arrays['daily_returns'], arrays['num_trades'],
+            self.config.initial_capital
+        )
+        
+        index, columns = aligned_prices.index, aligned_prices.columns
+        logger.info(f"Batch backtest completed: {len(columns)} symbols x {len(index)} bars")
+        return {
+            'equity': pd.DataFrame(arrays['values'], index=index, columns=columns),
+            'daily_returns': pd.DataFrame(arrays['daily_returns'], index=index, columns=columns),
+            'positions': pd.DataFrame(arrays['shares'], index=index, columns=columns),
+            'metrics': pd.DataFrame(metrics, index=columns)
+        }
+    
+    def _position_fraction(self) -> Tuple[float, bool]:
+        """Fraction of portfolio value invested per entry, and whether entries need a positive expected return"""
+        method = self.config.position_size_method
+        if method in ("fixed", "risk_parity"):
+            return self.config.max_position_size, False
+        if method == "kelly":
+            # Kelly Criterion (simplified): assume 60% win rate and 1:1 risk-reward
+            kelly_fraction = (0.6 * 1 - 0.4 * 1) / 1  # Kelly = (bp - q) / b
+            return max(min(kelly_fraction, self.config.max_position_size), 0), True
+        return 0.0, False
     
     def _calculate_position_size(self, portfolio_value: float, price: float, 
                                signal: str, expected_return: float) -> float:
         """Calculate optimal position size"""
-        
-        if self.config.position_size_method == "fixed":
-            # Fixed fraction of portfolio
-            max_investment = portfolio_value * self.config.max_position_size
-            return max_investment / price
-            
-        elif self.config.position_size_method == "kelly":
-            # Kelly Criterion (simplified)
-            if expected_return > 0:
-                # Assume 60% win rate and 1:1 risk-reward for simplicity
-                kelly_fraction = (0.6 * 1 - 0.4 * 1) / 1  # Kelly = (bp - q) / b
-                kelly_fraction = min(kelly_fraction, self.config.max_position_size)
-                max_investment = portfolio_value * max(kelly_fraction, 0)
-                return max_investment / price
-            else:
-                return 0
-                
-        elif self.config.position_size_method == "risk_parity":
-            # Risk parity (simplified - equal risk contribution)
-            max_investment = portfolio_value * self.config.max_position_size
-            return max_investment / price
-        
-        return 0
+        fraction, require_positive = self._position_fraction()
+        if require_positive and expected_return <= 0:
+            return 0
+        return portfolio_value * fraction / price
     
     def _calculate_performance_metrics(self, backtest_results: Dict) -> Dict:
         """Calculate comprehensive performance metrics"""
@@ -457,22 +605,15 @@ class BacktestingFramework(BaseValidator):
         # Beta calculation (if market returns available)
         if len(market_returns) > 0 and len(daily_returns) > 1:
             # Align portfolio and market returns
-            portfolio_dates = [entry['date'] for entry in self.portfolio_history if 'date' in entry]
-            if len(portfolio_dates) == len(daily_returns):
-                aligned_market_returns = []
-                for date in portfolio_dates:
-                    if date in market_returns.index:
-                        aligned_market_returns.append(market_returns[date])
-                    else:
-                        aligned_market_returns.append(0)
-                
-                if len(aligned_market_returns) == len(daily_returns):
-                    market_var = np.var(aligned_market_returns)
-                    if market_var > 0:
-                        covariance = np.cov(daily_returns, aligned_market_returns)[0, 1]
-                        risk_metrics['beta'] = covariance / market_var
-                    else:
-                        risk_metrics['beta'] = 0
+            portfolio_dates = backtest_results.get('dates')
+            if portfolio_dates is not None and len(portfolio_dates) == len(daily_returns):
+                aligned_market_returns = market_returns.reindex(portfolio_dates).fillna(0).values
+                market_var = np.var(aligned_market_returns)
+                if market_var > 0:
+                    covariance = np.cov(daily_returns, aligned_market_returns)[0, 1]
+                    risk_metrics['beta'] = covariance / market_var
+                else:
+                    risk_metrics['beta'] = 0
         
         return risk_metrics
 
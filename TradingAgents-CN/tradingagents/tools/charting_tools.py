@@ -20,6 +20,7 @@ from io import BytesIO
 import base64
 
 from tradingagents.utils.logging_init import get_logger
+from tradingagents.utils import indicator_kernels as kernels
 
 logger = get_logger("chart_tools")
 
@@ -584,11 +585,7 @@ class ChartGeneratorTools:
     
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """计算RSI指标"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
+        return pd.Series(kernels.rsi(kernels.as_float_array(prices), period), index=prices.index)
     
     def _generate_macd_chart(self, data: pd.DataFrame, symbol: str, config: Dict[str, Any]) -> Dict[str, Any]:
         """生成MACD图表"""
@@ -638,12 +635,10 @@ class ChartGeneratorTools:
     
     def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """计算MACD指标"""
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        macd = ema_fast - ema_slow
-        signal_line = macd.ewm(span=signal).mean()
-        histogram = macd - signal_line
-        return macd, signal_line, histogram
+        macd, signal_line, histogram = kernels.macd(kernels.as_float_array(prices), fast, slow, signal)
+        return (pd.Series(macd, index=prices.index),
+                pd.Series(signal_line, index=prices.index),
+                pd.Series(histogram, index=prices.index))
     
     def _get_sentiment_color(self, score: float) -> str:
         """根据情绪评分获取颜色"""
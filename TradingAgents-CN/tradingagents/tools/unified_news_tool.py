@@ -9,6 +9,8 @@ import logging
 from datetime import datetime
 import re
 
+from tradingagents.utils.news_dedup import dedup_markdown_news
+
 logger = logging.getLogger(__name__)
 
 class UnifiedNewsAnalyzer:
@@ -216,7 +218,8 @@ class UnifiedNewsAnalyzer:
         return "❌ 无法获取美股新闻数据，所有新闻源均不可用"
     
     def _format_news_result(self, news_content: str, source: str) -> str:
-        """格式化新闻结果"""
+        """格式化新闻结果（合并近似重复的转载新闻）"""
+        news_content = dedup_markdown_news(news_content)
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         formatted_result = f"""
@@ -17,6 +17,13 @@ logger = logging.getLogger(__name__)
 
 class EnhancedNewsFilter(NewsRelevanceFilter):
     """增强新闻过滤器，集成本地模型和多种过滤策略"""
+
+    # 综合评分权重
+    SCORE_WEIGHTS = {
+        'rule': 0.4,      # 规则过滤权重40%
+        'semantic': 0.35,  # 语义相似度权重35%
+        'classification': 0.25  # 分类模型权重25%
+    }
     
     def __init__(self, stock_code: str, company_name: str, use_semantic: bool = True, use_local_model: bool = False):
         """
@@ -202,13 +209,15 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             logger.error(f"[增强过滤器] 本地模型分类失败: {e}")
             return 0
     
-    def calculate_enhanced_relevance_score(self, title: str, content: str) -> Dict[str, float]:
+    def calculate_enhanced_relevance_score(self, title: str, content: str,
+                                           rule_score: float = None) -> Dict[str, float]:
         """
         计算增强相关性评分（综合多种方法）
         
         Args:
             title: 新闻标题
             content: 新闻内容
+            rule_score: 已批量计算好的规则评分，None时逐条计算
             
         Returns:
             Dict: 包含各种评分的字典
@@ -216,7 +225,8 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
         scores = {}
         
         # 1. 基础规则评分
-        rule_score = super().calculate_relevance_score(title, content)
+        if rule_score is None:
+            rule_score = super().calculate_relevance_score(title, content)
         scores['rule_score'] = rule_score
         
         # 2. 语义相似度评分
@@ -234,11 +244,7 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             scores['classification_score'] = 0
         
         # 4. 综合评分（加权平均）
-        weights = {
-            'rule': 0.4,      # 规则过滤权重40%
-            'semantic': 0.35,  # 语义相似度权重35%
-            'classification': 0.25  # 分类模型权重25%
-        }
+        weights = self.SCORE_WEIGHTS
         
         final_score = (
             weights['rule'] * rule_score +
@@ -270,14 +276,26 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
         
         logger.info(f"[增强过滤器] 开始增强过滤，原始数量: {len(news_df)}条，最低评分阈值: {min_score}")
         
+        # 先批量计算规则评分，规则评分加上模型评分上限仍达不到阈值的新闻不再进入语义/分类阶段
+        titles, contents = self._news_text_columns(news_df)
+        rule_scores = self.score_news_batch(titles, contents)
+        max_model_score = 0.0
+        if self.use_semantic and self.sentence_model is not None:
+            max_model_score += self.SCORE_WEIGHTS['semantic'] * 100
+        if self.use_local_model and self.classification_model is not None:
+            max_model_score += self.SCORE_WEIGHTS['classification'] * 100
+        candidates = self.SCORE_WEIGHTS['rule'] * rule_scores + max_model_score >= min_score
+        logger.debug(f"[增强过滤器] 规则预筛选: {int(candidates.sum())}/{len(news_df)}条进入模型评分阶段")
+        
         filtered_news = []
         
-        for idx, row in news_df.iterrows():
-            title = row.get('新闻标题', row.get('标题', ''))
-            content = row.get('新闻内容', row.get('内容', ''))
+        for position in np.flatnonzero(candidates):
+            row = news_df.iloc[position]
+            title, content = titles[position], contents[position]
             
             # 计算增强评分
-            scores = self.calculate_enhanced_relevance_score(title, content)
+            scores = self.calculate_enhanced_relevance_score(title, content,
+                                                             rule_score=int(rule_scores[position]))
             
             if scores['final_score'] >= min_score:
                 row_dict = row.to_dict()
@@ -0,0 +1,239 @@
+"""
+技术指标NumPy计算内核
+所有函数只接受/返回连续的一维浮点数组，不经过pandas中间Series：
+
+- 滚动窗口统计用累加和或滑动窗口视图一次完成；
+- 指数加权（EMA/MACD/简化SAR）用分块闭式解计算一阶线性递推，避免逐行Python循环；
+- 内部累加统一使用float64，输出可选float32以减半内存。
+
+语义与pandas实现保持一致（rolling默认min_periods=窗口长度、ewm(span).mean() 的 adjust=True、
+cumsum跳过NaN），供特征工程、图表工具和自动化分析共用。
+"""
+
+import math
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+DEFAULT_FIBONACCI_RATIOS = (0.236, 0.382, 0.5, 0.618)
+
+
+def as_float_array(values, dtype=np.float64) -> np.ndarray:
+    """转换为连续的一维浮点数组"""
+    return np.ascontiguousarray(np.asarray(values, dtype=dtype).ravel())
+
+
+def _output(values: np.ndarray, dtype) -> np.ndarray:
+    return values if values.dtype == dtype else values.astype(dtype)
+
+
+def shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """向后平移，空出的位置为NaN（同 Series.shift）"""
+    out = np.full(len(x), np.nan, dtype=np.float64)
+    if 0 < periods < len(x):
+        out[periods:] = x[:-periods]
+    elif periods == 0:
+        out[:] = x
+    return out
+
+
+def diff(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    return x - shift(x, periods)
+
+
+def pct_change(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    previous = shift(x, periods)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return x / previous - 1
+
+
+def cumsum_skipna(x: np.ndarray) -> np.ndarray:
+    """累加和，NaN位置保持NaN且不中断累加（同 Series.cumsum）"""
+    out = np.nancumsum(x)
+    out[np.isnan(x)] = np.nan
+    return out
+
+
+def rolling_sum(x: np.ndarray, window: int, dtype=np.float64) -> np.ndarray:
+    """窗口内含NaN或数据不足时为NaN"""
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    out = np.full(n, np.nan, dtype=np.float64)
+    if window <= 0 or n < window:
+        return _output(out, dtype)
+    missing = np.isnan(x)
+    # 先减去参考值再累加，降低长序列前缀和的舍入误差
+    reference = x[~missing][0] if not missing.all() else 0.0
+    sums = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, x - reference))))
+    counts = np.concatenate(([0], np.cumsum(missing)))
+    window_sums = sums[window:] - sums[:-window] + window * reference
+    out[window - 1:] = np.where(counts[window:] - counts[:-window] == 0, window_sums, np.nan)
+    return _output(out, dtype)
+
+
+def rolling_mean(x: np.ndarray, window: int, dtype=np.float64) -> np.ndarray:
+    return _output(rolling_sum(x, window) / window, dtype)
+
+
+def _rolling_reduce(x: np.ndarray, window: int, reducer, dtype, **kwargs) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(len(x), np.nan, dtype=np.float64)
+    if 0 < window <= len(x):
+        out[window - 1:] = reducer(sliding_window_view(x, window), axis=-1, **kwargs)
+    return _output(out, dtype)
+
+
+def rolling_std(x: np.ndarray, window: int, ddof: int = 1, dtype=np.float64) -> np.ndarray:
+    return _rolling_reduce(x, window, np.std, dtype, ddof=ddof)
+
+
+def rolling_max(x: np.ndarray, window: int, dtype=np.float64) -> np.ndarray:
+    return _rolling_reduce(x, window, np.max, dtype)
+
+
+def rolling_min(x: np.ndarray, window: int, dtype=np.float64) -> np.ndarray:
+    return _rolling_reduce(x, window, np.min, dtype)
+
+
+def linear_recurrence(x: np.ndarray, decay: float, initial: float = 0.0) -> np.ndarray:
+    """
+    计算 y[t] = x[t] + decay * y[t-1]（y[-1] = initial）
+
+    按块使用闭式解 y[s+j] = decay^j * (decay * y[s-1] + Σ x[s+i] * decay^-i)，
+    块长保证 decay^-块长 不溢出，整体仍是一次顺序扫描。
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n == 0:
+        return np.empty(0, dtype=np.float64)
+    if decay == 0:
+        return x.copy()
+    if decay == 1:
+        return np.cumsum(x) + initial
+
+    block = n if decay > 1 else max(1, min(n, int(150 * math.log(10) / -math.log(decay))))
+    exponents = np.arange(block)
+    powers = decay ** exponents
+    inverse_powers = decay ** -exponents.astype(np.float64)
+
+    out = np.empty(n, dtype=np.float64)
+    carry = initial
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        k = end - start
+        out[start:end] = powers[:k] * (decay * carry + np.cumsum(x[start:end] * inverse_powers[:k]))
+        carry = out[end - 1]
+    return out
+
+
+def ema(x: np.ndarray, span: int, dtype=np.float64) -> np.ndarray:
+    """指数移动平均，等价于 Series.ewm(span=span).mean()（adjust=True，NaN不计入权重）"""
+    x = np.asarray(x, dtype=np.float64)
+    decay = 1.0 - 2.0 / (span + 1.0)
+    valid = ~np.isnan(x)
+    numerator = linear_recurrence(np.where(valid, x, 0.0), decay)
+    denominator = linear_recurrence(valid.astype(np.float64), decay)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = np.where(denominator > 0, numerator / denominator, np.nan)
+    return _output(out, dtype)
+
+
+def rsi(close: np.ndarray, period: int = 14, dtype=np.float64) -> np.ndarray:
+    """RSI（涨跌幅简单移动平均版本，与项目原有实现一致）"""
+    delta = diff(np.asarray(close, dtype=np.float64))
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    avg_gain = rolling_mean(gain, period)
+    avg_loss = rolling_mean(loss, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = 100 - 100 / (1 + avg_gain / avg_loss)
+    return _output(out, dtype)
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9,
+         dtype=np.float64) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD线、信号线、柱状图"""
+    close = np.asarray(close, dtype=np.float64)
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal)
+    return _output(macd_line, dtype), _output(signal_line, dtype), _output(macd_line - signal_line, dtype)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, dtype=np.float64) -> np.ndarray:
+    """真实波幅，首行因缺少前收盘价为NaN"""
+    previous_close = shift(np.asarray(close, dtype=np.float64))
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    out = np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+    return _output(out, dtype)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14,
+        dtype=np.float64) -> np.ndarray:
+    """平均真实波幅（真实波幅的简单移动平均）"""
+    return rolling_mean(true_range(high, low, close), period, dtype)
+
+
+def bollinger_bands(close: np.ndarray, period: int = 20, num_std: float = 2.0,
+                    dtype=np.float64) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """布林带：中轨、上轨、下轨（样本标准差）"""
+    middle = rolling_mean(close, period)
+    std = rolling_std(close, period)
+    return (_output(middle, dtype), _output(middle + num_std * std, dtype),
+            _output(middle - num_std * std, dtype))
+
+
+def pivot_points(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                 dtype=np.float64) -> Dict[str, np.ndarray]:
+    """基于前一根K线的经典枢轴点"""
+    prev_high = shift(np.asarray(high, dtype=np.float64))
+    prev_low = shift(np.asarray(low, dtype=np.float64))
+    prev_close = shift(np.asarray(close, dtype=np.float64))
+    pivot = (prev_high + prev_low + prev_close) / 3
+    prev_range = prev_high - prev_low
+    levels = {
+        'pivot_point': pivot,
+        'resistance_1': 2 * pivot - prev_low,
+        'support_1': 2 * pivot - prev_high,
+        'resistance_2': pivot + prev_range,
+        'support_2': pivot - prev_range,
+    }
+    return {name: _output(values, dtype) for name, values in levels.items()}
+
+
+def fibonacci_levels(high: np.ndarray, low: np.ndarray, period: int,
+                     ratios: Sequence[float] = DEFAULT_FIBONACCI_RATIOS,
+                     dtype=np.float64) -> np.ndarray:
+    """
+    区间回撤位：最高价 - 比例 × (最高价 - 最低价)
+
+    Returns:
+        np.ndarray: 形状 (n, len(ratios))
+    """
+    high_max = rolling_max(high, period)
+    low_min = rolling_min(low, period)
+    price_range = high_max - low_min
+    levels = high_max[:, None] - np.asarray(ratios, dtype=np.float64)[None, :] * price_range[:, None]
+    return _output(levels, dtype)
+
+
+def parabolic_sar_simplified(high: np.ndarray, low: np.ndarray, af: float = 0.02,
+                             dtype=np.float64) -> np.ndarray:
+    """
+    简化抛物线SAR（与特征工程原实现一致，不做趋势反转）
+
+    sar[0] = low[0]，sar[1] = high[0]，之后 sar[i] = sar[i-1] + af × (high[i-1] - sar[i-1])，
+    即对前一根最高价的指数平滑。
+    """
+    high = np.asarray(high, dtype=np.float64)
+    n = len(high)
+    out = np.full(n, np.nan, dtype=np.float64)
+    if n < 2:
+        return _output(out, dtype)
+    out[0] = low[0]
+    # y[j] = sar[j+1]：y[j] = (1-af) y[j-1] + af*high[j]，y[0] = high[0]
+    driven = af * high[:n - 1]
+    driven[0] = high[0]
+    out[1:] = linear_recurrence(driven, 1.0 - af)
+    return _output(out, dtype)
@@ -0,0 +1,278 @@
+"""
+新闻近似重复聚类
+基于MinHash + LSH分桶，把同一事件被多家媒体转载、标题略有差异的新闻聚成一簇，
+每簇只保留一条代表新闻并记录"另有N个来源报道"，减少送入大模型的重复内容。
+
+复杂度约为 O(n)：每条新闻计算一次签名，只对落入同一LSH桶的候选对做相似度校验。
+"""
+
+import logging
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# 默认相似度阈值（字符3-gram的Jaccard相似度）
+DEFAULT_SIMILARITY_THRESHOLD = 0.6
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# 去掉标点、空白，只保留文字和数字参与比较
+_NORMALIZE_PATTERN = re.compile(r'[\W_]+', re.UNICODE)
+
+# markdown新闻块中的来源信息
+_SOURCE_PATTERNS = (
+    re.compile(r'\(source:\s*([^)]+)\)', re.IGNORECASE),
+    re.compile(r'\*\*来源\*\*:\s*([^|\n]+)'),
+    re.compile(r'来源[:：]\s*([^|\n]+)'),
+)
+
+
+@dataclass
+class NewsCluster:
+    """一簇近似重复的新闻"""
+    representative: int
+    members: List[int] = field(default_factory=list)
+    sources: List[Optional[str]] = field(default_factory=list)
+
+    @property
+    def also_reported_by(self) -> int:
+        """除代表新闻外，另有多少个来源报道了同一内容"""
+        rep_source = self.sources[0] if self.sources else None
+        known = [s for s in self.sources if s]
+        if len(known) == len(self.sources):
+            return len(set(known) - {rep_source})
+        # 来源信息不完整时按条数计
+        return len(self.members) - 1
+
+
+class NearDuplicateDetector:
+    """MinHash + LSH 近似重复检测器"""
+
+    def __init__(self, threshold: float = DEFAULT_SIMILARITY_THRESHOLD, num_perm: int = 64,
+                 shingle_size: int = 3, max_chars: int = 500, seed: int = 1):
+        """
+        Args:
+            threshold: 判定为重复的相似度阈值 (0-1)
+            num_perm: MinHash签名长度
+            shingle_size: 字符n-gram长度（同时适用于中英文）
+            max_chars: 每条新闻参与比较的最大字符数
+            seed: 哈希置换的随机种子
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_chars = max_chars
+        self.bands, self.rows = self._choose_bands(threshold, num_perm)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+    @staticmethod
+    def _choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """选择LSH分带参数，使候选阈值 (1/b)^(1/r) 略低于判定阈值（偏向召回，再由签名校验）"""
+        target = threshold * 0.8
+        best = (num_perm, 1)
+        best_diff = float('inf')
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            diff = abs((1.0 / bands) ** (1.0 / rows) - target)
+            if diff < best_diff:
+                best, best_diff = (bands, rows), diff
+        return best
+
+    def _shingles(self, text: str) -> np.ndarray:
+        normalized = _NORMALIZE_PATTERN.sub('', (text or '').lower())[:self.max_chars]
+        k = self.shingle_size
+        if len(normalized) <= k:
+            grams = {normalized} if normalized else set()
+        else:
+            grams = {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+        return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams),
+                           dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        """计算文本的MinHash签名"""
+        hashes = self._shingles(text)
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+    def cluster(self, texts: Sequence[str]) -> List[List[int]]:
+        """
+        对文本聚类
+
+        Returns:
+            List[List[int]]: 每簇的下标列表，簇内和簇间都按原始顺序排列
+        """
+        n = len(texts)
+        if n < 2:
+            return [[i] for i in range(n)]
+
+        signatures = np.vstack([self.signature(text) for text in texts])
+        parent = list(range(n))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        checked = set()
+        for band in range(self.bands):
+            buckets: Dict[bytes, List[int]] = {}
+            band_values = signatures[:, band * self.rows:(band + 1) * self.rows]
+            for i in range(n):
+                buckets.setdefault(band_values[i].tobytes(), []).append(i)
+
+            for candidates in buckets.values():
+                if len(candidates) < 2:
+                    continue
+                first = candidates[0]
+                for other in candidates[1:]:
+                    root_a, root_b = find(first), find(other)
+                    if root_a == root_b or (first, other) in checked:
+                        continue
+                    checked.add((first, other))
+                    similarity = float(np.mean(signatures[first] == signatures[other]))
+                    if similarity >= self.threshold:
+                        # 保留靠前的下标作为根，代表新闻即原始顺序中的第一条
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        clusters: Dict[int, List[int]] = {}
+        for i in range(n):
+            clusters.setdefault(find(i), []).append(i)
+        return sorted(clusters.values(), key=lambda members: members[0])
+
+    def cluster_items(self, items: Sequence[T], text_fn: Callable[[T], str],
+                      source_fn: Callable[[T], Optional[str]] = None) -> List[NewsCluster]:
+        """
+        对任意新闻对象聚类，每簇的代表为原始顺序中的第一条
+
+        Args:
+            items: 新闻对象列表（调用方应预先按优先级/相关性排序）
+            text_fn: 提取用于比较的文本（通常为标题+正文）
+            source_fn: 提取新闻来源，用于统计"另有N个来源报道"
+        """
+        groups = self.cluster([text_fn(item) for item in items])
+        return [
+            NewsCluster(
+                representative=members[0],
+                members=members,
+                sources=[source_fn(items[i]) if source_fn else None for i in members],
+            )
+            for members in groups
+        ]
+
+
+_detectors: Dict[float, NearDuplicateDetector] = {}
+
+
+def get_near_duplicate_detector(threshold: float = None) -> NearDuplicateDetector:
+    """获取（按阈值缓存的）检测器实例"""
+    if threshold is None:
+        threshold = DEFAULT_SIMILARITY_THRESHOLD
+    if threshold not in _detectors:
+        _detectors[threshold] = NearDuplicateDetector(threshold=threshold)
+    return _detectors[threshold]
+
+
+def dedup_news_dataframe(news_df: pd.DataFrame, threshold: float = None,
+                         title_columns: Sequence[str] = ('新闻标题', '标题', 'title'),
+                         content_columns: Sequence[str] = ('新闻内容', '内容', 'content'),
+                         source_columns: Sequence[str] = ('文章来源', '来源', 'source')) -> pd.DataFrame:
+    """
+    对新闻DataFrame做近似重复聚类，每簇保留第一行并增加 also_reported_by 列
+
+    Args:
+        news_df: 新闻DataFrame（调用方应预先按相关性排序，靠前的行作为代表）
+        threshold: 相似度阈值
+
+    Returns:
+        pd.DataFrame: 去重后的新闻
+    """
+    if news_df is None or len(news_df) < 2:
+        return news_df
+
+    def first_column(candidates: Sequence[str]) -> Optional[str]:
+        return next((c for c in candidates if c in news_df.columns), None)
+
+    title_col = first_column(title_columns)
+    content_col = first_column(content_columns)
+    source_col = first_column(source_columns)
+    if title_col is None and content_col is None:
+        return news_df
+
+    titles = news_df[title_col].fillna('').astype(str) if title_col else pd.Series('', index=news_df.index)
+    contents = news_df[content_col].fillna('').astype(str) if content_col else pd.Series('', index=news_df.index)
+    texts = (titles + ' ' + contents).tolist()
+    sources = news_df[source_col].astype(str).tolist() if source_col else None
+
+    detector = get_near_duplicate_detector(threshold)
+    clusters = detector.cluster_items(
+        list(range(len(texts))),
+        text_fn=lambda i: texts[i],
+        source_fn=(lambda i: sources[i]) if sources else None,
+    )
+
+    positions = [cluster.representative for cluster in clusters]
+    result = news_df.iloc[positions].copy()
+    result['also_reported_by'] = [cluster.also_reported_by for cluster in clusters]
+
+    removed = len(news_df) - len(result)
+    if removed:
+        logger.info(f"[新闻聚类] 近似重复聚类: {len(news_df)}条 -> {len(result)}条，合并 {removed} 条转载")
+    return result
+
+
+def _block_source(block: str) -> Optional[str]:
+    for pattern in _SOURCE_PATTERNS:
+        match = pattern.search(block)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def dedup_markdown_news(text: str, threshold: float = None) -> str:
+    """
+    对以 "### 标题" 分段的新闻文本做近似重复聚类
+
+    每簇保留第一段，并在其标题行后注明另有多少个来源报道；
+    不足两段新闻时原样返回。
+    """
+    if not text:
+        return text
+
+    parts = re.split(r'(?m)^(?=### )', text)
+    preamble, blocks = (parts[0], parts[1:]) if not parts[0].startswith('### ') else ('', parts)
+    if len(blocks) < 2:
+        return text
+
+    detector = get_near_duplicate_detector(threshold)
+    clusters = detector.cluster_items(blocks, text_fn=lambda b: b.lstrip('#'), source_fn=_block_source)
+    if len(clusters) == len(blocks):
+        return text
+
+    output = []
+    for cluster in clusters:
+        block = blocks[cluster.representative]
+        count = cluster.also_reported_by
+        if count > 0:
+            header, sep, body = block.partition('\n')
+            block = f"{header}{sep}（另有{count}个来源报道相同内容）\n{body}" if sep else f"{header}（另有{count}个来源报道相同内容）\n"
+        output.append(block)
+
+    logger.info(f"[新闻聚类] 新闻文本近似重复聚类: {len(blocks)}段 -> {len(clusters)}段")
+    return preamble + ''.join(output)
@@ -3,12 +3,15 @@
 用于过滤与特定股票/公司不相关的新闻，提高新闻分析质量
 """
 
+import numpy as np
 import pandas as pd
 import re
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Sequence
 from datetime import datetime
 import logging
 
+from .news_dedup import dedup_news_dataframe
+
 logger = logging.getLogger(__name__)
 
 class NewsRelevanceFilter:
@@ -47,6 +50,10 @@ class NewsRelevanceFilter:
             '股权激励', '员工持股', '定增', '配股', '送股',
             '资产重组', '借壳上市', '退市', '摘帽', 'ST'
         ]
+
+        # 批量评分用的关键词自动机（关键词列表变化时重新编译）
+        self._matcher_key = None
+        self._matcher = None
     
     def calculate_relevance_score(self, title: str, content: str) -> float:
         """
@@ -131,13 +138,121 @@ class NewsRelevanceFilter:
         
         return final_score
     
-    def filter_news(self, news_df: pd.DataFrame, min_score: float = 30) -> pd.DataFrame:
+    def _get_keyword_matcher(self) -> Dict:
+        """
+        把强相关/包含/排除关键词编译为一个组合正则
+
+        正则为按长度降序排列的前瞻匹配，每个位置命中最长的关键词；
+        同一位置上更短的关键词（如"业绩预告"中的"业绩"）通过包含关系补齐，
+        因此命中集合与逐个关键词做子串查找完全一致。
+        """
+        key = (tuple(self.strong_keywords), tuple(self.include_keywords), tuple(self.exclude_keywords))
+        if self._matcher_key == key:
+            return self._matcher
+
+        vocab = list(dict.fromkeys(self.strong_keywords + self.include_keywords + self.exclude_keywords))
+        index = {keyword: i for i, keyword in enumerate(vocab)}
+        alternatives = '|'.join(re.escape(k) for k in sorted(vocab, key=len, reverse=True) if k)
+        pattern = re.compile(f"(?=({alternatives}))") if alternatives else None
+        contained = {k: [index[other] for other in vocab if other and other in k] for k in vocab}
+
+        # 每个关键词在标题/内容中命中时的分值（同一关键词出现在多个列表中时累加）
+        title_weights = np.zeros(len(vocab), dtype=np.int64)
+        content_weights = np.zeros(len(vocab), dtype=np.int64)
+        for keywords, title_weight, content_weight in ((self.strong_keywords, 30, 15),
+                                                       (self.include_keywords, 15, 8),
+                                                       (self.exclude_keywords, -40, -20)):
+            for keyword in keywords:
+                title_weights[index[keyword]] += title_weight
+                content_weights[index[keyword]] += content_weight
+
+        exclude_mask = np.zeros(len(vocab), dtype=bool)
+        exclude_mask[[index[k] for k in self.exclude_keywords]] = True
+
+        self._matcher = {
+            'pattern': pattern,
+            'contained': contained,
+            'title_weights': title_weights,
+            'content_weights': content_weights,
+            'exclude_mask': exclude_mask,
+            'size': len(vocab),
+        }
+        self._matcher_key = key
+        return self._matcher
+
+    def _keyword_hits(self, texts: Sequence[str], matcher: Dict) -> np.ndarray:
+        """返回 (文本数, 关键词数) 的命中矩阵"""
+        hits = np.zeros((len(texts), matcher['size']), dtype=bool)
+        pattern = matcher['pattern']
+        if pattern is None:
+            return hits
+        contained = matcher['contained']
+        for row, text in enumerate(texts):
+            for matched in set(pattern.findall(text)):
+                hits[row, contained[matched]] = True
+        return hits
+
+    def score_news_batch(self, titles: Sequence[str], contents: Sequence[str]) -> np.ndarray:
+        """
+        批量计算新闻相关性评分，结果与逐条调用 calculate_relevance_score 完全一致
+
+        Args:
+            titles: 新闻标题列表
+            contents: 新闻内容列表
+
+        Returns:
+            np.ndarray: 相关性评分 (0-100)
+        """
+        titles = list(titles)
+        contents = list(contents)
+        matcher = self._get_keyword_matcher()
+
+        title_hits = self._keyword_hits([t.lower() for t in titles], matcher)
+        content_hits = self._keyword_hits([c.lower() for c in contents], matcher)
+        scores = np.where(title_hits, matcher['title_weights'],
+                          np.where(content_hits, matcher['content_weights'], 0)).sum(axis=1)
+
+        # 公司名称和股票代码（区分大小写，与逐条评分一致）
+        name_in_title = np.array([self.company_name in t for t in titles], dtype=bool)
+        name_in_content = np.array([self.company_name in c for c in contents], dtype=bool)
+        code_in_title = np.array([self.stock_code in t for t in titles], dtype=bool)
+        code_in_content = np.array([self.stock_code in c for c in contents], dtype=bool)
+        scores += np.where(name_in_title, 50, np.where(name_in_content, 25, 0))
+        scores += np.where(code_in_title, 40, np.where(code_in_content, 20, 0))
+
+        # 标题无公司信息但含排除词
+        exclude_in_title = title_hits[:, matcher['exclude_mask']].any(axis=1)
+        scores -= np.where(~name_in_title & ~code_in_title & exclude_in_title, 30, 0)
+
+        return np.clip(scores, 0, 100)
+
+    @staticmethod
+    def _news_text_columns(news_df: pd.DataFrame) -> Tuple[List[str], List[str]]:
+        """按 filter_news 的列优先级取出标题和内容"""
+        def column(names: Sequence[str]) -> List[str]:
+            for name in names:
+                if name in news_df.columns:
+                    return news_df[name].fillna('').astype(str).tolist()
+            return [''] * len(news_df)
+
+        return column(('新闻标题', '标题')), column(('新闻内容', '内容'))
+
+    def score_dataframe(self, news_df: pd.DataFrame) -> pd.Series:
+        """批量计算新闻DataFrame每一行的相关性评分"""
+        titles, contents = self._news_text_columns(news_df)
+        return pd.Series(self.score_news_batch(titles, contents), index=news_df.index)
+
+    def filter_news(self, news_df: pd.DataFrame, min_score: float = 30,
+                    deduplicate: bool = True, dedup_threshold: float = None) -> pd.DataFrame:
         """
         过滤新闻DataFrame
         
         Args:
             news_df: 原始新闻DataFrame
             min_score: 最低相关性评分阈值
+            deduplicate: 是否对保留的新闻做近似重复聚类（每簇保留评分最高的一条，
+                         并增加 also_reported_by 列）
+            dedup_threshold: 近似重复的相似度阈值，None使用默认值
             
         Returns:
             pd.DataFrame: 过滤后的新闻DataFrame，按相关性评分排序
@@ -148,29 +263,20 @@ class NewsRelevanceFilter:
         
         logger.info(f"[过滤器] 开始过滤新闻，原始数量: {len(news_df)}条，最低评分阈值: {min_score}")
         
-        filtered_news = []
-        
-        for idx, row in news_df.iterrows():
-            title = row.get('新闻标题', row.get('标题', ''))
-            content = row.get('新闻内容', row.get('内容', ''))
-            
-            # 计算相关性评分
-            score = self.calculate_relevance_score(title, content)
-            
-            if score >= min_score:
-                row_dict = row.to_dict()
-                row_dict['relevance_score'] = score
-                filtered_news.append(row_dict)
-                
-                logger.debug(f"[过滤器] 保留新闻 (评分: {score:.1f}): {title[:50]}...")
-            else:
-                logger.debug(f"[过滤器] 过滤新闻 (评分: {score:.1f}): {title[:50]}...")
+        # 批量计算相关性评分
+        scores = self.score_dataframe(news_df)
+        keep = scores >= min_score
+        logger.debug(f"[过滤器] 批量评分完成，保留 {int(keep.sum())}条，过滤 {int((~keep).sum())}条")
         
         # 创建过滤后的DataFrame
-        if filtered_news:
-            filtered_df = pd.DataFrame(filtered_news)
+        if keep.any():
+            filtered_df = news_df[keep].copy()
+            filtered_df['relevance_score'] = scores[keep]
+            filtered_df = filtered_df.reset_index(drop=True)
             # 按相关性评分排序
             filtered_df = filtered_df.sort_values('relevance_score', ascending=False)
+            if deduplicate:
+                filtered_df = dedup_news_dataframe(filtered_df, threshold=dedup_threshold)
             logger.info(f"[过滤器] 过滤完成，保留 {len(filtered_df)}条 新闻")
         else:
             filtered_df = pd.DataFrame()
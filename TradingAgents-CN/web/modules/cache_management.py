@@ -255,28 +255,23 @@ def render_cache_management(embedded: bool = False):
     
     # 显示缓存文件列表
     try:
-        metadata_files = list(cache.metadata_dir.glob("*_meta.json"))
+        metadata_list = cache.find_metadata(data_type=data_type)
         
-        if metadata_files:
-            import json
+        if metadata_list:
             from datetime import datetime
             
             cache_items = []
-            for metadata_file in metadata_files:
+            for metadata in metadata_list:
                 try:
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    
-                    if metadata.get('data_type') == data_type:
-                        cached_at = datetime.fromisoformat(metadata['cached_at'])
-                        cache_items.append({
-                            'symbol': metadata.get('symbol', 'N/A'),
-                            'data_source': metadata.get('data_source', 'N/A'),
-                            'cached_at': cached_at.strftime('%Y-%m-%d %H:%M:%S'),
-                            'start_date': metadata.get('start_date', 'N/A'),
-                            'end_date': metadata.get('end_date', 'N/A'),
-                            'file_path': metadata.get('file_path', 'N/A')
-                        })
+                    cached_at = datetime.fromisoformat(metadata['cached_at'])
+                    cache_items.append({
+                        'symbol': metadata.get('symbol', 'N/A'),
+                        'data_source': metadata.get('data_source', 'N/A'),
+                        'cached_at': cached_at.strftime('%Y-%m-%d %H:%M:%S'),
+                        'start_date': metadata.get('start_date', 'N/A'),
+                        'end_date': metadata.get('end_date', 'N/A'),
+                        'file_path': metadata.get('file_path', 'N/A')
+                    })
                 except Exception:
                     continue
             